@@ -0,0 +1,98 @@
+"""포트폴리오 성과(TWR·XIRR)·위험(변동성·낙폭·베타·상관)·실현 손익(lot 매칭) 분석 API"""
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import RISK_BENCHMARK
+from backend.db.database import get_db, run_offloop
+from backend.db.lots import get_lots, pnl_report, sync_lots
+from backend.db.version import VersionedCache
+from backend.services.analytics import compute_performance
+from backend.services.risk import compute_risk, refresh_benchmark
+
+router = APIRouter()
+
+_performance_cache = VersionedCache("performance", maxsize=32)
+_risk_cache        = VersionedCache("risk", maxsize=16)
+_pnl_cache         = VersionedCache("pnl", maxsize=4)
+_METHOD = "^(fifo|average)$"
+_DATE = r"^\d{4}-\d{2}-\d{2}$"
+
+
+@router.get("/analytics/performance")
+async def get_performance(
+    start: Optional[str] = Query(None, alias="from", pattern=_DATE),
+    end:   Optional[str] = Query(None, alias="to",   pattern=_DATE),
+    type:  Optional[str] = Query(None, description="자산 유형 (없으면 전체)"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    기간 성과: 보유 종목(holdings)·계좌(accounts)·유형(types)·전체(portfolio)별
+    시작/종료 평가액, 순유입, 배당, 손익, TWR(1년 이상이면 연환산 포함), XIRR(연율).
+    from 없으면 가장 이른 보유일부터, to 없으면 오늘까지.
+    """
+    # 오늘 날짜가 바뀌면 같은 data_version이라도 기간 끝이 달라짐
+    key = (start, end, type, datetime.now().strftime("%Y-%m-%d"))
+    try:
+        return await _performance_cache.get_or_compute(
+            db, key, lambda: run_offloop("performance", compute_performance, start, end, type)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.get("/analytics/risk")
+async def get_risk(
+    start:     Optional[str] = Query(None, alias="from", pattern=_DATE),
+    end:       Optional[str] = Query(None, alias="to",   pattern=_DATE),
+    benchmark: str           = Query(RISK_BENCHMARK, description="베타 기준 지수 Ticker (빈 값이면 베타 생략)"),
+    window:    int           = Query(63, ge=2, le=756, description="롤링 변동성 거래일 수"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    보유 Ticker 주식의 KRW 일간 수익률 기준 위험 지표 (기본 최근 3년).
+    종목·포트폴리오(현재 비중)·지수별 연환산 변동성, 최대 낙폭(고점·저점일), 지수 대비 베타,
+    롤링 변동성(rolling_dates에 맞춘 배열), 종목 간 상관·연환산 공분산 행렬.
+    """
+    benchmark = benchmark.strip().upper()
+    # 지수 종가가 없거나 오래됐으면 먼저 받아 커밋 (data_version이 바뀌어 아래 캐시 키에 반영)
+    if benchmark and await refresh_benchmark(db, benchmark):
+        await db.commit()
+    key = (start, end, benchmark, window)
+    try:
+        return await _risk_cache.get_or_compute(
+            db, key, lambda: run_offloop("risk", compute_risk, start, end, benchmark or None, window)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.get("/analytics/pnl")
+async def get_pnl(
+    method: str = Query("fifo", pattern=_METHOD, description="fifo(선입선출) | average(이동평균)"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    연도별 실현 손익(매도 금액·원가)·연말 미실현 손익, 해외주식 양도세 추정(기본공제 250만 원 후 22%),
+    보유 자산별 현재 원가·평가액·실현 손익 합계.
+    """
+    # 새 거래·수정이 있는 자산만 lot을 갱신해 커밋 (이후 계산은 읽기 전용)
+    if await sync_lots(db, method):
+        await db.commit()
+    return await _pnl_cache.get_or_compute(
+        db, (method, datetime.now().strftime("%Y-%m-%d")), lambda: run_offloop("pnl", pnl_report, method)
+    )
+
+
+@router.get("/assets/{asset_id}/lots")
+async def list_lots(
+    asset_id: str,
+    method: str = Query("fifo", pattern=_METHOD),
+    db: AsyncSession = Depends(get_db),
+):
+    """남은 매수 lot(매수일·수량·원가) + 연도별 실현 손익"""
+    if await sync_lots(db, method, [asset_id]):
+        await db.commit()
+    return await get_lots(db, asset_id, method)
@@ -1,24 +1,72 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.database import get_db
+from backend.core.encoding import dumps
+from backend.core.metrics import timed
+from backend.db.database import get_db, run_offloop
+from backend.db.liabilities import load_liabilities
+from backend.db.version import VersionedCache
 from backend.db.crud import (
-    get_all_assets, get_asset_by_id,
+    get_all_assets, get_asset_by_id, list_assets_page,
     create_asset, update_asset, delete_asset,
     generate_chart_data,
 )
 
 router = APIRouter()
 
+_chart_cache = VersionedCache("chart")
+_list_cache  = VersionedCache("asset_list")
+
+
+async def _asset_list(db: AsyncSession, filters: dict) -> tuple[bytes, Optional[str]]:
+    """(executor thread) 자산 적재 + 이력 파생 + JSON 직렬화 → (본문, 다음 cursor)"""
+    items, next_cursor = await list_assets_page(db, **filters)
+    with timed("serialize"):
+        return dumps(items), next_cursor
+
 
 @router.get("/assets")
 async def list_assets(
-    type: Optional[str] = Query(None, description="자산 유형 필터 (REAL_ESTATE|STOCK|PENSION|SAVINGS|PHYSICAL|ETC)"),
+    type:     Optional[str] = Query(None, description="자산 유형 필터 (REAL_ESTATE|STOCK|PENSION|SAVINGS|PHYSICAL|ETC)"),
+    account:  Optional[str] = Query(None, description="계좌명 (STOCK)"),
+    ticker:   Optional[str] = Query(None, description="Ticker (STOCK)"),
+    currency: Optional[str] = Query(None, description="통화 KRW|USD|JPY (STOCK)"),
+    status:   Optional[str] = Query(None, description="active|disposed|all (기본 all)"),
+    q:        Optional[str] = Query(None, description="이름·주소·메모 검색 (토큰별 접두어)"),
+    sort:     Optional[str] = Query(None, description="name|value|acquisition_date|created_at|updated_at"),
+    order:    str           = Query("asc", pattern="^(asc|desc)$"),
+    cursor:   Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor"),
+    limit:    Optional[int] = Query(None, ge=1, le=500, description="페이지 크기 (없으면 전체)"),
     db: AsyncSession = Depends(get_db),
 ):
-    """전체 자산 조회 (이력 + 상세 포함). type 쿼리파람으로 유형 필터."""
-    return await get_all_assets(db, asset_type=type)
+    """
+    자산 목록 (이력 + 상세 포함). 필터·정렬·검색은 SQL에서 처리.
+    limit을 주면 다음 페이지 cursor를 X-Next-Cursor 헤더로 반환 (마지막 페이지면 헤더 없음).
+    차트와 같이 적재·직렬화는 CPU executor thread에서 하고, 결과 bytes는 data_version이 바뀔 때까지 캐시.
+    """
+    filters = {
+        "sort": sort, "order": order, "cursor": cursor, "limit": limit,
+        "asset_type": type, "account": account, "ticker": ticker, "currency": currency, "status": status, "search": q,
+    }
+    try:
+        body, next_cursor = await _list_cache.get_or_compute(
+            db, tuple(filters.values()), lambda: run_offloop("asset_list", _asset_list, filters)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return Response(body, media_type="application/json", headers=headers)
+
+
+async def _chart(db: AsyncSession, type: Optional[str], account: Optional[str], period: str, group_by: str) -> bytes:
+    """(executor thread) 자산 적재 + pandas 집계 + JSON 직렬화 (수천 포인트 인코딩도 루프 밖에서 1회)"""
+    assets = await get_all_assets(db, asset_type=type, account=account)
+    liabs  = await load_liabilities(db, [a["id"] for a in assets if a["type"] == "REAL_ESTATE"])
+    with timed("pandas"):
+        chart = generate_chart_data(assets, period=period, group_by=group_by, liabilities=liabs)
+    with timed("serialize"):
+        return dumps(chart)
 
 
 @router.get("/assets/chart")
@@ -29,14 +77,16 @@ async def asset_chart(
     account:  Optional[str] = Query(None, description="계좌명 필터 (STOCK 전용)"),
     db: AsyncSession = Depends(get_db),
 ):
-    """차트 집계 데이터. Forward Fill 후 group_by 기준으로 합산."""
-    assets = await get_all_assets(db, asset_type=type)
-    if account:
-        assets = [
-            a for a in assets
-            if (a.get("detail") or {}).get("account_name") == account
-        ]
-    return generate_chart_data(assets, period=period, group_by=group_by)
+    """
+    차트 집계 데이터. Forward Fill 후 group_by 기준으로 합산.
+    결과(직렬화된 JSON)는 worker별로 캐시하고 DB 쓰기(data_version 변경) 시 다시 계산.
+    적재·pandas 집계는 CPU executor thread에서 실행하고, 같은 조건의 동시 요청은 계산 1회를 공유한다.
+    """
+    async def compute():
+        return await run_offloop("chart", _chart, type, account, period, group_by)
+
+    body = await _chart_cache.get_or_compute(db, (type, period, group_by, account), compute)
+    return Response(body, media_type="application/json")
 
 
 @router.get("/assets/{asset_id}")
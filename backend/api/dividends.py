@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.db.crud import asset_exists
 from backend.db.database import get_db
 from backend.db.models import DividendHistory, StockDetail
 
@@ -38,6 +39,8 @@ async def get_dividends(asset_id: str, db: AsyncSession = Depends(get_db)):
 async def add_dividend(asset_id: str, data: dict, db: AsyncSession = Depends(get_db)):
     if not data.get("date") or data.get("amount_krw") is None:
         raise HTTPException(status_code=422, detail="date, amount_krw는 필수입니다.")
+    if not await asset_exists(db, asset_id):
+        raise HTTPException(status_code=404, detail="자산을 찾을 수 없습니다.")
     row = DividendHistory(
         asset_id        = asset_id,
         date            = data["date"],
@@ -1,12 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.db.database import get_db
-from backend.db.crud import get_history, add_history, update_history, delete_history
-from backend.services.stock_updater import get_exchange_rate
+from backend.db.crud import asset_exists, get_history, add_history, update_history, delete_history
+from backend.db.series import asset_series
+from backend.db.version import VersionedCache
+from backend.services.stock_updater import current_rate
 
 router = APIRouter()
 
+_series_cache = VersionedCache("series", maxsize=64)
+_DATE = r"^\d{4}-\d{2}-\d{2}$"
+
+
+async def _require_asset(db: AsyncSession, asset_id: str):
+    if not await asset_exists(db, asset_id):
+        raise HTTPException(status_code=404, detail="자산을 찾을 수 없습니다.")
+
 
 @router.get("/assets/{asset_id}/history")
 async def list_history(asset_id: str, db: AsyncSession = Depends(get_db)):
@@ -14,11 +26,39 @@ async def list_history(asset_id: str, db: AsyncSession = Depends(get_db)):
     return await get_history(db, asset_id)
 
 
+@router.get("/assets/{asset_id}/series")
+async def get_series(
+    asset_id:      str,
+    start:         Optional[str] = Query(None, alias="from", pattern=_DATE),
+    end:           Optional[str] = Query(None, alias="to",   pattern=_DATE),
+    interval:      str           = Query("day", pattern="^(day|week|month)$"),
+    fields:        Optional[str] = Query(None, description="price,value,quantity 중 쉼표 구분 (기본 전체)"),
+    since_version: Optional[int] = Query(None, ge=0, description="이 data_version 이후 바뀐 구간만"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    기간 지정·리샘플링 시계열 (단가 OHLC, 평가액·수량은 구간 마지막 값).
+    since_version을 주면 응답의 since 이후 점만 담긴다 (full=true면 전체 교체, since=null이면 변경 없음).
+    """
+    names = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    key   = (asset_id, start, end, interval, tuple(names or ()), since_version)
+    try:
+        series = await _series_cache.get_or_compute(
+            db, key, lambda: asset_series(db, asset_id, start, end, interval, names, since_version)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if series is None:
+        raise HTTPException(status_code=404, detail="자산을 찾을 수 없습니다.")
+    return series
+
+
 @router.post("/assets/{asset_id}/history", status_code=201)
 async def create_history(asset_id: str, data: dict, db: AsyncSession = Depends(get_db)):
     """이력 추가"""
     if not data.get("date"):
         raise HTTPException(status_code=422, detail="date는 필수입니다.")
+    await _require_asset(db, asset_id)
     await add_history(db, asset_id, data)
     return {"message": "이력이 추가되었습니다."}
 
@@ -32,18 +72,20 @@ async def modify_history(
 ):
     """
     이력 수정. value가 없으면 price * quantity * exchange_rate로 자동 계산.
-    수량 변경 시 이후 날짜 이력에 수량 전파.
+    수량 변경은 거래 원장에 차이분 1건으로 기록 (이후 보유량은 누적합으로 반영).
     """
+    await _require_asset(db, asset_id)
+
     # 해당 자산의 통화 확인 (환율 적용)
     from sqlalchemy import select
     from backend.db.models import StockDetail
     currency_q = select(StockDetail.currency).where(StockDetail.asset_id == asset_id)
     result     = await db.execute(currency_q)
     currency   = result.scalar_one_or_none() or "KRW"
-    rate       = get_exchange_rate(currency)
+    rate       = await current_rate(db, currency)
 
-    propagated = await update_history(db, asset_id, date, data, exchange_rate=rate)
-    return {"message": "수정되었습니다.", "propagated_count": propagated}
+    recorded = await update_history(db, asset_id, date, data, exchange_rate=rate)
+    return {"message": "수정되었습니다.", "recorded_count": recorded}
 
 
 @router.delete("/assets/{asset_id}/history/{date}")
@@ -0,0 +1,66 @@
+"""부동산 부채(대출 잔액·보증금) 이력 및 상환 스케줄 API"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.database import get_db
+from backend.db.liabilities import (
+    COLUMNS, apply_amortization, delete_liability, get_liabilities, load_current, sync_current, upsert_liabilities,
+)
+
+router = APIRouter()
+
+
+async def _require_real_estate(db: AsyncSession, asset_id: str):
+    if await load_current(db, asset_id) is None:
+        raise HTTPException(status_code=404, detail="부동산 자산을 찾을 수 없습니다.")
+
+
+# ── 부채 이력 조회 ─────────────────────────────────────────
+@router.get("/assets/{asset_id}/liabilities")
+async def list_liabilities(asset_id: str, db: AsyncSession = Depends(get_db)):
+    """기록 행(날짜 오름차순) + 각 날짜의 적용 부채 합계(total)"""
+    await _require_real_estate(db, asset_id)
+    return await get_liabilities(db, asset_id)
+
+
+# ── 부채 기록 (같은 날짜면 보낸 칸만 덮어씀) ─────────────────
+@router.put("/assets/{asset_id}/liabilities/{date}")
+async def put_liability(asset_id: str, date: str, data: dict, db: AsyncSession = Depends(get_db)):
+    """body: {"loan"?, "deposit"?} — null은 '직전 값 유지'"""
+    await _require_real_estate(db, asset_id)
+    columns = tuple(c for c in COLUMNS if c in data)
+    if not columns:
+        raise HTTPException(status_code=422, detail="loan 또는 deposit이 필요합니다.")
+    try:
+        row = {"date": date, **{c: None if data[c] is None else float(data[c]) for c in columns}}
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=422, detail="loan, deposit은 숫자여야 합니다.")
+    await upsert_liabilities(db, asset_id, [row], columns=columns)
+    return {"message": "기록되었습니다.", "current": await sync_current(db, asset_id)}
+
+
+# ── 부채 기록 삭제 ─────────────────────────────────────────
+@router.delete("/assets/{asset_id}/liabilities/{date}")
+async def remove_liability(asset_id: str, date: str, db: AsyncSession = Depends(get_db)):
+    await _require_real_estate(db, asset_id)
+    await delete_liability(db, asset_id, date)
+    return {"message": "삭제되었습니다.", "current": await sync_current(db, asset_id)}
+
+
+# ── 상환 스케줄 일괄 생성 ──────────────────────────────────
+@router.post("/assets/{asset_id}/liabilities/amortization", status_code=201)
+async def create_amortization(asset_id: str, data: dict, db: AsyncSession = Depends(get_db)):
+    """
+    body: {"principal", "annual_rate"(연 %), "months", "start_date", "method"?}
+    method: equal_payment(원리금균등, 기본) | equal_principal(원금균등) | bullet(만기일시)
+    실행일 이후의 기존 대출 기록은 스케줄로 교체된다 (보증금 기록은 유지).
+    """
+    await _require_real_estate(db, asset_id)
+    missing = [k for k in ("principal", "months", "start_date") if data.get(k) in (None, "")]
+    if missing:
+        raise HTTPException(status_code=422, detail=f"{', '.join(missing)}는 필수입니다.")
+    try:
+        result = await apply_amortization(db, asset_id, data)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"message": f"상환 스케줄 {result['count']}건이 기록되었습니다.", **result}
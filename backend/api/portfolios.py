@@ -0,0 +1,112 @@
+"""
+포트폴리오(포트폴리오별 SQLite 파일) 목록·생성 + 전체 합산 요약 API, 요청 라우팅 미들웨어.
+
+/api 요청은 X-Portfolio 헤더(EventSource 등 헤더를 못 보내면 ?portfolio=)의 포트폴리오 DB로 간다.
+헤더가 없으면 default(기존 assets.db).
+"""
+import asyncio
+import os
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, QueryParams
+
+from backend.api.summary import cached_summary
+from backend.db.database import async_session, open_portfolio, open_portfolios, portfolio_scope
+from backend.db.portfolio import (
+    DEFAULT, HEADER, list_portfolios, portfolio_exists, portfolio_path, valid_name,
+)
+
+router = APIRouter()
+
+
+class PortfolioMiddleware:
+    """요청의 포트폴리오를 정해 그 DB로 라우팅 (없는 이름은 404). 요청 중에는 엔진이 evict되지 않음"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/api"):
+            await self.app(scope, receive, send)
+            return
+        name = (
+            Headers(scope=scope).get(HEADER)
+            or QueryParams(scope.get("query_string", b"")).get("portfolio")
+            or DEFAULT
+        )
+        if not portfolio_exists(name):
+            await JSONResponse({"detail": f"포트폴리오를 찾을 수 없습니다: {name}"}, status_code=404)(scope, receive, send)
+            return
+        async with portfolio_scope(name):
+            await self.app(scope, receive, send)
+
+
+@router.get("/portfolios")
+async def get_portfolios():
+    """포트폴리오 목록 (DB 파일 크기, 현재 worker에서 엔진이 열려 있는지)"""
+    opened = set(open_portfolios())
+    return [
+        {
+            "name": name,
+            "size": os.path.getsize(portfolio_path(name)) if os.path.exists(portfolio_path(name)) else 0,
+            "open": name in opened,
+        }
+        for name in list_portfolios()
+    ]
+
+
+@router.post("/portfolios", status_code=201)
+async def create_portfolio(data: dict):
+    """body: {"name"} — 소문자·숫자·-·_ 32자 이내. 새 DB 파일 생성 + migration"""
+    name = str(data.get("name") or "").strip()
+    if not valid_name(name):
+        raise HTTPException(status_code=422, detail="이름은 소문자·숫자·-·_ 32자 이내여야 합니다.")
+    if portfolio_exists(name):
+        raise HTTPException(status_code=409, detail="이미 있는 포트폴리오입니다.")
+    await open_portfolio(name)
+    return {"name": name, "message": "생성되었습니다."}
+
+
+async def _summary_of(name: str) -> dict:
+    async with portfolio_scope(name), async_session() as db:
+        return {"name": name, **await cached_summary(db)}
+
+
+@router.get("/portfolios/summary")
+async def consolidated_summary():
+    """
+    전체 포트폴리오 합산 요약. 포트폴리오별 요약(각자 버전 캐시)을 동시에 집계한다 —
+    DB 파일이 달라 한 포트폴리오의 쓰기 lock이 다른 포트폴리오 집계를 막지 않는다.
+    """
+    parts = await asyncio.gather(*(_summary_of(name) for name in list_portfolios()))
+
+    total_asset = sum(p["total_asset"] for p in parts)
+    total_liab  = sum(p["total_liability"] for p in parts)
+    by_type: dict[str, dict] = {}
+    for p in parts:
+        for t in p["by_type"]:
+            agg = by_type.setdefault(t["type"], {"type": t["type"], "value": 0.0, "count": 0})
+            agg["value"] += t["value"]
+            agg["count"] += t["count"]
+    types = sorted(by_type.values(), key=lambda t: -t["value"])
+    for t in types:
+        t["share"] = t["value"] / total_asset * 100 if total_asset > 0 else 0.0
+
+    return {
+        "total_asset":     total_asset,
+        "total_liability": total_liab,
+        "net_worth":       total_asset - total_liab,
+        "by_type":         types,
+        "portfolios": [
+            {
+                "name":            p["name"],
+                "total_asset":     p["total_asset"],
+                "total_liability": p["total_liability"],
+                "net_worth":       p["net_worth"],
+                "share":           p["total_asset"] / total_asset * 100 if total_asset > 0 else 0.0,
+                "stocks":          {k: p["stocks"][k] for k in ("value", "cost", "pnl", "roi")},
+            }
+            for p in parts
+        ],
+    }
@@ -11,12 +11,18 @@ router = APIRouter()
 async def run_stock_update(db: AsyncSession = Depends(get_db)):
     """
     Ticker가 설정된 모든 주식 자산의 시세 업데이트.
-    yfinance에서 마지막 이력 날짜부터 현재까지 Backfill.
+    거래소 캘린더로 새 시세가 있을 수 있는 Ticker만 마지막 확정 종가일부터 현재까지 Backfill.
+    같은 응답의 배당락 이벤트는 dividend_history에 자동 기록.
     """
     result = await update_all_stocks(db)
     count  = result["updated_count"]
     failed = result["failed_tickers"]
     msg    = f"{count}개 자산 업데이트 완료"
+    if result.get("dividend_count"):
+        msg += f", 배당 {result['dividend_count']}건 자동 기록"
+    plan = result.get("plan")
+    if plan:
+        msg += f" (시세 조회 {plan['requests']}건, 생략 {plan['avoided']}건)"
     if failed:
         msg += f" (실패: {', '.join(failed)})"
     return {**result, "message": msg}
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from backend.db.portfolio import current_portfolio
+from backend.services.price_stream import broadcaster_for
+
+router = APIRouter()
+
+
+@router.get("/stream/prices")
+async def stream_prices(request: Request):
+    """
+    시세 변경 SSE (현재 포트폴리오, EventSource는 헤더를 못 보내므로 ?portfolio=). 업데이트 커밋마다 Ticker별 event: price
+    data: {ticker, price, previous_price, currency, ts, batch, assets: [{id, current_value, previous_value}]}
+    """
+    broadcaster = broadcaster_for(current_portfolio())
+    if broadcaster.full:
+        raise HTTPException(status_code=503, detail="스트림 연결 수 초과")
+    return StreamingResponse(
+        broadcaster.events(request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,91 @@
+"""대시보드 KPI·자산 비중 요약 API (이력 없이 1회 집계)"""
+from fastapi import APIRouter, Depends
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.database import get_db
+from backend.db.prices import load_fallback_rates
+from backend.db.version import VersionedCache
+
+router = APIRouter()
+
+_summary_cache = VersionedCache("summary", maxsize=1)
+
+# 보유 중(disposal_date 비어 있음) 자산을 유형·계좌·통화별로 한 번에 집계
+_SUMMARY_SQL = text("""
+    SELECT
+        a.type,
+        CASE WHEN a.type = 'STOCK' THEN COALESCE(sd.account_name, '미분류') END AS account,
+        COALESCE(sd.currency, 'KRW')                                              AS currency,
+        COUNT(*)                                                                  AS cnt,
+        SUM(COALESCE(a.current_value, 0))                                         AS value,
+        SUM(COALESCE(a.acquisition_price, 0) * COALESCE(a.quantity, 0))          AS cost_native,
+        SUM(COALESCE(re.loan_amount, 0) + COALESCE(re.tenant_deposit, 0))         AS liability
+    FROM assets a
+    LEFT JOIN real_estate_details re ON re.asset_id = a.id
+    LEFT JOIN stock_details       sd ON sd.asset_id = a.id
+    WHERE COALESCE(a.disposal_date, '') = ''
+    GROUP BY a.type, account, currency
+""")
+
+
+def _pnl(value: float, cost: float) -> dict:
+    pnl = value - cost
+    return {"value": value, "cost": cost, "pnl": pnl, "roi": pnl / cost * 100 if cost > 0 else 0.0}
+
+
+async def compute_summary(db: AsyncSession) -> dict:
+    """
+    총자산·부채·순자산, 유형별 비중, 주식 계좌별 원금(KRW 환산)·손익.
+    원금은 평균단가(네이티브 통화) × 수량 × settings에 캐시된 환율.
+    """
+    rows  = (await db.execute(_SUMMARY_SQL)).fetchall()
+    rates = await load_fallback_rates(db)
+
+    total_asset = total_liab = 0.0
+    by_type: dict[str, dict] = {}
+    accounts: dict[str, dict] = {}
+    for r in rows:
+        value = float(r.value or 0)
+        total_asset += value
+        total_liab  += float(r.liability or 0) if r.type == "REAL_ESTATE" else 0.0
+
+        t = by_type.setdefault(r.type, {"type": r.type, "value": 0.0, "count": 0})
+        t["value"] += value
+        t["count"] += r.cnt
+
+        if r.type == "STOCK":
+            rate = 1.0 if r.currency == "KRW" else rates.get(r.currency, 1.0)
+            acct = accounts.setdefault(r.account, {"account": r.account, "value": 0.0, "cost": 0.0, "count": 0})
+            acct["value"] += value
+            acct["cost"]  += float(r.cost_native or 0) * rate
+            acct["count"] += r.cnt
+
+    types = sorted((t for t in by_type.values() if t["value"] > 0), key=lambda t: -t["value"])
+    for t in types:
+        t["share"] = t["value"] / total_asset * 100 if total_asset > 0 else 0.0
+
+    acct_list = sorted(accounts.values(), key=lambda a: -a["value"])
+    for a in acct_list:
+        a.update(_pnl(a["value"], a["cost"]))
+    stock_total = _pnl(sum(a["value"] for a in acct_list), sum(a["cost"] for a in acct_list))
+
+    return {
+        "total_asset":     total_asset,
+        "total_liability": total_liab,
+        "net_worth":       total_asset - total_liab,
+        "by_type":         types,
+        "stocks":          {**stock_total, "accounts": acct_list},
+        "rates":           rates,
+    }
+
+
+async def cached_summary(db: AsyncSession) -> dict:
+    """현재 포트폴리오 요약 (data_version이 바뀔 때만 다시 집계)"""
+    return await _summary_cache.get_or_compute(db, "all", lambda: compute_summary(db))
+
+
+@router.get("/summary")
+async def get_summary(db: AsyncSession = Depends(get_db)):
+    """대시보드·주식 페이지 KPI. data_version이 바뀔 때만 다시 집계"""
+    return await cached_summary(db)
@@ -10,6 +10,66 @@ DB_NAME = os.getenv("DB_FILE_NAME", "assets.db")
 DB_PATH = os.path.join(DB_DIR, DB_NAME)
 DB_URL  = f"sqlite+aiosqlite:///{DB_PATH}"
 
+# 다중 worker 동시 쓰기 대기 시간 (SQLite busy_timeout, ms)
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "10000"))
+
+# 포트폴리오별 DB: 기본(default)은 DB_PATH, 나머지는 PORTFOLIO_DIR/{이름}.db (X-Portfolio 헤더로 선택)
+# 마지막 사용 후 PORTFOLIO_IDLE_SECONDS가 지난 포트폴리오 엔진은 닫고, 다음 요청 때 다시 연다
+PORTFOLIO_DIR          = os.getenv("PORTFOLIO_DIR", os.path.join(DB_DIR, "portfolios"))
+PORTFOLIO_IDLE_SECONDS = float(os.getenv("PORTFOLIO_IDLE_SECONDS", "600"))
+
+# 주기적 시세 업데이트 간격 (분, 0이면 비활성). worker가 여럿이어도 lock을 잡은 1개만 실행
+UPDATE_INTERVAL_MINUTES = int(os.getenv("UPDATE_INTERVAL_MINUTES", "0"))
+
+# 이력 압축: 최근 N년은 일별 유지, 이전 구간은 월말 + 변경 시점만 보관
+COMPACTION_KEEP_YEARS = int(os.getenv("COMPACTION_KEEP_YEARS", "3"))
+ARCHIVE_DIR           = os.getenv("ARCHIVE_DIR", os.path.join(DB_DIR, "archive"))
+
+# 온라인 백업: BACKUP_DIR에 gzip 압축본을 최근 BACKUP_KEEP개 유지
+# - BACKUP_INTERVAL_HOURS: 예약 백업 주기 (0이면 비활성, 가장 최근 백업 파일 시각 기준)
+# - BACKUP_STEP_PAGES: backup step당 복사 page 수 (작을수록 step마다 읽기 lock을 짧게 잡음)
+BACKUP_DIR            = os.getenv("BACKUP_DIR", os.path.join(DB_DIR, "backups"))
+BACKUP_INTERVAL_HOURS = float(os.getenv("BACKUP_INTERVAL_HOURS", "0"))
+BACKUP_KEEP           = int(os.getenv("BACKUP_KEEP", "7"))
+BACKUP_STEP_PAGES     = int(os.getenv("BACKUP_STEP_PAGES", "256"))
+
+# 시세 이력 Parquet 아카이브 (pyarrow 설치 시): 지난 달까지의 price_history를 연도별 Parquet로 내보내
+# 장기 구간 조회는 Parquet(필요한 열·Ticker·기간만), 최근 구간만 SQLite에서 읽는다
+# - PARQUET_INTERVAL_HOURS: 내보내기 확인 주기 (0이면 비활성, 여러 worker 중 lock 잡은 1개만)
+PARQUET_DIR            = os.getenv("PARQUET_DIR", os.path.join(DB_DIR, "parquet"))
+PARQUET_INTERVAL_HOURS = float(os.getenv("PARQUET_INTERVAL_HOURS", "0"))
+
+# 위험 분석: 수익률 행렬 memory-map 캐시 위치, 베타 기준 지수 Ticker
+RISK_CACHE_DIR = os.getenv("RISK_CACHE_DIR", os.path.join(DB_DIR, "cache"))
+RISK_BENCHMARK = os.getenv("RISK_BENCHMARK", "^KS11")
+
+# 시세/환율 provider
+# - MARKET_DATA_PROVIDERS: 사용할 provider 순서 (비우면 조회 종류별 기본 순서)
+#   예) "fixture" → 네트워크 없이 MARKET_DATA_FIXTURES 디렉터리의 JSON만 사용
+# - *_BASE_URL: 로컬 Stub 서버로 바꿔 오프라인 검증 가능
+MARKET_DATA_PROVIDERS = [p.strip() for p in os.getenv("MARKET_DATA_PROVIDERS", "").split(",") if p.strip()]
+MARKET_DATA_FIXTURES  = os.getenv("MARKET_DATA_FIXTURES", os.path.join(DB_DIR, "fixtures"))
+NAVER_BASE_URL        = os.getenv("NAVER_BASE_URL", "https://m.stock.naver.com")
+NAVER_POLLING_URL     = os.getenv("NAVER_POLLING_URL", "https://polling.finance.naver.com")
+NAVER_QUOTE_BATCH     = int(os.getenv("NAVER_QUOTE_BATCH", "20"))   # 실시간 시세 1회 요청당 종목 수
+QUOTE_TTL_SECONDS     = float(os.getenv("QUOTE_TTL_SECONDS", "60"))  # 실시간 현재가 메모리 캐시 유효 시간
+YAHOO_BASE_URL        = os.getenv("YAHOO_BASE_URL", "https://query1.finance.yahoo.com")
+FRANKFURTER_BASE_URL  = os.getenv("FRANKFURTER_BASE_URL", "https://api.frankfurter.app")
+HTTP_CONNECT_TIMEOUT  = float(os.getenv("HTTP_CONNECT_TIMEOUT", "2"))
+HTTP_READ_TIMEOUT     = float(os.getenv("HTTP_READ_TIMEOUT", "5"))
+# 연속 N회 실패 시 provider를 COOLDOWN초 동안 건너뜀 (fail fast)
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+CIRCUIT_COOLDOWN_SECONDS  = float(os.getenv("CIRCUIT_COOLDOWN_SECONDS", "60"))
+
+# 차트 집계 등 CPU 작업 전용 thread 수 (0이면 이벤트 루프 안에서 실행)
+CPU_EXECUTOR_WORKERS = int(os.getenv("CPU_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# 계측: 1이면 응답에 Server-Timing 헤더 (db/pandas/serialize/app 구간, ms)
+SERVER_TIMING = os.getenv("SERVER_TIMING", "0") == "1"
+
+# 응답 압축: 이 크기(byte) 이상인 API 응답만 br/gzip (0이면 압축 끔)
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+
 # 서버 설정
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "8090"))
@@ -0,0 +1,206 @@
+"""
+응답 직렬화·압축.
+
+- dumps: orjson 직렬화 (표준 json 대비 수 배 빠름, numpy 배열·비문자열 키 허용, NaN/inf → null)
+- CompressionMiddleware: Accept-Encoding 협상으로 큰 API 응답을 br(brotli 설치 시)/gzip 압축
+  · body 메시지 1개로 끝나는 응답만 압축 — SSE(text/event-stream)·파일 스트리밍은 그대로 통과
+  · 같은 본문(차트 캐시 bytes 등)의 압축 결과는 재사용, 큰 본문 압축은 CPU executor에서
+- PrecompressedStaticFiles: 빌드 시 만든 .br/.gz 정적 파일을 그대로 전송 (요청마다 압축 X)
+  · Vite 해시 파일(assets/)은 1년 immutable 캐시, index.html 등은 매번 재검증(no-cache)
+"""
+import gzip
+import os
+from collections import OrderedDict
+from mimetypes import guess_type
+from typing import Optional
+
+import orjson
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from backend.core.config import COMPRESS_MIN_BYTES
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli 미설치 시 gzip만
+    brotli = None
+
+_JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# 응답 압축 선호 순서 (정적 파일은 빌드 결과물만 보므로 brotli 모듈과 무관)
+ENCODINGS        = ("br", "gzip") if brotli is not None else ("gzip",)
+STATIC_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# 동적 응답은 속도 위주 수준 (정적 파일은 빌드 시 최고 수준으로 미리 압축)
+BROTLI_QUALITY = 4
+GZIP_LEVEL     = 6
+
+_COMPRESSIBLE    = ("application/json", "text/", "application/javascript", "image/svg+xml")
+_REUSE_MIN_BYTES = 64 * 1024    # 이 크기 이상 본문은 압축 결과를 재사용 (캐시된 bytes는 hash도 캐시됨)
+_REUSE_MAX_ITEMS = 16
+_OFFLOOP_BYTES   = 256 * 1024   # 이 크기 이상은 CPU executor에서 압축 (루프 블로킹 방지)
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE      = "no-cache"
+
+
+def dumps(content) -> bytes:
+    """JSON bytes (orjson)"""
+    return orjson.dumps(content, option=_JSON_OPTIONS)
+
+
+# ──────────────────────────────────────────────────────────────
+# Accept-Encoding 협상
+# ──────────────────────────────────────────────────────────────
+def accepted_encodings(header: str) -> set[str]:
+    """Accept-Encoding → 허용 코딩 집합 (q=0 제외)"""
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = params.strip().lower()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name)
+    return accepted
+
+
+def choose_encoding(header: str, available: tuple = ENCODINGS) -> Optional[str]:
+    """available(선호 순) 중 클라이언트가 받는 첫 코딩. 없으면 None (identity)"""
+    if not header:
+        return None
+    accepted = accepted_encodings(header)
+    for encoding in available:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+# ──────────────────────────────────────────────────────────────
+# 동적 응답 압축
+# ──────────────────────────────────────────────────────────────
+_reuse: "OrderedDict[tuple[str, bytes], bytes]" = OrderedDict()
+
+
+async def _compress_body(body: bytes, encoding: str) -> bytes:
+    """큰 본문은 (코딩, 본문) 키로 결과 재사용 — 캐시 적중 차트는 매 요청 같은 bytes 객체"""
+    if len(body) < _REUSE_MIN_BYTES:
+        return compress(body, encoding)
+    key = (encoding, body)
+    hit = _reuse.get(key)
+    if hit is not None:
+        _reuse.move_to_end(key)
+        return hit
+    if len(body) >= _OFFLOOP_BYTES:
+        from backend.core.executor import run_cpu   # executor → metrics → encoding 순환 import 회피
+        out = await run_cpu("compress", compress, body, encoding)
+    else:
+        out = compress(body, encoding)
+    _reuse[key] = out
+    while len(_reuse) > _REUSE_MAX_ITEMS:
+        _reuse.popitem(last=False)
+    return out
+
+
+def _compressible(headers: MutableHeaders) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(_COMPRESSIBLE) and not content_type.startswith("text/event-stream")
+
+
+class CompressionMiddleware:
+    """min_size 이상 단일 body 응답을 br/gzip 압축 (Content-Length·Vary 갱신)"""
+
+    def __init__(self, app, min_size: int = COMPRESS_MIN_BYTES):
+        self.app = app
+        self.min_size = min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.min_size <= 0 or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        state = {"start": None, "passthrough": False}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                if _compressible(MutableHeaders(raw=message["headers"])):
+                    state["start"] = message   # body를 보고 결정
+                    return
+                state["passthrough"] = True
+                await send(message)
+                return
+            if message["type"] != "http.response.body" or state["passthrough"]:
+                await send(message)
+                return
+
+            start, state["passthrough"] = state["start"], True
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.min_size:
+                await send(start)      # 스트리밍·작은 응답은 그대로
+                await send(message)
+                return
+
+            data    = await _compress_body(body, encoding)
+            headers = MutableHeaders(raw=start["headers"])
+            headers["content-encoding"] = encoding
+            headers["content-length"]   = str(len(data))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": data})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# ──────────────────────────────────────────────────────────────
+# 정적 파일
+# ──────────────────────────────────────────────────────────────
+class PrecompressedStaticFiles(StaticFiles):
+    """빌드 시 만든 .br/.gz 형제 파일 우선 전송 + 해시 파일 immutable 캐시"""
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        request_headers = Headers(scope=scope)
+        relative = os.path.relpath(full_path, self.directory).replace(os.sep, "/") if self.directory else ""
+        headers  = {
+            "cache-control": IMMUTABLE_CACHE if relative.startswith("assets/") else REVALIDATE,
+            "vary":          "Accept-Encoding",
+        }
+
+        accepted = accepted_encodings(request_headers.get("accept-encoding", "")) if status_code == 200 else set()
+        for encoding, suffix in STATIC_ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                variant_stat = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            response = FileResponse(
+                f"{full_path}{suffix}", stat_result=variant_stat,
+                media_type=guess_type(str(full_path))[0] or "application/octet-stream",
+                headers={**headers, "content-encoding": encoding},
+            )
+            if self.is_not_modified(response.headers, request_headers):
+                return NotModifiedResponse(response.headers)
+            return response
+
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers.update(headers)
+        return response
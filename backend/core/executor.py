@@ -0,0 +1,68 @@
+"""
+CPU 집계 전용 executor.
+
+pandas 차트 집계처럼 수백 ms 걸리는 동기 계산을 이벤트 루프 밖(전용 thread pool)에서 실행해
+같은 worker의 /api/health, CRUD, SSE 응답이 그동안 멈추지 않도록 한다.
+- 기본 thread pool(asyncio.to_thread)과 분리 → 시세 조회용 to_thread 작업과 서로 막지 않음
+- contextvars를 복사해 실행 → timed("pandas") 등 요청 구간 계측이 그대로 기록됨
+- executor thread 안에서 다시 run_cpu를 부르면 그 자리에서 실행 (pool 고갈 방지)
+- DB 적재까지 옮길 때는 database.run_offloop (thread별 이벤트 루프 + 별도 읽기 엔진)
+- CPU_EXECUTOR_WORKERS=0이면 기존처럼 루프 안에서 실행 (비교 측정용)
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from backend.core.config import CPU_EXECUTOR_WORKERS
+from backend.core.metrics import CPU_TASK_SECONDS
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_local = threading.local()
+
+
+def cpu_executor() -> Optional[ThreadPoolExecutor]:
+    global _executor
+    if _executor is None and CPU_EXECUTOR_WORKERS > 0:
+        _executor = ThreadPoolExecutor(max_workers=CPU_EXECUTOR_WORKERS, thread_name_prefix="cpu")
+    return _executor
+
+
+def in_executor() -> bool:
+    """현재 thread가 CPU executor thread인지 (중첩 제출 시 pool 고갈 deadlock 방지용)"""
+    return getattr(_local, "active", False)
+
+
+def _enter(call: Callable[[], T]) -> T:
+    _local.active = True
+    try:
+        return call()
+    finally:
+        _local.active = False
+
+
+async def run_cpu(name: str, fn: Callable[..., T], *args, **kwargs) -> T:
+    """fn(*args, **kwargs)를 CPU executor에서 실행하고 결과 반환 (대기 포함 시간은 cpu_task_seconds)"""
+    call = functools.partial(fn, *args, **kwargs)
+    t0   = time.perf_counter()
+    try:
+        executor = cpu_executor()
+        if executor is None or in_executor():
+            return call()
+        ctx = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(executor, ctx.run, _enter, call)
+    finally:
+        CPU_TASK_SECONDS.observe(time.perf_counter() - t0, name)
+
+
+def shutdown():
+    """lifespan 종료 시 호출 (진행 중 작업은 끝까지 기다림)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
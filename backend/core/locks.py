@@ -0,0 +1,66 @@
+"""
+프로세스 간 파일 lock (uvicorn --workers N 조정용).
+
+fcntl.flock 기반이라 lock을 잡은 프로세스가 죽으면 OS가 자동 해제한다.
+fcntl이 없는 플랫폼(Windows)에서는 단일 worker를 전제로 항상 획득 성공으로 동작한다.
+"""
+import os
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class FileLock:
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: int | None = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def _open(self) -> int:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        return os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def try_acquire(self) -> bool:
+        """non-blocking 획득. 이미 보유 중이면 True"""
+        if self._fd is not None:
+            return True
+        fd = self._open()
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                return False
+        self._fd = fd
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        return True
+
+    def acquire(self):
+        """blocking 획득"""
+        if self._fd is not None:
+            return
+        fd = self._open()
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        self._fd = fd
+
+    def release(self):
+        if self._fd is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
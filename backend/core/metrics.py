@@ -0,0 +1,242 @@
+"""
+요청 지연·SQL·업데이터 계측 + Prometheus 텍스트 포맷 출력.
+
+- MetricsMiddleware: 라우트별 지연 히스토그램, 요청당 SQL 쿼리 수/시간
+- install_sql_hooks: SQLAlchemy 엔진 이벤트로 쿼리 수·시간 집계
+- timed("pandas") 등: 요청 내 구간 시간 누적 → Server-Timing 헤더 (SERVER_TIMING=1)
+- /api/metrics 에서 render_prometheus() 결과 노출
+"""
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+
+from backend.core.config import SERVER_TIMING
+from backend.core.encoding import dumps
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS   = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# 현재 요청의 구간별 누적 시간(초) + 쿼리 수. 요청 밖(스케줄러 등)에서는 None
+_request_timings: ContextVar[Optional[dict]] = ContextVar("request_timings", default=None)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = ['%s="%s"' % (n, _escape(v)) for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name, self.help, self.labels = name, help_text, labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, amount: float = 1.0, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for lv, v in sorted(self._values.items()):
+                lines.append(f"{self.name}{_fmt_labels(self.labels, lv)} {v}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name, self.help, self.labels, self.buckets = name, help_text, labels, buckets
+        # label_values → [bucket counts..., sum, count]
+        self._values: dict[tuple, list[float]] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value: float, *label_values):
+        with self._lock:
+            row = self._values.setdefault(label_values, [0.0] * (len(self.buckets) + 2))
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for lv, row in sorted(self._values.items()):
+                for b, c in zip(self.buckets, row):
+                    le = 'le="%s"' % b
+                    lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, lv, le)} {c}")
+                le = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, lv, le)} {row[-1]}")
+                lines.append(f"{self.name}_sum{_fmt_labels(self.labels, lv)} {row[-2]}")
+                lines.append(f"{self.name}_count{_fmt_labels(self.labels, lv)} {row[-1]}")
+        return lines
+
+
+REGISTRY: list = []
+
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route", "status"))
+HTTP_DB_QUERIES = Histogram(
+    "http_request_db_queries", "요청당 SQL 쿼리 수", ("route",), COUNT_BUCKETS)
+HTTP_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "요청당 SQL 실행 시간 합계", ("route",))
+HTTP_STAGE_SECONDS = Histogram(
+    "http_request_stage_seconds", "요청 내 구간별 시간 (pandas, serialize 등)", ("route", "stage"))
+DB_QUERIES = Counter("db_queries_total", "SQL 쿼리 수 (요청 외 포함)")
+DB_SECONDS = Counter("db_query_seconds_total", "SQL 실행 시간 합계 (요청 외 포함)")
+UPDATER_FETCH = Histogram(
+    "updater_fetch_seconds", "업데이터 Ticker별 시세 조회 시간", ("ticker",))
+UPDATER_WRITE = Histogram(
+    "updater_write_seconds", "업데이터 Ticker별 DB 기록 시간", ("ticker",))
+UPDATER_RUNS = Counter("updater_runs_total", "업데이터 실행 결과", ("result",))
+UPDATER_FETCHES = Counter(
+    "updater_fetches_total", "업데이터 외부 조회 요청 수 (fetched/avoided: 캘린더로 생략)", ("result",))
+CACHE_REQUESTS = Counter("cache_requests_total", "버전 캐시 조회 (hit/miss/coalesced: 진행 중 계산 공유)", ("cache", "result"))
+PROVIDER_REQUESTS = Counter(
+    "provider_requests_total", "시세 provider 호출 결과 (ok/empty/error/open)", ("provider", "op", "result"))
+PROVIDER_SECONDS = Histogram(
+    "provider_request_seconds", "시세 provider HTTP 요청 시간", ("provider",))
+CPU_TASK_SECONDS = Histogram(
+    "cpu_task_seconds", "CPU executor 작업 시간 (대기 포함)", ("task",))
+PRICE_ROWS = Counter("price_rows_read_total", "시세 이력 조회 행 수 (parquet: 아카이브, sqlite)", ("source",))
+BACKUP_RUNS = Counter("backup_runs_total", "온라인 백업 실행 결과 (ok/error/skipped)", ("result",))
+BACKUP_SECONDS = Histogram(
+    "backup_seconds", "온라인 백업 구간 시간 (copy/compress)", ("stage",),
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0))
+BACKUP_LOCK_WAIT = Histogram(
+    "backup_lock_wait_seconds", "백업 1회 중 BUSY/LOCKED 대기 시간 합계",
+    buckets=(0.0, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0))
+LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds", "이벤트 루프 지연 (예정 시각 대비 깨어난 시각)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+
+
+def render_prometheus() -> str:
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+async def loop_lag_monitor(interval: float = 0.1):
+    """interval마다 깨어나 예정 대비 지연을 event_loop_lag_seconds에 기록 (lifespan 백그라운드 task)"""
+    while True:
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        LOOP_LAG_SECONDS.observe(max(0.0, time.perf_counter() - t0 - interval))
+
+
+# ──────────────────────────────────────────────────────────────
+# 구간 계측
+# ──────────────────────────────────────────────────────────────
+def add_timing(stage: str, seconds: float):
+    """현재 요청의 구간 시간 누적 (요청 밖이면 무시)"""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def timed(stage: str):
+    """with timed("pandas"): ... — 현재 요청의 stage 시간 누적"""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_timing(stage, time.perf_counter() - t0)
+
+
+class TimedJSONResponse(JSONResponse):
+    """orjson 직렬화 + 시간을 serialize 구간으로 기록하는 기본 응답 클래스"""
+
+    def render(self, content) -> bytes:
+        with timed("serialize"):
+            return dumps(content)
+
+
+def install_sql_hooks(sync_engine):
+    """SQLAlchemy 엔진에 쿼리 수·시간 계측 이벤트 등록"""
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["_query_start"].pop()
+        DB_QUERIES.inc()
+        DB_SECONDS.inc(elapsed)
+        add_timing("db", elapsed)
+        add_timing("db_count", 1)
+
+
+# ──────────────────────────────────────────────────────────────
+# ASGI 미들웨어
+# ──────────────────────────────────────────────────────────────
+def _route_label(scope) -> str:
+    """고정 카디널리티 라벨: 매칭된 라우트 템플릿 (/api/assets/{asset_id} 등)"""
+    route  = scope.get("route")
+    path   = getattr(route, "path", None)
+    is_api = scope.get("path", "").startswith("/api")
+    if path:
+        # include_router(prefix="/api") 라우트는 prefix 없는 템플릿이 들어옴
+        return "/api" + path if is_api and not path.startswith("/api") else path
+    return "unmatched" if is_api else "static"
+
+
+class MetricsMiddleware:
+    """라우트별 지연·SQL 집계. SERVER_TIMING=1이면 Server-Timing 헤더 추가"""
+
+    def __init__(self, app, server_timing: bool = SERVER_TIMING):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = {}
+        token   = _request_timings.set(timings)
+        start   = time.perf_counter()
+        status  = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                if self.server_timing:
+                    total = time.perf_counter() - start
+                    parts = [f"{k};dur={v * 1000:.1f}" for k, v in timings.items() if k != "db_count"]
+                    parts.append(f"app;dur={total * 1000:.1f}")
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"server-timing", ", ".join(parts).encode())
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_timings.reset(token)
+            route = _route_label(scope)
+            HTTP_LATENCY.observe(time.perf_counter() - start, scope["method"], route, status["code"])
+            if route != "static":
+                HTTP_DB_QUERIES.observe(timings.get("db_count", 0), route)
+                HTTP_DB_SECONDS.observe(timings.get("db", 0.0), route)
+                for stage, seconds in timings.items():
+                    if stage not in ("db", "db_count"):
+                        HTTP_STAGE_SECONDS.observe(seconds, route, stage)
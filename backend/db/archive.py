@@ -0,0 +1,330 @@
+"""
+시세 이력(price_history) 연도별 Parquet 아카이브.
+
+지난 달 말일(through)까지의 종가를 PARQUET_DIR/price_history/year=YYYY/part.parquet로 내보내고,
+여러 Ticker 일괄 조회(load_price_series / load_price_ranges)는 through 이하 구간을 Parquet에서, through 이후(최근 구간)만 SQLite에서 읽는다.
+Ticker 1개 조회(load_price_range)는 SQLite 인덱스 범위 읽기가 더 싸므로 그대로 SQLite.
+- 파일 안은 Ticker·날짜순 정렬 + 작은 row group → min/max 통계로 Ticker·기간이 겹치지 않는 row group은 읽지 않음
+- ticker·date·close 열만 읽고 (dividend 등은 건너뜀), 기간 밖 연도 파일은 열지 않음
+
+SQLite가 원본이고 아카이브는 읽기 전용 사본이다.
+- manifest.json의 version(내보낸 snapshot의 data_version) 이후 series_changes 로그에
+  through 이하 날짜 변경이 남은 Ticker는 SQLite에서 전체를 읽는다 (소급 수정·삭제 즉시 반영)
+- 다음 내보내기는 새로 닫힌 달 + 변경이 있었던 연도부터만 다시 쓴다
+- pyarrow가 없거나 아직 내보낸 적이 없으면 전부 SQLite (기존 동작)
+포트폴리오마다 디렉터리가 따로 있다 (default는 PARQUET_DIR, 나머지는 PARQUET_DIR/{이름}).
+"""
+import asyncio
+import functools
+import importlib.util
+import json
+import os
+import shutil
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import PARQUET_DIR, SQLITE_BUSY_TIMEOUT_MS
+from backend.core.metrics import PRICE_ROWS
+from backend.db.portfolio import DEFAULT, current_portfolio
+from backend.db.version import VERSION_KEY, get_data_version
+
+if TYPE_CHECKING:
+    import pyarrow.parquet as pq
+
+TABLE          = "price_history"
+MANIFEST       = "manifest.json"
+ROW_GROUP_ROWS = 4096   # Ticker 정렬 → row group마다 Ticker 범위가 좁아 통계로 건너뛰기 쉬움
+COMPRESSION    = "zstd"
+_COLUMNS       = ["ticker", "date", "close"]
+
+
+@functools.cache
+def available() -> bool:
+    """pyarrow 설치 여부. import는 실제로 읽고 쓸 때 (기동 시 worker마다 ~100ms 아끼기)"""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def archive_dir(name: Optional[str] = None) -> str:
+    """기본 포트폴리오는 PARQUET_DIR, 나머지는 그 아래 포트폴리오 이름 디렉터리"""
+    name = name or current_portfolio()
+    return PARQUET_DIR if name == DEFAULT else os.path.join(PARQUET_DIR, name)
+
+
+def _year_path(directory: str, year: int) -> str:
+    return os.path.join(directory, TABLE, f"year={year}", "part.parquet")
+
+
+def _years(directory: str) -> list[int]:
+    """아카이브에 있는 연도 partition (오름차순)"""
+    root = os.path.join(directory, TABLE)
+    if not os.path.isdir(root):
+        return []
+    return sorted(int(d[5:]) for d in os.listdir(root) if d.startswith("year="))
+
+
+def closed_through(today: Optional[date] = None) -> str:
+    """내보낼 수 있는 마지막 날짜 = 지난 달 말일"""
+    today = today or date.today()
+    return (today.replace(day=1) - timedelta(days=1)).isoformat()
+
+
+# ──────────────────────────────────────────────────────────────
+# manifest
+# ──────────────────────────────────────────────────────────────
+_manifests: dict[str, tuple[int, dict]] = {}   # 경로 → (mtime_ns, manifest)
+
+
+def load_manifest(directory: str) -> Optional[dict]:
+    """manifest.json (mtime이 같으면 worker 로컬 사본 재사용). 없으면 None"""
+    path = os.path.join(directory, MANIFEST)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    hit = _manifests.get(path)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["_tickers"] = frozenset(manifest["tickers"])
+    _manifests[path] = (mtime, manifest)
+    return manifest
+
+
+def _write_manifest(directory: str, manifest: dict):
+    tmp = os.path.join(directory, MANIFEST + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, os.path.join(directory, MANIFEST))
+
+
+# ──────────────────────────────────────────────────────────────
+# 조회
+# ──────────────────────────────────────────────────────────────
+# 디렉터리 → ((manifest mtime, data_version), 아카이브 이후 through 이하가 바뀐 Ticker)
+_dirty: dict[str, tuple[tuple, frozenset]] = {}
+
+
+async def _dirty_tickers(db: AsyncSession, directory: str, manifest: dict, version: int) -> Optional[frozenset]:
+    """아카이브 snapshot 이후 through 이하 종가가 바뀐 Ticker. 로그가 snapshot을 덮지 못하면 None"""
+    from backend.db.series import CHANGES_TABLE, FLOOR_KEY   # series → prices → archive 순환 import 회피
+
+    key = (_manifests[os.path.join(directory, MANIFEST)][0], version)
+    hit = _dirty.get(directory)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    floor = (await db.execute(text("SELECT value FROM settings WHERE key = :k"), {"k": FLOOR_KEY})).scalar()
+    if floor is None or int(floor) > manifest["version"]:
+        return None
+    rows = await db.execute(
+        text(f"SELECT DISTINCT key FROM {CHANGES_TABLE} "
+             "WHERE key LIKE 't:%' AND version >= :v AND since <= :through"),
+        {"v": manifest["version"], "through": manifest["through"]},
+    )
+    dirty = frozenset(k[2:] for (k,) in rows)
+    _dirty[directory] = (key, dirty)
+    return dirty
+
+
+async def coverage(db: AsyncSession, tickers: set[str]) -> tuple[Optional[str], set[str]]:
+    """
+    (through, through 이하 구간을 Parquet에서 읽어도 되는 Ticker).
+    아카이브가 없거나 쓸 수 없으면 (None, 빈 집합) → 전부 SQLite
+    """
+    if not tickers or not available():
+        return None, set()
+    directory = archive_dir()
+    manifest  = load_manifest(directory)
+    if manifest is None:
+        return None, set()
+    version = await get_data_version(db)
+    if manifest["version"] > version:          # 이 세션 snapshot보다 새 아카이브 → 섞지 않음
+        return None, set()
+    dirty = await _dirty_tickers(db, directory, manifest, version)
+    if dirty is None:
+        return None, set()
+    return manifest["through"], (tickers & manifest["_tickers"]) - dirty
+
+
+def _row_groups(pf: "pq.ParquetFile", lo: str, hi: str, start: Optional[str], end: str) -> list[int]:
+    """min/max 통계가 Ticker 범위 [lo, hi]·기간 [start, end]와 겹치는 row group만"""
+    names  = pf.schema_arrow.names
+    t_col  = names.index("ticker")
+    d_col  = names.index("date")
+    groups = []
+    for i in range(pf.metadata.num_row_groups):
+        rg = pf.metadata.row_group(i)
+        t, d = rg.column(t_col).statistics, rg.column(d_col).statistics
+        if t is not None and t.has_min_max and (t.max < lo or t.min > hi):
+            continue
+        if d is not None and d.has_min_max and (d.min > end or (start and d.max < start)):
+            continue
+        groups.append(i)
+    return groups
+
+
+def _read(directory: str, tickers: set[str], start: Optional[str], end: str) -> dict[str, tuple]:
+    """
+    (thread) tickers의 [start, end] 종가. 기간 밖 연도 파일은 열지 않고,
+    파일 안에서는 통계로 고른 row group의 ticker·date·close 열만 읽은 뒤 행 단위로 거른다.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    first = int(start[:4]) if start else 0
+    wanted = pa.array(sorted(tickers))
+    lo, hi = wanted[0].as_py(), wanted[-1].as_py()
+    parts: dict[str, list[tuple]] = {}
+    rows = 0
+    for year in (y for y in _years(directory) if first <= y <= int(end[:4])):
+        pf     = pq.ParquetFile(_year_path(directory, year), memory_map=True)
+        groups = _row_groups(pf, lo, hi, start, end)
+        if not groups:
+            continue
+        table = pf.read_row_groups(groups, columns=_COLUMNS)
+        mask  = pc.and_(pc.is_in(table.column("ticker"), value_set=wanted), pc.less_equal(table.column("date"), end))
+        if start:
+            mask = pc.and_(mask, pc.greater_equal(table.column("date"), start))
+        table = table.filter(mask)
+        if not table.num_rows:
+            continue
+        rows  += table.num_rows
+        tick   = table.column("ticker").to_numpy(zero_copy_only=False)
+        dates  = table.column("date").to_numpy(zero_copy_only=False).astype("U10")
+        closes = table.column("close").to_numpy()
+        # 파일 안은 (Ticker, 날짜)순 → Ticker가 바뀌는 위치로 자름
+        cuts = [0, *(np.flatnonzero(tick[1:] != tick[:-1]) + 1), len(tick)]
+        for a, b in zip(cuts[:-1], cuts[1:]):
+            parts.setdefault(tick[a], []).append((dates[a:b], closes[a:b]))
+    PRICE_ROWS.inc(rows, "parquet")
+    return {
+        t: (np.concatenate([d for d, _ in p]), np.concatenate([c for _, c in p]).astype(float))
+        for t, p in parts.items()
+    }
+
+
+async def read_prices(tickers: set[str], start: Optional[str], end: str) -> dict[str, tuple]:
+    """Ticker별 (dates, closes) — 아카이브 구간 [start, end]. 파일 읽기는 thread에서"""
+    if not tickers:
+        return {}
+    return await asyncio.to_thread(_read, archive_dir(), tickers, start, end)
+
+
+# ──────────────────────────────────────────────────────────────
+# 내보내기
+# ──────────────────────────────────────────────────────────────
+def _setting(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    row = conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _first_date(conn: sqlite3.Connection, old: Optional[dict], through: str) -> Optional[str]:
+    """
+    다시 쓸 구간의 시작일. 전체면 ''. 새로 닫힌 달도 변경도 없으면 None
+    (지난 내보내기 이후 through 이하 변경 중 가장 이른 날짜, 또는 지난 through 다음 날)
+    """
+    from backend.db.series import CHANGES_TABLE, FLOOR_KEY
+
+    if old is None:
+        return ""
+    floor = _setting(conn, FLOOR_KEY)
+    if floor is None or int(floor) > old["version"]:
+        return ""
+    changed = conn.execute(
+        f"SELECT MIN(since) FROM {CHANGES_TABLE} WHERE key LIKE 't:%' AND version >= ? AND since <= ?",
+        (old["version"], old["through"]),
+    ).fetchone()[0]
+    new_months = None
+    if old["through"] < through:
+        new_months = (date.fromisoformat(old["through"]) + timedelta(days=1)).isoformat()
+    starts = [s for s in (changed, new_months) if s is not None]
+    return min(starts) if starts else None
+
+
+def export_prices(db_path: str, directory: str, through: Optional[str] = None, full: bool = False) -> Optional[dict]:
+    """
+    (sync, thread에서 실행) through(기본: 지난 달 말일)까지의 price_history를 연도별 Parquet로 내보내기.
+    읽기 transaction 1개(WAL snapshot)로 읽으므로 쓰기를 막지 않는다.
+    반환: 보고 dict. 새로 닫힌 달·변경이 없으면 None
+    """
+    if not available():
+        raise RuntimeError("pyarrow가 설치되어 있지 않습니다 (pip install pyarrow).")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    through = through or closed_through()
+    old     = None if full else load_manifest(directory)
+    t0      = time.perf_counter()
+
+    conn = sqlite3.connect(db_path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+    try:
+        conn.execute("BEGIN")
+        version = int(_setting(conn, VERSION_KEY) or 0)
+        start   = _first_date(conn, old, through)
+        if start is None:
+            return None
+        rewrite = start == ""
+        if rewrite:
+            start = conn.execute("SELECT MIN(date) FROM price_history WHERE date <= ?", (through,)).fetchone()[0]
+        years   = {} if rewrite else dict(old["years"])
+        written = 0
+        if start:
+            for year in range(int(start[:4]), int(through[:4]) + 1):
+                rows = conn.execute(
+                    "SELECT ticker, date, close, dividend FROM price_history "
+                    "WHERE date >= ? AND date <= ? ORDER BY ticker, date",
+                    (f"{year}-01-01", min(f"{year}-12-31", through)),
+                ).fetchall()
+                path = _year_path(directory, year)
+                if not rows:
+                    shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+                    years.pop(str(year), None)
+                    continue
+                names, dates, closes, dividends = zip(*rows)
+                table = pa.table({
+                    "ticker":   pa.array(names, pa.string()).dictionary_encode(),
+                    "date":     pa.array(dates, pa.string()),
+                    "close":    pa.array(closes, pa.float64()),
+                    "dividend": pa.array(dividends, pa.float64()),
+                })
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                pq.write_table(table, path + ".tmp", row_group_size=ROW_GROUP_ROWS, compression=COMPRESSION)
+                os.replace(path + ".tmp", path)
+                years[str(year)] = len(rows)
+                written += len(rows)
+        tickers = [t for (t,) in conn.execute(
+            "SELECT DISTINCT ticker FROM price_history WHERE date <= ? ORDER BY ticker", (through,)
+        )]
+    finally:
+        conn.close()
+
+    if rewrite:
+        # 전체 내보내기: 이번에 쓰지 않은 연도 파일(이전 아카이브 잔재) 정리
+        for year in _years(directory):
+            if str(year) not in years:
+                shutil.rmtree(os.path.dirname(_year_path(directory, year)), ignore_errors=True)
+
+    manifest = {
+        "table":       TABLE,
+        "through":     through,
+        "version":     version,
+        "years":       dict(sorted(years.items())),
+        "rows":        sum(years.values()),
+        "tickers":     tickers,
+        "exported_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    _write_manifest(directory, manifest)
+    return {
+        **{k: manifest[k] for k in ("through", "version", "rows")},
+        "from":         start,
+        "written_rows": written,
+        "bytes":        sum(os.path.getsize(_year_path(directory, int(y))) for y in years),
+        "seconds":      round(time.perf_counter() - t0, 3),
+    }
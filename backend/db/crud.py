@@ -1,16 +1,23 @@
+import base64
+import json
 import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
-import pandas as pd
-from sqlalchemy import select, delete
+import numpy as np
+from sqlalchemy import column, delete, func, or_, select, table, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from backend.db.models import (
-    Asset, AssetHistory,
+    Asset, AssetHistory, Transaction,
     RealEstateDetail, StockDetail, PensionDetail, SavingsDetail,
 )
+from backend.db.ledger import QTY_TYPES, record_quantity
+from backend.db.liabilities import current_liability, liability_at, liability_series, load_current, record_detail_change
+from backend.db.prices import derive_history, fill_ledger_quantity, load_price_context, normalize_ticker, price_ticker
+from backend.db.search import FTS_TABLE, fts_available, match_query
+from backend.db.version import VersionedCache
 
 # ──────────────────────────────────────────────────────────────
 # 헬퍼
@@ -27,12 +34,36 @@ TYPE_LABELS = {
 def _now() -> str:
     return datetime.now().isoformat()
 
-def _asset_to_dict(asset: Asset) -> dict:
-    """Asset ORM → dict (이력 + 상세 포함)"""
-    sorted_history = sorted(asset.history, key=lambda x: x.date)
+async def _load_history(db: AsyncSession, asset_ids: list[str]) -> dict[str, list[dict]]:
+    """
+    저장 이력 → {asset_id: [dict, ...]} (날짜 오름차순).
+    ORM 객체(행마다 identity map·상태 추적) 대신 컬럼 tuple로 읽어 수만 행도 가볍게.
+    """
+    stored: dict[str, list[dict]] = {i: [] for i in asset_ids}
+    for k in range(0, len(asset_ids), 500):
+        q = (
+            select(AssetHistory.asset_id, AssetHistory.date, AssetHistory.value, AssetHistory.price, AssetHistory.quantity)
+            .where(AssetHistory.asset_id.in_(asset_ids[k:k + 500]))
+            .order_by(AssetHistory.asset_id, AssetHistory.date)
+        )
+        for asset_id, d, value, price, qty in (await db.execute(q)).all():
+            stored[asset_id].append({"date": d, "value": value, "price": price, "quantity": qty})
+    return stored
+
+def _history_rows(asset: Asset, stored: list[dict], ctx: Optional[dict] = None) -> list[dict]:
+    """
+    저장된 이력(_load_history) → dict 리스트. 원장 자산의 수량은 원장 누적합으로 채우고,
+    Ticker 주식은 price_history 종가로 일별 이력 파생.
+    """
+    fill_ledger_quantity(asset, stored)
+    return derive_history(asset, stored, ctx) if ctx else stored
+
+def _asset_to_dict(asset: Asset, stored: list[dict], ctx: Optional[dict] = None) -> dict:
+    """Asset ORM → dict (이력 + 상세 포함). stored: _load_history 결과, ctx: load_price_context 결과"""
+    sorted_history = _history_rows(asset, stored, ctx)
     # 직전 이력 시점(전일 등락 계산용): 평가액 + 단가
-    previous_value = sorted_history[-2].value if len(sorted_history) >= 2 else None
-    previous_price = sorted_history[-2].price if len(sorted_history) >= 2 else None
+    previous_value = sorted_history[-2]["value"] if len(sorted_history) >= 2 else None
+    previous_price = sorted_history[-2]["price"] if len(sorted_history) >= 2 else None
 
     d = {
         "id":                asset.id,
@@ -46,16 +77,17 @@ def _asset_to_dict(asset: Asset) -> dict:
         "disposal_date":     asset.disposal_date,
         "disposal_price":    asset.disposal_price,
         "quantity":          asset.quantity,
+        "memo":              asset.memo,
         "created_at":        asset.created_at,
         "updated_at":        asset.updated_at,
-        "history": [
-            {"date": h.date, "value": h.value, "price": h.price, "quantity": h.quantity}
-            for h in sorted_history
-        ],
+        "history":           sorted_history,
         "detail": _detail_to_dict(asset),
     }
     return d
 
+def _assets_to_dicts(assets: list[Asset], history: dict[str, list[dict]], ctx: Optional[dict]) -> list[dict]:
+    return [_asset_to_dict(a, history[a.id], ctx) for a in assets]
+
 def _detail_to_dict(asset: Asset) -> Optional[dict]:
     """유형별 상세 ORM → dict"""
     if asset.type == "REAL_ESTATE" and asset.real_estate:
@@ -76,6 +108,9 @@ def _detail_to_dict(asset: Asset) -> Optional[dict]:
             "pension_start_year": s.pension_start_year,
             "pension_monthly":    s.pension_monthly,
             "ticker":             s.ticker,
+            "dividend_yield":     s.dividend_yield,
+            "dividend_dps":       s.dividend_dps,
+            "dividend_cycle":     s.dividend_cycle,
         }
     if asset.type == "PENSION" and asset.pension:
         p = asset.pension
@@ -97,9 +132,9 @@ def _detail_to_dict(asset: Asset) -> Optional[dict]:
     return None
 
 def _load_options():
-    """모든 관계를 Eager Load하는 옵션"""
+    """이력을 제외한 모든 관계를 Eager Load하는 옵션 (이력은 _load_history)"""
     return [
-        selectinload(Asset.history),
+        selectinload(Asset.transactions),
         selectinload(Asset.real_estate),
         selectinload(Asset.stock),
         selectinload(Asset.pension),
@@ -110,19 +145,144 @@ def _load_options():
 # ──────────────────────────────────────────────────────────────
 # CRUD - Assets
 # ──────────────────────────────────────────────────────────────
-async def get_all_assets(db: AsyncSession, asset_type: Optional[str] = None) -> list[dict]:
-    q = select(Asset).options(*_load_options())
+# 목록 정렬 키 → 컬럼 (cursor는 (정렬값, id) keyset)
+SORT_KEYS = {
+    "name":             Asset.name,
+    "value":            Asset.current_value,
+    "acquisition_date": func.coalesce(Asset.acquisition_date, ""),
+    "created_at":       Asset.created_at,
+    "updated_at":       Asset.updated_at,
+}
+
+
+def _encode_cursor(value, asset_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, asset_id]).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        value, asset_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return value, str(asset_id)
+    except (ValueError, TypeError):
+        raise ValueError("잘못된 cursor입니다.")
+
+
+async def _filter_assets(
+    db: AsyncSession,
+    q,
+    asset_type: Optional[str] = None,
+    account:    Optional[str] = None,
+    ticker:     Optional[str] = None,
+    currency:   Optional[str] = None,
+    status:     Optional[str] = None,
+    search:     Optional[str] = None,
+):
+    """목록 필터를 SQL 조건으로 (account/ticker/currency는 주식 상세 조인, search는 FTS5)"""
     if asset_type:
         q = q.where(Asset.type == asset_type)
-    result = await db.execute(q)
-    return [_asset_to_dict(a) for a in result.scalars().all()]
+    if status == "active":
+        q = q.where(or_(Asset.disposal_date.is_(None), Asset.disposal_date == ""))
+    elif status == "disposed":
+        q = q.where(Asset.disposal_date.is_not(None), Asset.disposal_date != "")
+    elif status not in (None, "all"):
+        raise ValueError("status는 active|disposed|all 중 하나입니다.")
+
+    if account or ticker or currency:
+        q = q.join(StockDetail, StockDetail.asset_id == Asset.id)
+        if account:
+            q = q.where(StockDetail.account_name == account)
+        if ticker:
+            # 입력 그대로 또는 정규화 Ticker (005930.kr → 005930.KS)
+            q = q.where(StockDetail.ticker.in_({ticker.strip(), normalize_ticker(ticker)}))
+        if currency:
+            q = q.where(StockDetail.currency == currency.upper())
+
+    if search and search.strip():
+        match = match_query(search)
+        if match and await fts_available(db):
+            fts = table(FTS_TABLE, column("asset_id"))
+            q = q.where(Asset.id.in_(
+                select(fts.c.asset_id).where(text(f"{FTS_TABLE} MATCH :match").bindparams(match=match))
+            ))
+        elif match:
+            like = f"%{search.strip()}%"
+            q = q.outerjoin(RealEstateDetail, RealEstateDetail.asset_id == Asset.id).where(or_(
+                Asset.name.like(like), Asset.memo.like(like), RealEstateDetail.address.like(like),
+            ))
+    return q
+
+
+async def list_assets_page(
+    db: AsyncSession,
+    sort:   Optional[str] = None,
+    order:  str = "asc",
+    cursor: Optional[str] = None,
+    limit:  Optional[int] = None,
+    **filters,
+) -> tuple[list[dict], Optional[str]]:
+    """
+    필터·정렬·cursor 페이지네이션 자산 목록 (이력 + 상세 포함).
+    filters: asset_type, account, ticker, currency, status(active|disposed|all), search
+    반환: (자산 목록, 다음 페이지 cursor — 마지막 페이지면 None)
+    """
+    q = await _filter_assets(db, select(Asset).options(*_load_options()), **filters)
+
+    if sort is None and (limit or cursor):
+        sort = "name"
+    if sort is not None:
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort는 {'|'.join(SORT_KEYS)} 중 하나입니다.")
+        col  = SORT_KEYS[sort]
+        desc = order == "desc"
+        if cursor:
+            value, last_id = _decode_cursor(cursor)
+            key = tuple_(col, Asset.id)
+            q = q.where(key < tuple_(value, last_id) if desc else key > tuple_(value, last_id))
+        q = q.order_by(col.desc(), Asset.id.desc()) if desc else q.order_by(col, Asset.id)
+    if limit:
+        q = q.limit(limit + 1)
+
+    assets = list((await db.execute(q)).scalars().unique().all())
+    next_cursor = None
+    if limit and len(assets) > limit:
+        assets = assets[:limit]
+        last   = assets[-1]
+        value  = {
+            "name": last.name, "value": last.current_value, "acquisition_date": last.acquisition_date or "",
+            "created_at": last.created_at, "updated_at": last.updated_at,
+        }[sort]
+        next_cursor = _encode_cursor(value, last.id)
+
+    # 이력 파생·dict 변환(수만 행)은 세션을 가진 thread에서 그대로 (ORM 객체를 다른 thread로 넘기지 않음).
+    # 루프를 비워야 하는 호출부는 run_offloop로 적재부터 통째로 옮긴다 (api/assets.py)
+    history = await _load_history(db, [a.id for a in assets])
+    ctx     = await load_price_context(db, assets)
+    return _assets_to_dicts(assets, history, ctx), next_cursor
+
+
+async def get_all_assets(db: AsyncSession, asset_type: Optional[str] = None, **filters) -> list[dict]:
+    """조건에 맞는 전체 자산 (페이지네이션 없음). filters: list_assets_page 참고"""
+    return (await list_assets_page(db, asset_type=asset_type, **filters))[0]
 
 
 async def get_asset_by_id(db: AsyncSession, asset_id: str) -> Optional[dict]:
+    asset = await _load_asset(db, asset_id)
+    if not asset:
+        return None
+    stored = (await _load_history(db, [asset_id]))[asset_id]
+    return _asset_to_dict(asset, stored, await load_price_context(db, [asset]))
+
+
+async def asset_exists(db: AsyncSession, asset_id: str) -> bool:
+    """이력·배당 등 하위 행을 쓰기 전 자산 존재 확인 (FK 위반 대신 404로 응답하기 위함)"""
+    result = await db.execute(select(Asset.id).where(Asset.id == asset_id))
+    return result.scalar_one_or_none() is not None
+
+
+async def _load_asset(db: AsyncSession, asset_id: str) -> Optional[Asset]:
     q = select(Asset).options(*_load_options()).where(Asset.id == asset_id)
     result = await db.execute(q)
-    asset = result.scalar_one_or_none()
-    return _asset_to_dict(asset) if asset else None
+    return result.scalar_one_or_none()
 
 
 async def create_asset(db: AsyncSession, data: dict) -> str:
@@ -139,6 +299,7 @@ async def create_asset(db: AsyncSession, data: dict) -> str:
         disposal_date     = data.get("disposal_date"),
         disposal_price    = data.get("disposal_price", 0),
         quantity          = data.get("quantity", 0),
+        memo              = data.get("memo"),
         created_at        = now,
         updated_at        = now,
     )
@@ -149,14 +310,24 @@ async def create_asset(db: AsyncSession, data: dict) -> str:
     _add_detail(db, asset_id, data)
 
     # 초기 이력 저장
-    if "initial_history" in data and data["initial_history"]:
-        h = data["initial_history"]
+    h = data.get("initial_history") or {}
+    if h:
         db.add(AssetHistory(
             asset_id = asset_id,
             date     = h.get("date", data.get("acquisition_date", "")),
             value    = h.get("value"),
             price    = h.get("price"),
-            quantity = h.get("quantity"),
+            quantity = None if data["type"] in QTY_TYPES else h.get("quantity"),
+        ))
+
+    # 수량형 자산: 최초 매수 거래를 원장에 기록
+    quantity = data.get("quantity") or h.get("quantity") or 0
+    if data["type"] in QTY_TYPES and quantity:
+        db.add(Transaction(
+            asset_id  = asset_id,
+            date      = (h.get("date") or data.get("acquisition_date") or now)[:10],
+            qty_delta = quantity,
+            price     = data.get("acquisition_price") or h.get("price"),
         ))
 
     return asset_id
@@ -175,17 +346,28 @@ async def update_asset(db: AsyncSession, asset_id: str, data: dict):
     asset.acquisition_price = data.get("acquisition_price", asset.acquisition_price)
     asset.disposal_date     = data.get("disposal_date", asset.disposal_date)
     asset.disposal_price    = data.get("disposal_price", asset.disposal_price)
-    asset.quantity          = data.get("quantity", asset.quantity)
+    asset.memo              = data.get("memo", asset.memo)
     asset.updated_at        = _now()
 
+    # 수량: 원장 자산은 현재 보유량과의 차이를 오늘 날짜 거래로 기록
+    if "quantity" in data and data["quantity"] is not None:
+        if asset.type in QTY_TYPES:
+            await record_quantity(db, asset_id, _now()[:10], data["quantity"])
+        asset.quantity = data["quantity"]
+
     # 상세 테이블: detail 키가 있을 때만 재생성 (없으면 기존 유지)
     if "detail" in data:
+        before = await load_current(db, asset_id) if asset.type == "REAL_ESTATE" else None
         await _delete_detail(db, asset_id, asset.type)
         await db.flush()   # Core DELETE를 먼저 반영 후 ORM INSERT
         _add_detail(db, asset_id, data)
+        # 부채 이력을 쓰는 부동산: 대출·보증금 변경을 오늘 날짜 행으로 기록
+        if before is not None and data.get("type", asset.type) == "REAL_ESTATE":
+            await record_detail_change(db, asset_id, before, current_liability(data["detail"]), asset.acquisition_date)
 
 
 async def delete_asset(db: AsyncSession, asset_id: str):
+    """자산 삭제. 이력·원장·상세·부채·lot 등 하위 행은 FK ondelete=CASCADE로 함께 삭제 (PRAGMA foreign_keys)"""
     await db.execute(delete(Asset).where(Asset.id == asset_id))
 
 
@@ -212,6 +394,9 @@ def _add_detail(db: AsyncSession, asset_id: str, data: dict):
             pension_start_year = detail.get("pension_start_year"),
             pension_monthly    = detail.get("pension_monthly"),
             ticker             = detail.get("ticker"),
+            dividend_yield     = detail.get("dividend_yield", 0),
+            dividend_dps       = detail.get("dividend_dps", 0),
+            dividend_cycle     = detail.get("dividend_cycle", "연간"),
         ))
     elif a_type == "PENSION":
         db.add(PensionDetail(
@@ -249,26 +434,33 @@ async def _delete_detail(db: AsyncSession, asset_id: str, a_type: str):
 # CRUD - History
 # ──────────────────────────────────────────────────────────────
 async def get_history(db: AsyncSession, asset_id: str) -> list[dict]:
-    q = select(AssetHistory).where(AssetHistory.asset_id == asset_id).order_by(AssetHistory.date)
-    result = await db.execute(q)
-    return [{"date": h.date, "value": h.value, "price": h.price, "quantity": h.quantity}
-            for h in result.scalars().all()]
+    asset = await _load_asset(db, asset_id)
+    if not asset:
+        return []
+    stored = (await _load_history(db, [asset_id]))[asset_id]
+    return _history_rows(asset, stored, await load_price_context(db, [asset]))
 
 
 async def add_history(db: AsyncSession, asset_id: str, data: dict):
+    ledger = await _is_ledger_asset(db, asset_id)
+    if ledger and data.get("quantity") is not None:
+        await record_quantity(db, asset_id, data["date"], data["quantity"], price=data.get("price"))
     db.add(AssetHistory(
         asset_id = asset_id,
         date     = data["date"],
         value    = data.get("value"),
         price    = data.get("price"),
-        quantity = data.get("quantity"),
+        quantity = None if ledger else data.get("quantity"),
     ))
+    await _sync_asset_value(db, asset_id)
 
 
 async def update_history(db: AsyncSession, asset_id: str, date: str, data: dict, exchange_rate: float = 1.0) -> int:
     """
-    이력 수정. 수량이 변경되면 해당 날짜 이후 모든 이력에 수량 전파.
-    반환값: 전파된 행 수
+    이력 수정.
+    수량형 자산(STOCK/PHYSICAL)의 수량 변경은 원장에 차이분 거래 1건만 기록하고
+    이후 보유량은 누적합으로 자동 반영된다 (이후 이력 재작성 없음).
+    반환값: 기록된 거래 수 (0 또는 1)
     """
     q = select(AssetHistory).where(
         AssetHistory.asset_id == asset_id,
@@ -285,81 +477,92 @@ async def update_history(db: AsyncSession, asset_id: str, date: str, data: dict,
     if new_value is None and new_price is not None and new_quantity is not None:
         new_value = new_price * new_quantity * exchange_rate
 
-    propagated_count = 0
+    recorded = 0
+    ledger   = await _is_ledger_asset(db, asset_id)
+    if ledger and new_quantity is not None:
+        tx = await record_quantity(db, asset_id, date, new_quantity, price=new_price)
+        recorded = 1 if tx else 0
+        new_quantity = None   # 수량은 원장에만 저장
 
     if hist is None:
         # 신규 추가
         db.add(AssetHistory(asset_id=asset_id, date=date,
                             value=new_value, price=new_price, quantity=new_quantity))
     else:
-        old_qty = hist.quantity
         hist.price    = new_price    if new_price    is not None else hist.price
         hist.quantity = new_quantity if new_quantity is not None else hist.quantity
         hist.value    = new_value    if new_value    is not None else hist.value
 
-        # 수량 변경 시 이후 이력 전파
-        if new_quantity is not None and old_qty != new_quantity:
-            future_q = select(AssetHistory).where(
-                AssetHistory.asset_id == asset_id,
-                AssetHistory.date > date,
-            ).order_by(AssetHistory.date)
-            future_result = await db.execute(future_q)
-            for fh in future_result.scalars().all():
-                fh.quantity = new_quantity
-                if fh.price is not None:
-                    fh.value = fh.price * new_quantity * exchange_rate
-                propagated_count += 1
-
     # assets 테이블 current_value / quantity 동기화 (최신 이력 기준)
     await _sync_asset_value(db, asset_id)
 
-    return propagated_count
+    return recorded
 
 
 async def delete_history(db: AsyncSession, asset_id: str, date: str):
+    """특정 날짜 이력 삭제. 원장 자산은 같은 날짜 거래도 함께 취소"""
     await db.execute(
         delete(AssetHistory).where(
             AssetHistory.asset_id == asset_id,
             AssetHistory.date == date,
         )
     )
+    await db.execute(
+        delete(Transaction).where(
+            Transaction.asset_id == asset_id,
+            Transaction.date == date,
+        )
+    )
     await _sync_asset_value(db, asset_id)
 
 
+async def _is_ledger_asset(db: AsyncSession, asset_id: str) -> bool:
+    """수량을 원장으로 관리하는 자산인지 (STOCK/PHYSICAL)"""
+    a_type = (await db.execute(select(Asset.type).where(Asset.id == asset_id))).scalar_one_or_none()
+    return a_type in QTY_TYPES
+
+
 async def _sync_asset_value(db: AsyncSession, asset_id: str):
-    """최신 이력을 기준으로 assets.current_value, quantity 동기화"""
-    q = select(AssetHistory).where(
-        AssetHistory.asset_id == asset_id
-    ).order_by(AssetHistory.date.desc()).limit(1)
-    result = await db.execute(q)
-    latest = result.scalar_one_or_none()
-    if not latest:
+    """최신 이력을 기준으로 assets.current_value, quantity 동기화 (수량은 원장 합계 우선)"""
+    await db.flush()
+    asset = await _load_asset(db, asset_id)
+    if not asset:
         return
+    await db.refresh(asset, ["transactions"])
 
-    asset_q = select(Asset).where(Asset.id == asset_id)
-    asset_result = await db.execute(asset_q)
-    asset = asset_result.scalar_one_or_none()
-    if asset:
-        asset.current_value = latest.value if latest.value is not None else 0
-        asset.quantity      = latest.quantity if latest.quantity is not None else asset.quantity
-        asset.updated_at    = _now()
+    stored = (await _load_history(db, [asset_id]))[asset_id]
+    if price_ticker(asset):
+        # Ticker 주식: 저장 이력은 수동 입력분뿐이므로 파생 이력의 마지막 값 기준
+        rows = _history_rows(asset, stored, await load_price_context(db, [asset]))
+    else:
+        rows = _history_rows(asset, stored)
+    if not rows:
+        return
+    latest = rows[-1]
+    asset.current_value = latest["value"] if latest["value"] is not None else 0
+    asset.quantity      = latest["quantity"] if latest["quantity"] is not None else asset.quantity
+    asset.updated_at    = _now()
 
 
 # ──────────────────────────────────────────────────────────────
 # CRUD - Settings
 # ──────────────────────────────────────────────────────────────
-from sqlalchemy import text
+_settings_cache = VersionedCache("settings", maxsize=1)
+
 
 async def get_settings(db: AsyncSession) -> dict:
-    result = await db.execute(text("SELECT key, value FROM settings"))
-    rows = result.fetchall()
-    out = {}
-    for key, val in rows:
-        try:
-            out[key] = float(val) if "." in val else int(val)
-        except (ValueError, TypeError):
-            out[key] = val
-    return out
+    """설정 전체 (worker별 캐시, data_version이 바뀌면 다시 조회)"""
+    async def load() -> dict:
+        result = await db.execute(text("SELECT key, value FROM settings"))
+        out = {}
+        for key, val in result.fetchall():
+            try:
+                out[key] = float(val) if "." in val else int(val)
+            except (ValueError, TypeError):
+                out[key] = val
+        return out
+
+    return dict(await _settings_cache.get_or_compute(db, "all", load))
 
 
 async def save_settings(db: AsyncSession, data: dict):
@@ -378,11 +581,15 @@ def generate_chart_data(
     assets: list[dict],
     period: str = "all",
     group_by: str = "type",
+    liabilities: Optional[dict[str, list[tuple]]] = None,
 ) -> list[dict]:
     """
     이력 데이터를 Forward Fill하여 날짜별 자산 가치 집계.
-    부동산은 (current_value - loan - deposit)로 순자산 기준 집계.
+    부동산은 (평가액 - 그날의 대출 - 보증금)으로 순자산 기준 집계.
+    liabilities: load_liabilities 결과 (없는 자산은 상세의 현재 부채를 전 기간 적용)
     """
+    import pandas as pd  # 차트 집계에서만 사용 → 기동 시 import 비용 제외
+
     today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
 
     period_days = {"10y": 3650, "3y": 1095, "1y": 365, "3m": 90, "1m": 30}
@@ -412,6 +619,17 @@ def generate_chart_data(
     hist_min  = df["date"].min()
     full_range = pd.date_range(start=min(hist_min, start), end=today, freq="D")
     df_pivot  = df_pivot.reindex(full_range).ffill().fillna(0)
+
+    # 부동산 부채: 자산별 부채 시계열을 같은 날짜 축에 정렬해 (날짜 × 자산) 행렬로 한 번에 차감
+    meta   = {a["id"]: a for a in assets}
+    re_ids = [aid for aid in df_pivot.columns if meta.get(aid, {}).get("type") == "REAL_ESTATE"]
+    if re_ids:
+        days = full_range.strftime("%Y-%m-%d").to_numpy()
+        liab = np.column_stack([
+            liability_at(liability_series(current_liability(meta[aid].get("detail")), (liabilities or {}).get(aid, [])), days)
+            for aid in re_ids
+        ])
+        df_pivot[re_ids] = np.maximum(df_pivot[re_ids].to_numpy() - liab, 0)
     df_pivot  = df_pivot.loc[start:]
 
     # 언피벗
@@ -422,7 +640,6 @@ def generate_chart_data(
     )
 
     # 메타데이터 매핑
-    meta = {a["id"]: a for a in assets}
     df_melt["label"] = df_melt["asset_id"].map(
         lambda aid: _get_label(meta.get(aid, {}), group_by)
     )
@@ -440,18 +657,12 @@ def generate_chart_data(
 def _asset_to_records(asset: dict) -> list[dict]:
     """
     자산 하나의 이력 포인트를 레코드 리스트로 변환.
-    부동산은 부채(대출+보증금) 차감.
+    부동산 부채는 generate_chart_data에서 날짜별로 차감 (여기서는 평가액 그대로).
     """
     a_id  = asset["id"]
     a_type = asset["type"]
     history = asset.get("history", [])
 
-    # 부동산 부채
-    liab = 0.0
-    if a_type == "REAL_ESTATE" and asset.get("detail"):
-        d = asset["detail"]
-        liab = (d.get("loan_amount") or 0) + (d.get("tenant_deposit") or 0)
-
     records = []
 
     # (1) 취득일 초기값
@@ -459,7 +670,7 @@ def _asset_to_records(asset: dict) -> list[dict]:
     acq_price = asset.get("acquisition_price") or 0
     qty       = asset.get("quantity") or 0
     init_val  = (acq_price * qty) if a_type in ("STOCK", "PHYSICAL") and qty else acq_price
-    records.append({"asset_id": a_id, "date": acq_date, "value": max(0, init_val - liab)})
+    records.append({"asset_id": a_id, "date": acq_date, "value": max(0, init_val)})
 
     # (2) 이력
     for h in history:
@@ -471,7 +682,7 @@ def _asset_to_records(asset: dict) -> list[dict]:
             val = float(h["price"]) * float(h["quantity"])
         else:
             continue
-        records.append({"asset_id": a_id, "date": h["date"][:10], "value": max(0, val - liab)})
+        records.append({"asset_id": a_id, "date": h["date"][:10], "value": max(0, val)})
 
     # (3) 현재값 or 매각값
     disp_date  = asset.get("disposal_date")
@@ -485,7 +696,7 @@ def _asset_to_records(asset: dict) -> list[dict]:
         records.append({
             "asset_id": a_id,
             "date": datetime.now().strftime("%Y-%m-%d"),
-            "value": max(0, float(cur_val) - liab),
+            "value": max(0, float(cur_val)),
         })
 
     return records
@@ -1,17 +1,150 @@
+import asyncio
 import os
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.pool import NullPool
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
-from backend.core.config import DB_DIR, DB_URL
+from backend.core.config import DB_DIR, PORTFOLIO_IDLE_SECONDS, SQLITE_BUSY_TIMEOUT_MS
+from backend.core.executor import cpu_executor, run_cpu
+from backend.core.locks import FileLock
+from backend.core.metrics import install_sql_hooks
+from backend.db.portfolio import DEFAULT, current_portfolio, portfolio_path, reset_portfolio, set_portfolio
+from backend.db.version import install_version_hooks
+
+
+T = TypeVar("T")
 
 
 class Base(DeclarativeBase):
     pass
 
 
-# 엔진 & 세션 팩토리
-engine = create_async_engine(DB_URL, echo=False)
-async_session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+class _Portfolio:
+    """포트폴리오 1개의 엔진 묶음: 요청용 풀 엔진 + CPU executor thread 전용 읽기 엔진"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.path = portfolio_path(name)
+        self.url  = f"sqlite+aiosqlite:///{self.path}"
+        self.engine  = create_async_engine(self.url, echo=False)
+        self.session = async_sessionmaker(self.engine, expire_on_commit=False, class_=AsyncSession)
+        # executor thread마다 자체 이벤트 루프라 커넥션을 풀에 두지 않음 (NullPool)
+        self.offloop_engine  = create_async_engine(self.url, echo=False, poolclass=NullPool)
+        self.offloop_session = async_sessionmaker(self.offloop_engine, expire_on_commit=False, class_=AsyncSession)
+        for eng in (self.engine, self.offloop_engine):
+            install_sql_hooks(eng.sync_engine)
+            event.listen(eng.sync_engine, "connect", _sqlite_pragmas)
+        install_version_hooks(self.engine.sync_engine)
+        self.ready     = False           # migration 확인 완료
+        self.active    = 0               # 진행 중인 요청·작업 수 (portfolio_scope)
+        self.last_used = time.monotonic()
+
+    @property
+    def idle(self) -> bool:
+        return self.active == 0 and self.engine.pool.checkedout() == 0
+
+    async def dispose(self):
+        await self.engine.dispose()
+        await self.offloop_engine.dispose()
+
+
+def _sqlite_pragmas(dbapi_conn, record):
+    """
+    다중 worker: WAL(읽기/쓰기 동시 진행) + busy_timeout(쓰기 lock 대기).
+    foreign_keys: 자산 삭제 시 하위 테이블(ondelete=CASCADE)도 함께 삭제 (SQLite 기본값은 꺼짐)
+    """
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+# 포트폴리오별 엔진 registry (처음 쓸 때 생성 + migration, 유휴 시 evict_idle로 닫음)
+# 파일이 달라 한 포트폴리오의 쓰기 lock이 다른 포트폴리오를 막지 않는다
+_portfolios: dict[str, _Portfolio] = {DEFAULT: _Portfolio(DEFAULT)}
+_open_lock = asyncio.Lock()
+
+# 기본 포트폴리오 엔진 (기존 import 호환: 벤치마크 등)
+engine         = _portfolios[DEFAULT].engine
+offloop_engine = _portfolios[DEFAULT].offloop_engine
+
+
+def _entry() -> _Portfolio:
+    name  = current_portfolio()
+    entry = _portfolios.get(name)
+    if entry is None or not (entry.ready or name == DEFAULT):
+        raise RuntimeError(f"열리지 않은 포트폴리오: {name} (portfolio_scope 밖에서 사용)")
+    entry.last_used = time.monotonic()
+    return entry
+
+
+def async_session() -> AsyncSession:
+    """현재 포트폴리오의 세션 (기존 async_sessionmaker와 같은 사용법)"""
+    return _entry().session()
+
+
+def offloop_session() -> AsyncSession:
+    return _entry().offloop_session()
+
+
+async def open_portfolio(name: str) -> _Portfolio:
+    """엔진 생성 + 미적용 migration 실행 (이미 열려 있으면 그대로)"""
+    entry = _portfolios.get(name)
+    if entry is not None and entry.ready:
+        return entry
+    async with _open_lock:
+        entry = _portfolios.get(name)
+        if entry is None:
+            entry = _portfolios[name] = _Portfolio(name)
+        if not entry.ready:
+            await _migrate(entry)
+            entry.ready = True
+    return entry
+
+
+@asynccontextmanager
+async def portfolio_scope(name: str):
+    """with 안에서 async_session()·get_db·run_offloop가 name 포트폴리오를 사용 (사용 중에는 evict 안 됨)"""
+    entry = await open_portfolio(name)
+    entry.active += 1
+    token = set_portfolio(name)
+    try:
+        yield entry
+    finally:
+        reset_portfolio(token)
+        entry.active -= 1
+        entry.last_used = time.monotonic()
+
+
+async def evict_idle(max_idle: float = PORTFOLIO_IDLE_SECONDS) -> list[str]:
+    """max_idle초 넘게 쓰지 않은 포트폴리오 엔진 닫기 (default 제외). 닫은 이름 반환"""
+    now, evicted = time.monotonic(), []
+    async with _open_lock:
+        for name, entry in list(_portfolios.items()):
+            if name != DEFAULT and entry.idle and now - entry.last_used > max_idle:
+                del _portfolios[name]
+                await entry.dispose()
+                evicted.append(name)
+    return evicted
+
+
+async def evict_loop(max_idle: float = PORTFOLIO_IDLE_SECONDS):
+    """lifespan 백그라운드 루프"""
+    while True:
+        await asyncio.sleep(max(1.0, min(60.0, max_idle / 2)))
+        for name in await evict_idle(max_idle):
+            print(f"💤 포트폴리오 엔진 닫음: {name}")
+
+
+def open_portfolios() -> list[str]:
+    return [n for n, e in _portfolios.items() if e.ready]
 
 
 async def get_db():
@@ -25,26 +158,42 @@ async def get_db():
             raise
 
 
+async def run_offloop(name: str, fn: Callable[..., Awaitable[T]], *args) -> T:
+    """
+    읽기 전용 집계 코루틴 fn(db, *args)를 CPU executor thread의 별도 이벤트 루프·세션에서 실행.
+    ORM 적재(수만 행 객체 생성)부터 pandas 집계까지 요청 루프를 막지 않는다.
+    CPU_EXECUTOR_WORKERS=0이면 현재 루프에서 그대로 실행.
+    """
+    if cpu_executor() is None:
+        async with async_session() as db:
+            return await fn(db, *args)
+
+    session = _entry().offloop_session
+
+    def call() -> T:
+        async def main() -> T:
+            async with session() as db:
+                return await fn(db, *args)
+        return asyncio.run(main())
+
+    return await run_cpu(name, call)
+
+
+async def _migrate(entry: _Portfolio):
+    """미적용 migration만 실행 (PRAGMA user_version 기준, migrations.py)"""
+    from backend.db.migrations import run_migrations
+    directory = os.path.dirname(entry.path)
+    os.makedirs(directory, exist_ok=True)
+    lock_name = "migrate.lock" if entry.name == DEFAULT else f"{entry.name}.migrate.lock"
+    # worker들이 동시에 기동해도 migration은 한 번에 하나만 (나머지는 대기 후 최신 버전 확인만)
+    with FileLock(os.path.join(directory, lock_name)):
+        async with entry.engine.begin() as conn:
+            applied = await conn.run_sync(run_migrations)
+    suffix = f" (migration v{applied[0]}~v{applied[-1]} 적용)" if applied else ""
+    print(f"✅ DB initialized: {entry.url}{suffix}")
+
+
 async def init_db():
-    """DB 초기화 (테이블 생성 + 신규 컬럼 migration)"""
+    """기본 포트폴리오 DB 초기화 (나머지 포트폴리오는 처음 요청될 때 open_portfolio)"""
     os.makedirs(DB_DIR, exist_ok=True)
-    from backend.db import models  # noqa: F401
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-        t = __import__("sqlalchemy", fromlist=["text"]).text
-        # stock_details 배당 컬럼
-        for col, defval in [
-            ("dividend_yield", "0"),
-            ("dividend_dps",   "0"),
-            ("dividend_cycle", "'연간'"),
-        ]:
-            try:
-                await conn.execute(t(f"ALTER TABLE stock_details ADD COLUMN {col} REAL DEFAULT {defval}"))
-            except Exception:
-                pass
-        # pension_details hide_in_chart 컬럼
-        try:
-            await conn.execute(t("ALTER TABLE pension_details ADD COLUMN hide_in_chart INTEGER DEFAULT 0"))
-        except Exception:
-            pass
-    print(f"✅ DB initialized: {DB_URL}")
+    await open_portfolio(DEFAULT)
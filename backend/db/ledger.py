@@ -0,0 +1,186 @@
+"""
+거래 원장(transactions) 기반 보유 수량 계산.
+
+수량은 transactions(asset_id, date, qty_delta, price, fees)가 원천이며,
+일별 보유 수량은 qty_delta 누적합을 시세 날짜에 맞춰 정렬(searchsorted)해 한 번에 계산한다.
+매수/매도는 원장 1행 INSERT로 끝나고, asset_history는 단가/평가액 이력만 담는다.
+원장 행이 하나도 없는 자산은 기존처럼 asset_history.quantity를 사용한다.
+"""
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.models import Transaction
+
+# 수량을 갖는 자산 유형 (원장 대상)
+QTY_TYPES = ("STOCK", "PHYSICAL")
+_QTY_TYPES_SQL = "('STOCK', 'PHYSICAL')"
+
+# (dates, 누적 수량) — dates는 'YYYY-MM-DD' 문자열 배열(오름차순)
+Position = tuple[np.ndarray, np.ndarray]
+
+
+def position_series(transactions: list[Transaction]) -> Optional[Position]:
+    """원장 → 거래일별 누적 보유 수량. 원장이 없으면 None"""
+    if not transactions:
+        return None
+    txs = sorted(transactions, key=lambda t: (t.date, t.id or 0))
+    return _cumulative([t.date[:10] for t in txs], [t.qty_delta for t in txs])
+
+
+def _cumulative(dates: list[str], deltas: list[float]) -> Position:
+    """(거래일 오름차순) 수량 증감 → 거래일별 누적 보유 수량"""
+    dates  = np.array(dates)
+    cumqty = np.cumsum(deltas, dtype=float)
+    # 같은 날짜 거래가 여러 건이면 마지막 누적값만 유효
+    last = np.append(dates[1:] != dates[:-1], True)
+    return dates[last], cumqty[last]
+
+
+def quantity_at(position: Position, dates) -> np.ndarray:
+    """각 날짜 종료 시점의 보유 수량 (첫 거래 이전은 0)"""
+    idx = np.searchsorted(position[0], dates, side="right") - 1
+    return np.where(idx >= 0, position[1][np.maximum(idx, 0)], 0.0)
+
+
+def quantity_before(position: Optional[Position], date: str) -> float:
+    """date 당일 거래 반영 전(전일 종료 시점) 보유 수량"""
+    if position is None:
+        return 0.0
+    idx = np.searchsorted(position[0], date, side="left") - 1
+    return float(position[1][idx]) if idx >= 0 else 0.0
+
+
+def total_quantity(position: Optional[Position]) -> Optional[float]:
+    """현재 보유 수량 (원장이 없으면 None)"""
+    return float(position[1][-1]) if position is not None else None
+
+
+async def load_position(db: AsyncSession, asset_id: str) -> Optional[Position]:
+    q = select(Transaction).where(Transaction.asset_id == asset_id)
+    return position_series((await db.execute(q)).scalars().all())
+
+
+async def record_quantity(
+    db: AsyncSession,
+    asset_id: str,
+    date: str,
+    quantity: float,
+    price: Optional[float] = None,
+    fees: float = 0,
+) -> Optional[Transaction]:
+    """
+    date 시점 보유 수량을 quantity로 맞추는 거래 1건 기록.
+    해당 날짜의 기존 보유량과의 차이만 qty_delta로 INSERT (이후 이력 재작성 없음).
+    차이가 없으면 None.
+    """
+    position = await load_position(db, asset_id)
+    current  = float(quantity_at(position, [date])[0]) if position is not None else 0.0
+    delta    = quantity - current
+    if abs(delta) < 1e-9:
+        return None
+    tx = Transaction(asset_id=asset_id, date=date, qty_delta=delta, price=price, fees=fees)
+    db.add(tx)
+    await db.flush()
+    return tx
+
+
+# ──────────────────────────────────────────────────────────────
+# 1회성 migration: asset_history 수량 변화 → 원장
+# ──────────────────────────────────────────────────────────────
+def migrate_quantity_history(conn) -> tuple[int, list[dict]]:
+    """
+    (sync Connection) 수량형 자산의 asset_history 수량 변화로 원장을 추론해 기록.
+    - 수량이 바뀐 날짜마다 (새 수량 - 직전 수량)을 qty_delta로, 그날 단가를 price로
+    - 수량 이력이 없으면 취득일에 현재 보유 수량 1건
+    이후 asset_history.quantity는 비우고 (원장 누적합이 같은 수량을 재현), Ticker 주식의 단가 행 중
+    단가가 price_history 종가와 같고 평가액이 종가×원장 수량×환율과 같은 행만 삭제
+    (단가/평가액 전용 테이블로 축소). 수동으로 고친 단가·평가액 행은 남긴다.
+    반환: (기록한 거래 수, 삭제한 이력 행 — 호출자가 아카이브에 기록)
+    """
+    assets = conn.execute(text(
+        "SELECT id, acquisition_date, acquisition_price, quantity, created_at FROM assets "
+        f"WHERE type IN {_QTY_TYPES_SQL} AND id NOT IN (SELECT DISTINCT asset_id FROM transactions)"
+    )).fetchall()
+
+    params = []
+    for asset_id, acq_date, acq_price, qty, created_at in assets:
+        rows = conn.execute(text(
+            "SELECT date, price, quantity FROM asset_history "
+            "WHERE asset_id = :a AND quantity IS NOT NULL ORDER BY date"
+        ), {"a": asset_id}).fetchall()
+        prev = 0.0
+        for date, price, q in rows:
+            if q != prev:
+                params.append({"a": asset_id, "d": date[:10], "q": q - prev, "p": price})
+                prev = q
+        if not rows and qty:
+            date = (acq_date or created_at or datetime.now().isoformat())[:10]
+            params.append({"a": asset_id, "d": date, "q": qty, "p": acq_price})
+
+    if params:
+        conn.execute(text(
+            "INSERT INTO transactions (asset_id, date, qty_delta, price, fees) VALUES (:a, :d, :q, :p, 0)"
+        ), params)
+
+    removed = _redundant_price_rows(conn)
+    conn.execute(text(
+        "UPDATE asset_history SET quantity = NULL "
+        f"WHERE asset_id IN (SELECT id FROM assets WHERE type IN {_QTY_TYPES_SQL})"
+    ))
+    if removed:
+        conn.execute(text("DELETE FROM asset_history WHERE id = :id"), [{"id": r["id"]} for r in removed])
+    return len(params), removed
+
+
+def _redundant_price_rows(conn) -> list[dict]:
+    """(sync Connection) Ticker 주식 이력 중 price_history 종가로 똑같이 파생되는 행 (삭제 대상)"""
+    from backend.db.prices import FALLBACK_RATES, fx_ticker, rate_at, same_number
+
+    rows = conn.execute(text("""
+        SELECT h.id, h.asset_id, h.date, h.value, h.price, h.quantity, p.close, sd.currency
+        FROM asset_history h
+        JOIN assets a ON a.id = h.asset_id
+        JOIN stock_details sd ON sd.asset_id = h.asset_id
+        JOIN price_history p ON p.date = h.date
+          AND p.ticker = CASE
+              WHEN UPPER(TRIM(sd.ticker)) LIKE '%.KR'
+              THEN SUBSTR(UPPER(TRIM(sd.ticker)), 1, LENGTH(TRIM(sd.ticker)) - 3) || '.KS'
+              ELSE UPPER(TRIM(sd.ticker)) END
+        WHERE a.type = 'STOCK' AND h.price IS NOT NULL
+    """)).fetchall()
+    rows = [r for r in rows if same_number(r.price, r.close)]
+    if not rows:
+        return []
+
+    txs: dict[str, list[tuple]] = {}
+    for asset_id, date, delta in conn.execute(text(
+        "SELECT asset_id, date, qty_delta FROM transactions ORDER BY asset_id, date, id"
+    )):
+        txs.setdefault(asset_id, []).append((date[:10], delta))
+    positions = {a: _cumulative([d for d, _ in items], [q for _, q in items]) for a, items in txs.items()}
+    fx: dict[str, tuple] = {}
+    for currency in {r.currency for r in rows if r.currency and r.currency != "KRW"}:
+        found = conn.execute(text("SELECT date, close FROM price_history WHERE ticker = :t ORDER BY date"),
+                             {"t": fx_ticker(currency)}).fetchall()
+        fx[currency] = (np.array([d for d, _ in found]), np.array([c for _, c in found], dtype=float))
+
+    removed = []
+    for r in rows:
+        if r.value is not None:
+            position = positions.get(r.asset_id)
+            if position is None:
+                continue
+            qty  = float(quantity_at(position, [r.date[:10]])[0])
+            rate = 1.0
+            if r.currency and r.currency != "KRW":
+                rate = float(rate_at(fx.get(r.currency), np.array([r.date[:10]]),
+                                     FALLBACK_RATES.get(r.currency, 1.0))[0])
+            if not same_number(r.value, r.close * qty * rate):
+                continue
+        removed.append({"id": r.id, "asset_id": r.asset_id, "date": r.date,
+                        "value": r.value, "price": r.price, "quantity": r.quantity})
+    return removed
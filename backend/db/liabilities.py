@@ -0,0 +1,237 @@
+"""
+부동산 부채(대출 잔액·임대 보증금) 시계열.
+
+real_estate_details의 loan_amount/tenant_deposit은 현재 값 1개뿐이라 차트의 과거 순자산에서도
+항상 현재 부채를 뺐다. liability_history(asset_id, date, loan, deposit)에 변동 시점만 기록하고,
+차트 집계에서 일별 날짜 축에 정렬(searchsorted)한 부채 행렬을 평가액 행렬에서 한 번에 차감한다.
+- 컬럼별 forward fill: 행의 None 칸은 직전 값 유지, 첫 기록 이전은 0 (그 시점엔 부채 없음)
+- 한 번도 기록되지 않은 컬럼은 상세의 현재 값을 전 기간에 적용 (기존 동작)
+- 대출 상환 스케줄(원리금균등·원금균등·만기일시)은 대출 조건으로 월별 잔액을 한 번에 생성
+- 기록이 바뀌면 오늘 기준 값을 real_estate_details에 반영 → 요약 KPI의 현재 부채와 일치
+"""
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.models import LiabilityHistory, RealEstateDetail
+
+METHODS = ("equal_payment", "equal_principal", "bullet")
+COLUMNS = ("loan", "deposit")
+
+# 상세 컬럼 ↔ 이력 컬럼
+_DETAIL_COLUMNS = {"loan": "loan_amount", "deposit": "tenant_deposit"}
+
+# (base, dates, totals) — dates[i]부터 부채 합계 totals[i], 첫 날짜 이전은 base
+LiabilitySeries = tuple[float, np.ndarray, np.ndarray]
+
+
+def _today() -> str:
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+# ──────────────────────────────────────────────────────────────
+# 시계열 (차트 집계용, 순수 함수)
+# ──────────────────────────────────────────────────────────────
+def current_liability(detail: Optional[dict]) -> dict:
+    """자산 dict의 detail → {"loan", "deposit"} 현재 값"""
+    d = detail or {}
+    return {col: float(d.get(field) or 0) for col, field in _DETAIL_COLUMNS.items()}
+
+
+def liability_series(current: dict, rows: list[tuple]) -> LiabilitySeries:
+    """
+    current: {"loan", "deposit"} 상세의 현재 값, rows: [(date, loan, deposit)] 날짜 오름차순.
+    기록이 없는 컬럼은 current 값이 전 기간 상수로 들어간다.
+    """
+    if not rows:
+        return float(sum(current.values())), np.array([], dtype=str), np.array([])
+    dates = np.array([r[0][:10] for r in rows])
+    base  = 0.0
+    total = np.zeros(len(rows))
+    for i, col in enumerate(COLUMNS, start=1):
+        vals = np.array([np.nan if r[i] is None else r[i] for r in rows], dtype=float)
+        if np.isnan(vals).all():
+            base  += current.get(col, 0.0)
+            total += current.get(col, 0.0)
+            continue
+        idx = np.maximum.accumulate(np.where(np.isnan(vals), -1, np.arange(len(vals))))
+        total += np.where(idx >= 0, vals[np.maximum(idx, 0)], 0.0)
+    return base, dates, total
+
+
+def liability_at(series: LiabilitySeries, dates) -> np.ndarray:
+    """각 날짜('YYYY-MM-DD')의 부채 합계"""
+    base, changes, totals = series
+    if not len(changes):
+        return np.full(len(dates), base)
+    idx = np.searchsorted(changes, dates, side="right") - 1
+    return np.where(idx >= 0, totals[np.maximum(idx, 0)], base)
+
+
+def amortization_schedule(
+    principal: float,
+    annual_rate: float,
+    months: int,
+    start: str,
+    method: str = "equal_payment",
+) -> tuple[list[str], np.ndarray]:
+    """
+    대출 실행일부터 만기까지 월별 잔액 (실행일 = 원금, 만기 = 0).
+    annual_rate는 연 %, 상환일은 실행일과 같은 날(말일 초과 시 해당 월 말일).
+    - equal_payment:   원리금균등 — 잔액 P(1+r)^k − A((1+r)^k − 1)/r
+    - equal_principal: 원금균등   — 잔액 P(1 − k/n)
+    - bullet:          만기일시   — 만기 전까지 P
+    """
+    if method not in METHODS:
+        raise ValueError(f"method는 {', '.join(METHODS)} 중 하나여야 합니다.")
+    if principal <= 0 or months <= 0:
+        raise ValueError("principal과 months는 0보다 커야 합니다.")
+    if annual_rate < 0:
+        raise ValueError("annual_rate는 0 이상이어야 합니다.")
+
+    k = np.arange(months + 1, dtype=float)
+    r = annual_rate / 100 / 12
+    if method == "equal_principal" or (method == "equal_payment" and r == 0):
+        balance = principal * (1 - k / months)
+    elif method == "equal_payment":
+        growth  = (1 + r) ** k
+        payment = principal * r / (1 - (1 + r) ** -months)
+        balance = principal * growth - payment * (growth - 1) / r
+    else:
+        balance = np.where(k < months, principal, 0.0)
+    balance[-1] = 0.0
+
+    first   = np.datetime64(start[:10], "D")
+    month0  = first.astype("datetime64[M]")
+    day     = (first - month0.astype("datetime64[D]")).astype(int)
+    mstart  = month0 + np.arange(months + 1)
+    mlength = ((mstart + 1).astype("datetime64[D]") - mstart.astype("datetime64[D]")).astype(int)
+    dates   = mstart.astype("datetime64[D]") + np.minimum(day, mlength - 1)
+    return dates.astype(str).tolist(), np.maximum(balance, 0.0)
+
+
+# ──────────────────────────────────────────────────────────────
+# 조회 / 저장
+# ──────────────────────────────────────────────────────────────
+async def load_liabilities(db: AsyncSession, asset_ids: Optional[list[str]] = None) -> dict[str, list[tuple]]:
+    """자산별 부채 이력 [(date, loan, deposit)] 날짜 오름차순 (asset_ids 없으면 전체)"""
+    q = select(LiabilityHistory.asset_id, LiabilityHistory.date, LiabilityHistory.loan, LiabilityHistory.deposit)
+    if asset_ids is not None:
+        q = q.where(LiabilityHistory.asset_id.in_(asset_ids))
+    out: dict[str, list[tuple]] = {}
+    for aid, d, loan, deposit in (await db.execute(q.order_by(LiabilityHistory.asset_id, LiabilityHistory.date))).all():
+        out.setdefault(aid, []).append((d, loan, deposit))
+    return out
+
+
+async def load_current(db: AsyncSession, asset_id: str) -> Optional[dict]:
+    """real_estate_details의 현재 {"loan", "deposit"} (상세가 없으면 None)"""
+    detail = (await db.execute(
+        select(RealEstateDetail).where(RealEstateDetail.asset_id == asset_id)
+    )).scalar_one_or_none()
+    if detail is None:
+        return None
+    return {col: float(getattr(detail, field) or 0) for col, field in _DETAIL_COLUMNS.items()}
+
+
+async def get_liabilities(db: AsyncSession, asset_id: str) -> list[dict]:
+    """기록 행 + 각 날짜의 적용 부채 합계(total, forward fill 반영)"""
+    rows = (await load_liabilities(db, [asset_id])).get(asset_id, [])
+    if not rows:
+        return []
+    totals = liability_series(await load_current(db, asset_id) or {}, rows)[2]
+    return [
+        {"date": d, "loan": loan, "deposit": deposit, "total": float(t)}
+        for (d, loan, deposit), t in zip(rows, totals)
+    ]
+
+
+async def upsert_liabilities(db: AsyncSession, asset_id: str, rows: list[dict], columns: tuple = COLUMNS):
+    """rows: [{"date", "loan"?, "deposit"?}] — 같은 날짜가 있으면 columns에 해당하는 칸만 덮어씀"""
+    if not rows:
+        return
+    sets = ", ".join(f"{c} = excluded.{c}" for c in columns)
+    await db.execute(
+        text("INSERT INTO liability_history (asset_id, date, loan, deposit) VALUES (:a, :d, :loan, :deposit) "
+             f"ON CONFLICT(asset_id, date) DO UPDATE SET {sets}"),
+        [{"a": asset_id, "d": r["date"][:10], "loan": r.get("loan"), "deposit": r.get("deposit")} for r in rows],
+    )
+
+
+async def delete_liability(db: AsyncSession, asset_id: str, date: str):
+    await db.execute(delete(LiabilityHistory).where(
+        LiabilityHistory.asset_id == asset_id, LiabilityHistory.date == date[:10]
+    ))
+
+
+async def sync_current(db: AsyncSession, asset_id: str) -> Optional[dict]:
+    """기록된 컬럼의 오늘 기준 값을 real_estate_details에 반영. 반환: 반영 후 현재 값"""
+    detail = (await db.execute(
+        select(RealEstateDetail).where(RealEstateDetail.asset_id == asset_id)
+    )).scalar_one_or_none()
+    if detail is None:
+        return None
+    rows  = (await load_liabilities(db, [asset_id])).get(asset_id, [])
+    today = _today()
+    for i, col in enumerate(COLUMNS, start=1):
+        recorded = [(r[0], r[i]) for r in rows if r[i] is not None]
+        if not recorded:
+            continue
+        past = [v for d, v in recorded if d[:10] <= today]
+        setattr(detail, _DETAIL_COLUMNS[col], float(past[-1]) if past else 0.0)
+    return {col: float(getattr(detail, field) or 0) for col, field in _DETAIL_COLUMNS.items()}
+
+
+async def sync_all_current(db: AsyncSession) -> int:
+    """부채 이력이 있는 모든 부동산의 현재 값 재반영 (상환 스케줄 진행분, 예약 업데이트 때 호출)"""
+    ids = (await db.execute(select(LiabilityHistory.asset_id).distinct())).scalars().all()
+    for asset_id in ids:
+        await sync_current(db, asset_id)
+    return len(ids)
+
+
+async def record_detail_change(db: AsyncSession, asset_id: str, before: dict, after: dict, since: Optional[str]):
+    """
+    상세 폼에서 대출·보증금을 바꿨을 때 오늘 날짜 행으로 기록 (부채 이력을 쓰는 자산만).
+    그 컬럼의 첫 기록이면 이전 값을 since(취득일)에 먼저 남겨 과거 구간이 0이 되지 않게 한다.
+    """
+    rows = (await load_liabilities(db, [asset_id])).get(asset_id, [])
+    if not rows:
+        return
+    today = _today()
+    for i, col in enumerate(COLUMNS, start=1):
+        if abs(after.get(col, 0.0) - before.get(col, 0.0)) < 1e-9:
+            continue
+        if all(r[i] is None for r in rows) and before.get(col):
+            seed = (since or rows[0][0])[:10]
+            if seed < today:
+                await upsert_liabilities(db, asset_id, [{"date": seed, col: before[col]}], columns=(col,))
+        await upsert_liabilities(db, asset_id, [{"date": today, col: after.get(col, 0.0)}], columns=(col,))
+
+
+async def apply_amortization(db: AsyncSession, asset_id: str, terms: dict) -> dict:
+    """
+    대출 조건 → 월별 잔액을 loan 컬럼에 일괄 기록 (실행일 이후 기존 loan 기록은 교체, deposit 유지).
+    terms: {"principal", "annual_rate", "months", "start_date", "method"?}
+    반환: {"count": 기록 행 수, "current": 반영 후 현재 부채}
+    """
+    start = str(terms["start_date"])[:10]
+    dates, balance = amortization_schedule(
+        float(terms["principal"]), float(terms.get("annual_rate") or 0), int(terms["months"]),
+        start, terms.get("method") or "equal_payment",
+    )
+    await db.execute(
+        text("UPDATE liability_history SET loan = NULL WHERE asset_id = :a AND date >= :d"),
+        {"a": asset_id, "d": start},
+    )
+    await db.execute(
+        text("DELETE FROM liability_history WHERE asset_id = :a AND loan IS NULL AND deposit IS NULL"),
+        {"a": asset_id},
+    )
+    await upsert_liabilities(
+        db, asset_id, [{"date": d, "loan": float(b)} for d, b in zip(dates, balance)], columns=("loan",)
+    )
+    return {"count": len(dates), "current": await sync_current(db, asset_id)}
@@ -0,0 +1,427 @@
+"""
+lot 매칭 엔진: 매도·매각의 실현 손익과 보유분 미실현 손익 (선입선출 fifo / 이동평균 average).
+
+자산별 거래(원장 qty_delta, 없으면 asset_history 수량 변화)를 당일 체결가·환율로 KRW 금액화한 뒤
+한 번의 벡터 연산으로 매칭한다.
+- fifo: 누적 매수 수량 축 위에서 매수 원가를 누적한 구간 선형 함수 C(x)를 두면
+  m번째 매도의 원가 = C(누적 매도 수량_m) − C(누적 매도 수량_m−1) → np.interp 한 번
+- average: 보유 원가 H_t = a_t·H_t−1 + b_t (매도 a = 1 − 매도/보유, 매수 b = 원가)를
+  전량 매도 지점에서 끊은 구간별 누적곱·누적합으로 계산
+- 보유분 초과 매도(원장 오류)는 보유분까지만 매칭
+- 원장에 매도가 없는데 매각일이 있으면 그날 남은 수량 전부를 매각가(disposal_price, KRW)로 매도
+
+결과는 lots(남은 lot), realized_pnl(연도별 실현 손익·연말 보유 상태), lot_cursors(처리 위치)에 저장하고,
+다음 조회 때는 series_changes 로그로 바뀐 자산만 본다.
+새 거래가 마지막 처리일 이후면 저장된 lot을 시작 잔고로 두고 새 거래만 매칭(증분),
+그 이전 날짜가 바뀌었으면(과거 거래 수정·체결가 없는 날 종가 변경 등) 그 자산만 전체 재생한다.
+"""
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from backend.db.ledger import QTY_TYPES
+from backend.db.models import Asset, AssetHistory, Lot, LotCursor, RealizedPnl
+from backend.db.prices import (
+    FALLBACK_RATES, fx_ticker, load_fallback_rates, load_price_series, price_ticker, rate_at, stored_position,
+    unit_price_series,
+)
+from backend.db.series import changes_since
+from backend.db.version import get_data_version
+
+METHODS = ("fifo", "average")
+
+# 해외주식 양도소득세 추정 (연간 기본공제 후 22%, 지방소득세 포함). 국내 상장주식은 대상 아님
+OVERSEAS_DEDUCTION = 2_500_000
+OVERSEAS_TAX_RATE  = 0.22
+
+_EPS = 1e-9
+
+# (dates, qty(매수 +, 매도 −), amount(KRW — 매수는 수수료 포함 원가, 매도는 수수료 차감 금액))
+Events = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _today() -> str:
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+# ──────────────────────────────────────────────────────────────
+# 매칭 (순수 함수)
+# ──────────────────────────────────────────────────────────────
+def _segment_cumsum(x: np.ndarray, first: np.ndarray) -> np.ndarray:
+    """구간별 누적합 — first[i] = i가 속한 구간의 첫 인덱스"""
+    c = np.cumsum(x)
+    return c - (c - x)[first]
+
+
+def match_lots(dates: np.ndarray, qty: np.ndarray, amount: np.ndarray, method: str = "fifo") -> dict:
+    """
+    날짜순 거래 → 거래별 매도 수량·매도 금액·매도 원가, 거래 후 보유 수량·원가, 남은 lot.
+    반환: {"sold", "proceeds", "cost", "held_qty", "held_cost", "lots": [(open_date, qty, cost)]}
+    """
+    if method not in METHODS:
+        raise ValueError(f"method는 {', '.join(METHODS)} 중 하나여야 합니다.")
+    n      = len(qty)
+    buy    = qty > _EPS
+    bought = np.cumsum(np.where(buy, qty, 0.0))
+    wanted = np.where(buy, 0.0, -qty)
+    # 보유분 초과 매도는 무시: S_t = min(S_t−1 + 매도_t, 누적 매수_t) = W_t + min(0, min_j≤t(B_j − W_j))
+    asked     = np.cumsum(wanted)
+    sold_cum  = asked + np.minimum(0.0, np.minimum.accumulate(bought - asked)) if n else np.zeros(0)
+    sold_prev = np.concatenate([[0.0], sold_cum[:-1]])
+    sold      = sold_cum - sold_prev
+    proceeds  = amount * np.divide(sold, wanted, out=np.zeros(n), where=wanted > _EPS)
+    held_qty  = bought - sold_cum
+
+    if method == "fifo":
+        bi    = np.nonzero(buy)[0]
+        knots = np.concatenate([[0.0], bought[bi]])
+        costs = np.concatenate([[0.0], np.cumsum(amount[bi])])
+        cost_at   = lambda x: np.interp(x, knots, costs)
+        cost      = cost_at(sold_cum) - cost_at(sold_prev)
+        held_cost = cost_at(bought) - cost_at(sold_cum)
+        # 남은 lot: 매수 구간 [knots[k], knots[k+1]) 중 마지막 누적 매도 이후 부분
+        end  = sold_cum[-1] if n else 0.0
+        left = knots[1:] - np.maximum(knots[:-1], end)
+        unit = amount[bi] / qty[bi]
+        lots = [(str(dates[i]), float(q), float(q * u)) for i, q, u in zip(bi, left, unit) if q > _EPS]
+    else:
+        before = held_qty + sold                                   # 거래 직전 보유
+        factor = np.where(sold > _EPS, 1 - np.divide(sold, before, out=np.ones(n), where=before > _EPS), 1.0)
+        factor = np.where(factor < _EPS, 0.0, factor)
+        reset  = factor == 0.0                                     # 전량 매도 → 새 구간
+        first  = np.searchsorted(np.cumsum(reset), np.cumsum(reset))
+        growth = np.exp(_segment_cumsum(np.log(np.where(reset, 1.0, factor)), first))
+        held_cost = growth * _segment_cumsum(np.where(buy, amount, 0.0) / growth, first)
+        prev_cost = np.concatenate([[0.0], held_cost[:-1]])
+        cost = prev_cost * (1 - factor)
+        lots = []
+        if n and held_qty[-1] > _EPS:
+            start = np.nonzero(buy & (np.arange(n) >= first[-1]))[0]
+            lots = [(str(dates[start[0]] if len(start) else dates[-1]), float(held_qty[-1]), float(held_cost[-1]))]
+
+    held_cost = np.where(held_qty > _EPS, held_cost, 0.0)
+    return {"sold": sold, "proceeds": proceeds, "cost": cost, "held_qty": held_qty, "held_cost": held_cost, "lots": lots}
+
+
+def yearly(dates: np.ndarray, result: dict, skip: int = 0) -> dict[int, dict]:
+    """거래별 결과 → 연도별 {sold_qty, proceeds, cost, end_qty, end_cost} (앞 skip행 = 시작 잔고 제외)"""
+    if len(dates) <= skip:
+        return {}
+    years = np.array([d[:4] for d in dates[skip:]]).astype(int)
+    uniq, inv = np.unique(years, return_inverse=True)
+    last = np.searchsorted(years, uniq, side="right") - 1 + skip
+    sums = {k: np.bincount(inv, weights=result[k][skip:], minlength=len(uniq)) for k in ("sold", "proceeds", "cost")}
+    return {
+        int(y): {
+            "sold_qty": float(sums["sold"][i]),
+            "proceeds": float(sums["proceeds"][i]),
+            "cost":     float(sums["cost"][i]),
+            "end_qty":  float(result["held_qty"][last[i]]),
+            "end_cost": float(result["held_cost"][last[i]]),
+        }
+        for i, y in enumerate(uniq)
+    }
+
+
+def trade_events(asset: Asset, stored: list[dict], unit, fx, fallback: float) -> Events:
+    """자산 거래 → 날짜순 KRW 이벤트. 체결가가 없으면 당일(직전) 단가"""
+    if asset.transactions:
+        txs   = sorted(asset.transactions, key=lambda t: (t.date, t.id or 0))
+        dates = np.array([t.date[:10] for t in txs])
+        qty   = np.array([t.qty_delta for t in txs], dtype=float)
+        price = np.array([np.nan if t.price is None else t.price for t in txs], dtype=float)
+        fees  = np.array([t.fees or 0 for t in txs], dtype=float)
+    else:
+        position = stored_position(asset, stored)
+        if position is None:
+            return np.array([], dtype=str), np.zeros(0), np.zeros(0)
+        dq    = np.diff(position[1], prepend=0.0)
+        keep  = np.abs(dq) > _EPS
+        dates = np.array([d[:10] for d in position[0][keep]])
+        qty   = dq[keep]
+        price = np.full(len(qty), np.nan)
+        fees  = np.zeros(len(qty))
+        if len(qty) and qty[0] > 0 and asset.acquisition_price:
+            price[0] = asset.acquisition_price                     # 최초 보유분은 취득 단가
+
+    def unit_at(d):
+        idx = np.searchsorted(unit[0], d, side="right") - 1
+        return np.where(idx >= 0, unit[1][np.maximum(idx, 0)], np.nan) if len(unit[0]) else np.full(len(d), np.nan)
+
+    rate   = rate_at(fx, dates, fallback)                         # KRW 자산은 fx None, fallback 1
+    price  = np.nan_to_num(np.where(np.isnan(price), unit_at(dates), price))
+    gross  = np.abs(qty) * price * rate
+    amount = np.where(qty > 0, gross + fees * rate, gross - fees * rate)
+
+    # 매각일에 남은 수량은 매각가로 전량 매도
+    if asset.disposal_date:
+        d    = asset.disposal_date[:10]
+        held = float(qty[dates <= d].sum())
+        if held > _EPS:
+            proceeds = float(asset.disposal_price or 0)
+            if not proceeds:
+                r = float(rate_at(fx, [d], fallback)[0])
+                proceeds = held * float(np.nan_to_num(unit_at(np.array([d]))[0])) * r
+            at     = int(np.searchsorted(dates, d, side="right"))
+            dates  = np.insert(dates, at, d)
+            qty    = np.insert(qty, at, -held)
+            amount = np.insert(amount, at, proceeds)
+    return dates, qty, amount
+
+
+# ──────────────────────────────────────────────────────────────
+# 동기화 (변경된 자산만 재생/증분)
+# ──────────────────────────────────────────────────────────────
+def _relevant_keys(asset: Asset) -> list[str]:
+    keys   = [f"a:{asset.id}"]
+    ticker = price_ticker(asset)
+    if ticker:
+        keys.append(f"t:{ticker}")
+    currency = (asset.stock.currency if asset.stock else None) or "KRW"
+    if currency != "KRW":
+        keys.append(f"t:{fx_ticker(currency)}")
+    return keys
+
+
+async def _plan(db: AsyncSession, method: str, asset_ids: Optional[list[str]]) -> tuple[int, list[Asset], dict]:
+    """다시 매칭할 자산 → {asset_id: None(전체 재생) | 마지막 처리일(그 이후 거래만 증분)}"""
+    version = await get_data_version(db)
+    q = select(Asset).options(selectinload(Asset.stock)).where(Asset.type.in_(QTY_TYPES))
+    if asset_ids is not None:
+        q = q.where(Asset.id.in_(asset_ids))
+    assets  = (await db.execute(q)).scalars().all()
+    cursors = {
+        c.asset_id: c for c in (await db.execute(select(LotCursor).where(LotCursor.method == method))).scalars()
+    }
+    logs: dict[int, Optional[dict]] = {}
+    for c in cursors.values():
+        if c.version != version and c.version not in logs:
+            logs[c.version] = await changes_since(db, c.version)
+
+    plans: dict[str, object] = {}
+    for a in assets:
+        cursor = cursors.get(a.id)
+        if cursor is None:
+            plans[a.id] = None
+            continue
+        if cursor.version == version:
+            continue
+        log = logs[cursor.version]
+        if log is None:
+            plans[a.id] = None
+            continue
+        hits = [log[k] for k in _relevant_keys(a) if k in log]
+        if not hits:
+            continue
+        since = min(hits)
+        plans[a.id] = None if since == "" or since <= cursor.last_date else cursor.last_date
+    return version, assets, plans
+
+
+async def sync_lots(db: AsyncSession, method: str = "fifo", asset_ids: Optional[list[str]] = None) -> int:
+    """변경된 자산의 lot·실현 손익 갱신 (호출 측에서 커밋). 반환: 다시 매칭한 자산 수"""
+    if method not in METHODS:
+        raise ValueError(f"method는 {', '.join(METHODS)} 중 하나여야 합니다.")
+    version, _, plans = await _plan(db, method, asset_ids)
+    if not plans:
+        return 0
+
+    ids = list(plans)
+    q = (
+        select(Asset)
+        .options(selectinload(Asset.transactions), selectinload(Asset.stock))
+        .where(Asset.id.in_(ids))
+    )
+    assets = (await db.execute(q)).scalars().all()
+    stored: dict[str, list[dict]] = {}
+    for h in (await db.execute(
+        select(AssetHistory).where(AssetHistory.asset_id.in_(ids)).order_by(AssetHistory.date)
+    )).scalars():
+        stored.setdefault(h.asset_id, []).append(
+            {"date": h.date, "value": h.value, "price": h.price, "quantity": h.quantity}
+        )
+    currencies = {a.id: (a.stock.currency if a.stock else None) or "KRW" for a in assets}
+    tickers    = {price_ticker(a) for a in assets} - {None}
+    series     = await load_price_series(db, tickers | {fx_ticker(c) for c in currencies.values() if c != "KRW"})
+    rates      = await load_fallback_rates(db)
+
+    opening: dict[str, list[tuple]] = {}
+    incremental = [aid for aid, p in plans.items() if p]
+    if incremental:
+        q = select(Lot).where(Lot.method == method, Lot.asset_id.in_(incremental)).order_by(Lot.asset_id, Lot.seq)
+        for lot in (await db.execute(q)).scalars():
+            opening.setdefault(lot.asset_id, []).append((lot.open_date, lot.quantity, lot.cost))
+
+    for a in assets:
+        since    = plans[a.id]
+        ticker   = price_ticker(a)
+        currency = currencies[a.id]
+        unit = unit_price_series(a, stored.get(a.id, []), series.get(ticker) if ticker else None)
+        fx   = None if currency == "KRW" else series.get(fx_ticker(currency))
+        fallback = 1.0 if currency == "KRW" else rates.get(currency, FALLBACK_RATES.get(currency, 1.0))
+        dates, qty, amount = trade_events(a, stored.get(a.id, []), unit, fx, fallback)
+        if since:
+            new = dates > since
+            dates, qty, amount = dates[new], qty[new], amount[new]
+        start = opening.get(a.id, []) if since else []
+        if start:
+            dates  = np.concatenate([np.array([l[0] for l in start]), dates])
+            qty    = np.concatenate([[l[1] for l in start], qty])
+            amount = np.concatenate([[l[2] for l in start], amount])
+        result = match_lots(dates, qty, amount, method)
+        years  = yearly(dates, result, skip=len(start))
+        last   = max(str(dates[-1]) if len(dates) > len(start) else "", since or "")
+        await _save(db, a.id, method, result["lots"], years, version, last, full=not since)
+    return len(assets)
+
+
+async def _save(db: AsyncSession, asset_id: str, method: str, lots: list[tuple], years: dict[int, dict],
+                version: int, last_date: str, full: bool):
+    key = {"a": asset_id, "m": method}
+    await db.execute(delete(Lot).where(Lot.asset_id == asset_id, Lot.method == method))
+    if lots:
+        await db.execute(
+            text("INSERT INTO lots (asset_id, method, seq, open_date, quantity, cost) VALUES (:a, :m, :s, :d, :q, :c)"),
+            [{**key, "s": i, "d": d, "q": q, "c": c} for i, (d, q, c) in enumerate(lots)],
+        )
+    if full:
+        await db.execute(delete(RealizedPnl).where(RealizedPnl.asset_id == asset_id, RealizedPnl.method == method))
+    if years:
+        # 증분이면 같은 연도의 실현분은 더하고 연말 상태는 덮어씀
+        await db.execute(
+            text(
+                "INSERT INTO realized_pnl (asset_id, method, year, sold_qty, proceeds, cost, end_qty, end_cost) "
+                "VALUES (:a, :m, :y, :sold_qty, :proceeds, :cost, :end_qty, :end_cost) "
+                "ON CONFLICT(asset_id, method, year) DO UPDATE SET "
+                "sold_qty = sold_qty + excluded.sold_qty, proceeds = proceeds + excluded.proceeds, "
+                "cost = cost + excluded.cost, end_qty = excluded.end_qty, end_cost = excluded.end_cost"
+            ),
+            [{**key, "y": y, **row} for y, row in years.items()],
+        )
+    await db.execute(
+        text("INSERT INTO lot_cursors (asset_id, method, version, last_date) VALUES (:a, :m, :v, :d) "
+             "ON CONFLICT(asset_id, method) DO UPDATE SET version = excluded.version, last_date = excluded.last_date"),
+        {**key, "v": version, "d": last_date},
+    )
+
+
+# ──────────────────────────────────────────────────────────────
+# 조회 (읽기 전용 — sync_lots 이후 호출)
+# ──────────────────────────────────────────────────────────────
+async def get_lots(db: AsyncSession, asset_id: str, method: str = "fifo") -> dict:
+    """자산 하나의 남은 lot + 연도별 실현 손익"""
+    lots = (await db.execute(
+        select(Lot).where(Lot.asset_id == asset_id, Lot.method == method).order_by(Lot.seq)
+    )).scalars().all()
+    years = (await db.execute(
+        select(RealizedPnl).where(RealizedPnl.asset_id == asset_id, RealizedPnl.method == method)
+        .order_by(RealizedPnl.year)
+    )).scalars().all()
+    return {
+        "method": method,
+        "lots": [
+            {"open_date": l.open_date, "quantity": l.quantity, "cost": l.cost,
+             "unit_cost": l.cost / l.quantity if l.quantity else None}
+            for l in lots
+        ],
+        "realized": [
+            {"year": r.year, "sold_qty": r.sold_qty, "proceeds": r.proceeds, "cost": r.cost,
+             "gain": r.proceeds - r.cost, "end_qty": r.end_qty, "end_cost": r.end_cost}
+            for r in years if r.sold_qty > _EPS
+        ],
+    }
+
+
+async def pnl_report(db: AsyncSession, method: str = "fifo") -> dict:
+    """
+    연도별 실현·미실현 손익 + 해외주식 양도세 추정, 보유 자산별 현재 원가·평가액.
+    미실현은 연말(올해는 오늘) 보유 수량 × 그날 단가 × 환율 − 보유 원가.
+    """
+    today = _today()
+    q = (
+        select(Asset)
+        .options(selectinload(Asset.transactions), selectinload(Asset.stock))
+        .where(Asset.type.in_(QTY_TYPES))
+        .order_by(Asset.name, Asset.id)
+    )
+    assets = {a.id: a for a in (await db.execute(q)).scalars().all()}
+    rows: dict[str, dict[int, RealizedPnl]] = {}
+    for r in (await db.execute(select(RealizedPnl).where(RealizedPnl.method == method))).scalars():
+        if r.asset_id in assets:
+            rows.setdefault(r.asset_id, {})[r.year] = r
+    if not rows:
+        return {"method": method, "years": [], "holdings": []}
+
+    stored: dict[str, list[dict]] = {}
+    for h in (await db.execute(
+        select(AssetHistory).where(AssetHistory.asset_id.in_(list(rows))).order_by(AssetHistory.date)
+    )).scalars():
+        stored.setdefault(h.asset_id, []).append(
+            {"date": h.date, "value": h.value, "price": h.price, "quantity": h.quantity}
+        )
+    currencies = {aid: (assets[aid].stock.currency if assets[aid].stock else None) or "KRW" for aid in rows}
+    tickers    = {price_ticker(assets[aid]) for aid in rows} - {None}
+    series     = await load_price_series(db, tickers | {fx_ticker(c) for c in currencies.values() if c != "KRW"})
+    rates      = await load_fallback_rates(db)
+
+    this_year = int(today[:4])
+    years     = list(range(min(min(r) for r in rows.values()), this_year + 1))
+    marks     = np.array([f"{y}-12-31" if y < this_year else today for y in years])
+    totals    = {y: dict.fromkeys(("realized", "proceeds", "cost", "unrealized", "end_value", "end_cost",
+                                   "overseas_realized"), 0.0) for y in years}
+    holdings  = []
+    for aid in [aid for aid in assets if aid in rows]:           # 이름순
+        a        = assets[aid]
+        by_year  = rows[aid]
+        ticker   = price_ticker(a)
+        currency = currencies[aid]
+        unit     = unit_price_series(a, stored.get(aid, []), series.get(ticker) if ticker else None)
+        idx      = np.searchsorted(unit[0], marks, side="right") - 1
+        price    = np.where(idx >= 0, unit[1][np.maximum(idx, 0)], 0.0) if len(unit[0]) else np.zeros(len(marks))
+        fallback = rates.get(currency, FALLBACK_RATES.get(currency, 1.0))
+        rate     = np.ones(len(marks)) if currency == "KRW" else rate_at(series.get(fx_ticker(currency)), marks, fallback)
+
+        end_qty = end_cost = 0.0
+        realized_by_year: dict[int, float] = {}
+        for i, y in enumerate(years):
+            r = by_year.get(y)
+            if r is not None:
+                end_qty, end_cost = r.end_qty, r.end_cost
+                if r.sold_qty > _EPS:
+                    gain = r.proceeds - r.cost
+                    realized_by_year[y] = gain
+                    totals[y]["realized"] += gain
+                    totals[y]["proceeds"] += r.proceeds
+                    totals[y]["cost"]     += r.cost
+                    if currency != "KRW":
+                        totals[y]["overseas_realized"] += gain
+            if end_qty > _EPS:
+                value = end_qty * price[i] * rate[i]
+                totals[y]["end_value"]  += value
+                totals[y]["end_cost"]   += end_cost
+                totals[y]["unrealized"] += value - end_cost
+
+        value = end_qty * price[-1] * rate[-1] if end_qty > _EPS else 0.0
+        holdings.append({
+            "asset_id":         aid,
+            "name":             a.name,
+            "ticker":           ticker,
+            "currency":         currency,
+            "quantity":         end_qty,
+            "cost":             end_cost if end_qty > _EPS else 0.0,
+            "value":            float(value),
+            "unrealized":       float(value - end_cost) if end_qty > _EPS else 0.0,
+            "realized":         float(sum(realized_by_year.values())),
+            "realized_by_year": {str(y): g for y, g in realized_by_year.items()},
+        })
+
+    out_years = []
+    for y in years:
+        t = totals[y]
+        taxable = max(0.0, t["overseas_realized"] - OVERSEAS_DEDUCTION)
+        out_years.append({"year": y, **t, "taxable_overseas": taxable, "estimated_tax": taxable * OVERSEAS_TAX_RATE})
+    return {"method": method, "years": out_years, "holdings": holdings}
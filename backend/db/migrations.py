@@ -0,0 +1,187 @@
+"""
+PRAGMA user_version 기반 스키마/데이터 migration.
+
+DB 파일 헤더의 user_version에 마지막으로 적용한 버전을 기록하고,
+기동 시에는 그보다 큰 버전만 순서대로 실행한다 (최신 DB면 PRAGMA 1회로 끝).
+각 migration은 sync Connection을 받는 함수이며, 같은 트랜잭션에서 user_version도 갱신한다.
+
+- 새 테이블: 모델 추가 후 `Model.__table__.create(conn, checkfirst=True)` migration 추가
+- 새 컬럼:   `_add_column(conn, table, column, ddl)` (이미 있으면 건너뜀 → 신규 DB의 create_all과 공존)
+- 이미 배포된 migration은 수정하지 말고 새 버전을 뒤에 추가한다.
+- 기동 시 자동 실행되므로 행을 지우는 migration은 지운 행을 ARCHIVE_DIR에 남긴다
+  (compaction과 같은 jsonl.gz 형식 → `python -m backend.services.compaction restore`로 복원)
+"""
+import gzip
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import text
+
+from backend.core.config import ARCHIVE_DIR
+
+
+def _columns(conn, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+
+def _add_column(conn, table: str, column: str, ddl: str):
+    if column not in _columns(conn, table):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def _legacy_done(conn, key: str) -> bool:
+    """user_version 도입 전 settings 키로 기록된 1회성 migration 여부"""
+    return conn.execute(text("SELECT 1 FROM settings WHERE key = :k"), {"k": key}).fetchone() is not None
+
+
+def _archive_removed(conn, target: int, rows: list[dict]) -> str | None:
+    """
+    migration이 삭제한 asset_history 행을 ARCHIVE_DIR/{DB 이름}-migration-v{N}-*.jsonl.gz에 기록.
+    같은 트랜잭션 안에서 호출 → 기록에 실패하면 예외로 migration 전체가 롤백된다.
+    """
+    if not rows:
+        return None
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    stem = Path(conn.engine.url.database).stem
+    path = os.path.join(ARCHIVE_DIR, f"{stem}-migration-v{target}-{datetime.now():%Y%m%d%H%M%S}.jsonl.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"migration": target, "from": None, "to": None,
+                            "created_at": datetime.now().isoformat()}) + "\n")
+        for r in rows:
+            f.write(json.dumps({"table": "asset_history", "asset_id": r["asset_id"], "date": r["date"],
+                                "value": r["value"], "price": r["price"], "quantity": r["quantity"]}) + "\n")
+    return path
+
+
+# ──────────────────────────────────────────────────────────────
+# migrations
+# ──────────────────────────────────────────────────────────────
+def _m001_base_schema(conn):
+    """ORM 테이블 생성(없는 것만) + settings(key-value, ORM 모델 없음)"""
+    from backend.db.database import Base
+    from backend.db import models  # noqa: F401
+    Base.metadata.create_all(conn)
+    conn.execute(text("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)"))
+
+
+def _m002_added_columns(conn):
+    """초기 스키마 이후 추가된 컬럼 (배당 정보, 연금 차트 제외, 자동 배당 수량)"""
+    _add_column(conn, "stock_details",    "dividend_yield", "REAL DEFAULT 0")
+    _add_column(conn, "stock_details",    "dividend_dps",   "REAL DEFAULT 0")
+    _add_column(conn, "stock_details",    "dividend_cycle", "TEXT DEFAULT '연간'")
+    _add_column(conn, "pension_details",  "hide_in_chart",  "INTEGER DEFAULT 0")
+    _add_column(conn, "dividend_history", "quantity",       "REAL")
+
+
+def _m003_history_indexes(conn):
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_dividend_history_asset_date ON dividend_history (asset_id, date)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_asset_history_asset_date ON asset_history (asset_id, date)"
+    ))
+
+
+def _m004_price_history(conn):
+    """자산별 일별 시세 → price_history 공용 테이블"""
+    if _legacy_done(conn, "migration_price_history"):
+        return
+    from backend.db.prices import migrate_asset_history
+    moved, removed = migrate_asset_history(conn)
+    path = _archive_removed(conn, 4, removed)
+    print(f"🔄 price_history migration: 시세 {moved}행 이관, 중복 이력 {len(removed)}행 정리"
+          + (f" (보관: {path})" if path else ""))
+
+
+def _m005_transactions(conn):
+    """asset_history 수량 변화 → transactions 원장"""
+    if _legacy_done(conn, "migration_transactions"):
+        return
+    from backend.db.ledger import migrate_quantity_history
+    added, removed = migrate_quantity_history(conn)
+    path = _archive_removed(conn, 5, removed)
+    print(f"🔄 transactions migration: 거래 {added}건 기록, 단가 이력 {len(removed)}행 정리"
+          + (f" (보관: {path})" if path else ""))
+
+
+def _m006_data_version(conn):
+    """다중 worker 캐시 무효화용 데이터 버전 (version.py)"""
+    conn.execute(text("INSERT OR IGNORE INTO settings (key, value) VALUES ('data_version', '0')"))
+
+
+def _m007_asset_search(conn):
+    """자산 목록 서버 필터·정렬용 인덱스 + 이름·주소·메모 FTS5 검색 (search.py)"""
+    _add_column(conn, "assets", "memo", "TEXT")
+    for ddl in (
+        "CREATE INDEX IF NOT EXISTS ix_assets_type_disposal ON assets (type, disposal_date)",
+        "CREATE INDEX IF NOT EXISTS ix_assets_value ON assets (current_value, id)",
+        "CREATE INDEX IF NOT EXISTS ix_assets_name ON assets (name, id)",
+        "CREATE INDEX IF NOT EXISTS ix_stock_details_account ON stock_details (account_name)",
+        "CREATE INDEX IF NOT EXISTS ix_stock_details_ticker ON stock_details (ticker)",
+        "CREATE INDEX IF NOT EXISTS ix_stock_details_currency ON stock_details (currency)",
+    ):
+        conn.execute(text(ddl))
+    from backend.db.search import create_search_index
+    create_search_index(conn)
+
+
+def _m008_series_changes(conn):
+    """자산 시계열 증분 조회용 변경 로그 + 트리거 (series.py)"""
+    from backend.db.series import create_change_log
+    create_change_log(conn)
+
+
+def _m009_liability_history(conn):
+    """부동산 부채 변동 이력 (liabilities.py)"""
+    from backend.db.models import LiabilityHistory
+    LiabilityHistory.__table__.create(conn, checkfirst=True)
+
+
+def _m010_dividend_changes(conn):
+    """시계열 변경 로그에 배당 이력 트리거 추가 (성과 분석 증분 캐시용)"""
+    from backend.db.series import create_change_log
+    create_change_log(conn)
+
+
+def _m011_lots(conn):
+    """lot 잔량·처리 위치·연도별 실현 손익 (lots.py). 비어 있으면 첫 조회 때 전체 재생"""
+    from backend.db.models import Lot, LotCursor, RealizedPnl
+    for model in (Lot, LotCursor, RealizedPnl):
+        model.__table__.create(conn, checkfirst=True)
+
+
+# (버전, 설명, 함수) — 버전은 1부터 연속 증가
+MIGRATIONS = [
+    (1, "기본 스키마",                  _m001_base_schema),
+    (2, "추가 컬럼",                    _m002_added_columns),
+    (3, "이력 인덱스",                  _m003_history_indexes),
+    (4, "price_history 이관",          _m004_price_history),
+    (5, "transactions 원장 이관",       _m005_transactions),
+    (6, "data_version",                _m006_data_version),
+    (7, "자산 검색 인덱스 (FTS5)",       _m007_asset_search),
+    (8, "시계열 변경 로그",              _m008_series_changes),
+    (9, "부동산 부채 이력",              _m009_liability_history),
+    (10, "배당 변경 로그",               _m010_dividend_changes),
+    (11, "lot·실현 손익",                _m011_lots),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn) -> int:
+    return conn.execute(text("PRAGMA user_version")).scalar() or 0
+
+
+def run_migrations(conn) -> list[int]:
+    """(sync Connection) 미적용 migration 실행. 반환: 적용한 버전 목록"""
+    version = current_version(conn)
+    applied = []
+    for target, description, fn in MIGRATIONS:
+        if target <= version:
+            continue
+        fn(conn)
+        conn.execute(text(f"PRAGMA user_version = {target}"))
+        print(f"🔄 migration v{target}: {description}")
+        applied.append(target)
+    return applied
@@ -16,11 +16,13 @@ class Asset(Base):
     disposal_date     = Column(String)
     disposal_price    = Column(Float,   default=0)
     quantity          = Column(Float,   default=0)
+    memo              = Column(String)                 # 자유 메모 (검색 대상)
     created_at        = Column(String)
     updated_at        = Column(String)
 
     # 관계
     history      = relationship("AssetHistory",      back_populates="asset", cascade="all, delete-orphan")
+    transactions = relationship("Transaction",       back_populates="asset", cascade="all, delete-orphan")
     real_estate  = relationship("RealEstateDetail",  back_populates="asset", uselist=False, cascade="all, delete-orphan")
     stock        = relationship("StockDetail",        back_populates="asset", uselist=False, cascade="all, delete-orphan")
     pension      = relationship("PensionDetail",      back_populates="asset", uselist=False, cascade="all, delete-orphan")
@@ -35,11 +37,35 @@ class AssetHistory(Base):
     date     = Column(String,  nullable=False)   # YYYY-MM-DD
     value    = Column(Float)                     # 평가액 (KRW, 환율 적용 후)
     price    = Column(Float)                     # 단가 (주식/실물자산용)
-    quantity = Column(Float)                     # 수량 (주식/실물자산용)
+    quantity = Column(Float)                     # 수량 (원장 없는 자산만. 원장 자산은 transactions가 원천)
 
     asset = relationship("Asset", back_populates="history")
 
 
+class Transaction(Base):
+    """거래 원장. 보유 수량 = qty_delta 누적합"""
+    __tablename__ = "transactions"
+
+    id        = Column(Integer, primary_key=True, autoincrement=True)
+    asset_id  = Column(String,  ForeignKey("assets.id", ondelete="CASCADE"), nullable=False, index=True)
+    date      = Column(String,  nullable=False)   # YYYY-MM-DD
+    qty_delta = Column(Float,   nullable=False)   # 매수 +, 매도 -
+    price     = Column(Float)                     # 체결 단가 (네이티브 통화)
+    fees      = Column(Float,   default=0)        # 수수료·세금 (네이티브 통화)
+
+    asset = relationship("Asset", back_populates="transactions")
+
+
+class PriceHistory(Base):
+    """Ticker별 일별 종가 (여러 계좌가 공유). 환율은 'USDKRW=X' 형식 Ticker로 저장."""
+    __tablename__ = "price_history"
+
+    ticker   = Column(String, primary_key=True)   # 정규화된 Ticker
+    date     = Column(String, primary_key=True)   # YYYY-MM-DD
+    close    = Column(Float,  nullable=False)     # 종가 (네이티브 통화)
+    dividend = Column(Float,  default=0)          # 배당락일 주당 배당금 (네이티브 통화)
+
+
 class RealEstateDetail(Base):
     __tablename__ = "real_estate_details"
 
@@ -53,6 +79,52 @@ class RealEstateDetail(Base):
     asset = relationship("Asset", back_populates="real_estate")
 
 
+class LiabilityHistory(Base):
+    """부동산 부채 변동 이력. 값이 None인 칸은 직전 값 유지 (컬럼별 forward fill)"""
+    __tablename__ = "liability_history"
+
+    asset_id = Column(String, ForeignKey("assets.id", ondelete="CASCADE"), primary_key=True)
+    date     = Column(String, primary_key=True)   # YYYY-MM-DD
+    loan     = Column(Float)                      # 대출 잔액
+    deposit  = Column(Float)                      # 임대 보증금
+
+
+class Lot(Base):
+    """매수 lot 잔량 (lots.py). 평균단가법은 자산당 1행"""
+    __tablename__ = "lots"
+
+    asset_id  = Column(String,  ForeignKey("assets.id", ondelete="CASCADE"), primary_key=True)
+    method    = Column(String,  primary_key=True)   # fifo | average
+    seq       = Column(Integer, primary_key=True)   # 매칭 순서 (0부터)
+    open_date = Column(String,  nullable=False)     # 매수일 (평균단가법은 보유 시작일)
+    quantity  = Column(Float,   nullable=False)     # 남은 수량
+    cost      = Column(Float,   nullable=False)     # 남은 수량의 취득원가 합계 (KRW, 매수 수수료 포함)
+
+
+class LotCursor(Base):
+    """자산·방식별 lot 처리 위치: 마지막으로 반영한 거래일과 그때의 data_version"""
+    __tablename__ = "lot_cursors"
+
+    asset_id  = Column(String,  ForeignKey("assets.id", ondelete="CASCADE"), primary_key=True)
+    method    = Column(String,  primary_key=True)
+    version   = Column(Integer, nullable=False)
+    last_date = Column(String,  nullable=False)
+
+
+class RealizedPnl(Base):
+    """연도별 실현 손익 + 연말 보유 상태 (KRW)"""
+    __tablename__ = "realized_pnl"
+
+    asset_id = Column(String,  ForeignKey("assets.id", ondelete="CASCADE"), primary_key=True)
+    method   = Column(String,  primary_key=True)
+    year     = Column(Integer, primary_key=True)
+    sold_qty = Column(Float,   default=0)          # 매도 수량
+    proceeds = Column(Float,   default=0)          # 매도 금액 (매도 수수료·세금 차감)
+    cost     = Column(Float,   default=0)          # 매도분 취득원가
+    end_qty  = Column(Float,   default=0)          # 연말(마지막 거래 후) 보유 수량
+    end_cost = Column(Float,   default=0)          # 연말 보유분 취득원가
+
+
 class StockDetail(Base):
     __tablename__ = "stock_details"
 
@@ -95,6 +167,7 @@ class DividendHistory(Base):
     currency        = Column(String,  default="KRW")
     exchange_rate   = Column(Float,   default=1.0)
     memo            = Column(String,  default="")
+    quantity        = Column(Float)                     # 배당락 기준 보유 수량 (자동 수집분만 기록)
 
 
 class SavingsDetail(Base):
@@ -0,0 +1,60 @@
+"""
+포트폴리오 식별 + 현재 포트폴리오 컨텍스트.
+
+포트폴리오(가족 구성원 등)마다 SQLite 파일이 따로 있다:
+기본(default)은 DB_PATH, 나머지는 PORTFOLIO_DIR/{이름}.db.
+현재 포트폴리오는 ContextVar로 전달되므로 async_session()·get_db·run_offloop·버전 캐시가 모두 따라간다.
+  - HTTP 요청: PortfolioMiddleware가 X-Portfolio 헤더(SSE 등은 ?portfolio=)로 설정
+  - 백그라운드 작업: database.portfolio_scope(이름)
+"""
+import os
+import re
+from contextvars import ContextVar, Token
+
+from backend.core.config import DB_PATH, PORTFOLIO_DIR
+
+DEFAULT = "default"
+HEADER  = "x-portfolio"
+
+_NAME_RE = re.compile(r"^[a-z0-9][a-z0-9_-]{0,31}$")
+_current: ContextVar[str] = ContextVar("portfolio", default=DEFAULT)
+
+
+def current_portfolio() -> str:
+    return _current.get()
+
+
+def set_portfolio(name: str) -> Token:
+    return _current.set(name)
+
+
+def reset_portfolio(token: Token):
+    _current.reset(token)
+
+
+def valid_name(name: str) -> bool:
+    """소문자·숫자·-·_ 32자 이내 (파일 이름으로 그대로 사용)"""
+    return bool(_NAME_RE.match(name or ""))
+
+
+def portfolio_path(name: str) -> str:
+    if name == DEFAULT:
+        return DB_PATH
+    if not valid_name(name):
+        raise ValueError(f"잘못된 포트폴리오 이름: {name}")
+    return os.path.join(PORTFOLIO_DIR, f"{name}.db")
+
+
+def list_portfolios() -> list[str]:
+    """default + PORTFOLIO_DIR의 *.db (이름순)"""
+    names = []
+    if os.path.isdir(PORTFOLIO_DIR):
+        names = sorted(
+            f[:-3] for f in os.listdir(PORTFOLIO_DIR)
+            if f.endswith(".db") and valid_name(f[:-3]) and f[:-3] != DEFAULT
+        )
+    return [DEFAULT, *names]
+
+
+def portfolio_exists(name: str) -> bool:
+    return name == DEFAULT or (valid_name(name) and os.path.exists(portfolio_path(name)))
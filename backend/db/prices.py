@@ -0,0 +1,426 @@
+"""
+종목별 공용 시세 테이블(price_history) 접근 + 보유 이력 파생.
+
+같은 Ticker를 여러 계좌에서 보유해도 일별 종가는 Ticker당 1행만 저장하고,
+Ticker 연동 주식의 asset_history에는 수동 입력 행만 남고, 보유 수량은 거래 원장(ledger.py)이 원천이다.
+일별 평가액은 조회 시 종가 × 보유 수량 × 환율로 파생한다.
+여러 Ticker 일괄 조회는 지난 달까지의 종가를 Parquet 아카이브(archive.py)가 있으면 그쪽에서, 최근 구간만 SQLite에서 읽는다.
+환율 시계열도 '{통화}KRW=X' Ticker로 같은 테이블에 저장한다.
+price_history는 영속 조회 캐시 역할도 하므로, 이미 저장된 구간은 다시 받지 않는다.
+"""
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select, func, text, case
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.metrics import PRICE_ROWS
+from backend.db import archive
+from backend.db.ledger import Position, position_series, quantity_at
+from backend.db.models import Asset, PriceHistory
+
+# 환율 조회 실패 시 기본값
+FALLBACK_RATES = {"USD": 1450.0, "JPY": 9.5}
+
+# (dates, closes) — dates는 'YYYY-MM-DD' 문자열 배열(오름차순)
+Series = tuple[np.ndarray, np.ndarray]
+
+
+def normalize_ticker(ticker: str) -> str:
+    """
+    yfinance용 ticker 정규화.
+    - 앞뒤 공백 제거, 대문자 변환
+    - 한국 거래소 suffix: .KR / .kr / .ks → .KS
+    """
+    t = ticker.strip().upper()
+    # .KR 은 yfinance에서 인식 안 됨 → .KS 로 교정
+    if t.endswith(".KR"):
+        t = t[:-3] + ".KS"
+    return t
+
+
+def fx_ticker(currency: str) -> str:
+    """통화 → price_history 환율 Ticker (예: USD → USDKRW=X)"""
+    return f"{currency}KRW=X"
+
+
+def price_ticker(asset: Asset) -> Optional[str]:
+    """시세가 price_history에서 파생되는 자산이면 정규화된 Ticker, 아니면 None"""
+    if asset.type != "STOCK" or not asset.stock or not (asset.stock.ticker or "").strip():
+        return None
+    return normalize_ticker(asset.stock.ticker)
+
+
+# ──────────────────────────────────────────────────────────────
+# 캐시 조회 / 저장
+# ──────────────────────────────────────────────────────────────
+async def get_cached_range(db: AsyncSession, ticker: str) -> Optional[tuple[str, str]]:
+    """Ticker의 저장 구간 (최초일, 최종일). 없으면 None"""
+    q = select(func.min(PriceHistory.date), func.max(PriceHistory.date)).where(PriceHistory.ticker == ticker)
+    lo, hi = (await db.execute(q)).one()
+    return (lo, hi) if lo else None
+
+
+async def get_cache_states(db: AsyncSession, tickers: set[str]) -> dict[str, tuple[str, str, Optional[str]]]:
+    """
+    Ticker별 (최초일, 최종일, 확정 최종일) 일괄 조회. 저장 행이 없는 Ticker는 빠짐.
+    확정 최종일: provider 일별 시세로 받은(dividend가 NULL 아닌) 마지막 날짜.
+    장중 현재가·당일 환율 같은 임시가 행은 dividend NULL로 저장된다.
+    """
+    if not tickers:
+        return {}
+    q = (
+        select(
+            PriceHistory.ticker,
+            func.min(PriceHistory.date),
+            func.max(PriceHistory.date),
+            func.max(case((PriceHistory.dividend.isnot(None), PriceHistory.date))),
+        )
+        .where(PriceHistory.ticker.in_(tickers))
+        .group_by(PriceHistory.ticker)
+    )
+    return {t: (lo, hi, final) for t, lo, hi, final in (await db.execute(q)).all()}
+
+
+async def upsert_prices(db: AsyncSession, ticker: str, rows: list[dict]):
+    """
+    종가 일괄 upsert. rows: [{"date", "close", "dividend"}]
+    dividend가 None이면 기존 배당 값을 유지 (장중 실시간가 저장용).
+    """
+    if not rows:
+        return
+    await db.execute(
+        text("INSERT INTO price_history (ticker, date, close, dividend) VALUES (:t, :d, :c, :dv) "
+             "ON CONFLICT(ticker, date) DO UPDATE SET close = excluded.close, "
+             "dividend = COALESCE(excluded.dividend, price_history.dividend)"),
+        [{"t": ticker, "d": r["date"], "c": r["close"], "dv": r.get("dividend")} for r in rows],
+    )
+
+
+async def _select_series(
+    db: AsyncSession, tickers: set[str], after: Optional[str] = None,
+    start: Optional[str] = None, end: Optional[str] = None,
+) -> dict[str, Series]:
+    """SQLite에서 Ticker별 종가 시계열 (after 다음 날부터 / [start, end])"""
+    if not tickers:
+        return {}
+    q = (
+        select(PriceHistory.ticker, PriceHistory.date, PriceHistory.close)
+        .where(PriceHistory.ticker.in_(tickers))
+        .order_by(PriceHistory.ticker, PriceHistory.date)
+    )
+    if after:
+        q = q.where(PriceHistory.date > after)
+    if start:
+        q = q.where(PriceHistory.date >= start)
+    if end:
+        q = q.where(PriceHistory.date <= end)
+    grouped: dict[str, tuple[list, list]] = {}
+    rows = 0
+    for t, d, c in (await db.execute(q)).all():
+        dates, closes = grouped.setdefault(t, ([], []))
+        dates.append(d)
+        closes.append(c)
+        rows += 1
+    PRICE_ROWS.inc(rows, "sqlite")
+    return {t: (np.array(d), np.array(c, dtype=float)) for t, (d, c) in grouped.items()}
+
+
+async def _load_many(db: AsyncSession, tickers: set[str], start: Optional[str], end: Optional[str]) -> dict[str, Series]:
+    """
+    여러 Ticker의 [start, end] 종가: 아카이브된 구간(through 이하)은 Parquet에서 한 번에,
+    through 이후와 아카이브 이후 바뀐 Ticker는 SQLite에서
+    """
+    through, archived = await archive.coverage(db, tickers)
+    if start and through and start > through:
+        archived = set()
+    out = await _select_series(db, tickers - archived, start=start, end=end)
+    if archived:
+        cold = await archive.read_prices(archived, start, min(end, through) if end else through)
+        hot  = await _select_series(db, archived, after=through, end=end)
+        for t in archived:
+            parts = [s for s in (cold.get(t), hot.get(t)) if s is not None]
+            if parts:
+                out[t] = (np.concatenate([d for d, _ in parts]), np.concatenate([c for _, c in parts]))
+    return out
+
+
+async def load_price_series(db: AsyncSession, tickers: set[str]) -> dict[str, Series]:
+    """Ticker별 전체 종가 시계열 일괄 로드 (지난 달까지는 Parquet 아카이브가 있으면 그쪽에서)"""
+    if not tickers:
+        return {}
+    return await _load_many(db, tickers, None, None)
+
+
+async def load_price_ranges(db: AsyncSession, since: dict[str, str], end: Optional[str]) -> dict[str, Series]:
+    """
+    Ticker별 [since, end] 종가 + since 직전 1행 일괄 로드 (load_price_range(seed=True)의 묶음판).
+    가장 이른 since부터 한 번에 읽고 Ticker별로 자른다 — 아카이브 연도 파일을 Ticker마다 다시 열지 않음.
+    """
+    if not since:
+        return {}
+    earliest = min(since.values())
+    loaded   = await _load_many(db, set(since), earliest, end)
+    # 가장 이른 since 직전 행 (SQLite: 집계의 bare 열은 MAX(date) 행의 값)
+    placeholders = ", ".join(f":t{i}" for i in range(len(since)))
+    seeds = await db.execute(
+        text(f"SELECT ticker, MAX(date), close FROM price_history "
+             f"WHERE ticker IN ({placeholders}) AND date < :d GROUP BY ticker"),
+        {"d": earliest, **{f"t{i}": t for i, t in enumerate(since)}},
+    )
+    out: dict[str, Series] = {}
+    for t, d, c in seeds.all():
+        out[t] = (np.array([d]), np.array([c], dtype=float))
+    for t in since:
+        parts = [s for s in (out.get(t), loaded.get(t)) if s is not None]
+        dates  = np.concatenate([d for d, _ in parts]) if parts else np.array([])
+        closes = np.concatenate([c for _, c in parts]) if parts else np.array([], dtype=float)
+        cut    = max(int(np.searchsorted(dates, since[t])) - 1, 0) if len(dates) else 0
+        out[t] = dates[cut:], closes[cut:]
+    return out
+
+
+async def load_price_range(db: AsyncSession, ticker: str, start: Optional[str], end: Optional[str], seed: bool = False) -> Series:
+    """
+    Ticker 종가 [start, end] (+ seed면 start 직전 1행 — forward fill 시작값).
+    Ticker 1개는 SQLite 인덱스 범위 읽기가 연도별 Parquet 파일을 여는 것보다 빠르므로 아카이브를 쓰지 않는다.
+    """
+    q = select(PriceHistory.date, PriceHistory.close).where(PriceHistory.ticker == ticker)
+    if end:
+        q = q.where(PriceHistory.date <= end)
+    rows = []
+    if start:
+        if seed:
+            prev = (await db.execute(
+                q.where(PriceHistory.date < start).order_by(PriceHistory.date.desc()).limit(1)
+            )).all()
+            rows.extend(prev)
+        q = q.where(PriceHistory.date >= start)
+    rows.extend((await db.execute(q.order_by(PriceHistory.date))).all())
+    return np.array([d for d, _ in rows]), np.array([c for _, c in rows], dtype=float)
+
+
+async def load_dividend_events(db: AsyncSession, ticker: str, since: str) -> list[tuple[str, float]]:
+    """since 이후(포함) 배당락 이벤트 [(date, 주당 배당금(현지통화))]"""
+    q = (
+        select(PriceHistory.date, PriceHistory.dividend)
+        .where(PriceHistory.ticker == ticker)
+        .where(PriceHistory.date >= since)
+        .where(PriceHistory.dividend > 0)
+        .order_by(PriceHistory.date)
+    )
+    return [(d, float(v)) for d, v in (await db.execute(q)).all()]
+
+
+async def load_fallback_rates(db: AsyncSession) -> dict[str, float]:
+    """settings에 캐시된 최근 환율 (환율 시계열이 없을 때 사용)"""
+    rates = dict(FALLBACK_RATES)
+    result = await db.execute(text("SELECT key, value FROM settings WHERE key LIKE 'exchange_rate_%'"))
+    for key, val in result.fetchall():
+        try:
+            rates[key.removeprefix("exchange_rate_")] = float(val)
+        except (TypeError, ValueError):
+            pass
+    return rates
+
+
+async def load_price_context(db: AsyncSession, assets: list[Asset]) -> dict:
+    """
+    자산 목록의 이력 파생에 필요한 시세/환율 일괄 로드.
+    반환: {"series": {ticker: Series}, "rates": {currency: rate}}
+    """
+    tickers = set()
+    for a in assets:
+        t = price_ticker(a)
+        if t:
+            tickers.add(t)
+            currency = a.stock.currency or "KRW"
+            if currency != "KRW":
+                tickers.add(fx_ticker(currency))
+    if not tickers:
+        return {"series": {}, "rates": {}}
+    return {
+        "series": await load_price_series(db, tickers),
+        "rates":  await load_fallback_rates(db),
+    }
+
+
+# ──────────────────────────────────────────────────────────────
+# 이력 파생
+# ──────────────────────────────────────────────────────────────
+def rate_at(fx: Optional[Series], dates: np.ndarray, fallback: float) -> np.ndarray:
+    """각 날짜의 환율 (당일 없으면 직전 값, 시계열 이전이면 fallback)"""
+    if fx is None or not len(fx[0]):
+        return np.full(len(dates), fallback)
+    idx = np.searchsorted(fx[0], dates, side="right") - 1
+    return np.where(idx >= 0, fx[1][np.maximum(idx, 0)], fallback)
+
+
+def stored_position(asset: Asset, stored: list[dict]) -> Optional[Position]:
+    """
+    보유 수량 시계열: 원장(transactions)이 있으면 누적합, 없으면 저장 이력의 수량 forward fill
+    (이력이 없으면 취득일부터 현재 보유 수량).
+    """
+    position = position_series(asset.transactions)
+    if position is not None:
+        return position
+
+    points: list[tuple[str, float]] = []
+    qty = None
+    for h in stored:
+        if h.get("quantity") is not None:
+            qty = h["quantity"]
+        points.append((h["date"], qty if qty is not None else (asset.quantity or 0)))
+    if not points and asset.acquisition_date:
+        points.append((asset.acquisition_date[:10], asset.quantity or 0))
+    if not points:
+        return None
+    return np.array([d for d, _ in points]), np.array([q for _, q in points], dtype=float)
+
+
+def unit_price_series(asset: Asset, stored: list[dict], prices) -> tuple[np.ndarray, np.ndarray]:
+    """단가 시계열 (네이티브 통화). 시세 자산은 종가(prices), 아니면 저장 이력 단가 + 거래 체결가"""
+    if prices is not None:
+        return prices
+    points: dict[str, float] = {}
+    for t in sorted(asset.transactions, key=lambda t: (t.date, t.id or 0)):
+        if t.price:
+            points[t.date[:10]] = float(t.price)
+    for h in stored:
+        if h.get("price") is not None:
+            points[h["date"][:10]] = float(h["price"])
+        elif h.get("value") is not None and h.get("quantity"):
+            points[h["date"][:10]] = float(h["value"]) / float(h["quantity"])
+    dates = sorted(points)
+    return np.array(dates), np.array([points[d] for d in dates], dtype=float)
+
+
+def fill_ledger_quantity(asset: Asset, stored: list[dict]) -> list[dict]:
+    """원장 자산이면 저장 이력 행의 수량을 원장 누적합으로 채움 (stored 수정 후 반환)"""
+    position = position_series(asset.transactions)
+    if position is not None and stored:
+        qtys = quantity_at(position, [h["date"][:10] for h in stored])
+        for h, q in zip(stored, qtys):
+            h["quantity"] = float(q)
+    return stored
+
+
+def derive_history(asset: Asset, stored: list[dict], ctx: dict) -> list[dict]:
+    """
+    price_history 종가 + 보유 수량 시계열 → 일별 이력.
+    - 수량: 원장 누적합(없으면 저장 이력 수량)을 시세 날짜에 정렬
+    - 평가액: 종가 × 수량 × 당일 환율
+    - 종가가 없는 날짜의 저장 행(수동 입력 등)은 그대로 유지
+    - 종가가 있는 날짜라도 단가·평가액을 저장한 행(수동 수정)이 있으면 그 값이 우선
+      (평가액 없이 단가만 고쳤으면 고친 단가 × 수량 × 당일 환율)
+    - 매각일 이후 시세는 포함하지 않음
+    """
+    ticker = price_ticker(asset)
+    series = ctx.get("series", {}).get(ticker) if ticker else None
+    if series is None:
+        return stored
+    position = stored_position(asset, stored)
+    if position is None:
+        return stored
+
+    end = (asset.disposal_date or datetime.now().strftime("%Y-%m-%d"))[:10]
+    p_dates, p_close = series
+    lo = np.searchsorted(p_dates, position[0][0], side="left")
+    hi = np.searchsorted(p_dates, end, side="right")
+    dates, closes = p_dates[lo:hi], p_close[lo:hi]
+    qtys = quantity_at(position, dates)
+
+    currency = asset.stock.currency or "KRW"
+    if currency == "KRW":
+        rates = np.ones(len(dates))
+    else:
+        fallback = ctx.get("rates", {}).get(currency, FALLBACK_RATES.get(currency, 1.0))
+        rates = rate_at(ctx["series"].get(fx_ticker(currency)), dates, fallback)
+    values = closes * qtys * rates
+
+    edited = {h["date"][:10]: h for h in stored if h.get("price") is not None or h.get("value") is not None}
+    derived = []
+    for d, v, c, q, r in zip(dates.tolist(), values, closes, qtys, rates):
+        row = {"date": d, "value": float(v), "price": float(c), "quantity": float(q)}
+        h = edited.get(d)
+        if h is not None:
+            if h.get("price") is not None:
+                row["price"] = float(h["price"])
+            row["value"] = float(h["value"]) if h.get("value") is not None else row["price"] * float(q) * float(r)
+        derived.append(row)
+    priced = set(dates.tolist())
+    derived.extend(h for h in stored if h["date"][:10] not in priced)
+    derived.sort(key=lambda x: x["date"])
+    return derived
+
+
+# ──────────────────────────────────────────────────────────────
+# 1회성 migration: 자산별 일별 시세 → price_history
+# ──────────────────────────────────────────────────────────────
+def migrate_asset_history(conn) -> tuple[int, list[dict]]:
+    """
+    (sync Connection) 기존 asset_history의 Ticker 주식 일별 행을 price_history로 옮기고,
+    수량이 직전과 같은 중복 행은 삭제. 외화 자산은 평가액/(단가×수량)으로 일별 환율도 복원.
+    같은 Ticker·날짜의 단가가 계좌마다 다르거나 평가액이 단가×수량×환율과 다른 행(수동 수정)은 남긴다.
+    반환: (이관된 시세 행 수, 삭제한 이력 행 — 호출자가 아카이브에 기록)
+    """
+    rows = conn.execute(text("""
+        SELECT sd.ticker, sd.currency, h.date, h.price, h.quantity, h.value
+        FROM asset_history h
+        JOIN stock_details sd ON sd.asset_id = h.asset_id
+        JOIN assets a ON a.id = h.asset_id
+        WHERE a.type = 'STOCK' AND sd.ticker IS NOT NULL AND TRIM(sd.ticker) != ''
+          AND h.price IS NOT NULL
+    """)).fetchall()
+
+    prices: dict[tuple[str, str], float] = {}
+    conflicts: set[tuple[str, str]] = set()
+    fx: dict[tuple[str, str], list[float]] = {}
+    for ticker, currency, date, price, qty, value in rows:
+        key = (normalize_ticker(ticker), date[:10])
+        if not same_number(prices.setdefault(key, price), price):
+            conflicts.add(key)
+        if currency and currency != "KRW" and qty and price and value:
+            fx.setdefault((fx_ticker(currency), date[:10]), []).append(value / (price * qty))
+    rates = {k: sum(v) / len(v) for k, v in fx.items()}
+
+    params = [{"t": t, "d": d, "c": c} for (t, d), c in prices.items()]
+    params += [{"t": t, "d": d, "c": c} for (t, d), c in rates.items()]
+    if params:
+        conn.execute(
+            text("INSERT OR IGNORE INTO price_history (ticker, date, close, dividend) VALUES (:t, :d, :c, 0)"),
+            params,
+        )
+
+    candidates = conn.execute(text("""
+        SELECT id, asset_id, date, value, price, quantity, ticker, currency FROM (
+            SELECT h.id, h.asset_id, h.date, h.value, h.price, h.quantity, sd.ticker, sd.currency,
+                   LAG(h.quantity) OVER (PARTITION BY h.asset_id ORDER BY h.date) AS prev_qty,
+                   ROW_NUMBER()    OVER (PARTITION BY h.asset_id ORDER BY h.date) AS rn
+            FROM asset_history h
+            JOIN stock_details sd ON sd.asset_id = h.asset_id
+            JOIN assets a ON a.id = h.asset_id
+            WHERE a.type = 'STOCK' AND sd.ticker IS NOT NULL AND TRIM(sd.ticker) != ''
+        )
+        WHERE rn > 1 AND price IS NOT NULL AND quantity IS prev_qty
+    """)).fetchall()
+
+    removed = []
+    for i, asset_id, date, value, price, qty, ticker, currency in candidates:
+        key = (normalize_ticker(ticker), date[:10])
+        if key in conflicts:
+            continue
+        if value is not None:
+            rate = 1.0 if not currency or currency == "KRW" else rates.get((fx_ticker(currency), date[:10]))
+            if qty is None or rate is None or not same_number(value, price * qty * rate):
+                continue
+        removed.append({"id": i, "asset_id": asset_id, "date": date, "value": value, "price": price, "quantity": qty})
+    if removed:
+        conn.execute(text("DELETE FROM asset_history WHERE id = :id"), [{"id": r["id"]} for r in removed])
+    return len(params), removed
+
+
+def same_number(a: float, b: float) -> bool:
+    """저장값 비교 (부동소수 계산 오차만 허용)"""
+    return abs(a - b) <= 1e-6 * max(1.0, abs(a), abs(b))
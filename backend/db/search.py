@@ -0,0 +1,84 @@
+"""
+자산 검색 (SQLite FTS5).
+
+asset_search(asset_id, name, address, memo) 가상 테이블을 assets·real_estate_details 트리거로 동기화한다.
+- 이름·주소·메모를 토큰 단위로 색인 → 수천 건에서도 LIKE '%..%' 전체 스캔 없이 ms 단위 검색
+- 검색어는 토큰별 접두어 검색 ("삼성 ET" → "삼성"* AND "ET"*), 특수문자는 그대로 문자열로 취급
+- FTS5가 빠진 SQLite 빌드면 테이블을 만들지 않고 LIKE 검색으로 대체
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+FTS_TABLE = "asset_search"
+
+# 자산 1건의 검색 행을 다시 만드는 SQL (트리거 본문, {id}에 NEW/OLD 컬럼)
+_REFRESH = """
+    DELETE FROM asset_search WHERE asset_id = {id};
+    INSERT INTO asset_search (asset_id, name, address, memo)
+        SELECT a.id, a.name, COALESCE(re.address, ''), COALESCE(a.memo, '')
+        FROM assets a LEFT JOIN real_estate_details re ON re.asset_id = a.id
+        WHERE a.id = {id};
+"""
+
+# 트리거 이름 → (시점, 대상 자산 id)
+_TRIGGERS = {
+    "asset_search_ai":    ("AFTER INSERT ON assets",                         "NEW.id"),
+    "asset_search_au":    ("AFTER UPDATE OF name, memo ON assets",           "NEW.id"),
+    "asset_search_re_ai": ("AFTER INSERT ON real_estate_details",            "NEW.asset_id"),
+    "asset_search_re_au": ("AFTER UPDATE OF address ON real_estate_details", "NEW.asset_id"),
+    "asset_search_re_ad": ("AFTER DELETE ON real_estate_details",            "OLD.asset_id"),
+}
+
+_fts_available: Optional[bool] = None
+
+
+def create_search_index(conn) -> bool:
+    """(sync Connection, migration용) FTS 테이블·동기화 트리거 생성 + 기존 자산 색인. FTS5 미지원이면 False"""
+    try:
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "asset_id UNINDEXED, name, address, memo, tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+    except OperationalError as e:
+        print(f"⚠️ FTS5 미지원 SQLite — 자산 검색은 LIKE로 동작: {e}")
+        return False
+
+    for name, (when, ref) in _TRIGGERS.items():
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        conn.execute(text(f"CREATE TRIGGER {name} {when} BEGIN {_REFRESH.format(id=ref)} END"))
+    conn.execute(text("DROP TRIGGER IF EXISTS asset_search_ad"))
+    conn.execute(text(
+        f"CREATE TRIGGER asset_search_ad AFTER DELETE ON assets BEGIN "
+        f"DELETE FROM {FTS_TABLE} WHERE asset_id = OLD.id; END"
+    ))
+
+    conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    conn.execute(text(
+        f"INSERT INTO {FTS_TABLE} (asset_id, name, address, memo) "
+        "SELECT a.id, a.name, COALESCE(re.address, ''), COALESCE(a.memo, '') "
+        "FROM assets a LEFT JOIN real_estate_details re ON re.asset_id = a.id"
+    ))
+    return True
+
+
+def match_query(q: str) -> Optional[str]:
+    """사용자 검색어 → FTS5 MATCH 식 (토큰별 접두어 AND). 토큰이 없으면 None"""
+    tokens = [t for t in re.split(r"[\s\"'()*:^+\-]+", q) if t]
+    if not tokens:
+        return None
+    return " AND ".join('"%s"*' % t for t in tokens)
+
+
+async def fts_available(db: AsyncSession) -> bool:
+    """FTS 테이블 존재 여부 (worker당 1회 확인)"""
+    global _fts_available
+    if _fts_available is None:
+        row = (await db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :n"), {"n": FTS_TABLE}
+        )).fetchone()
+        _fts_available = row is not None
+    return _fts_available
@@ -0,0 +1,298 @@
+"""
+자산별 시계열 조회 (기간 지정 + 서버 리샘플링 + 버전 기준 증분).
+
+상세 모달 차트가 자산 전체 이력(수년치 일별 행)을 받지 않도록
+[from, to] 구간만 인덱스로 읽어 일/주/월 단위로 묶어 돌려준다.
+- 단가: 구간 OHLC (open/high/low/close), 평가액·수량: 구간 마지막 값
+- 구간 시작 이전 마지막 저장 행은 from 날짜로 이어 붙임 (비시세 자산 차트가 왼쪽 끝에서 시작)
+- 증분: series_changes 로그(트리거가 기록)로 since_version 이후 바뀐 가장 이른 날짜를 찾아
+  그 날짜가 속한 구간부터만 다시 계산 → 클라이언트는 해당 날짜 이후 점만 교체
+
+series_changes(key, version, since): key는 'a:{asset_id}'(이력·원장·배당·자산 속성) 또는 't:{ticker}'(종가·환율),
+version은 쓰기 시점의 data_version(커밋 시 +1 되기 전 값), since는 바뀐 가장 이른 날짜('' = 전체).
+"""
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from backend.db.models import Asset, AssetHistory
+from backend.db.prices import (
+    derive_history, fill_ledger_quantity, fx_ticker, load_fallback_rates, load_price_range, price_ticker,
+)
+from backend.db.version import VERSION_KEY, get_data_version
+
+INTERVALS = ("day", "week", "month")
+
+# 요청 필드 → 응답 컬럼
+FIELDS = {
+    "price":    ("open", "high", "low", "close"),
+    "value":    ("value",),
+    "quantity": ("quantity",),
+}
+
+CHANGES_TABLE = "series_changes"
+# 이 버전 이전 변경은 로그에 없음 (migration 시점 또는 마지막 정리 시점) → 그보다 오래된 since_version은 전체 응답
+FLOOR_KEY = "series_changes_floor"
+# 정리 시 남길 최근 data_version 수
+KEEP_VERSIONS = 5000
+
+_LOG = (
+    f"INSERT INTO {CHANGES_TABLE} (key, version, since) VALUES "
+    f"({{key}}, (SELECT CAST(value AS INTEGER) FROM settings WHERE key = '{VERSION_KEY}'), {{since}}) "
+    "ON CONFLICT(key, version) DO UPDATE SET since = MIN(since, excluded.since);"
+)
+
+# 트리거 이름 → (시점, key 식, since 식)
+_TRIGGERS = {
+    "series_ah_ai": ("AFTER INSERT ON asset_history", "'a:' || NEW.asset_id", "substr(NEW.date, 1, 10)"),
+    "series_ah_au": ("AFTER UPDATE ON asset_history", "'a:' || NEW.asset_id", "substr(MIN(OLD.date, NEW.date), 1, 10)"),
+    "series_ah_ad": ("AFTER DELETE ON asset_history", "'a:' || OLD.asset_id", "substr(OLD.date, 1, 10)"),
+    "series_tx_ai": ("AFTER INSERT ON transactions",  "'a:' || NEW.asset_id", "substr(NEW.date, 1, 10)"),
+    "series_tx_au": ("AFTER UPDATE ON transactions",  "'a:' || NEW.asset_id", "substr(MIN(OLD.date, NEW.date), 1, 10)"),
+    "series_tx_ad": ("AFTER DELETE ON transactions",  "'a:' || OLD.asset_id", "substr(OLD.date, 1, 10)"),
+    "series_ph_ai": ("AFTER INSERT ON price_history", "'t:' || NEW.ticker",   "NEW.date"),
+    "series_ph_au": ("AFTER UPDATE ON price_history", "'t:' || NEW.ticker",   "MIN(OLD.date, NEW.date)"),
+    "series_ph_ad": ("AFTER DELETE ON price_history", "'t:' || OLD.ticker",   "OLD.date"),
+    # 배당은 시계열 값에는 없지만 성과 분석(analytics.py) 증분 캐시가 같은 로그를 사용
+    "series_dv_ai": ("AFTER INSERT ON dividend_history", "'a:' || NEW.asset_id", "substr(NEW.date, 1, 10)"),
+    "series_dv_au": ("AFTER UPDATE ON dividend_history", "'a:' || NEW.asset_id", "substr(MIN(OLD.date, NEW.date), 1, 10)"),
+    "series_dv_ad": ("AFTER DELETE ON dividend_history", "'a:' || OLD.asset_id", "substr(OLD.date, 1, 10)"),
+    # 취득·매각일, 수량(원장 없는 자산), 유형, Ticker·통화가 바뀌면 전체 재계산
+    "series_asset_au": (
+        "AFTER UPDATE OF acquisition_date, disposal_date, quantity, type ON assets "
+        "WHEN NEW.acquisition_date IS NOT OLD.acquisition_date OR NEW.disposal_date IS NOT OLD.disposal_date "
+        "OR NEW.quantity IS NOT OLD.quantity OR NEW.type IS NOT OLD.type",
+        "'a:' || NEW.id", "''",
+    ),
+    "series_sd_au": (
+        "AFTER UPDATE OF ticker, currency ON stock_details "
+        "WHEN NEW.ticker IS NOT OLD.ticker OR NEW.currency IS NOT OLD.currency",
+        "'a:' || NEW.asset_id", "''",
+    ),
+}
+
+
+# ──────────────────────────────────────────────────────────────
+# 변경 로그
+# ──────────────────────────────────────────────────────────────
+def create_change_log(conn):
+    """(sync Connection, migration용) series_changes 테이블·트리거 생성. 현재 버전부터 기록"""
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {CHANGES_TABLE} ("
+        "key TEXT NOT NULL, version INTEGER NOT NULL, since TEXT NOT NULL, PRIMARY KEY (key, version))"
+    ))
+    for name, (when, key, since) in _TRIGGERS.items():
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        conn.execute(text(f"CREATE TRIGGER {name} {when} BEGIN {_LOG.format(key=key, since=since)} END"))
+    conn.execute(text(
+        "INSERT INTO settings (key, value) "
+        f"SELECT '{FLOOR_KEY}', COALESCE((SELECT value FROM settings WHERE key = '{VERSION_KEY}'), '0') "
+        "WHERE true ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+    ))
+
+
+async def changed_since(db: AsyncSession, keys: list[str], version: int) -> Optional[str]:
+    """
+    version 이후 keys에 기록된 가장 이른 변경 날짜.
+    반환: None = 변경 없음, '' = 전체 재계산 (속성 변경 또는 로그가 version을 덮지 못함)
+    """
+    floor = (await db.execute(text("SELECT value FROM settings WHERE key = :k"), {"k": FLOOR_KEY})).scalar()
+    if floor is None or version < int(floor):
+        return ""
+    placeholders = ", ".join(f":k{i}" for i in range(len(keys)))
+    row = (await db.execute(
+        text(f"SELECT COUNT(*), MIN(since) FROM {CHANGES_TABLE} WHERE key IN ({placeholders}) AND version >= :v"),
+        {"v": version, **{f"k{i}": k for i, k in enumerate(keys)}},
+    )).one()
+    return row[1] if row[0] else None
+
+
+async def changes_since(db: AsyncSession, version: int) -> Optional[dict[str, str]]:
+    """version 이후 모든 key의 가장 이른 변경 날짜 {key: since}. 로그가 version을 덮지 못하면 None (전체 재계산)"""
+    floor = (await db.execute(text("SELECT value FROM settings WHERE key = :k"), {"k": FLOOR_KEY})).scalar()
+    if floor is None or version < int(floor):
+        return None
+    rows = await db.execute(
+        text(f"SELECT key, MIN(since) FROM {CHANGES_TABLE} WHERE version >= :v GROUP BY key"), {"v": version}
+    )
+    return dict(rows.all())
+
+
+async def prune_changes(db: AsyncSession, keep: int = KEEP_VERSIONS) -> int:
+    """최근 keep개 버전 이전 로그 삭제 + floor 갱신 (예약 업데이트 때 호출). 반환: 삭제 행 수"""
+    floor = await get_data_version(db) - keep
+    if floor <= 0:
+        return 0
+    result = await db.execute(text(f"DELETE FROM {CHANGES_TABLE} WHERE version < :f"), {"f": floor})
+    await db.execute(
+        text("INSERT INTO settings (key, value) VALUES (:k, :v) "
+             "ON CONFLICT(key) DO UPDATE SET value = MAX(CAST(value AS INTEGER), excluded.value)"),
+        {"k": FLOOR_KEY, "v": floor},
+    )
+    return result.rowcount or 0
+
+
+# ──────────────────────────────────────────────────────────────
+# 리샘플링
+# ──────────────────────────────────────────────────────────────
+def bucket_start(dates, interval: str) -> np.ndarray:
+    """각 날짜가 속한 구간의 시작일 ('YYYY-MM-DD' 배열). week는 월요일 시작"""
+    d = np.asarray(dates, dtype="datetime64[D]")
+    if interval == "week":
+        d = d - (d.astype(np.int64) + 3) % 7   # 1970-01-01 = 목요일
+    elif interval == "month":
+        d = d.astype("datetime64[M]").astype("datetime64[D]")
+    return d.astype(str)
+
+
+def _column(rows: list[dict], field: str) -> np.ndarray:
+    return np.array([np.nan if r.get(field) is None else r[field] for r in rows], dtype=float)
+
+
+def resample(rows: list[dict], interval: str, fields=tuple(FIELDS)) -> list[dict]:
+    """
+    날짜 오름차순 일별 행 → 구간별 점 [{date(구간 시작일), open, high, low, close, value, quantity}].
+    값이 없는(None) 칸은 건너뛰고 집계하며, 구간 안에 값이 하나도 없으면 None.
+    """
+    if not rows:
+        return []
+    keys   = bucket_start([r["date"][:10] for r in rows], interval)
+    n      = len(keys)
+    idx    = np.arange(n)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends   = np.r_[starts[1:], n] - 1
+
+    def first(col: np.ndarray) -> np.ndarray:
+        nxt = np.minimum.accumulate(np.where(np.isnan(col), n, idx)[::-1])[::-1][starts]
+        return np.where(nxt <= ends, col[np.minimum(nxt, n - 1)], np.nan)
+
+    def last(col: np.ndarray) -> np.ndarray:
+        prv = np.maximum.accumulate(np.where(np.isnan(col), -1, idx))[ends]
+        return np.where(prv >= starts, col[np.maximum(prv, 0)], np.nan)
+
+    out: dict[str, np.ndarray] = {}
+    if "price" in fields:
+        price = _column(rows, "price")
+        out["open"]  = first(price)
+        out["high"]  = np.fmax.reduceat(price, starts)
+        out["low"]   = np.fmin.reduceat(price, starts)
+        out["close"] = last(price)
+    for f in ("value", "quantity"):
+        if f in fields:
+            out[f] = last(_column(rows, f))
+
+    cols = {name: [None if np.isnan(v) else v for v in col.tolist()] for name, col in out.items()}
+    return [
+        {"date": k, **{name: col[i] for name, col in cols.items()}}
+        for i, k in enumerate(keys[starts].tolist())
+    ]
+
+
+# ──────────────────────────────────────────────────────────────
+# 구간 적재
+# ──────────────────────────────────────────────────────────────
+async def _stored_rows(db: AsyncSession, asset_id: str, start: Optional[str], end: Optional[str], carry: bool) -> list[dict]:
+    """저장 이력 [start, end] (+ carry면 start 직전 마지막 행)"""
+    q = select(AssetHistory).where(AssetHistory.asset_id == asset_id)
+    if end:
+        q = q.where(AssetHistory.date <= end)
+    found: list[AssetHistory] = []
+    if start:
+        if carry:
+            found.extend((await db.execute(
+                q.where(AssetHistory.date < start).order_by(AssetHistory.date.desc()).limit(1)
+            )).scalars().all())
+        q = q.where(AssetHistory.date >= start)
+    found.extend((await db.execute(q.order_by(AssetHistory.date))).scalars().all())
+    return [{"date": h.date, "value": h.value, "price": h.price, "quantity": h.quantity} for h in found]
+
+
+async def _daily_rows(db: AsyncSession, asset: Asset, start: Optional[str], end: Optional[str], carry: bool) -> list[dict]:
+    """[start, end] 일별 행 (get_history와 같은 파생 규칙, 구간만 적재). carry는 비시세 자산만 적용"""
+    ticker = price_ticker(asset)
+    carry  = carry and not ticker
+    if ticker:
+        # 수동 입력 행만 남아 있어 적음 → 수량 forward fill을 위해 end 이전 전부
+        stored = fill_ledger_quantity(asset, await _stored_rows(db, asset.id, None, end, carry=False))
+        series = {ticker: await load_price_range(db, ticker, start, end)}
+        currency = asset.stock.currency or "KRW"
+        if currency != "KRW":
+            series[fx_ticker(currency)] = await load_price_range(db, fx_ticker(currency), start, end, seed=True)
+        rows = derive_history(asset, stored, {"series": series, "rates": await load_fallback_rates(db)})
+    else:
+        rows = fill_ledger_quantity(asset, await _stored_rows(db, asset.id, start, end, carry))
+
+    if start:
+        before = [r for r in rows if r["date"][:10] < start]
+        rows   = [r for r in rows if r["date"][:10] >= start]
+        if carry and before and (not rows or rows[0]["date"][:10] > start):
+            rows.insert(0, {**before[-1], "date": start})
+    if end:
+        rows = [r for r in rows if r["date"][:10] <= end]
+    return rows
+
+
+async def asset_series(
+    db: AsyncSession,
+    asset_id: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    interval: str = "day",
+    fields: Optional[list[str]] = None,
+    since_version: Optional[int] = None,
+) -> Optional[dict]:
+    """
+    자산 1건의 리샘플링 시계열. 자산이 없으면 None.
+    since_version 지정 시 그 이후 바뀐 구간만: since(교체 시작일) 이후 점만 담고,
+    변경이 없으면 points=[]·since=None, 전체 재계산이 필요하면 full=True.
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"interval은 {', '.join(INTERVALS)} 중 하나여야 합니다.")
+    fields = fields or list(FIELDS)
+    unknown = [f for f in fields if f not in FIELDS]
+    if unknown:
+        raise ValueError(f"알 수 없는 fields: {', '.join(unknown)} (가능: {', '.join(FIELDS)})")
+    if start and end and start > end:
+        raise ValueError("from이 to보다 늦습니다.")
+
+    version = await get_data_version(db)   # 계산 전에 읽음 → 계산 중 커밋은 다음 증분에 포함
+    q = (
+        select(Asset)
+        .options(selectinload(Asset.transactions), selectinload(Asset.stock))
+        .where(Asset.id == asset_id)
+    )
+    asset = (await db.execute(q)).scalar_one_or_none()
+    if asset is None:
+        return None
+
+    since, full = None, True
+    if since_version is not None:
+        ticker = price_ticker(asset)
+        keys   = [f"a:{asset.id}"]
+        if ticker:
+            keys.append(f"t:{ticker}")
+            if (asset.stock.currency or "KRW") != "KRW":
+                keys.append(f"t:{fx_ticker(asset.stock.currency)}")
+        changed = None if since_version >= version else await changed_since(db, keys, since_version)
+        if changed is None:
+            return {"asset_id": asset_id, "interval": interval, "from": start, "to": end,
+                    "version": version, "full": False, "since": None, "points": []}
+        if changed:
+            since = str(bucket_start([changed], interval)[0])
+            full  = bool(start and since <= start)
+
+    effective = start if full else since
+    rows = await _daily_rows(db, asset, effective, end, carry=(effective == start))
+    return {
+        "asset_id": asset_id,
+        "interval": interval,
+        "from":     start,
+        "to":       end,
+        "version":  version,
+        "full":     full,
+        "since":    None if full else since,
+        "points":   resample(rows, interval, fields),
+    }
@@ -0,0 +1,114 @@
+"""
+DB 기반 데이터 버전 + worker별 메모리 캐시 무효화.
+
+uvicorn --workers N 환경에서는 worker마다 메모리 캐시가 따로 있으므로,
+쓰기(INSERT/UPDATE/DELETE)가 있었던 트랜잭션은 커밋 직전에 settings.data_version을 +1 하고
+각 캐시는 값과 함께 계산 시점의 버전을 저장해 조회 때마다 현재 버전(1행 SELECT)과 비교한다.
+어느 worker가 쓰든 다음 조회에서 모든 worker의 캐시가 무효화된다.
+"""
+import asyncio
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.metrics import CACHE_REQUESTS
+from backend.db.portfolio import current_portfolio
+
+VERSION_KEY = "data_version"
+_DML = ("INSERT", "UPDATE", "DELETE", "REPLAC")
+
+
+def install_version_hooks(sync_engine):
+    """DML 실행 여부를 커넥션에 표시하고, 커밋 직전 data_version +1"""
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _mark_write(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip()[:6].upper() in _DML:
+            conn.info["wrote"] = True
+
+    @event.listens_for(sync_engine, "commit")
+    def _bump(conn):
+        if conn.info.pop("wrote", False):
+            # DBAPI 커서로 직접 실행 (엔진 이벤트를 다시 타지 않음)
+            cursor = conn.connection.cursor()
+            cursor.execute(
+                f"UPDATE settings SET value = CAST(value AS INTEGER) + 1 WHERE key = '{VERSION_KEY}'"
+            )
+            cursor.close()
+
+    @event.listens_for(sync_engine, "rollback")
+    def _reset(conn):
+        conn.info.pop("wrote", None)
+
+
+async def get_data_version(db: AsyncSession) -> int:
+    row = (await db.execute(text("SELECT value FROM settings WHERE key = :k"), {"k": VERSION_KEY})).fetchone()
+    return int(row[0]) if row else 0
+
+
+class VersionedCache:
+    """
+    data_version이 같을 때만 재사용하는 worker 로컬 캐시 (포트폴리오별 LRU, maxsize개).
+    같은 (key, 버전)을 동시에 요청하면 먼저 시작한 계산 1회의 결과를 함께 기다린다 (single-flight).
+    data_version은 포트폴리오 DB마다 따로 증가하므로 저장소도 포트폴리오별로 나눈다.
+    """
+
+    def __init__(self, name: str, maxsize: int = 32):
+        self.name    = name
+        self.maxsize = maxsize
+        self._stores: dict[str, OrderedDict] = {}
+        self._inflight: dict[tuple, asyncio.Future] = {}
+
+    async def get_or_compute(self, db: AsyncSession, key, compute: Callable[[], Awaitable]):
+        version = await get_data_version(db)
+        data    = self._stores.setdefault(current_portfolio(), OrderedDict())
+        key     = (current_portfolio(), key)
+        hit = data.get(key)
+        if hit is not None and hit[0] == version:
+            data.move_to_end(key)
+            CACHE_REQUESTS.inc(1, self.name, "hit")
+            return hit[1]
+
+        flight = self._inflight.get((key, version))
+        if flight is not None:
+            CACHE_REQUESTS.inc(1, self.name, "coalesced")
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise   # 이 요청이 취소됨
+                # 먼저 시작한 요청이 취소됨 → 직접 계산
+
+        CACHE_REQUESTS.inc(1, self.name, "miss")
+        flight = asyncio.get_running_loop().create_future()
+        flight.add_done_callback(_consume)
+        self._inflight[(key, version)] = flight
+        try:
+            # 계산 중 다른 worker가 쓰면 값이 더 최신일 뿐이고, 다음 조회에서 버전 불일치로 다시 계산된다
+            value = await compute()
+        except Exception as e:
+            flight.set_exception(e)
+            raise
+        except BaseException:
+            flight.cancel()
+            raise
+        else:
+            flight.set_result(value)
+        finally:
+            self._inflight.pop((key, version), None)
+
+        data[key] = (version, value)
+        data.move_to_end(key)
+        while len(data) > self.maxsize:
+            data.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._stores.clear()
+
+
+def _consume(future: asyncio.Future):
+    """기다리는 요청이 없어도 'exception was never retrieved' 경고가 나지 않도록"""
+    if not future.cancelled():
+        future.exception()
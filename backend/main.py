@@ -1,30 +1,73 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
-from backend.core.config import CORS_ORIGINS
-from backend.db.database import init_db
+from backend.core.config import BACKUP_INTERVAL_HOURS, CORS_ORIGINS, PARQUET_INTERVAL_HOURS, UPDATE_INTERVAL_MINUTES
+from backend.core import executor
+from backend.core.encoding import CompressionMiddleware, PrecompressedStaticFiles
+from backend.core.metrics import MetricsMiddleware, TimedJSONResponse, loop_lag_monitor
+from backend.db import archive as db_archive
+from backend.db.database import evict_loop, init_db
 from backend.api.assets   import router as assets_router
 from backend.api.history   import router as history_router
 from backend.api.stocks    import router as stocks_router
 from backend.api.settings   import router as settings_router
 from backend.api.retirement import router as retirement_router
 from backend.api.dividends  import router as dividends_router
+from backend.api.metrics    import router as metrics_router
+from backend.api.stream     import router as stream_router
+from backend.api.summary    import router as summary_router
+from backend.api.liabilities import router as liabilities_router
+from backend.api.analytics   import router as analytics_router
+from backend.api.portfolios  import PortfolioMiddleware, router as portfolios_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    lag_monitor = asyncio.create_task(loop_lag_monitor())
+    evictor     = asyncio.create_task(evict_loop())
+    task = None
+    if UPDATE_INTERVAL_MINUTES > 0:
+        from backend.services import scheduler
+        task = asyncio.create_task(scheduler.scheduler_loop())
+    backup_task = None
+    if BACKUP_INTERVAL_HOURS > 0:
+        from backend.services import backup
+        backup_task = asyncio.create_task(backup.backup_loop())
+    archive_task = None
+    if PARQUET_INTERVAL_HOURS > 0 and db_archive.available():
+        from backend.services import archive
+        archive_task = asyncio.create_task(archive.archive_loop())
     yield
+    if archive_task is not None:
+        archive_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await archive_task
+    if backup_task is not None:
+        backup_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await backup_task
+    if task is not None:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        scheduler.release()
+    from backend.services import market_data
+    await market_data.aclose()   # 공용 HTTP client (keep-alive 연결) 정리
+    lag_monitor.cancel()
+    evictor.cancel()
+    executor.shutdown()
 
 
 app = FastAPI(
     title="My Asset Manager",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=TimedJSONResponse,
 )
 
 # CORS
@@ -34,8 +77,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# 포트폴리오 라우팅 (X-Portfolio 헤더 → 포트폴리오별 DB)
+app.add_middleware(PortfolioMiddleware)
+
+# 응답 압축 (Accept-Encoding 협상, COMPRESS_MIN_BYTES 이상 단일 body 응답만 — SSE 제외)
+app.add_middleware(CompressionMiddleware)
+
+# 계측 (라우트별 지연·SQL 집계, SERVER_TIMING=1이면 Server-Timing 헤더)
+app.add_middleware(MetricsMiddleware)
+
 # API 라우터 등록
 app.include_router(assets_router,  prefix="/api")
 app.include_router(history_router, prefix="/api")
@@ -43,6 +96,12 @@ app.include_router(stocks_router,  prefix="/api")
 app.include_router(settings_router,   prefix="/api")
 app.include_router(retirement_router, prefix="/api")
 app.include_router(dividends_router,  prefix="/api")
+app.include_router(metrics_router,    prefix="/api")
+app.include_router(stream_router,     prefix="/api")
+app.include_router(summary_router,    prefix="/api")
+app.include_router(liabilities_router, prefix="/api")
+app.include_router(analytics_router,   prefix="/api")
+app.include_router(portfolios_router,  prefix="/api")
 
 
 @app.get("/api/health")
@@ -50,7 +109,7 @@ async def health_check():
     return {"status": "ok", "app": "My Asset Manager"}
 
 
-# 프론트엔드 정적 파일 서빙 — 반드시 마지막에 마운트
+# 프론트엔드 정적 파일 서빙 (빌드 시 만든 .br/.gz 우선, 해시 파일 immutable 캐시) — 반드시 마지막에 마운트
 static_path = Path(__file__).parent.parent / "static"
 if static_path.exists():
-    app.mount("/", StaticFiles(directory=str(static_path), html=True), name="static")
+    app.mount("/", PrecompressedStaticFiles(directory=str(static_path), html=True), name="static")
@@ -0,0 +1,419 @@
+"""
+포트폴리오 성과 분석: 시간가중수익률(TWR)·금액가중수익률(XIRR) — 보유 종목·계좌·유형·전체 단위.
+
+자산별 일별 프레임(평가액 V, 순유입 F, 배당 I — 모두 KRW)을 만든 뒤
+(날짜 × 자산) 행렬에 멤버십 행렬을 곱해 모든 그룹을 한 번에 합산하고 계산한다.
+- 순유입: 거래 원장(없으면 asset_history 수량 변화) Δ수량 × 체결가(없으면 당일 단가) × 환율 + 수수료.
+  매각일에 남은 보유분은 매각가(disposal_price)로 유출.
+  수량이 없는 자산(부동산·예적금 등)은 첫 평가액을 유입, 매각가를 유출로 보고 나머지 변화는 모두 수익
+  (기록되지 않은 예적금 납입도 수익으로 잡힘)
+- 배당: dividend_history.amount_krw (보유 가치 밖으로 나간 수익)
+- TWR: 일별 r_t = (V_t − F_t + I_t) / V_{t−1} − 1 을 연쇄 (전일 평가액이 0인 날은 제외, 유입은 장 마감 기준)
+- XIRR: 시작 평가액 투입, 기간 중 −F_t + I_t, 종료 평가액 회수 → Σ cf·(1+x)^(−τ) = 0을
+  모든 그룹에 대해 동시에 Newton 반복 (현금흐름이 있는 날만 모아 bincount로 합산)
+- 증분 캐시: 수량 자산의 프레임은 worker 메모리에 두고 series_changes 로그에서 바뀐 가장 이른 날짜부터만
+  다시 계산해 이어 붙인다 (일별 시세 업데이트 → 최근 며칠만, 과거 거래 수정 → 그 날짜부터)
+"""
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from backend.core.metrics import CACHE_REQUESTS
+from backend.db.crud import TYPE_LABELS
+from backend.db.ledger import QTY_TYPES, quantity_at
+from backend.db.models import Asset, AssetHistory, DividendHistory
+from backend.db.portfolio import current_portfolio
+from backend.db.prices import (
+    FALLBACK_RATES, fx_ticker, load_fallback_rates, load_price_ranges, price_ticker, rate_at, stored_position,
+    unit_price_series,
+)
+from backend.db.series import changes_since
+from backend.db.version import get_data_version
+
+_EPS = 1e-9
+
+# 수량 자산 프레임 캐시: 포트폴리오 → asset_id → {"version", "start", "value", "flow", "income"}
+_frames: dict[str, dict[str, dict]] = {}
+
+
+def _today() -> str:
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def _days(start: str, end: str) -> np.ndarray:
+    """[start, end] 일별 'YYYY-MM-DD' 배열"""
+    return np.arange(np.datetime64(start), np.datetime64(end) + 1, dtype="datetime64[D]").astype(str)
+
+
+def _shift(date: str, n: int) -> str:
+    return str(np.datetime64(date) + n)
+
+
+# ──────────────────────────────────────────────────────────────
+# 자산별 일별 프레임
+# ──────────────────────────────────────────────────────────────
+def _position_frame(asset: Asset, stored: list[dict], position, unit, fx, fallback: float,
+                    dividends: list[tuple], start: str, end: str) -> dict:
+    """수량 자산의 [start, end] 일별 V·F·I"""
+    days  = _days(start, end)
+    qty   = quantity_at(position, days)
+    rate  = np.ones(len(days)) if fx is None else rate_at(fx, days, fallback)
+    idx   = np.searchsorted(unit[0], days, side="right") - 1
+    price = np.where(idx >= 0, unit[1][np.maximum(idx, 0)], np.nan) if len(unit[0]) else np.full(len(days), np.nan)
+    value = np.nan_to_num(price) * qty * rate
+    flow  = np.zeros(len(days))
+
+    # 거래: 원장이 있으면 체결가·수수료, 없으면 저장 이력 수량 변화 × 당일 단가
+    if asset.transactions:
+        txs   = [t for t in asset.transactions if start <= t.date[:10] <= end]
+        at    = np.searchsorted(days, [t.date[:10] for t in txs])
+        dq    = np.array([t.qty_delta for t in txs], dtype=float)
+        px    = np.array([np.nan if t.price is None else t.price for t in txs], dtype=float)
+        fees  = np.array([t.fees or 0 for t in txs], dtype=float)
+        px    = np.where(np.isnan(px), np.nan_to_num(price[at]), px) if len(txs) else px
+        np.add.at(flow, at, (dq * px + fees) * rate[at] if len(txs) else dq)
+    else:
+        dq   = np.diff(position[1], prepend=0.0)
+        keep = (position[0] >= start) & (position[0] <= end) & (np.abs(dq) > _EPS)
+        at   = np.searchsorted(days, position[0][keep])
+        np.add.at(flow, at, dq[keep] * np.nan_to_num(price[at]) * rate[at])
+
+    _apply_disposal(asset, days, value, flow)
+    income = np.zeros(len(days))
+    _add_dividends(days, income, dividends)
+    return {"start": start, "value": value, "flow": flow, "income": income}
+
+
+def _value_frame(asset: Asset, stored: list[dict], dividends: list[tuple], end: str) -> Optional[dict]:
+    """수량이 없는 자산: 평가액 기록 forward fill, 첫 평가액 유입·매각가 유출"""
+    points: dict[str, float] = {}
+    if asset.acquisition_date and asset.acquisition_price:
+        points[asset.acquisition_date[:10]] = float(asset.acquisition_price)
+    for h in stored:
+        if h.get("value") is not None:
+            points[h["date"][:10]] = float(h["value"])
+        elif h.get("price") is not None and h.get("quantity") is not None:
+            points[h["date"][:10]] = float(h["price"]) * float(h["quantity"])
+    if not asset.disposal_date:
+        points[end] = float(asset.current_value or 0)
+    dates = sorted(d for d in points if d <= end)
+    if not dates:
+        return None
+
+    days  = _days(dates[0], end)
+    vals  = np.array([points[d] for d in dates], dtype=float)
+    idx   = np.searchsorted(dates, days, side="right") - 1
+    value = np.maximum(vals[idx], 0)
+    flow  = np.zeros(len(days))
+    flow[0] = value[0]
+    _apply_disposal(asset, days, value, flow)
+    income = np.zeros(len(days))
+    _add_dividends(days, income, dividends)
+    return {"start": dates[0], "value": value, "flow": flow, "income": income}
+
+
+def _apply_disposal(asset: Asset, days: np.ndarray, value: np.ndarray, flow: np.ndarray):
+    """매각일부터 평가액 0, 매각일에 남아 있던 가치는 매각가(없으면 전일 평가액)로 유출"""
+    if not asset.disposal_date:
+        return
+    d = asset.disposal_date[:10]
+    if not len(days) or d > days[-1]:
+        return
+    i = int(np.searchsorted(days, d))
+    prev = value[i - 1] if i > 0 else 0.0
+    remaining = value[i] > _EPS or prev > _EPS
+    value[i:] = 0.0
+    if remaining and d >= days[0]:
+        flow[i] -= float(asset.disposal_price or 0) or prev
+
+
+def _add_dividends(days: np.ndarray, income: np.ndarray, dividends: list[tuple]):
+    inside = [(d[:10], a) for d, a in dividends if days[0] <= d[:10] <= days[-1]]
+    if inside:
+        np.add.at(income, np.searchsorted(days, [d for d, _ in inside]), [a for _, a in inside])
+
+
+def _splice(old: dict, tail: dict) -> dict:
+    """캐시 프레임 앞부분 + since부터 새로 계산한 뒷부분"""
+    cut = len(_days(old["start"], _shift(tail["start"], -1)))
+    return {
+        "start":  old["start"],
+        "value":  np.concatenate([old["value"][:cut],  tail["value"]]),
+        "flow":   np.concatenate([old["flow"][:cut],   tail["flow"]]),
+        "income": np.concatenate([old["income"][:cut], tail["income"]]),
+    }
+
+
+async def _load_frames(db: AsyncSession, assets: list[Asset], end: str) -> dict[str, dict]:
+    """자산별 프레임 (수량 자산은 캐시 + 변경분만 재계산)"""
+    version = await get_data_version(db)
+    ids     = [a.id for a in assets]
+    cache   = _frames.setdefault(current_portfolio(), {})
+
+    stored: dict[str, list[dict]] = {}
+    q = select(AssetHistory).where(AssetHistory.asset_id.in_(ids)).order_by(AssetHistory.date)
+    for h in (await db.execute(q)).scalars():
+        stored.setdefault(h.asset_id, []).append(
+            {"date": h.date, "value": h.value, "price": h.price, "quantity": h.quantity}
+        )
+
+    # 캐시 버전별 변경 로그 (보통 1회 조회)
+    changes: dict[int, Optional[dict]] = {}
+    for f in cache.values():
+        if f["version"] != version and f["version"] not in changes:
+            changes[f["version"]] = await changes_since(db, f["version"])
+
+    # 자산별 재계산 시작일 (None = 재계산 불필요)
+    plans: dict[str, Optional[str]] = {}
+    for a in assets:
+        position = stored_position(a, stored.get(a.id, []))
+        if a.type not in QTY_TYPES or position is None or not (position[1] > _EPS).any():
+            plans[a.id] = ""                       # 수량 없는 자산: 항상 전체 (가벼움)
+            continue
+        cached = cache.get(a.id)
+        full   = str(position[0][0])[:10]
+        if cached is None:
+            plans[a.id] = full
+            continue
+        cached_end = _shift(cached["start"], len(cached["value"]) - 1)
+        if cached["version"] == version and cached_end == end:
+            plans[a.id] = None
+            CACHE_REQUESTS.inc(1, "performance_frame", "hit")
+            continue
+        log = changes.get(cached["version"]) if cached["version"] != version else {}
+        if log is None:
+            plans[a.id] = full
+            continue
+        ticker = price_ticker(a)
+        keys   = [f"a:{a.id}"]
+        if ticker:
+            keys.append(f"t:{ticker}")
+        currency = (a.stock.currency if a.stock else None) or "KRW"
+        if currency != "KRW":
+            keys.append(f"t:{fx_ticker(currency)}")
+        hits  = [log[k] for k in keys if k in log]
+        since = min(hits + [cached_end])          # 마지막 날(장중가)은 항상 다시
+        plans[a.id] = full if since == "" or since <= max(cached["start"], full) else since
+        CACHE_REQUESTS.inc(1, "performance_frame", "partial")
+
+    earliest = min((p for p in plans.values() if p), default=end)
+    dividends: dict[str, list[tuple]] = {}
+    q = (
+        select(DividendHistory.asset_id, DividendHistory.date, DividendHistory.amount_krw)
+        .where(DividendHistory.asset_id.in_(ids))
+        .where(DividendHistory.date >= earliest)
+    )
+    for aid, d, amount in (await db.execute(q)).all():
+        dividends.setdefault(aid, []).append((d, float(amount or 0)))
+
+    # 재계산할 자산의 시세·환율을 Ticker별 가장 이른 시작일부터 한 번에 로드 (자산마다 조회하지 않음)
+    wanted: dict[str, str] = {}
+    for a in assets:
+        plan = plans[a.id]
+        if not plan:
+            continue
+        currency = (a.stock.currency if a.stock else None) or "KRW"
+        for t in (price_ticker(a), None if currency == "KRW" else fx_ticker(currency)):
+            if t and (t not in wanted or plan < wanted[t]):
+                wanted[t] = plan
+    rates  = await load_fallback_rates(db)
+    loaded = await load_price_ranges(db, wanted, end)
+
+    def price_range(ticker: str, since: str):
+        """load_price_range(ticker, since, end, seed=True)와 같은 구간 (since 직전 1행 포함)"""
+        dates, closes = loaded[ticker]
+        cut = max(int(np.searchsorted(dates, since)) - 1, 0)
+        return dates[cut:], closes[cut:]
+
+    frames: dict[str, dict] = {}
+    for a in assets:
+        plan = plans[a.id]
+        rows = stored.get(a.id, [])
+        divs = dividends.get(a.id, [])
+        if plan == "":
+            frame = _value_frame(a, rows, divs, end)
+            if frame is not None:
+                frames[a.id] = frame
+            continue
+        if plan is None:
+            frames[a.id] = cache[a.id]
+            continue
+
+        position = stored_position(a, rows)
+        ticker   = price_ticker(a)
+        currency = (a.stock.currency if a.stock else None) or "KRW"
+        unit = unit_price_series(a, rows, price_range(ticker, plan) if ticker else None)
+        fx   = None if currency == "KRW" else price_range(fx_ticker(currency), plan)
+        tail = _position_frame(
+            a, rows, position, unit, fx, rates.get(currency, FALLBACK_RATES.get(currency, 1.0)),
+            divs, plan, end,
+        )
+        cached = cache.get(a.id)
+        frame  = _splice(cached, tail) if cached is not None and plan > cached["start"] else tail
+        frames[a.id] = cache[a.id] = {**frame, "version": version}
+        if cached is None or plan == str(position[0][0])[:10]:
+            CACHE_REQUESTS.inc(1, "performance_frame", "miss")
+
+    for stale in set(cache) - set(frames):
+        cache.pop(stale, None)
+    return frames
+
+
+# ──────────────────────────────────────────────────────────────
+# 수익률 계산 (그룹 전체 벡터 연산)
+# ──────────────────────────────────────────────────────────────
+def twr(value: np.ndarray, flow: np.ndarray, income: np.ndarray) -> np.ndarray:
+    """(T × G) 행렬, 0행 = 기간 시작 전일. 그룹별 기간 TWR"""
+    prev  = value[:-1]
+    valid = prev > _EPS
+    ratio = np.divide(value[1:] - flow[1:] + income[1:], prev, out=np.ones_like(prev), where=valid)
+    return np.prod(ratio, axis=0) - 1
+
+
+def xirr(cashflow: np.ndarray, tau: np.ndarray, iters: int = 100, tol: float = 1e-10) -> np.ndarray:
+    """
+    (T × G) 현금흐름(투입 −, 회수 +), tau = 연 단위 경과 시간.
+    현금흐름이 있는 칸만 모아 그룹 전체를 동시에 Newton 반복. 해가 없으면 NaN.
+    """
+    rows, cols = np.nonzero(np.abs(cashflow) > _EPS)
+    amount = cashflow[rows, cols]
+    t      = tau[rows]
+    groups = cashflow.shape[1]
+
+    has_in  = np.bincount(cols, weights=(amount < 0).astype(float), minlength=groups) > 0
+    has_out = np.bincount(cols, weights=(amount > 0).astype(float), minlength=groups) > 0
+    x    = np.full(groups, 0.1)
+    done = ~(has_in & has_out)
+    for _ in range(iters):
+        base = 1 + x[cols]
+        disc = base ** -t
+        f    = np.bincount(cols, weights=amount * disc, minlength=groups)
+        df   = np.bincount(cols, weights=-t * amount * disc / base, minlength=groups)
+        step = np.divide(f, df, out=np.zeros(groups), where=np.abs(df) > _EPS)
+        step[done] = 0
+        x = np.maximum(x - step, -0.9999)
+        done |= np.abs(step) < tol
+        if done.all():
+            break
+    ok = has_in & has_out & done & np.isfinite(x)
+    return np.where(ok, x, np.nan)
+
+
+def _group_columns(assets: list[Asset]) -> list[dict]:
+    """보유 종목·계좌(주식)·유형·전체 그룹 정의 [{"level", "key", "label", "members": [자산 인덱스]}]"""
+    groups = [
+        {"level": "holding", "key": a.id, "label": a.name, "type": a.type,
+         "account": (a.stock.account_name or "미분류") if a.type == "STOCK" and a.stock else None,
+         "members": [i]}
+        for i, a in enumerate(assets)
+    ]
+    accounts: dict[str, list[int]] = {}
+    types:    dict[str, list[int]] = {}
+    for i, a in enumerate(assets):
+        types.setdefault(a.type, []).append(i)
+        if a.type == "STOCK":
+            accounts.setdefault((a.stock.account_name if a.stock else None) or "미분류", []).append(i)
+    groups += [{"level": "account", "key": k, "label": k, "members": m} for k, m in sorted(accounts.items())]
+    groups += [{"level": "type", "key": k, "label": TYPE_LABELS.get(k, k), "members": m} for k, m in types.items()]
+    groups.append({"level": "portfolio", "key": "all", "label": "전체", "members": list(range(len(assets)))})
+    return groups
+
+
+def _nan_none(v: float) -> Optional[float]:
+    return None if not np.isfinite(v) else float(v)
+
+
+def performance(frames: list[dict], assets: list[Asset], start: str, end: str) -> dict:
+    """프레임 → 기간 [start, end] 그룹별 성과"""
+    days = _days(_shift(start, -1), end)
+    T, N = len(days), len(assets)
+    V = np.zeros((T, N))
+    F = np.zeros((T, N))
+    I = np.zeros((T, N))
+    for j, f in enumerate(frames):
+        if f is None:
+            continue
+        offset = len(_days(f["start"], days[0])) - 1 if f["start"] <= days[0] else -(len(_days(days[0], f["start"])) - 1)
+        lo, hi = max(0, -offset), min(T, len(f["value"]) - offset)
+        if lo < hi:
+            V[lo:hi, j] = f["value"][lo + offset:hi + offset]
+            F[lo:hi, j] = f["flow"][lo + offset:hi + offset]
+            I[lo:hi, j] = f["income"][lo + offset:hi + offset]
+
+    groups = _group_columns(assets)
+    M = np.zeros((N, len(groups)))
+    for g, grp in enumerate(groups):
+        M[grp["members"], g] = 1.0
+    GV, GF, GI = V @ M, F @ M, I @ M
+
+    period_twr = twr(GV, GF, GI)
+    cash       = -GF + GI
+    cash[0]    = -GV[0]
+    cash[-1]  += GV[-1]
+    period_irr = xirr(cash, np.arange(T) / 365.0)
+
+    years  = (T - 1) / 365.0
+    result = {"from": start, "to": end, "holdings": [], "accounts": [], "types": [], "portfolio": None}
+    for g, grp in enumerate(groups):
+        start_value, end_value = float(GV[0, g]), float(GV[-1, g])
+        net_flow, income = float(GF[1:, g].sum()), float(GI[1:, g].sum())
+        if start_value <= _EPS and end_value <= _EPS and abs(net_flow) <= _EPS and income <= _EPS:
+            continue   # 기간 중 보유 이력 없음
+        r = _nan_none(period_twr[g])
+        item = {
+            "key":            grp["key"],
+            "label":          grp["label"],
+            "start_value":    start_value,
+            "end_value":      end_value,
+            "net_flow":       net_flow,
+            "income":         income,
+            "pnl":            end_value - start_value - net_flow + income,
+            "twr":            r,
+            "twr_annualized": (1 + r) ** (1 / years) - 1 if r is not None and years >= 1 and r > -1 else None,
+            "xirr":           _nan_none(period_irr[g]),
+        }
+        if grp["level"] == "holding":
+            item.update(type=grp["type"], account=grp["account"])
+            result["holdings"].append(item)
+        elif grp["level"] == "portfolio":
+            result["portfolio"] = item
+        else:
+            result[grp["level"] + "s"].append(item)
+    return result
+
+
+async def compute_performance(
+    db: AsyncSession,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    asset_type: Optional[str] = None,
+) -> dict:
+    """
+    기간 [start, end]의 보유 종목·계좌·유형·전체 TWR/XIRR.
+    start 없으면 가장 이른 보유일, end 없으면 오늘 (미래 날짜는 오늘로 제한).
+    """
+    today = _today()
+    end   = min(end or today, today)
+    q = (
+        select(Asset)
+        .options(selectinload(Asset.transactions), selectinload(Asset.stock), selectinload(Asset.pension))
+        .order_by(Asset.name, Asset.id)
+    )
+    # 연금 중 차트 제외(주식으로 이미 집계) 자산은 중복 합산하지 않음
+    assets = [a for a in (await db.execute(q)).scalars().all() if not (a.pension and a.pension.hide_in_chart)]
+    all_frames = await _load_frames(db, assets, today)
+
+    if asset_type:
+        assets = [a for a in assets if a.type == asset_type]
+    frames = [all_frames.get(a.id) for a in assets]
+    starts = [f["start"] for f in frames if f is not None]
+    if not starts:
+        return {"from": start, "to": end, "holdings": [], "accounts": [], "types": [], "portfolio": None}
+    start = start or min(starts)
+    if start > end:
+        raise ValueError("from이 to보다 늦습니다.")
+    return performance(frames, assets, start, end)
@@ -0,0 +1,76 @@
+"""
+시세 이력 Parquet 아카이브 내보내기 (예약 실행 + CLI).
+
+지난 달 말일까지의 price_history를 포트폴리오별 연도 Parquet로 내보낸다 (backend/db/archive.py).
+- 읽기 transaction 1개(WAL snapshot)로 읽고 thread에서 쓰므로 API 요청·업데이터 쓰기를 막지 않음
+- 새로 닫힌 달이 생겼거나 지난 내보내기 이후 과거 종가가 바뀐 연도만 다시 씀 (없으면 건너뜀)
+- 예약 실행: PARQUET_INTERVAL_HOURS마다 포트폴리오별로 확인 (여러 worker 중 lock 잡은 1개만)
+
+사용법:
+    python -m backend.services.archive export [--portfolio 이름] [--full]
+    python -m backend.services.archive status [--portfolio 이름]
+"""
+import argparse
+import asyncio
+import json
+import os
+from typing import Optional
+
+from backend.core.config import PARQUET_INTERVAL_HOURS
+from backend.core.locks import FileLock
+from backend.db.archive import archive_dir, export_prices, load_manifest
+from backend.db.portfolio import DEFAULT, list_portfolios, portfolio_path
+
+
+async def run_export(name: str = DEFAULT, full: bool = False) -> Optional[dict]:
+    """포트폴리오 1개 내보내기. 다른 프로세스가 내보내는 중이거나 할 일이 없으면 None"""
+    directory = archive_dir(name)
+    lock = FileLock(os.path.join(directory, "export.lock"))
+    if not lock.try_acquire():
+        return None
+    try:
+        return await asyncio.to_thread(export_prices, portfolio_path(name), directory, None, full)
+    finally:
+        lock.release()
+
+
+async def archive_loop(interval_hours: float = PARQUET_INTERVAL_HOURS):
+    """lifespan 백그라운드 루프: 포트폴리오마다 새로 닫힌 달·과거 변경이 있으면 내보내기"""
+    while True:
+        for name in list_portfolios():
+            try:
+                report = await run_export(name)
+                if report is not None:
+                    print(f"🗄️  Parquet 아카이브 ({name}): {report['through']}까지 {report['rows']}행 "
+                          f"({report['written_rows']}행 다시 씀, {report['bytes'] / 1e6:.1f}MB, {report['seconds']}초)")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Parquet 아카이브 실패 ({name}): {e}")
+        await asyncio.sleep(interval_hours * 3600)
+
+
+def _main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="시세 이력 Parquet 아카이브")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_export = sub.add_parser("export")
+    p_export.add_argument("--portfolio", default=DEFAULT)
+    p_export.add_argument("--full", action="store_true", help="변경 여부와 관계없이 전체 다시 쓰기")
+    p_status = sub.add_parser("status")
+    p_status.add_argument("--portfolio", default=DEFAULT)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "export":
+        report = asyncio.run(run_export(args.portfolio, args.full))
+        if report is None:
+            report = {"message": "새로 닫힌 달·변경이 없거나 다른 프로세스가 내보내는 중입니다."}
+    else:
+        manifest = load_manifest(archive_dir(args.portfolio))
+        report   = None
+        if manifest is not None:
+            report = {k: v for k, v in manifest.items() if k != "_tickers"} | {"tickers": len(manifest["tickers"])}
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    _main()
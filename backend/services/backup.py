@@ -0,0 +1,285 @@
+"""
+SQLite 온라인 백업 + 압축 로테이션 + 새 파일로 복원.
+
+sqlite3 backup API로 BACKUP_STEP_PAGES page씩 복사한다 (step마다 읽기 lock을 잠깐만 잡음).
+복사·압축은 이벤트 루프 밖(thread)에서 실행하므로 백업 중에도 API 요청은 그대로 처리되고,
+WAL 모드라 업데이터 등의 쓰기도 막히지 않는다.
+
+- 다른 커넥션이 쓰면 backup API는 처음부터 다시 복사한다. 재시작이 MAX_RESTARTS회를 넘으면
+  나머지를 1 step(단일 읽기 snapshot)으로 끝낸다 — WAL에서는 읽기 snapshot이 쓰기를 막지 않음
+- 복사본은 quick_check 후 gzip 압축 → 임시 파일에서 rename (중간에 죽어도 반쪽 백업이 남지 않음)
+- BACKUP_KEEP개를 넘는 오래된 백업은 삭제
+- 보고: 구간별 시간, 처리량(MB/s), BUSY/LOCKED 대기 시간, 최장 step, 재시작 수, 압축률
+- 예약 백업: BACKUP_INTERVAL_HOURS마다 포트폴리오 DB별로 (default 외 포트폴리오는 BACKUP_DIR/portfolios,
+  가장 최근 백업 파일 시각 기준, 여러 worker 중 lock 잡은 1개만)
+
+사용법:
+    python -m backend.services.backup backup [--portfolio 이름] [--dest DIR] [--pages N] [--keep N]
+    python -m backend.services.backup list [--portfolio 이름] [--dest DIR]
+    python -m backend.services.backup restore <백업 파일> <새 DB 경로>
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from backend.core.config import (
+    BACKUP_DIR, BACKUP_INTERVAL_HOURS, BACKUP_KEEP, BACKUP_STEP_PAGES, DB_PATH, SQLITE_BUSY_TIMEOUT_MS,
+)
+from backend.core.locks import FileLock
+from backend.core.metrics import BACKUP_LOCK_WAIT, BACKUP_RUNS, BACKUP_SECONDS
+from backend.db.portfolio import DEFAULT, list_portfolios, portfolio_path
+
+MAX_RESTARTS = 3
+SUFFIX       = ".db.gz"
+_CHUNK       = 1024 * 1024
+
+
+class _Restarted(Exception):
+    """step 단위 복사가 동시 쓰기로 계속 재시작됨 → 단일 step으로 전환"""
+
+
+def _prefix(db_path: str) -> str:
+    return Path(db_path).stem + "-"
+
+
+def list_backups(dest_dir: str = BACKUP_DIR, db_path: str = DB_PATH) -> list[dict]:
+    """백업 목록 (최신순)"""
+    if not os.path.isdir(dest_dir):
+        return []
+    prefix = _prefix(db_path)
+    items  = []
+    for name in os.listdir(dest_dir):
+        if name.startswith(prefix) and name.endswith(SUFFIX):
+            st = os.stat(os.path.join(dest_dir, name))
+            items.append({
+                "path":       os.path.join(dest_dir, name),
+                "size":       st.st_size,
+                "created_at": datetime.fromtimestamp(st.st_mtime).isoformat(timespec="seconds"),
+            })
+    return sorted(items, key=lambda b: b["path"], reverse=True)
+
+
+def _copy(src_path: str, dst_path: str, pages: int) -> dict:
+    """backup API로 src → dst 복사. step 통계 반환 (progress 콜백 간격 = step 시간)"""
+    stats = {"steps": 0, "restarts": 0, "lock_wait_s": 0.0, "max_step_ms": 0.0, "mode": "stepped", "pages": 0}
+    state = {"remaining": None, "t": 0.0, "busy": False}
+
+    def progress(status, remaining, total):
+        now     = time.perf_counter()
+        elapsed = now - state["t"]
+        state["t"] = now
+        stats["steps"] += 1
+        stats["pages"]  = total
+        # BUSY/LOCKED면 콜백 뒤 sleep 후 재시도 → 그 step과 다음 간격까지 대기 시간
+        busy = status in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+        if busy or state["busy"]:
+            stats["lock_wait_s"] += elapsed
+        else:
+            stats["max_step_ms"] = max(stats["max_step_ms"], elapsed * 1000)
+        state["busy"] = busy
+        if state["remaining"] is not None and remaining > state["remaining"]:
+            stats["restarts"] += 1
+            if stats["restarts"] > MAX_RESTARTS:
+                raise _Restarted()
+        state["remaining"] = remaining
+
+    src = sqlite3.connect(src_path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000)
+    dst = sqlite3.connect(dst_path)
+    try:
+        state["t"] = time.perf_counter()
+        try:
+            src.backup(dst, pages=pages, progress=progress, sleep=0.05)
+        except _Restarted:
+            stats["mode"] = "snapshot"
+            t0 = time.perf_counter()
+            src.backup(dst, pages=-1)
+            stats["max_step_ms"] = max(stats["max_step_ms"], (time.perf_counter() - t0) * 1000)
+        stats["check"] = dst.execute("PRAGMA quick_check").fetchone()[0]
+        stats["schema_version"] = dst.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        dst.close()
+        src.close()
+    stats["lock_wait_ms"] = round(stats.pop("lock_wait_s") * 1000, 1)
+    stats["max_step_ms"]  = round(stats["max_step_ms"], 1)
+    return stats
+
+
+def _gzip_file(src: str, dst: str):
+    with open(src, "rb") as fin, gzip.open(dst, "wb", compresslevel=6) as fout:
+        shutil.copyfileobj(fin, fout, _CHUNK)
+    with open(dst, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def rotate(dest_dir: str = BACKUP_DIR, keep: int = BACKUP_KEEP, db_path: str = DB_PATH) -> list[str]:
+    """최근 keep개만 남기고 삭제. 삭제한 경로 반환"""
+    removed = [b["path"] for b in list_backups(dest_dir, db_path)[max(keep, 1):]]
+    for path in removed:
+        os.remove(path)
+    return removed
+
+
+def backup_database(db_path: str = DB_PATH, dest_dir: str = BACKUP_DIR,
+                    pages: int = BACKUP_STEP_PAGES, keep: int = BACKUP_KEEP) -> dict:
+    """(동기, thread에서 호출) 온라인 백업 1회 → 압축 → 로테이션. 보고서 dict"""
+    os.makedirs(dest_dir, exist_ok=True)
+    name  = f"{_prefix(db_path)}{datetime.now():%Y%m%d-%H%M%S}{SUFFIX}"
+    final = os.path.join(dest_dir, name)
+    raw   = final[:-len(".gz")] + ".tmp"
+    part  = final + ".tmp"
+    try:
+        t0    = time.perf_counter()
+        stats = _copy(db_path, raw, pages)
+        copy_s = time.perf_counter() - t0
+        if stats["check"] != "ok":
+            raise ValueError(f"백업 복사본 무결성 검사 실패: {stats['check']}")
+
+        t1 = time.perf_counter()
+        _gzip_file(raw, part)
+        os.replace(part, final)
+        compress_s = time.perf_counter() - t1
+        size, packed = os.path.getsize(raw), os.path.getsize(final)
+    except Exception:
+        BACKUP_RUNS.inc(1, "error")
+        raise
+    finally:
+        for path in (raw, part):
+            if os.path.exists(path):
+                os.remove(path)
+
+    removed = rotate(dest_dir, keep, db_path)
+    BACKUP_RUNS.inc(1, "ok")
+    BACKUP_SECONDS.observe(copy_s, "copy")
+    BACKUP_SECONDS.observe(compress_s, "compress")
+    BACKUP_LOCK_WAIT.observe(stats["lock_wait_ms"] / 1000)
+    return {
+        "path":            final,
+        "bytes":           size,
+        "compressed":      packed,
+        "ratio":           round(packed / size, 3) if size else None,
+        "copy_ms":         round(copy_s * 1000, 1),
+        "compress_ms":     round(compress_s * 1000, 1),
+        "copy_mb_per_s":   round(size / 1e6 / copy_s, 1) if copy_s else None,
+        **stats,
+        "removed":         removed,
+    }
+
+
+async def run_backup(db_path: str = DB_PATH, dest_dir: str = BACKUP_DIR,
+                     pages: int = BACKUP_STEP_PAGES, keep: int = BACKUP_KEEP,
+                     min_interval_hours: float = 0) -> Optional[dict]:
+    """
+    이벤트 루프 밖에서 백업 1회. 다른 프로세스가 백업 중이거나
+    가장 최근 백업이 min_interval_hours 이내면 None
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    lock = FileLock(os.path.join(dest_dir, "backup.lock"))
+    if not lock.try_acquire():
+        BACKUP_RUNS.inc(1, "skipped")
+        return None
+    try:
+        if min_interval_hours > 0:
+            latest = list_backups(dest_dir, db_path)
+            if latest and time.time() - os.path.getmtime(latest[0]["path"]) < min_interval_hours * 3600:
+                return None
+        return await asyncio.to_thread(backup_database, db_path, dest_dir, pages, keep)
+    finally:
+        lock.release()
+
+
+def portfolio_backup_dir(name: str, dest_dir: str = BACKUP_DIR) -> str:
+    """default는 dest_dir 그대로, 나머지 포트폴리오는 dest_dir/portfolios (파일 이름 충돌 방지)"""
+    return dest_dir if name == DEFAULT else os.path.join(dest_dir, "portfolios")
+
+
+async def backup_loop(interval_hours: float = BACKUP_INTERVAL_HOURS):
+    """lifespan 백그라운드 루프: 포트폴리오 DB마다 가장 최근 백업이 interval_hours보다 오래되면 백업"""
+    while True:
+        for name in list_portfolios():
+            try:
+                report = await run_backup(portfolio_path(name), portfolio_backup_dir(name),
+                                          min_interval_hours=interval_hours)
+                if report is not None:
+                    print(f"💾 예약 백업: {report['path']} ({report['compressed'] / 1e6:.1f}MB, "
+                          f"{report['copy_mb_per_s']}MB/s, lock 대기 {report['lock_wait_ms']}ms)")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ 예약 백업 실패 ({name}): {e}")
+        await asyncio.sleep(min(600, interval_hours * 3600))
+
+
+# ──────────────────────────────────────────────────────────────
+# 복원
+# ──────────────────────────────────────────────────────────────
+def restore_backup(backup_path: str, dest_path: str) -> dict:
+    """백업을 새 DB 파일로 복원 (운영 DB는 건드리지 않음 — 교체는 서버 중지 후 수동)"""
+    if os.path.exists(dest_path):
+        raise FileExistsError(f"이미 있는 파일입니다: {dest_path}")
+    os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+    part = dest_path + ".tmp"
+    t0   = time.perf_counter()
+    try:
+        opener = gzip.open if backup_path.endswith(".gz") else open
+        with opener(backup_path, "rb") as fin, open(part, "wb") as fout:
+            shutil.copyfileobj(fin, fout, _CHUNK)
+        conn = sqlite3.connect(part)
+        try:
+            check   = conn.execute("PRAGMA quick_check").fetchone()[0]
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            assets  = conn.execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+        finally:
+            conn.close()
+        if check != "ok":
+            raise ValueError(f"복원 파일 무결성 검사 실패: {check}")
+        os.replace(part, dest_path)
+    finally:
+        if os.path.exists(part):
+            os.remove(part)
+    return {
+        "path":           dest_path,
+        "bytes":          os.path.getsize(dest_path),
+        "schema_version": version,
+        "assets":         assets,
+        "elapsed_ms":     round((time.perf_counter() - t0) * 1000, 1),
+    }
+
+
+def _main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="SQLite 온라인 백업/복원")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_backup = sub.add_parser("backup")
+    p_backup.add_argument("--portfolio", default=DEFAULT)
+    p_backup.add_argument("--dest",      default=BACKUP_DIR)
+    p_backup.add_argument("--pages",     type=int, default=BACKUP_STEP_PAGES, help="step당 page 수 (-1이면 한 번에)")
+    p_backup.add_argument("--keep",      type=int, default=BACKUP_KEEP)
+    p_list = sub.add_parser("list")
+    p_list.add_argument("--portfolio", default=DEFAULT)
+    p_list.add_argument("--dest",      default=BACKUP_DIR)
+    p_restore = sub.add_parser("restore")
+    p_restore.add_argument("backup")
+    p_restore.add_argument("dest", help="새 DB 파일 경로 (이미 있으면 중단)")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "backup":
+        dest   = portfolio_backup_dir(args.portfolio, args.dest)
+        report = asyncio.run(run_backup(portfolio_path(args.portfolio), dest, args.pages, args.keep))
+        if report is None:
+            raise SystemExit("다른 프로세스가 백업 중입니다.")
+    elif args.cmd == "list":
+        report = list_backups(portfolio_backup_dir(args.portfolio, args.dest), portfolio_path(args.portfolio))
+    else:
+        report = restore_backup(args.backup, args.dest)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    _main()
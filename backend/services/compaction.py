@@ -0,0 +1,306 @@
+"""
+오래된 일별 이력 압축 (Tiered compaction).
+
+최근 COMPACTION_KEEP_YEARS년은 일별 그대로 두고, 그 이전 구간은
+  - 월별 마지막 행 (월말 시점 값)
+  - 변경 시점: 첫 행, 거래일, 취득일, 매각일, 배당락일
+만 남긴다. 차트는 forward fill이므로 월말 샘플 값은 압축 전후가 동일하며,
+실행 시 이를 직접 비교해 다르면 롤백한다.
+
+- 증분 실행: settings의 compaction_cutoff 이후~새 cutoff 이전 구간만 처리
+- 되돌리기: 삭제 행은 ARCHIVE_DIR/compaction-*.jsonl.gz에 보관 → restore로 복원
+
+사용법:
+    python -m backend.services.compaction [--portfolio 이름] compact [--keep-years 3]
+    python -m backend.services.compaction [--portfolio 이름] restore <archive 파일>
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import ARCHIVE_DIR, COMPACTION_KEEP_YEARS
+from backend.db.crud import get_all_assets, generate_chart_data
+from backend.db.prices import normalize_ticker, fx_ticker
+
+_WATERMARK_KEY = "compaction_cutoff"
+
+
+def _cutoff_for(keep_years: int) -> str:
+    """keep_years년 전 달의 1일 (월 단위로 끊어야 월말 행이 온전히 남음)"""
+    today = datetime.now()
+    return f"{today.year - keep_years:04d}-{today.month:02d}-01"
+
+
+def _month_end_samples(chart: list[dict]) -> dict[tuple[str, str], float]:
+    """차트 결과 중 월말(및 마지막 날짜) 값만 추출"""
+    dates = sorted({r["date"] for r in chart})
+    keep  = {d for d, nxt in zip(dates, dates[1:]) if d[:7] != nxt[:7]}
+    if dates:
+        keep.add(dates[-1])
+    return {(r["date"], r["label"]): r["value"] for r in chart if r["date"] in keep}
+
+
+def _same_samples(a: dict, b: dict) -> bool:
+    if a.keys() != b.keys():
+        return False
+    return all(abs(a[k] - b[k]) <= 1e-6 * max(1.0, abs(a[k])) for k in a)
+
+
+async def _timed_chart(db: AsyncSession, repeat: int = 3) -> tuple[list[dict], float]:
+    """전체 기간 차트 (자산 로드 + 집계) 결과와 최소 소요 시간(ms, repeat회 중)"""
+    best = float("inf")
+    for _ in range(repeat):
+        db.expire_all()
+        t0     = time.perf_counter()
+        assets = await get_all_assets(db)
+        chart  = generate_chart_data(assets, period="all")
+        best   = min(best, (time.perf_counter() - t0) * 1000)
+    return chart, best
+
+
+async def _get_watermark(db: AsyncSession) -> str:
+    row = (await db.execute(text("SELECT value FROM settings WHERE key = :k"), {"k": _WATERMARK_KEY})).fetchone()
+    return row[0] if row else "0000-00-00"
+
+
+async def daily_from(db: AsyncSession) -> Optional[str]:
+    """이 날짜 이후만 일별 이력이 온전함 (이전은 월말·변경 시점만). 압축한 적 없으면 None"""
+    value = await _get_watermark(db)
+    return None if value == "0000-00-00" else value
+
+
+async def _set_watermark(db: AsyncSession, value: str):
+    await db.execute(
+        text("INSERT INTO settings (key, value) VALUES (:k, :v) "
+             "ON CONFLICT(key) DO UPDATE SET value = :v"),
+        {"k": _WATERMARK_KEY, "v": value},
+    )
+
+
+async def _change_points(db: AsyncSession) -> tuple[dict, dict, dict]:
+    """
+    자산별 변경 시점 날짜 집합 + Ticker/통화 매핑.
+    반환: (asset_id → {dates}, asset_id → ticker, asset_id → currency)
+    """
+    points: dict[str, set[str]] = defaultdict(set)
+    for asset_id, date in (await db.execute(text("SELECT asset_id, date FROM transactions"))).all():
+        points[asset_id].add(date[:10])
+    for asset_id, acq, disp in (await db.execute(
+        text("SELECT id, acquisition_date, disposal_date FROM assets")
+    )).all():
+        for d in (acq, disp):
+            if d:
+                points[asset_id].add(d[:10])
+
+    tickers, currencies = {}, {}
+    for asset_id, ticker, currency in (await db.execute(text(
+        "SELECT sd.asset_id, sd.ticker, sd.currency FROM stock_details sd "
+        "JOIN assets a ON a.id = sd.asset_id "
+        "WHERE a.type = 'STOCK' AND sd.ticker IS NOT NULL AND TRIM(sd.ticker) != ''"
+    ))).all():
+        tickers[asset_id]    = normalize_ticker(ticker)
+        currencies[asset_id] = currency or "KRW"
+    return points, tickers, currencies
+
+
+def _keep_monthly(dates: list[str], always: set[str]) -> set[str]:
+    """날짜 목록(오름차순) 중 월별 마지막 날짜 + always에 포함된 날짜"""
+    keep = {d for d, nxt in zip(dates, dates[1:]) if d[:7] != nxt[:7]}
+    if dates:
+        keep.add(dates[-1])
+    return keep | (always & set(dates))
+
+
+async def compact_history(
+    db: AsyncSession,
+    keep_years: int = COMPACTION_KEEP_YEARS,
+    archive_dir: str = ARCHIVE_DIR,
+) -> dict:
+    """
+    이력 압축 실행 (호출자가 commit). 월말 샘플 차트가 달라지면 변경 없이 ValueError.
+    반환: 삭제 행 수, 아카이브 경로, 압축 전후 전체 차트 소요 시간(ms)
+    """
+    cutoff = _cutoff_for(keep_years)
+    since  = await _get_watermark(db)
+    report = {"from": since, "to": cutoff, "price_rows_removed": 0, "history_rows_removed": 0,
+              "archive": None, "chart_ms_before": None, "chart_ms_after": None}
+    if cutoff <= since:
+        return report
+
+    chart_before, report["chart_ms_before"] = await _timed_chart(db)
+    points, tickers, currencies = await _change_points(db)
+
+    # ── price_history: Ticker별 월말 + 배당락일 + 보유 자산 변경 시점 + 첫 행
+    ticker_points: dict[str, set[str]] = defaultdict(set)
+    for asset_id, t in tickers.items():
+        ticker_points[t] |= points.get(asset_id, set())
+    first_rows = dict((await db.execute(text(
+        "SELECT ticker, MIN(date) FROM price_history GROUP BY ticker"
+    ))).all())
+
+    price_rows: dict[str, list[tuple]] = defaultdict(list)
+    for row in (await db.execute(text(
+        "SELECT ticker, date, close, dividend FROM price_history "
+        "WHERE date >= :s AND date < :c ORDER BY ticker, date"
+    ), {"s": since, "c": cutoff})).all():
+        price_rows[row[0]].append(row)
+
+    fx_names   = {fx_ticker(c) for c in set(currencies.values()) if c != "KRW"}
+    kept_dates: dict[str, set[str]] = {}
+    removed_prices: list[tuple] = []
+
+    def _compact_ticker(t: str, always: set[str]):
+        rows   = price_rows.get(t, [])
+        dates  = [r[1] for r in rows]
+        always = always | {r[1] for r in rows if (r[3] or 0) > 0} | {first_rows.get(t)}
+        keep   = _keep_monthly(dates, always)
+        kept_dates[t] = keep
+        removed_prices.extend(r for r in rows if r[1] not in keep)
+
+    for t in price_rows:
+        if t not in fx_names:
+            _compact_ticker(t, ticker_points.get(t, set()))
+    # 환율: 남은 종가 날짜마다 '그 날짜 이전 마지막 환율' 행을 유지해야 월말 평가액이 동일
+    for t in fx_names & price_rows.keys():
+        fx_dates = np.array([r[1] for r in price_rows[t]])
+        needed   = set()
+        for asset_id, cur in currencies.items():
+            if fx_ticker(cur) != t:
+                continue
+            kd = np.array(sorted(kept_dates.get(tickers[asset_id], set()) | points.get(asset_id, set())))
+            if len(kd):
+                idx = np.searchsorted(fx_dates, kd, side="right") - 1
+                needed |= {str(fx_dates[i]) for i in idx if i >= 0}
+        _compact_ticker(t, needed)
+
+    # ── asset_history: 자산별 월말 + 변경 시점 + 첫 행 (값이 없는 행은 차트 무관 → 유지)
+    hist_rows: dict[str, list[tuple]] = defaultdict(list)
+    for row in (await db.execute(text(
+        "SELECT id, asset_id, date, value, price, quantity FROM asset_history "
+        "WHERE date >= :s AND date < :c ORDER BY asset_id, date"
+    ), {"s": since, "c": cutoff})).all():
+        if row[3] is not None or row[4] is not None:
+            hist_rows[row[1]].append(row)
+    first_hist = dict((await db.execute(text(
+        "SELECT asset_id, MIN(date) FROM asset_history GROUP BY asset_id"
+    ))).all())
+
+    removed_hist: list[tuple] = []
+    for asset_id, rows in hist_rows.items():
+        # 같은 날짜 중복 행은 차트에서 마지막 것만 쓰이므로 날짜 단위로 판단
+        keep = _keep_monthly(sorted({r[2][:10] for r in rows}),
+                             points.get(asset_id, set()) | {first_hist.get(asset_id)})
+        removed_hist.extend(r for r in rows if r[2][:10] not in keep)
+
+    if not removed_prices and not removed_hist:
+        await _set_watermark(db, cutoff)
+        return report
+
+    if removed_prices:
+        await db.execute(
+            text("DELETE FROM price_history WHERE ticker = :t AND date = :d"),
+            [{"t": r[0], "d": r[1]} for r in removed_prices],
+        )
+    if removed_hist:
+        await db.execute(
+            text("DELETE FROM asset_history WHERE id = :i"),
+            [{"i": r[0]} for r in removed_hist],
+        )
+
+    chart_after, report["chart_ms_after"] = await _timed_chart(db)
+    if not _same_samples(_month_end_samples(chart_before), _month_end_samples(chart_after)):
+        await db.rollback()
+        raise ValueError("압축 후 월말 차트 값이 달라져 중단했습니다.")
+
+    # 아카이브 기록 후 watermark 갱신 (commit은 호출자)
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"compaction-{since[:7]}_{cutoff[:7]}-{datetime.now():%Y%m%d%H%M%S}.jsonl.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"from": since, "to": cutoff, "created_at": datetime.now().isoformat()}) + "\n")
+        for t, d, c, dv in removed_prices:
+            f.write(json.dumps({"table": "price_history", "ticker": t, "date": d, "close": c, "dividend": dv}) + "\n")
+        for i, a, d, v, p, q in removed_hist:
+            f.write(json.dumps({"table": "asset_history", "asset_id": a, "date": d,
+                                "value": v, "price": p, "quantity": q}) + "\n")
+    await _set_watermark(db, cutoff)
+
+    report.update({
+        "price_rows_removed":   len(removed_prices),
+        "history_rows_removed": len(removed_hist),
+        "archive":              path,
+    })
+    return report
+
+
+async def restore_archive(db: AsyncSession, path: str) -> dict:
+    """
+    압축 아카이브 복원 (호출자가 commit). 이미 있는 행/삭제된 자산의 행은 건너뛴다.
+    가장 최근 압축을 되돌린 경우 watermark도 압축 전 값으로 되돌린다.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        rows   = [json.loads(line) for line in f if line.strip()]
+
+    prices = [r for r in rows if r["table"] == "price_history"]
+    hist   = [r for r in rows if r["table"] == "asset_history"]
+    if prices:
+        await db.execute(
+            text("INSERT OR IGNORE INTO price_history (ticker, date, close, dividend) "
+                 "VALUES (:ticker, :date, :close, :dividend)"),
+            prices,
+        )
+    restored_hist = 0
+    if hist:
+        live = set((await db.execute(text("SELECT id FROM assets"))).scalars().all())
+        existing = set((await db.execute(text("SELECT asset_id, date FROM asset_history"))).all())
+        hist = [r for r in hist if r["asset_id"] in live and (r["asset_id"], r["date"]) not in existing]
+        if hist:
+            await db.execute(
+                text("INSERT INTO asset_history (asset_id, date, value, price, quantity) "
+                     "VALUES (:asset_id, :date, :value, :price, :quantity)"),
+                hist,
+            )
+        restored_hist = len(hist)
+
+    if await _get_watermark(db) == header["to"]:
+        await _set_watermark(db, header["from"])
+    return {"price_rows_restored": len(prices), "history_rows_restored": restored_hist, **header}
+
+
+async def _main(argv: Optional[list[str]] = None):
+    from backend.db.database import async_session, init_db, portfolio_scope
+    from backend.db.portfolio import DEFAULT, portfolio_exists
+
+    parser = argparse.ArgumentParser(description="오래된 일별 이력 압축/복원")
+    parser.add_argument("--portfolio", default=DEFAULT)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_compact = sub.add_parser("compact")
+    p_compact.add_argument("--keep-years", type=int, default=COMPACTION_KEEP_YEARS)
+    p_restore = sub.add_parser("restore")
+    p_restore.add_argument("archive")
+    args = parser.parse_args(argv)
+
+    if not portfolio_exists(args.portfolio):
+        raise SystemExit(f"포트폴리오를 찾을 수 없습니다: {args.portfolio}")
+    await init_db()
+    async with portfolio_scope(args.portfolio), async_session() as db:
+        if args.cmd == "compact":
+            report = await compact_history(db, keep_years=args.keep_years)
+        else:
+            report = await restore_archive(db, args.archive)
+        await db.commit()
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,293 @@
+"""
+거래소 캘린더: KRX / NYSE·NASDAQ / TSE 정규장 시간과 휴장일, 외환(평일 24시간).
+
+업데이트 계획(update planner)이 Ticker별로 "새 시세가 생겼을 수 있는가"를 판단하는 데 쓴다.
+- 장중: 실시간 현재가만 의미 있음
+- 장 마감(+정산 여유) 후: 당일 확정 종가 조회
+- 휴장일·주말·이미 확정 종가 보유: 네트워크 조회 불필요
+
+휴장일은 규칙 + 음력/선거일 표(_KRX_LUNAR 등)로 계산한다. 표에 없는 해의 음력 휴일은 영업일로 간주하므로
+판단이 틀려도 조회를 1회 더 할 뿐이고(휴일을 영업일로 본 경우), 반대로 놓친 영업일은 다음 조회 구간에 포함된다.
+"""
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+# 장 마감 후 확정 종가가 provider에 반영될 때까지의 여유 (분)
+SETTLE_MINUTES = 30
+
+_DAY = timedelta(days=1)
+
+
+# ──────────────────────────────────────────────────────────────
+# 날짜 규칙
+# ──────────────────────────────────────────────────────────────
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """month의 n번째 weekday (월=0)"""
+    d = date(year, month, 1)
+    return d + timedelta(days=(weekday - d.weekday()) % 7 + 7 * (n - 1))
+
+
+def _last_weekday(year: int, month: int, weekday: int) -> date:
+    d = date(year + month // 12, month % 12 + 1, 1) - _DAY
+    return d - timedelta(days=(d.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    """부활절 (그레고리력, Anonymous 알고리즘)"""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    return date(year, (h + l - 7 * m + 114) // 31, (h + l - 7 * m + 114) % 31 + 1)
+
+
+def _next_free(d: date, taken: set[date]) -> date:
+    """d 이후 첫 평일이면서 휴일이 아닌 날 (대체공휴일)"""
+    d += _DAY
+    while d.weekday() >= 5 or d in taken:
+        d += _DAY
+    return d
+
+
+# ──────────────────────────────────────────────────────────────
+# KRX
+# ──────────────────────────────────────────────────────────────
+# 설날, 추석, 부처님오신날 (양력)
+_KRX_LUNAR = {
+    2020: ("2020-01-25", "2020-10-01", "2020-04-30"),
+    2021: ("2021-02-12", "2021-09-21", "2021-05-19"),
+    2022: ("2022-02-01", "2022-09-10", "2022-05-08"),
+    2023: ("2023-01-22", "2023-09-29", "2023-05-27"),
+    2024: ("2024-02-10", "2024-09-17", "2024-05-15"),
+    2025: ("2025-01-29", "2025-10-06", "2025-05-05"),
+    2026: ("2026-02-17", "2026-09-25", "2026-05-24"),
+    2027: ("2027-02-07", "2027-09-15", "2027-05-13"),
+    2028: ("2028-01-26", "2028-10-03", "2028-05-02"),
+    2029: ("2029-02-13", "2029-09-22", "2029-05-20"),
+    2030: ("2030-02-03", "2030-09-12", "2030-05-09"),
+}
+# 선거일·임시공휴일
+_KRX_EXTRA = {
+    "2020-04-15", "2020-08-17", "2022-03-09", "2022-06-01", "2023-10-02",
+    "2024-04-10", "2024-10-01", "2025-01-27", "2025-06-03", "2026-06-03",
+}
+
+
+def _krx_holidays(year: int) -> set[date]:
+    fixed = {
+        "new_year":  date(year, 1, 1),
+        "march1":    date(year, 3, 1),
+        "labor":     date(year, 5, 1),    # 근로자의 날 (증시 휴장)
+        "children":  date(year, 5, 5),
+        "memorial":  date(year, 6, 6),
+        "liberty":   date(year, 8, 15),
+        "national":  date(year, 10, 3),
+        "hangul":    date(year, 10, 9),
+        "christmas": date(year, 12, 25),
+    }
+    days = set(fixed.values())
+    days |= {date.fromisoformat(d) for d in _KRX_EXTRA if d.startswith(str(year))}
+
+    lunar = _KRX_LUNAR.get(year)
+    blocks: list[list[date]] = []
+    buddha = None
+    if lunar:
+        for center in map(date.fromisoformat, lunar[:2]):
+            blocks.append([center - _DAY, center, center + _DAY])
+        buddha = date.fromisoformat(lunar[2])
+        days |= {d for block in blocks for d in block} | {buddha}
+
+    # 대체공휴일
+    subs: set[date] = set()
+    if year >= 2014:
+        for block in blocks:   # 설날·추석: 일요일 또는 다른 공휴일과 겹치면 연휴 다음 첫 평일
+            others = days - set(block)
+            if any(d.weekday() == 6 or d in others for d in block):
+                subs.add(_next_free(block[-1], days | subs))
+        d = fixed["children"]
+        if d.weekday() >= 5 or d == buddha:
+            subs.add(_next_free(d, days | subs))
+    weekend_rule = [fixed["march1"], fixed["liberty"], fixed["national"], fixed["hangul"]] if year >= 2021 else []
+    if year >= 2023:
+        weekend_rule += [fixed["christmas"]] + ([buddha] if buddha else [])
+    for d in weekend_rule:
+        if d.weekday() >= 5:
+            subs.add(_next_free(d, days | subs))
+    days |= subs
+
+    # 연말 휴장: 12월 마지막 영업일
+    d = date(year, 12, 31)
+    while d.weekday() >= 5 or d in days:
+        d -= _DAY
+    days.add(d)
+    return days
+
+
+# ──────────────────────────────────────────────────────────────
+# NYSE / NASDAQ
+# ──────────────────────────────────────────────────────────────
+def _observed(d: date) -> date:
+    """토 → 금, 일 → 월"""
+    return d - _DAY if d.weekday() == 5 else d + _DAY if d.weekday() == 6 else d
+
+
+def _nyse_holidays(year: int) -> set[date]:
+    days = {
+        _nth_weekday(year, 1, 0, 3),      # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),      # Presidents' Day
+        _easter(year) - 2 * _DAY,         # Good Friday
+        _last_weekday(year, 5, 0),        # Memorial Day
+        _observed(date(year, 7, 4)),      # Independence Day
+        _nth_weekday(year, 9, 0, 1),      # Labor Day
+        _nth_weekday(year, 11, 3, 4),     # Thanksgiving
+        _observed(date(year, 12, 25)),    # Christmas
+    }
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:          # 토요일이면 전년 12/31로 옮기지 않음 (NYSE 규칙)
+        days.add(_observed(new_year))
+    if year >= 2022:
+        days.add(_observed(date(year, 6, 19)))   # Juneteenth
+    return days
+
+
+def _nyse_early_closes(year: int) -> set[date]:
+    """13:00 조기 마감: 독립기념일 전날, 추수감사절 다음날, 크리스마스 이브 (평일 월~목만)"""
+    days = {_nth_weekday(year, 11, 3, 4) + _DAY}
+    for d in (date(year, 7, 3), date(year, 12, 24)):
+        if d.weekday() <= 3:
+            days.add(d)
+    return days
+
+
+# ──────────────────────────────────────────────────────────────
+# TSE
+# ──────────────────────────────────────────────────────────────
+def _equinox(year: int, base: float) -> int:
+    return int(base + 0.242194 * (year - 1980) - (year - 1980) // 4)
+
+
+# 도쿄 올림픽 특례 (바다의 날·스포츠의 날·산의 날 이동)
+_TSE_OVERRIDES = {
+    2020: ("2020-07-23", "2020-07-24", "2020-08-10"),
+    2021: ("2021-07-22", "2021-07-23", "2021-08-08"),
+}
+
+
+def _tse_holidays(year: int) -> set[date]:
+    national = {
+        date(year, 1, 1),
+        _nth_weekday(year, 1, 0, 2),                  # 성인의 날
+        date(year, 2, 11),                            # 건국기념일
+        date(year, 3, _equinox(year, 20.8431)),       # 춘분
+        date(year, 4, 29),                            # 쇼와의 날
+        date(year, 5, 3), date(year, 5, 4), date(year, 5, 5),
+        date(year, 9, _equinox(year, 23.2488)),       # 추분
+        _nth_weekday(year, 9, 0, 3),                  # 경로의 날
+        date(year, 11, 3), date(year, 11, 23),
+    }
+    if year >= 2020:
+        national.add(date(year, 2, 23))               # 천황탄생일
+    if year in _TSE_OVERRIDES:
+        national |= {date.fromisoformat(d) for d in _TSE_OVERRIDES[year]}
+    else:
+        national |= {
+            _nth_weekday(year, 7, 0, 3),              # 바다의 날
+            date(year, 8, 11),                        # 산의 날
+            _nth_weekday(year, 10, 0, 2),             # 스포츠의 날
+        }
+    # 국민의 휴일: 공휴일 사이에 낀 평일
+    for d in list(national):
+        if d + 2 * _DAY in national and d + _DAY not in national and (d + _DAY).weekday() != 6:
+            national.add(d + _DAY)
+    # 대체휴일: 일요일 공휴일 → 다음 비공휴일
+    for d in sorted(national):
+        if d.weekday() == 6:
+            n = d + _DAY
+            while n in national:
+                n += _DAY
+            national.add(n)
+    # 거래소 연말연시 휴장 (1/1~1/3, 12/31)
+    return national | {date(year, 1, 2), date(year, 1, 3), date(year, 12, 31)}
+
+
+# ──────────────────────────────────────────────────────────────
+# 거래소
+# ──────────────────────────────────────────────────────────────
+# 이름 → (시간대, 개장, 마감, 휴장일 함수, 조기 마감일 함수, 조기 마감 시각)
+_EXCHANGES = {
+    "KRX":  ("Asia/Seoul",       time(9, 0),  time(15, 30), _krx_holidays,  None,               None),
+    "NYSE": ("America/New_York", time(9, 30), time(16, 0),  _nyse_holidays, _nyse_early_closes, time(13, 0)),
+    "TSE":  ("Asia/Tokyo",       time(9, 0),  time(15, 30), _tse_holidays,  None,               None),
+    "FX":   ("UTC",              None,        None,         None,           None,               None),
+}
+
+
+def exchange_of(ticker: str) -> Optional[str]:
+    """Ticker → 거래소 이름. 알 수 없는 시장(.L, .HK 등)은 None"""
+    t = ticker.upper()
+    if t.endswith("=X"):
+        return "FX"
+    if t.endswith((".KS", ".KQ")):
+        return "KRX"
+    if t.endswith(".T"):
+        return "TSE"
+    if "." not in t:   # 미국 주식 (NYSE·NASDAQ 같은 일정)
+        return "NYSE"
+    return None
+
+
+@lru_cache(maxsize=64)
+def holidays(exchange: str, year: int) -> frozenset[date]:
+    fn = _EXCHANGES[exchange][3]
+    return frozenset(fn(year)) if fn else frozenset()
+
+
+def is_trading_day(exchange: str, d: date) -> bool:
+    return d.weekday() < 5 and d not in holidays(exchange, d.year)
+
+
+def previous_trading_day(exchange: str, d: date) -> date:
+    d -= _DAY
+    while not is_trading_day(exchange, d):
+        d -= _DAY
+    return d
+
+
+def _close_time(exchange: str, d: date) -> Optional[time]:
+    _, _, close, _, early_fn, early_at = _EXCHANGES[exchange]
+    if early_fn and d in early_fn(d.year):
+        return early_at
+    return close
+
+
+def session(exchange: str, now: Optional[datetime] = None) -> dict:
+    """
+    거래소 현지 기준 현재 세션 상태.
+    반환: {
+        "date":          현지 오늘 ('YYYY-MM-DD'),
+        "open":          장중 여부 (개장 ~ 마감 + SETTLE_MINUTES),
+        "last_complete": 확정 종가가 나와 있어야 하는 마지막 거래일,
+    }
+    외환(FX)은 평일 24시간 거래 → 평일은 항상 장중, 확정 종가는 전 영업일까지.
+    """
+    tz_name, open_at, _, _, _, _ = _EXCHANGES[exchange]
+    now   = (now or datetime.now().astimezone()).astimezone(ZoneInfo(tz_name))
+    today = now.date()
+
+    if not is_trading_day(exchange, today):
+        is_open, last = False, previous_trading_day(exchange, today)
+    elif open_at is None:
+        is_open, last = True, previous_trading_day(exchange, today)
+    else:
+        settled = datetime.combine(today, _close_time(exchange, today), now.tzinfo) + timedelta(minutes=SETTLE_MINUTES)
+        if now >= settled:
+            is_open, last = False, today
+        else:
+            is_open = now >= datetime.combine(today, open_at, now.tzinfo)
+            last    = previous_trading_day(exchange, today)
+    return {"date": today.isoformat(), "open": is_open, "last_complete": last.isoformat()}
@@ -0,0 +1,147 @@
+"""
+시세/환율 provider 계층.
+
+조회 종류별로 provider를 순서대로 시도한다 (ordered fallback).
+- 해당 조회를 지원하지 않는 provider(예: 해외 주식에 네이버)는 건너뜀
+- circuit이 열린 provider는 호출 없이 건너뜀 → 장애 provider가 Ticker마다 타임아웃을 물지 않음
+- None(알 수 없음)·ProviderError면 다음 provider, 빈 목록은 '데이터 없음'으로 확정
+- 현재가는 provider별 묶음 조회(quotes) + TTL 메모리 캐시(quote_cache)
+
+MARKET_DATA_PROVIDERS로 순서를 지정하면 모든 조회에 같은 순서를 적용한다 (예: "fixture").
+"""
+from typing import Optional
+
+from backend.core.config import MARKET_DATA_PROVIDERS
+from backend.core.metrics import PROVIDER_REQUESTS
+from backend.services.market_data.base import (
+    Provider, HttpProvider, ProviderError, CircuitBreaker, HostLimiter, Rows, aclose,
+)
+from backend.services.market_data.fixture import FixtureProvider
+from backend.services.market_data.frankfurter import FrankfurterProvider
+from backend.services.market_data.naver import NaverProvider
+from backend.services.market_data.quotes import QuoteCache, quote_cache
+from backend.services.market_data.yahoo import YahooProvider, YFinanceProvider
+
+_FACTORIES = {
+    "naver":       NaverProvider,
+    "yahoo":       YahooProvider,
+    "yfinance":    YFinanceProvider,
+    "frankfurter": FrankfurterProvider,
+    "fixture":     FixtureProvider,
+}
+
+# 조회 종류별 기본 순서 (기존 동작: 국내 현재가 네이버, 환율 frankfurter 우선)
+_DEFAULT_ORDER = {
+    "history": ("yahoo", "yfinance", "frankfurter"),
+    "quote":   ("naver", "yahoo", "yfinance"),
+    "fx_rate": ("frankfurter", "yahoo", "yfinance"),
+}
+
+_instances: dict[str, Provider] = {}
+_override: Optional[list[Provider]] = None
+
+
+def _provider(name: str) -> Provider:
+    if name not in _instances:
+        if name not in _FACTORIES:
+            raise ValueError(f"알 수 없는 provider: {name} (가능: {', '.join(_FACTORIES)})")
+        _instances[name] = _FACTORIES[name]()
+    return _instances[name]
+
+
+def providers(op: str) -> list[Provider]:
+    """op 조회 시 시도할 provider 순서"""
+    if _override is not None:
+        return _override
+    return [_provider(n) for n in (MARKET_DATA_PROVIDERS or _DEFAULT_ORDER[op])]
+
+
+def set_providers(chain: Optional[list[Provider]]):
+    """모든 조회의 provider 순서를 교체 (None이면 설정/기본 순서로 복귀). 검증·benchmark용"""
+    global _override
+    _override = list(chain) if chain is not None else None
+    quote_cache.clear()
+
+
+async def _first(op: str, key: str, *args):
+    for p in providers(op):
+        if not p.supports(op, key):
+            continue
+        if not p.breaker.allow():
+            PROVIDER_REQUESTS.inc(1, p.name, op, "open")
+            continue
+        try:
+            result = await getattr(p, op)(key, *args)
+        except Exception as e:
+            p.breaker.failure()
+            PROVIDER_REQUESTS.inc(1, p.name, op, "error")
+            state = " → circuit open" if p.breaker.state == "open" else ""
+            print(f"⚠️ {p.name} {op} 실패 ({key}): {e}{state}")
+            continue
+        p.breaker.success()
+        PROVIDER_REQUESTS.inc(1, p.name, op, "empty" if result is None else "ok")
+        if result is not None:
+            return result
+    return None
+
+
+async def quotes_counted(tickers: list[str]) -> tuple[dict[str, float], int]:
+    """
+    여러 Ticker 현재가를 provider별 묶음 조회. 앞 provider가 못 준 Ticker만 다음 provider로.
+    반환: ({Ticker: 가격}, upstream 요청 수)
+    """
+    found: dict[str, float] = {}
+    remaining = list(dict.fromkeys(tickers))
+    requests  = 0
+    for p in providers("quote"):
+        subset = [t for t in remaining if p.supports("quote", t)]
+        if not subset:
+            continue
+        if not p.breaker.allow():
+            PROVIDER_REQUESTS.inc(1, p.name, "quotes", "open")
+            continue
+        requests += -(-len(subset) // p.batch_size)
+        try:
+            result = await p.quotes(subset)
+        except Exception as e:
+            p.breaker.failure()
+            PROVIDER_REQUESTS.inc(1, p.name, "quotes", "error")
+            print(f"⚠️ {p.name} quotes 실패 ({len(subset)}종목): {e}")
+            continue
+        p.breaker.success()
+        PROVIDER_REQUESTS.inc(1, p.name, "quotes", "ok" if result else "empty")
+        found.update({t: v for t, v in result.items() if v and v > 0})
+        remaining = [t for t in remaining if t not in found]
+        if not remaining:
+            break
+    return found, requests
+
+
+async def quotes(tickers: list[str]) -> dict[str, float]:
+    """여러 Ticker 현재가 (캐시 없음 — 반복 조회는 quote_cache.get_many 사용)"""
+    return (await quotes_counted(tickers))[0]
+
+
+async def history(ticker: str, start: str, end: str) -> Optional[Rows]:
+    """[start, end) 일별 종가·배당락. 모든 provider 실패/미지원이면 None"""
+    return await _first("history", ticker, start, end)
+
+
+async def quote(ticker: str) -> Optional[float]:
+    """실시간 현재가"""
+    price = await _first("quote", ticker)
+    return price if price and price > 0 else None
+
+
+async def fx_rate(currency: str) -> Optional[float]:
+    """1 currency = ? KRW"""
+    rate = await _first("fx_rate", currency)
+    return rate if rate and rate > 0 else None
+
+
+__all__ = [
+    "Provider", "HttpProvider", "ProviderError", "CircuitBreaker", "HostLimiter", "Rows",
+    "NaverProvider", "YahooProvider", "YFinanceProvider", "FrankfurterProvider", "FixtureProvider",
+    "QuoteCache", "quote_cache",
+    "providers", "set_providers", "history", "quote", "quotes", "quotes_counted", "fx_rate", "aclose",
+]
@@ -0,0 +1,196 @@
+"""
+provider 공통 기반: 공유 HTTP client, host별 동시성·속도 제한, circuit breaker.
+
+- http_client(): keep-alive 연결을 재사용하는 프로세스 공용 httpx.AsyncClient (event loop당 1개)
+- HostLimiter: host별 동시 요청 수(semaphore) + 초당 요청 수(token bucket) 제한
+- CircuitBreaker: 연속 실패 N회 → cooldown 동안 호출하지 않고 즉시 다음 provider로 (fail fast)
+"""
+import asyncio
+import time
+from typing import Optional
+
+from backend.core.config import (
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_COOLDOWN_SECONDS,
+)
+from backend.core.metrics import PROVIDER_SECONDS
+
+# 조회 결과 행: {"date": "YYYY-MM-DD", "close": float, "dividend": float}
+Rows = list[dict]
+
+
+class ProviderError(Exception):
+    """네트워크 오류·5xx·응답 형식 오류 (circuit breaker 실패로 집계)"""
+
+
+# ──────────────────────────────────────────────────────────────
+# 공유 HTTP client
+# ──────────────────────────────────────────────────────────────
+_client: Optional[tuple] = None   # (event loop, httpx.AsyncClient)
+
+
+def http_client():
+    """현재 event loop의 공용 AsyncClient (httpx는 첫 조회 시점에 import)"""
+    global _client
+    loop = asyncio.get_running_loop()
+    if _client is None or _client[0] is not loop or _client[1].is_closed:
+        import httpx
+        _client = (loop, httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30),
+            headers={"User-Agent": "Mozilla/5.0"},
+            follow_redirects=True,
+        ))
+    return _client[1]
+
+
+async def aclose():
+    """공용 client 종료 (lifespan shutdown)"""
+    global _client
+    if _client is not None and _client[0] is asyncio.get_running_loop():
+        await _client[1].aclose()
+    _client = None
+
+
+# ──────────────────────────────────────────────────────────────
+# host별 제한
+# ──────────────────────────────────────────────────────────────
+class HostLimiter:
+    """async with limiter: — 동시 concurrency개, 초당 rate개까지 (burst = concurrency)"""
+
+    def __init__(self, concurrency: int, rate: float):
+        self.concurrency, self.rate = concurrency, rate
+        self._loop   = None
+        self._sem    = None
+        self._tokens = float(concurrency)
+        self._stamp  = time.monotonic()
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:   # semaphore는 event loop에 묶임 (benchmark 등 loop 재생성 대비)
+            self._loop, self._sem = loop, asyncio.Semaphore(self.concurrency)
+        await self._sem.acquire()
+        try:
+            await self._take_token()
+        except BaseException:
+            self._sem.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        self._sem.release()
+
+    async def _take_token(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(float(self.concurrency), self._tokens + (now - self._stamp) * self.rate)
+            self._stamp  = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """
+    closed → (연속 실패 threshold회) → open → (cooldown 경과) → half_open: 시험 호출 1회
+    시험 호출이 성공하면 closed, 실패하면 다시 open.
+    """
+
+    def __init__(self, threshold: int = CIRCUIT_FAILURE_THRESHOLD, cooldown: float = CIRCUIT_COOLDOWN_SECONDS):
+        self.threshold, self.cooldown = threshold, cooldown
+        self.failures  = 0
+        self.opened_at: Optional[float] = None
+        self._probing  = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "open" if time.monotonic() - self.opened_at < self.cooldown else "half_open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def success(self):
+        self.failures, self.opened_at, self._probing = 0, None, False
+
+    def failure(self):
+        self.failures += 1
+        self._probing  = False
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
+
+# ──────────────────────────────────────────────────────────────
+# provider 기반 클래스
+# ──────────────────────────────────────────────────────────────
+class Provider:
+    """
+    조회 종류(op)별 메서드. 반환 None = 이 provider에서는 알 수 없음(다음 provider 시도),
+    빈 목록 = 조회는 성공했으나 해당 구간 데이터 없음. 장애는 ProviderError.
+    """
+    name        = ""
+    ops: tuple  = ()    # 지원 조회 종류: "history", "quote", "fx_rate"
+    concurrency = 4
+    rate        = 10.0
+    batch_size  = 1     # quotes() 요청 1회당 최대 Ticker 수
+
+    def __init__(self):
+        self.breaker = CircuitBreaker()
+        self.limiter = HostLimiter(self.concurrency, self.rate)
+
+    def supports(self, op: str, key: str) -> bool:
+        return op in self.ops
+
+    async def history(self, ticker: str, start: str, end: str) -> Optional[Rows]:
+        """[start, end) 일별 종가·배당락"""
+        return None
+
+    async def quote(self, ticker: str) -> Optional[float]:
+        """실시간(장중) 현재가"""
+        return None
+
+    async def fx_rate(self, currency: str) -> Optional[float]:
+        """1 currency = ? KRW"""
+        return None
+
+    async def quotes(self, tickers: list[str]) -> dict[str, float]:
+        """여러 Ticker 현재가. 기본은 Ticker별 quote() 동시 실행 (묶음 조회 API가 있으면 override)"""
+        prices = await asyncio.gather(*(self.quote(t) for t in tickers))
+        return {t: p for t, p in zip(tickers, prices) if p}
+
+
+class HttpProvider(Provider):
+    base_url = ""
+
+    def __init__(self, base_url: Optional[str] = None):
+        super().__init__()
+        if base_url:
+            self.base_url = base_url.rstrip("/")
+
+    async def get_json(self, path: str, params: Optional[dict] = None, base_url: Optional[str] = None) -> Optional[dict]:
+        """GET → JSON. 404는 None (데이터 없음), 그 외 4xx/5xx·타임아웃·연결 오류는 ProviderError"""
+        import httpx
+        async with self.limiter:
+            t0 = time.perf_counter()
+            try:
+                resp = await http_client().get((base_url or self.base_url) + path, params=params)
+            except httpx.HTTPError as e:
+                raise ProviderError(f"{type(e).__name__} {e}".strip()) from e
+            finally:
+                PROVIDER_SECONDS.observe(time.perf_counter() - t0, self.name)
+        if resp.status_code == 404:
+            return None
+        if resp.status_code >= 400:
+            raise ProviderError(f"HTTP {resp.status_code}")
+        try:
+            return resp.json()
+        except ValueError as e:
+            raise ProviderError(f"JSON 파싱 실패: {e}") from e
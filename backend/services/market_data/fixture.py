@@ -0,0 +1,58 @@
+"""
+로컬 파일 provider (네트워크 없음). 오프라인 개발·검증용.
+
+디렉터리(MARKET_DATA_FIXTURES)에 Ticker별 JSON 파일:
+    {dir}/005930.KS.json  = {"history": [{"date", "close", "dividend"}], "quote": 71000}
+    {dir}/USDKRW=X.json   = {"history": [...], "quote": 1380.5}   ← fx_rate는 환율 Ticker의 quote
+"""
+import json
+import os
+from typing import Optional
+
+from backend.core.config import MARKET_DATA_FIXTURES
+from backend.db.prices import fx_ticker
+from backend.services.market_data.base import Provider, ProviderError, Rows
+
+
+class FixtureProvider(Provider):
+    name        = "fixture"
+    ops         = ("history", "quote", "fx_rate")
+    concurrency = 16
+    rate        = 1e6
+
+    def __init__(self, directory: Optional[str] = None):
+        super().__init__()
+        self.directory = directory or MARKET_DATA_FIXTURES
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.directory, f"{ticker}.json")
+
+    def _load(self, ticker: str) -> Optional[dict]:
+        try:
+            with open(self._path(ticker), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            raise ProviderError(f"{self._path(ticker)}: {e}") from e
+
+    def supports(self, op: str, key: str) -> bool:
+        ticker = fx_ticker(key) if op == "fx_rate" else key
+        return op in self.ops and os.path.exists(self._path(ticker))
+
+    async def history(self, ticker: str, start: str, end: str) -> Optional[Rows]:
+        data = self._load(ticker)
+        if data is None:
+            return None
+        return [
+            {"date": r["date"], "close": float(r["close"]), "dividend": float(r.get("dividend") or 0.0)}
+            for r in data.get("history", [])
+            if start <= r["date"] < end
+        ]
+
+    async def quote(self, ticker: str) -> Optional[float]:
+        value = (self._load(ticker) or {}).get("quote")
+        return float(value) if value else None
+
+    async def fx_rate(self, currency: str) -> Optional[float]:
+        return await self.quote(fx_ticker(currency))
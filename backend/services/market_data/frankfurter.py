@@ -0,0 +1,34 @@
+"""frankfurter.app: 환율 (무료, API 키 불필요). ECB 기준 영업일 환율"""
+import re
+from typing import Optional
+
+from backend.core.config import FRANKFURTER_BASE_URL
+from backend.services.market_data.base import HttpProvider, Rows
+
+_FX_TICKER = re.compile(r"^([A-Z]{3})KRW=X$")
+
+
+class FrankfurterProvider(HttpProvider):
+    name     = "frankfurter"
+    ops      = ("fx_rate", "history")
+    base_url = FRANKFURTER_BASE_URL
+
+    def supports(self, op: str, key: str) -> bool:
+        # history는 환율 Ticker('USDKRW=X')만
+        return op == "fx_rate" or (op == "history" and bool(_FX_TICKER.match(key)))
+
+    async def fx_rate(self, currency: str) -> Optional[float]:
+        data = await self.get_json("/latest", {"from": currency, "to": "KRW"})
+        rate = (data or {}).get("rates", {}).get("KRW")
+        return float(rate) if rate else None
+
+    async def history(self, ticker: str, start: str, end: str) -> Optional[Rows]:
+        currency = _FX_TICKER.match(ticker).group(1)
+        data     = await self.get_json(f"/{start}..{end}", {"from": currency, "to": "KRW"})
+        if data is None:
+            return None
+        return [
+            {"date": d, "close": float(r["KRW"]), "dividend": 0.0}
+            for d, r in sorted(data.get("rates", {}).items())
+            if start <= d < end and r.get("KRW")
+        ]
@@ -0,0 +1,57 @@
+"""
+네이버 금융: 국내 주식(.KS/.KQ) 실시간 현재가.
+
+- quote():  종목별 기본 정보 API (m.stock.naver.com)
+- quotes(): 실시간 polling API로 여러 종목을 NAVER_QUOTE_BATCH개씩 묶어 1회 요청
+"""
+import asyncio
+from typing import Optional
+
+from backend.core.config import NAVER_BASE_URL, NAVER_POLLING_URL, NAVER_QUOTE_BATCH
+from backend.services.market_data.base import HttpProvider, ProviderError
+
+
+def _price(value) -> Optional[float]:
+    """'71,000' → 71000.0"""
+    if value in (None, ""):
+        return None
+    try:
+        return float(str(value).replace(",", ""))
+    except ValueError as e:
+        raise ProviderError(f"가격 형식 오류: {value!r}") from e
+
+
+class NaverProvider(HttpProvider):
+    name       = "naver"
+    ops        = ("quote",)
+    base_url   = NAVER_BASE_URL
+    batch_size = NAVER_QUOTE_BATCH
+
+    def __init__(self, base_url: Optional[str] = None, polling_url: Optional[str] = None):
+        super().__init__(base_url)
+        self.polling_url = (polling_url or NAVER_POLLING_URL).rstrip("/")
+
+    def supports(self, op: str, key: str) -> bool:
+        return op in self.ops and key.endswith((".KS", ".KQ"))
+
+    async def quote(self, ticker: str) -> Optional[float]:
+        """'005930.KS' → 종목코드 '005930'의 현재가"""
+        data = await self.get_json(f"/api/stock/{ticker.split('.')[0]}/basic")
+        return _price(data.get("closePrice")) if data else None
+
+    async def quotes(self, tickers: list[str]) -> dict[str, float]:
+        by_code = {t.split(".")[0]: t for t in tickers}
+        codes   = list(by_code)
+        chunks  = [codes[i:i + self.batch_size] for i in range(0, len(codes), self.batch_size)]
+        results = await asyncio.gather(*(
+            self.get_json(f"/api/realtime/domestic/stock/{','.join(chunk)}", base_url=self.polling_url)
+            for chunk in chunks
+        ))
+        prices = {}
+        for data in results:
+            for item in (data or {}).get("datas", []):
+                ticker = by_code.get(item.get("itemCode"))
+                price  = _price(item.get("closePrice"))
+                if ticker and price:
+                    prices[ticker] = price
+        return prices
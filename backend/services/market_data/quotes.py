@@ -0,0 +1,69 @@
+"""
+실시간 현재가 메모리 캐시 (TTL + single-flight).
+
+대시보드 새로고침마다 업데이트가 반복돼도 QUOTE_TTL_SECONDS 안에서는 upstream 조회가 없다.
+같은 Ticker를 동시에 요청하면 먼저 시작한 조회 1회의 결과를 함께 기다린다.
+조회 실패(가격 없음)는 캐시하지 않으므로 provider 복구 후 다음 요청에서 바로 다시 시도한다.
+"""
+import asyncio
+import time
+
+from backend.core.config import QUOTE_TTL_SECONDS
+from backend.core.metrics import CACHE_REQUESTS
+
+
+class QuoteCache:
+    def __init__(self, ttl: float = QUOTE_TTL_SECONDS):
+        self.ttl      = ttl
+        self.requests = 0   # upstream 요청 수 (누적, 묶음 요청은 1회)
+        self._values: dict[str, tuple[float, float]] = {}      # Ticker → (가격, 조회 시각)
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def get_many(self, tickers: list[str]) -> dict[str, float]:
+        """Ticker별 현재가 (가격을 얻지 못한 Ticker는 빠짐)"""
+        from backend.services import market_data
+
+        now     = time.monotonic()
+        result  = {}
+        misses  = []
+        waiting = {}
+        for t in dict.fromkeys(tickers):
+            hit = self._values.get(t)
+            if hit and now - hit[1] < self.ttl:
+                result[t] = hit[0]
+                CACHE_REQUESTS.inc(1, "quote", "hit")
+            elif t in self._inflight:
+                waiting[t] = self._inflight[t]
+                CACHE_REQUESTS.inc(1, "quote", "hit")
+            else:
+                misses.append(t)
+                CACHE_REQUESTS.inc(1, "quote", "miss")
+
+        if misses:
+            future = asyncio.get_running_loop().create_future()
+            for t in misses:
+                self._inflight[t] = future
+            found = {}
+            try:
+                found, requests = await market_data.quotes_counted(misses)
+                self.requests += requests
+                stamp = time.monotonic()
+                for t, price in found.items():
+                    self._values[t] = (price, stamp)
+            finally:
+                future.set_result(found)
+                for t in misses:
+                    self._inflight.pop(t, None)
+            result.update(found)
+
+        for t, future in waiting.items():
+            price = (await future).get(t)
+            if price is not None:
+                result[t] = price
+        return result
+
+    def clear(self):
+        self._values.clear()
+
+
+quote_cache = QuoteCache()
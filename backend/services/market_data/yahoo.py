@@ -0,0 +1,119 @@
+"""
+Yahoo Finance: 일별 종가·배당락, 현재가, 환율.
+
+- YahooProvider: v8 chart API를 공용 HTTP client로 직접 호출 (keep-alive, async)
+- YFinanceProvider: yfinance 라이브러리 (동기) → thread에서 실행. chart API 형식이 바뀌었을 때의 fallback
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from urllib.parse import quote as urlquote
+
+from backend.core.config import YAHOO_BASE_URL
+from backend.db.prices import fx_ticker
+from backend.services.market_data.base import HttpProvider, Provider, ProviderError, Rows
+
+
+def _yf():
+    """yfinance 지연 import (pandas 포함 수백 ms → 실제 조회 시점에만 로드)"""
+    import yfinance
+    return yfinance
+
+
+def _epoch(date_str: str) -> int:
+    return int(datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+
+
+class YahooProvider(HttpProvider):
+    name        = "yahoo"
+    ops         = ("history", "quote", "fx_rate")
+    concurrency = 4
+    rate        = 5.0
+    base_url    = YAHOO_BASE_URL
+
+    async def _chart(self, ticker: str, params: dict) -> Optional[dict]:
+        data = await self.get_json(f"/v8/finance/chart/{urlquote(ticker)}", params)
+        if data is None:
+            return None
+        result = (data.get("chart") or {}).get("result")
+        return result[0] if result else None   # 미상장/폐지 Ticker는 result 없음
+
+    async def history(self, ticker: str, start: str, end: str) -> Optional[Rows]:
+        chart = await self._chart(ticker, {
+            "period1": _epoch(start), "period2": _epoch(end), "interval": "1d", "events": "div",
+        })
+        if chart is None:
+            return None
+        try:
+            # 거래소 현지 날짜 = UTC timestamp + gmtoffset
+            offset = timedelta(seconds=chart.get("meta", {}).get("gmtoffset", 0))
+            day    = lambda ts: (datetime.fromtimestamp(int(ts), timezone.utc) + offset).strftime("%Y-%m-%d")
+            stamps = chart.get("timestamp") or []
+            ind    = chart.get("indicators", {})
+            # yfinance history() 기본값(auto_adjust)과 같은 수정 종가 → 기존 캐시와 연속
+            closes = ((ind.get("adjclose") or [{}])[0].get("adjclose")
+                      or (ind.get("quote") or [{}])[0].get("close") or [])
+            divs   = {day(ts): float(ev["amount"])
+                      for ts, ev in (chart.get("events", {}).get("dividends") or {}).items()}
+        except (KeyError, TypeError, ValueError) as e:
+            raise ProviderError(f"chart 응답 형식 오류: {e}") from e
+
+        rows: dict[str, dict] = {}   # 장중 bar가 같은 날짜로 한 번 더 오는 경우 마지막 값
+        for ts, close in zip(stamps, closes):
+            if close is None:
+                continue
+            d = day(ts)
+            if start <= d < end:
+                rows[d] = {"date": d, "close": float(close), "dividend": divs.get(d, 0.0)}
+        return list(rows.values())
+
+    async def quote(self, ticker: str) -> Optional[float]:
+        chart = await self._chart(ticker, {"range": "1d", "interval": "1d"})
+        price = (chart or {}).get("meta", {}).get("regularMarketPrice")
+        return float(price) if price else None
+
+    async def fx_rate(self, currency: str) -> Optional[float]:
+        return await self.quote(fx_ticker(currency))
+
+
+class YFinanceProvider(Provider):
+    name        = "yfinance"
+    ops         = ("history", "quote", "fx_rate")
+    concurrency = 2
+    rate        = 2.0
+
+    async def _run(self, fn, *args):
+        async with self.limiter:
+            try:
+                return await asyncio.to_thread(fn, *args)
+            except Exception as e:
+                raise ProviderError(f"{type(e).__name__} {e}".strip()) from e
+
+    async def history(self, ticker: str, start: str, end: str) -> Optional[Rows]:
+        def fetch():
+            df = _yf().Ticker(ticker).history(start=start, end=end)
+            if df.empty:
+                return []
+            has_div = "Dividends" in df.columns
+            return [
+                {
+                    "date":     idx.strftime("%Y-%m-%d"),
+                    "close":    float(row["Close"]),
+                    "dividend": float(row["Dividends"]) if has_div else 0.0,
+                }
+                for idx, row in df.iterrows()
+            ]
+        return await self._run(fetch)
+
+    async def quote(self, ticker: str) -> Optional[float]:
+        def fetch():
+            dat  = _yf().Ticker(ticker)
+            rate = getattr(dat.fast_info, "last_price", None)
+            if not rate:
+                hist = dat.history(period="1d")
+                rate = float(hist["Close"].iloc[-1]) if not hist.empty else None
+            return float(rate) if rate else None
+        return await self._run(fetch)
+
+    async def fx_rate(self, currency: str) -> Optional[float]:
+        return await self.quote(fx_ticker(currency))
@@ -0,0 +1,165 @@
+"""
+실시간 시세 변경 SSE 브로드캐스터.
+
+업데이터가 계산한 Ticker별 변경분(delta)을 세션에 모아 두었다가 커밋 직후 연결된 모든 클라이언트에 전달한다.
+  - 배압: 클라이언트별 대기열은 Ticker당 최신 1건만 유지 (느린 클라이언트는 중간 값 생략, 메모리 상한 = Ticker 수)
+  - 하트비트: HEARTBEAT_SECONDS마다 SSE 주석 행 전송 (프록시 idle timeout 방지 + 끊긴 연결 정리)
+  - 포트폴리오: 브로드캐스터가 포트폴리오별로 따로 있어 구독자는 자기 포트폴리오 시세만 받음
+  - 다중 worker: 마지막 배치를 settings.price_stream에 저장하고, 구독자가 있는 worker는
+    POLL_SECONDS마다 확인해 다른 worker에서 커밋된 배치도 자기 클라이언트에 전달
+"""
+import asyncio
+import json
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.db.portfolio import DEFAULT, current_portfolio
+
+HEARTBEAT_SECONDS = 15
+POLL_SECONDS      = 2
+MAX_CLIENTS       = 100
+_STREAM_KEY       = "price_stream"
+_SESSION_KEY      = "price_deltas"
+
+
+class _Subscriber:
+    def __init__(self):
+        self.pending: OrderedDict[str, dict] = OrderedDict()
+        self.wake      = asyncio.Event()
+        self.coalesced = 0
+
+    def offer(self, delta: dict):
+        ticker = delta["ticker"]
+        if ticker in self.pending:
+            self.coalesced += 1
+        self.pending[ticker] = delta
+        self.pending.move_to_end(ticker)
+        self.wake.set()
+
+
+class PriceBroadcaster:
+    def __init__(self, portfolio: str = DEFAULT):
+        self.portfolio = portfolio
+        self.subscribers: set[_Subscriber] = set()
+        self.latest: dict[str, dict] = {}     # Ticker별 최신 delta (신규 연결 시 snapshot)
+        self._seen_batch: Optional[str] = None
+        self._poller: Optional[asyncio.Task] = None
+
+    @property
+    def full(self) -> bool:
+        return len(self.subscribers) >= MAX_CLIENTS
+
+    def publish(self, batch: dict):
+        """배치 1건을 모든 구독자에게 전달 (같은 배치 중복 전달 방지)"""
+        if batch["id"] == self._seen_batch:
+            return
+        self._seen_batch = batch["id"]
+        for delta in batch["deltas"]:
+            delta = {**delta, "batch": batch["id"]}
+            self.latest[delta["ticker"]] = delta
+            for sub in self.subscribers:
+                sub.offer(delta)
+
+    def subscribe(self) -> _Subscriber:
+        sub = _Subscriber()
+        for delta in self.latest.values():
+            sub.offer(delta)
+        self.subscribers.add(sub)
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+        return sub
+
+    def unsubscribe(self, sub: _Subscriber):
+        self.subscribers.discard(sub)
+
+    async def _poll(self):
+        """구독자가 있는 동안 다른 worker가 커밋한 배치 확인"""
+        from backend.db.database import async_session, portfolio_scope
+        while self.subscribers:
+            try:
+                async with portfolio_scope(self.portfolio), async_session() as db:
+                    row = (await db.execute(
+                        text("SELECT value FROM settings WHERE key = :k"), {"k": _STREAM_KEY}
+                    )).fetchone()
+                if row:
+                    self.publish(json.loads(row[0]))
+            except Exception as e:
+                print(f"⚠️ price stream poll 실패: {e}")
+            await asyncio.sleep(POLL_SECONDS)
+
+    async def events(self, is_disconnected):
+        """SSE 본문 생성기"""
+        sub = self.subscribe()
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    await asyncio.wait_for(sub.wake.wait(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await is_disconnected():
+                        break
+                    yield ": ping\n\n"
+                    continue
+                sub.wake.clear()
+                while sub.pending:
+                    _, delta = sub.pending.popitem(last=False)
+                    data = json.dumps(delta, ensure_ascii=False, separators=(",", ":"))
+                    yield f"event: price\nid: {delta['batch']}\ndata: {data}\n\n"
+        finally:
+            self.unsubscribe(sub)
+
+
+# 포트폴리오별 브로드캐스터 (시세 배치는 포트폴리오 DB마다 따로 커밋됨)
+_broadcasters: dict[str, PriceBroadcaster] = {}
+
+
+def broadcaster_for(portfolio: str) -> PriceBroadcaster:
+    if portfolio not in _broadcasters:
+        _broadcasters[portfolio] = PriceBroadcaster(portfolio)
+    return _broadcasters[portfolio]
+
+
+# ──────────────────────────────────────────────────────────────
+# 업데이터 연동: 세션에 적재 → 커밋 직후 전달
+# ──────────────────────────────────────────────────────────────
+def queue_price_delta(db: AsyncSession, delta: dict):
+    """
+    delta: {"ticker", "price", "previous_price", "currency",
+            "assets": [{"id", "current_value", "previous_value"}]}
+    """
+    db.sync_session.info.setdefault(_SESSION_KEY, []).append(
+        {**delta, "ts": datetime.now().isoformat(timespec="seconds")}
+    )
+
+
+async def persist_price_batch(db: AsyncSession):
+    """적재된 delta를 같은 트랜잭션에서 settings.price_stream에 저장 (다른 worker 전달용)"""
+    deltas = db.sync_session.info.get(_SESSION_KEY)
+    if not deltas:
+        return
+    batch = {"id": uuid.uuid4().hex[:12], "deltas": deltas}
+    db.sync_session.info["price_batch"] = batch
+    await db.execute(
+        text("INSERT INTO settings (key, value) VALUES (:k, :v) ON CONFLICT(key) DO UPDATE SET value = :v"),
+        {"k": _STREAM_KEY, "v": json.dumps(batch, ensure_ascii=False)},
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session):
+    session.info.pop(_SESSION_KEY, None)
+    batch = session.info.pop("price_batch", None)
+    if batch:
+        broadcaster_for(current_portfolio()).publish(batch)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session):
+    session.info.pop(_SESSION_KEY, None)
+    session.info.pop("price_batch", None)
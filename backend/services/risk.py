@@ -0,0 +1,392 @@
+"""
+위험 분석: 변동성·최대 낙폭·베타·공분산/상관 행렬 (보유 중인 Ticker 주식).
+
+수익률 행렬 R (거래일 × Ticker, KRW 환산 일간 수익률, float32)을 data_version별로 한 번만 만들어
+RISK_CACHE_DIR(포트폴리오별 하위 디렉터리)에 memory-map 파일로 저장한다. 같은 버전이면 어느 worker든 파일을 mmap으로 열어
+요청 기간의 행만 읽는다 (수백 종목 × 10년 ≈ 수 MB, 프로세스 힙에 상주하지 않음).
+- 날짜 축: 보유 Ticker 시세 날짜의 합집합 (주말·공휴일 제외)
+- 수익률: 그 Ticker에 시세가 있는 날만 직전 시세일 대비 (종가 × 환율), 없는 날은 NaN
+  → 시장 휴일이 달라도 0 수익률로 변동성·상관이 희석되지 않음
+- 같은 Ticker를 여러 계좌에 보유하면 한 열로 합침 (비중은 합산)
+- 공분산·상관·베타는 NaN을 뺀 쌍별(pairwise) 표본으로 행렬곱 한 번에 계산
+- 포트폴리오: 현재 평가액 비중 고정, 그날 수익률이 있는 종목끼리 비중 재정규화
+수동 단가만 있는 자산(Ticker 없음)은 관측 간격이 불규칙해 제외한다.
+압축(compaction)된 구간은 월말·변경 시점 행만 남아 일간 수익률이 아니므로, 기간 시작을 압축 경계 이후로 당긴다.
+"""
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from glob import glob
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from backend.core.config import RISK_CACHE_DIR
+from backend.db.models import Asset
+from backend.db.portfolio import DEFAULT, current_portfolio
+from backend.db.prices import (
+    FALLBACK_RATES, fx_ticker, get_cached_range, load_fallback_rates, load_price_range, load_price_series,
+    price_ticker, rate_at, upsert_prices,
+)
+from backend.db.version import get_data_version
+from backend.services import market_data
+from backend.services.compaction import daily_from
+from backend.services.market_data.base import ProviderError
+
+TRADING_DAYS   = 252    # 연환산 기준 거래일 수
+MIN_OBS        = 20     # 변동성·상관을 내기 위한 최소 관측 수
+ROLLING_POINTS = 200    # 롤링 변동성 응답 최대 점 수 (종목당)
+
+# 포트폴리오별 현재 열려 있는 수익률 행렬 {"version", "columns", "dates", "returns"(memmap)}
+_current: dict[str, dict] = {}
+_lock = threading.Lock()
+
+# (포트폴리오, 지수 Ticker)별 마지막 조회 확인일 (하루 1회만 provider 조회)
+_benchmark_checked: dict[tuple[str, str], str] = {}
+
+
+def _today() -> str:
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+# ──────────────────────────────────────────────────────────────
+# 수익률 행렬 (memory-map 캐시)
+# ──────────────────────────────────────────────────────────────
+def _cache_dir() -> str:
+    """기본 포트폴리오는 RISK_CACHE_DIR, 나머지는 그 아래 포트폴리오 이름 디렉터리"""
+    name = current_portfolio()
+    return RISK_CACHE_DIR if name == DEFAULT else os.path.join(RISK_CACHE_DIR, name)
+
+
+def _paths(version: int) -> tuple[str, str]:
+    base = os.path.join(_cache_dir(), f"returns-v{version}")
+    return base + ".f32", base + ".json"
+
+
+def _open(version: int) -> Optional[dict]:
+    """다른 worker가 이미 만든 같은 버전의 캐시 파일을 읽기 전용 mmap으로 열기"""
+    data_path, meta_path = _paths(version)
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        returns = np.memmap(data_path, dtype=np.float32, mode="r", shape=tuple(meta["shape"]))
+    except (OSError, ValueError, KeyError):
+        return None
+    return {"version": version, "columns": meta["columns"], "dates": np.array(meta["dates"]), "returns": returns}
+
+
+def _write(version: int, columns: list[dict], dates: np.ndarray, fill) -> dict:
+    """
+    memmap 파일을 만들어 fill(mm)로 채운 뒤 원자적으로 교체 (meta가 마지막 → meta가 있으면 완성본).
+    이전 버전 파일은 삭제.
+    """
+    os.makedirs(_cache_dir(), exist_ok=True)
+    data_path, meta_path = _paths(version)
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    shape  = (len(dates), len(columns))
+
+    mm = np.memmap(data_path + suffix, dtype=np.float32, mode="w+", shape=shape)
+    mm[:] = np.nan
+    fill(mm)
+    mm.flush()
+    del mm
+    os.replace(data_path + suffix, data_path)
+    with open(meta_path + suffix, "w", encoding="utf-8") as f:
+        json.dump({"shape": shape, "columns": columns, "dates": dates.tolist()}, f, ensure_ascii=False)
+    os.replace(meta_path + suffix, meta_path)
+
+    for stale in glob(os.path.join(_cache_dir(), "returns-v*")):
+        if stale not in (data_path, meta_path) and not stale.endswith(".tmp"):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return _open(version)
+
+
+async def _build(db: AsyncSession, version: int) -> Optional[dict]:
+    """보유 Ticker 주식 → KRW 일간 수익률 행렬 생성·저장"""
+    q = (
+        select(Asset)
+        .options(selectinload(Asset.stock))
+        .where(Asset.type == "STOCK", (Asset.disposal_date.is_(None)) | (Asset.disposal_date == ""))
+        .order_by(Asset.name, Asset.id)
+    )
+    columns: dict[str, dict] = {}
+    for a in (await db.execute(q)).scalars().all():
+        ticker = price_ticker(a)
+        if not ticker:
+            continue
+        col = columns.setdefault(ticker, {
+            "ticker":    ticker,
+            "name":      a.name,
+            "currency":  a.stock.currency or "KRW",
+            "asset_ids": [],
+            "value":     0.0,
+        })
+        col["asset_ids"].append(a.id)
+        col["value"] += float(a.current_value or 0)
+
+    fx_needed = {fx_ticker(c["currency"]) for c in columns.values() if c["currency"] != "KRW"}
+    series    = await load_price_series(db, set(columns) | fx_needed)
+    rates     = await load_fallback_rates(db)
+
+    # 시세가 2일 이상 있는 Ticker만
+    cols  = [c for t, c in columns.items() if t in series and len(series[t][0]) > 1]
+    if not cols:
+        return None
+    dates = np.unique(np.concatenate([series[c["ticker"]][0] for c in cols]))
+
+    def fill(mm):
+        for j, c in enumerate(cols):
+            d, close = series[c["ticker"]]
+            if c["currency"] != "KRW":
+                fallback = rates.get(c["currency"], FALLBACK_RATES.get(c["currency"], 1.0))
+                close = close * rate_at(series.get(fx_ticker(c["currency"])), d, fallback)
+            prev = close[:-1]
+            r    = np.divide(close[1:], prev, out=np.full(len(prev), np.nan), where=prev > 0) - 1
+            mm[np.searchsorted(dates, d[1:]), j] = r
+
+    return _write(version, cols, dates, fill)
+
+
+async def load_returns(db: AsyncSession) -> Optional[dict]:
+    """현재 data_version의 수익률 행렬 (메모리 → 캐시 파일 → 새로 생성 순)"""
+    name    = current_portfolio()
+    version = await get_data_version(db)
+    with _lock:
+        current = _current.get(name)
+        if current is not None and current["version"] == version:
+            return current
+    matrix = _open(version) or await _build(db, version)
+    with _lock:
+        if matrix is None:
+            _current.pop(name, None)
+        else:
+            _current[name] = matrix
+    return matrix
+
+
+# ──────────────────────────────────────────────────────────────
+# 통계 (열 단위 벡터 연산)
+# ──────────────────────────────────────────────────────────────
+def pairwise_cov(X: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    NaN 포함 (T × K) → 쌍별 완전 표본 기준 (cov, var, n).
+    var[i, j] = j와 함께 관측된 날만으로 낸 i의 분산 → corr = cov / sqrt(var * var.T)
+    """
+    M   = ~np.isnan(X)
+    Z   = np.where(M, X, 0.0)
+    Mf  = M.astype(float)
+    n   = Mf.T @ Mf
+    sx  = Z.T @ Mf
+    sxx = (Z * Z).T @ Mf
+    sxy = Z.T @ Z
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = (sxy - sx * sx.T / n) / (n - 1)
+        var = (sxx - sx * sx / n) / (n - 1)
+    few = n < MIN_OBS
+    cov[few] = np.nan
+    var[few] = np.nan
+    return cov, var, n
+
+
+def max_drawdown(X: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """열별 (최대 낙폭(음수), 고점 행, 저점 행) — 수익률 누적 지수 기준"""
+    wealth = np.cumprod(1 + np.nan_to_num(X), axis=0)
+    peak   = np.maximum.accumulate(wealth, axis=0)
+    dd     = wealth / peak - 1
+    trough = np.argmin(dd, axis=0)
+    rows   = np.arange(len(X))[:, None]
+    peak_at = np.maximum.accumulate(np.where(wealth >= peak, rows, 0), axis=0)
+    cols   = np.arange(X.shape[1])
+    return dd[trough, cols], peak_at[trough, cols], trough
+
+
+def rolling_volatility(X: np.ndarray, window: int) -> np.ndarray:
+    """(T × K) → 끝 행 기준 window 거래일 연환산 변동성 (관측이 절반 미만이면 NaN)"""
+    M  = ~np.isnan(X)
+    Z  = np.where(M, X, 0.0)
+    zero = np.zeros((1, X.shape[1]))
+    s  = np.concatenate([zero, np.cumsum(Z, axis=0)])
+    ss = np.concatenate([zero, np.cumsum(Z * Z, axis=0)])
+    c  = np.concatenate([zero, np.cumsum(M, axis=0)])
+    w  = min(window, len(X))
+    n  = c[w:] - c[:-w]
+    sw = s[w:] - s[:-w]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = (ss[w:] - ss[:-w] - sw * sw / n) / (n - 1)
+    var[n < max(2, w // 2)] = np.nan
+    return np.sqrt(np.maximum(var, 0) * TRADING_DAYS)
+
+
+def _portfolio_returns(X: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """현재 비중 고정, 그날 수익률이 있는 종목끼리 재정규화"""
+    M = ~np.isnan(X)
+    w = M @ weights
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(w > 0, np.nan_to_num(X) @ weights / w, np.nan)
+
+
+def _observation_returns(dates: np.ndarray, levels: tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+    """지수 종가 → 날짜 축(dates)에 맞춘 관측일 간 수익률 (축에 없는 날은 건너뜀)"""
+    out = np.full(len(dates), np.nan)
+    d, close = levels
+    common, ai, bi = np.intersect1d(dates, d, return_indices=True)
+    if len(common) > 1:
+        prev = close[bi[:-1]]
+        out[ai[1:]] = np.divide(close[bi[1:]], prev, out=np.full(len(prev), np.nan), where=prev > 0) - 1
+    return out
+
+
+def _num(v) -> Optional[float]:
+    v = float(v)
+    return v if np.isfinite(v) else None
+
+
+def _nums(a: np.ndarray) -> list:
+    """배열 → JSON 목록 (NaN·inf는 None, 2차원이면 중첩 목록)"""
+    a   = np.asarray(a, dtype=float)
+    out = a.astype(object)
+    out[~np.isfinite(a)] = None
+    return out.tolist()
+
+
+# ──────────────────────────────────────────────────────────────
+# 지수 시세 (베타 기준)
+# ──────────────────────────────────────────────────────────────
+async def refresh_benchmark(db: AsyncSession, ticker: str, years: int = 10) -> bool:
+    """
+    지수 종가가 없거나 오래됐으면 provider에서 받아 price_history에 저장 (Ticker별 하루 1회 확인).
+    반환: 새로 저장한 행이 있으면 True (호출 측에서 커밋)
+    """
+    today = _today()
+    key   = (current_portfolio(), ticker)
+    if _benchmark_checked.get(key) == today:
+        return False
+    _benchmark_checked[key] = today
+    cached = await get_cached_range(db, ticker)
+    if cached:
+        start = (datetime.strptime(cached[1][:10], "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    else:
+        start = (datetime.now() - timedelta(days=365 * years)).strftime("%Y-%m-%d")
+    if start > today:
+        return False
+    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    try:
+        rows = await market_data.history(ticker, start, tomorrow)
+    except ProviderError as e:
+        print(f"⚠️  지수 {ticker} 조회 실패: {e}")
+        return False
+    if not rows:
+        return False
+    await upsert_prices(db, ticker, rows)
+    return True
+
+
+# ──────────────────────────────────────────────────────────────
+# 위험 지표
+# ──────────────────────────────────────────────────────────────
+async def compute_risk(
+    db: AsyncSession,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    benchmark: Optional[str] = None,
+    window: int = 63,
+) -> dict:
+    """
+    기간 [start, end] (기본: 최근 3년)의 종목·포트폴리오 위험 지표.
+    window: 롤링 변동성 거래일 수. benchmark: 베타 기준 지수 Ticker (price_history에 있어야 함).
+    start가 압축 경계(daily_from)보다 이르면 경계부터 계산하고, 요청값은 requested_from으로 돌려준다.
+    """
+    if window < 2:
+        raise ValueError("window는 2 이상이어야 합니다.")
+    matrix = await load_returns(db)
+    floor  = await daily_from(db)
+    empty  = {"from": start, "to": end, "requested_from": start, "daily_from": floor, "benchmark": None,
+              "window": window, "observations": 0, "holdings": [], "portfolio": None, "rolling_dates": [], "matrix": {"tickers": [], "correlation": [], "covariance": []}}
+    if matrix is None:
+        return empty
+
+    dates = matrix["dates"]
+    end   = end or str(dates[-1])
+    start = start or str(np.datetime64(end) - np.timedelta64(365 * 3, "D"))
+    if start > end:
+        raise ValueError("from이 to보다 늦습니다.")
+    requested = start
+    # 압축 구간의 행 간격(월말)을 일간 수익률로 보고 252일로 연환산하면 값이 틀리므로 제외
+    if floor and start < floor:
+        start = floor
+    lo, hi = np.searchsorted(dates, start), np.searchsorted(dates, end, side="right")
+    if hi - lo < 2:
+        return {**empty, "from": start, "to": end, "requested_from": requested}
+
+    days    = dates[lo:hi]
+    X       = np.asarray(matrix["returns"][lo:hi], dtype=float)   # 기간 행만 mmap에서 읽음
+    columns = matrix["columns"]
+    values  = np.array([c["value"] for c in columns], dtype=float)
+    weights = values / values.sum() if values.sum() > 0 else np.full(len(columns), 1 / len(columns))
+
+    # 열: 종목들 + 포트폴리오 (+ 지수)
+    extra = [_portfolio_returns(X, weights)]
+    bench = None
+    if benchmark:
+        levels = await load_price_range(db, benchmark, str(days[0]), str(days[-1]), seed=True)
+        if len(levels[0]) > 1:
+            bench = _observation_returns(days, levels)
+            extra.append(bench)
+    A = np.column_stack([X, *extra])
+    K = len(columns)
+
+    cov, var, n = pairwise_cov(A)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.sqrt(var * var.T)
+        beta = cov[:, -1] / var[-1, :] if bench is not None else np.full(A.shape[1], np.nan)
+    vol = np.sqrt(np.diag(cov) * TRADING_DAYS)
+    mdd, peak, trough = max_drawdown(A)
+    rolling = rolling_volatility(A, window)
+    step    = max(1, -(-len(rolling) // ROLLING_POINTS))
+    sampled = np.arange(len(rolling) - 1, -1, -step)[::-1]      # 마지막 점 포함
+    offset  = len(days) - len(rolling)
+
+    def stats(j: int) -> dict:
+        return {
+            "volatility":         _num(vol[j]),
+            "max_drawdown":       _num(mdd[j]),
+            "drawdown_start":     str(days[peak[j]]) if mdd[j] < 0 else None,
+            "drawdown_end":       str(days[trough[j]]) if mdd[j] < 0 else None,
+            "beta":               _num(beta[j]) if j < K + 1 else None,
+            "observations":       int(n[j, j]),
+            "rolling_volatility": _nums(rolling[sampled, j]),
+        }
+
+    holdings = [
+        {"ticker": c["ticker"], "name": c["name"], "currency": c["currency"], "asset_ids": c["asset_ids"],
+         "weight": float(weights[j]), **stats(j)}
+        for j, c in enumerate(columns)
+    ]
+    annual_cov = cov[:K, :K] * TRADING_DAYS
+    return {
+        "from":           str(days[0]),
+        "to":             str(days[-1]),
+        "requested_from": requested,
+        "daily_from":     floor,
+        "version":       matrix["version"],
+        "window":        window,
+        "observations":  len(days),
+        "holdings":      holdings,
+        "portfolio":     stats(K),
+        "benchmark":     {"ticker": benchmark, **stats(K + 1)} if bench is not None else None,
+        "rolling_dates": [str(days[i + offset]) for i in sampled],
+        "matrix": {
+            "tickers":     [c["ticker"] for c in columns],
+            "correlation": _nums(corr[:K, :K]),
+            "covariance":  _nums(annual_cov),
+        },
+    }
@@ -0,0 +1,86 @@
+"""
+주기적 시세 업데이트 (uvicorn --workers N 중 1개 worker만 실행).
+
+DB_DIR/updater.lock에 배타 lock을 잡은 worker가 leader가 되어
+settings.last_price_update 기준 UPDATE_INTERVAL_MINUTES가 지나면 update_all_stocks를 실행한다.
+나머지 worker는 매 주기 lock 획득만 시도하므로, leader가 죽으면 OS가 lock을 풀고 다음 주기에 다른 worker가 이어받는다.
+마지막 실행 시각은 DB에 있으므로 재기동·leader 교체 시에도 중복 실행되지 않는다.
+같은 주기에 시계열 변경 로그 정리, 부동산 부채 현재 값(상환 스케줄 진행분) 반영도 함께 한다.
+포트폴리오가 여럿이면 포트폴리오 DB마다 차례로 (주기·마지막 실행 시각도 DB별) 실행한다.
+"""
+import asyncio
+import os
+from datetime import datetime
+
+from sqlalchemy import text
+
+from backend.core.config import DB_DIR, UPDATE_INTERVAL_MINUTES
+from backend.core.locks import FileLock
+
+_LAST_RUN_KEY = "last_price_update"
+_leader_lock  = FileLock(os.path.join(DB_DIR, "updater.lock"))
+
+
+def is_leader() -> bool:
+    return _leader_lock.held
+
+
+async def _due(db, interval_min: int) -> bool:
+    row = (await db.execute(text("SELECT value FROM settings WHERE key = :k"), {"k": _LAST_RUN_KEY})).fetchone()
+    if not row:
+        return True
+    elapsed = datetime.now() - datetime.fromisoformat(row[0])
+    return elapsed.total_seconds() >= interval_min * 60
+
+
+async def run_scheduled_update(interval_min: int) -> dict | None:
+    """
+    leader이면 주기가 지난 포트폴리오마다 업데이트 1회 실행.
+    반환: {"updated_count", "portfolios": {이름: 결과}}. 실행한 포트폴리오가 없으면 None
+    """
+    from backend.db.database import async_session, portfolio_scope
+    from backend.db.liabilities import sync_all_current
+    from backend.db.portfolio import list_portfolios
+    from backend.db.series import prune_changes
+    from backend.services.stock_updater import update_all_stocks
+
+    if not _leader_lock.try_acquire():
+        return None
+    results = {}
+    for name in list_portfolios():
+        async with portfolio_scope(name), async_session() as db:
+            if not await _due(db, interval_min):
+                continue
+            results[name] = await update_all_stocks(db)
+            await prune_changes(db)
+            await sync_all_current(db)
+            await db.execute(
+                text("INSERT INTO settings (key, value) VALUES (:k, :v) ON CONFLICT(key) DO UPDATE SET value = :v"),
+                {"k": _LAST_RUN_KEY, "v": datetime.now().isoformat()},
+            )
+            await db.commit()
+    if not results:
+        return None
+    return {"updated_count": sum(r["updated_count"] for r in results.values()), "portfolios": results}
+
+
+async def scheduler_loop(interval_min: int = UPDATE_INTERVAL_MINUTES):
+    """lifespan에서 실행하는 백그라운드 루프 (1분 간격으로 leader 획득/실행 여부 확인)"""
+    announced = False
+    while True:
+        try:
+            result = await run_scheduled_update(interval_min)
+            if is_leader() and not announced:
+                print(f"👑 시세 업데이트 leader: pid {os.getpid()} (주기 {interval_min}분)")
+                announced = True
+            if result is not None:
+                print(f"⏰ 예약 업데이트: {result['updated_count']}개 자산 ({len(result['portfolios'])}개 포트폴리오)")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ 예약 업데이트 실패: {e}")
+        await asyncio.sleep(min(60, interval_min * 60))
+
+
+def release():
+    _leader_lock.release()
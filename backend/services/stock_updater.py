@@ -1,105 +1,172 @@
 """
-yfinance 기반 주가/환율 자동 업데이트 서비스.
-Ticker가 설정된 주식 자산의 이력을 Backfill하고 current_value를 동기화.
+주가/환율 자동 업데이트 서비스 (조회는 market_data provider 계층).
+Ticker별 종가·배당락·환율을 price_history 공용 테이블에 Backfill하고 current_value를 동기화.
+price_history는 영속 캐시이므로 이미 저장된 구간은 다시 조회하지 않고,
+거래소 캘린더(update_planner)로 새 시세가 있을 수 없는 Ticker는 네트워크 조회 자체를 생략한다.
+배당락 이벤트는 dividend_history에 자동 기록.
 """
 from datetime import datetime, timedelta
 from typing import Optional
-import urllib.request
-import json
+import asyncio
+import time
 
-import yfinance as yf
-from sqlalchemy import select, delete, text
+from sqlalchemy import select, insert, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.models import Asset, AssetHistory, StockDetail
+from backend.core.metrics import UPDATER_FETCH, UPDATER_WRITE, UPDATER_RUNS, UPDATER_FETCHES
+from backend.db.ledger import Position, load_position, quantity_at, quantity_before, total_quantity
+from backend.db.models import Asset, StockDetail, DividendHistory
+from backend.db.prices import (
+    FALLBACK_RATES, normalize_ticker, fx_ticker,
+    get_cache_states, upsert_prices, load_price_series, load_dividend_events, rate_at,
+)
+from backend.services import market_data
+from backend.services.market_data import ProviderError
+from backend.services.price_stream import queue_price_delta, persist_price_batch
+from backend.services.update_planner import plan_ticker, summarize
+
 
 # 환율 캐시 (실행 당 1회만 조회)
 _RATE_CACHE: dict[str, float] = {}
 
+# 배당 주기 → 연간 지급 횟수 (api/dividends.py 요약 계산과 동일)
+_CYCLE_TIMES = {"월": 12, "분기": 4, "반기": 2, "연간": 1}
 
-def get_naver_realtime_price(ticker: str) -> float | None:
-    """
-    네이버 금융 API로 국내 주식 실시간 현재가 조회.
-    ticker: '005930.KS' 형식 → 종목코드 '005930' 추출
-    """
-    try:
-        code = ticker.split(".")[0]
-        url  = f"https://m.stock.naver.com/api/stock/{code}/basic"
-        req  = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=5) as r:
-            data  = json.loads(r.read())
-            price = data.get("closePrice", "")
-            if price:
-                return float(str(price).replace(",", ""))
-    except Exception as e:
-        print(f"⚠️ 네이버 실시간가 조회 실패 ({ticker}): {e}")
-    return None
-
-
-def normalize_ticker(ticker: str) -> str:
-    """
-    yfinance용 ticker 정규화.
-    - 앞뒤 공백 제거, 대문자 변환
-    - 한국 거래소 suffix: .KR / .kr / .ks → .KS
-    """
-    t = ticker.strip().upper()
-    # .KR 은 yfinance에서 인식 안 됨 → .KS 로 교정
-    if t.endswith(".KR"):
-        t = t[:-3] + ".KS"
-    return t
-
-
-def _fetch_rate_frankfurter(currency: str) -> float | None:
-    """frankfurter.app에서 환율 조회 (무료, API 키 불필요)"""
-    try:
-        url = f"https://api.frankfurter.app/latest?from={currency}&to=KRW"
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=5) as r:
-            data = json.loads(r.read())
-            rate = data.get("rates", {}).get("KRW")
-            if rate:
-                return float(rate)
-    except Exception as e:
-        print(f"⚠️ frankfurter 환율 조회 실패 ({currency}): {e}")
-    return None
-
-
-def _fetch_rate_yfinance(currency: str) -> float | None:
-    """yfinance에서 환율 조회 (fallback)"""
-    try:
-        ticker = f"{currency}KRW=X"
-        dat    = yf.Ticker(ticker)
-        rate   = dat.fast_info.get("last_price")
-        if not rate:
-            hist = dat.history(period="1d")
-            if not hist.empty:
-                rate = float(hist["Close"].iloc[-1])
-        if rate:
-            return float(rate)
-    except Exception as e:
-        print(f"⚠️ yfinance 환율 조회 실패 ({currency}): {e}")
-    return None
-
-
-def get_exchange_rate(currency: str) -> float:
-    """통화 → KRW 환율 조회 (frankfurter 우선, yfinance fallback)"""
+
+async def get_exchange_rate(currency: str) -> float:
+    """통화 → KRW 환율 조회 (provider 순서: frankfurter → yahoo → yfinance, 모두 실패 시 기본값)"""
     if currency == "KRW":
         return 1.0
     if currency in _RATE_CACHE:
         return _RATE_CACHE[currency]
 
-    rate = _fetch_rate_frankfurter(currency) or _fetch_rate_yfinance(currency)
+    rate = await market_data.fx_rate(currency)
     if rate:
         _RATE_CACHE[currency] = rate
         print(f"💱 환율 조회: 1 {currency} = {rate:,.2f} KRW")
         return rate
 
-    fallback = {"USD": 1450.0, "JPY": 9.5}
-    rate = fallback.get(currency, 1.0)
+    rate = FALLBACK_RATES.get(currency, 1.0)
     _RATE_CACHE[currency] = rate
     return rate
 
 
+async def current_rate(db: AsyncSession, currency: str) -> float:
+    """
+    요청 처리용 환율: 업데이트 때 settings에 저장된 값(모든 worker 공통) 우선,
+    없으면 실시간 조회. worker별 _RATE_CACHE가 서로 다른 값을 쓰는 것을 막는다.
+    """
+    if currency == "KRW":
+        return 1.0
+    from backend.db.crud import get_settings
+    rate = (await get_settings(db)).get(f"exchange_rate_{currency}")
+    return float(rate) if rate else await get_exchange_rate(currency)
+
+
+async def _fetch_ranges(ticker: str, ranges: list[tuple[str, str]]) -> list[dict]:
+    """
+    구간별 시세 조회 (DB 접근 없음 → 여러 Ticker를 동시에 실행).
+    배당락(dividend)도 같은 응답에서 함께 받는다. 모든 provider가 실패하면 ProviderError.
+    """
+    rows: list[dict] = []
+    for start, end in ranges:
+        print(f"⏳ {ticker}: {start} ~ {end} 조회")
+        t0     = time.perf_counter()
+        result = await market_data.history(ticker, start, end)
+        UPDATER_FETCH.observe(time.perf_counter() - t0, ticker)
+        if result is None:
+            raise ProviderError(f"{ticker}: 시세 조회 실패 (모든 provider)")
+        rows.extend(result)
+    return rows
+
+
+async def _store_prices(db: AsyncSession, ticker: str, rows: list[dict]):
+    t0 = time.perf_counter()
+    await upsert_prices(db, ticker, rows)
+    UPDATER_WRITE.observe(time.perf_counter() - t0, ticker)
+
+
+def _rate_on(fx_series, date_str: str, currency: str, fallback: float) -> float:
+    """date_str 당일(없으면 직전 영업일) 환율. 일별 환율이 없으면 fallback(현재 환율)"""
+    if currency == "KRW":
+        return 1.0
+    return float(rate_at(fx_series, [date_str], fallback)[0])
+
+
+async def _ingest_dividends(
+    db: AsyncSession,
+    asset: Asset,
+    currency: str,
+    events: list[tuple[str, float]],
+    position: Optional[Position],
+    fallback_qty: float,
+) -> int:
+    """배당락 이벤트를 dividend_history에 일괄 INSERT. (asset_id, date) 중복은 건너뜀. 반환: 추가 건수"""
+    known_q = select(DividendHistory.date).where(DividendHistory.asset_id == asset.id)
+    known   = set((await db.execute(known_q)).scalars().all())
+    pending = [(d, dps) for d, dps in events if d not in known]
+    if not pending:
+        return 0
+
+    fx      = (await load_price_series(db, {fx_ticker(currency)})).get(fx_ticker(currency))
+    current = await get_exchange_rate(currency)
+    rows    = []
+    for date_str, dps in pending:
+        # 배당락일 기준 보유 수량 = 배당락일 전일 종료 시점 원장 누적 수량
+        qty = quantity_before(position, date_str) if position is not None else fallback_qty
+        if qty <= 0:
+            continue
+        rate   = _rate_on(fx, date_str, currency, current)
+        amount = dps * qty
+        rows.append({
+            "asset_id":        asset.id,
+            "date":            date_str,
+            "amount_krw":      amount * rate,
+            "amount_original": amount,
+            "currency":        currency,
+            "exchange_rate":   rate,
+            "memo":            f"자동 수집 (주당 {dps:,.4g} {currency})",
+            "quantity":        qty,
+        })
+    if rows:
+        await db.execute(insert(DividendHistory), rows)
+    return len(rows)
+
+
+async def _refresh_dividend_stats(db: AsyncSession, detail: StockDetail, price_krw: float | None):
+    """
+    자동 수집된 배당 이력(quantity 기록분)으로 trailing DPS/주기/수익률 갱신.
+    - 주기: 배당락 간격 중앙값으로 추정 (이벤트 1건이면 기존 설정 유지)
+    - DPS: 최근 1년 배당의 주당 KRW 평균
+    - 수익률: DPS × 연간 횟수 / 현재가(KRW)
+    최근 1년 배당이 없으면 수동 설정을 그대로 둔다.
+    """
+    q = (
+        select(DividendHistory.date, DividendHistory.amount_krw, DividendHistory.quantity)
+        .where(DividendHistory.asset_id == detail.asset_id)
+        .where(DividendHistory.quantity > 0)
+        .order_by(DividendHistory.date)
+    )
+    per_share = [(d, amt / qty) for d, amt, qty in (await db.execute(q)).all()]
+    cutoff    = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
+    ttm       = [ps for d, ps in per_share if d >= cutoff]
+    if not ttm:
+        return
+
+    cycle = detail.dividend_cycle or "연간"
+    if len(per_share) >= 2:
+        dates = [datetime.strptime(d, "%Y-%m-%d") for d, _ in per_share]
+        gaps  = sorted((b - a).days for a, b in zip(dates, dates[1:]))
+        gap   = gaps[len(gaps) // 2]
+        cycle = "월" if gap <= 45 else "분기" if gap <= 135 else "반기" if gap <= 270 else "연간"
+
+    dps = sum(ttm) / len(ttm)
+    detail.dividend_cycle = cycle
+    detail.dividend_dps   = dps
+    if price_krw:
+        detail.dividend_yield = dps * _CYCLE_TIMES[cycle] / price_krw * 100
+
+
 async def save_exchange_rates_to_settings(db: AsyncSession):
     """조회된 환율을 settings 테이블에 캐시 저장"""
     from sqlalchemy import text as _text
@@ -117,7 +184,8 @@ async def save_exchange_rates_to_settings(db: AsyncSession):
 async def update_all_stocks(db: AsyncSession) -> dict:
     """
     Ticker가 설정된 모든 주식 자산의 시세 업데이트.
-    반환: {"updated_count": int, "failed_tickers": list}
+    반환: {"updated_count": int, "failed_tickers": list, "dividend_count": int,
+           "plan": {"requests": 실제 조회 수, "avoided": 생략 수, "reasons": {reason: Ticker 수}, "backfill": int}}
     """
     _RATE_CACHE.clear()  # 실행마다 환율 캐시 초기화
 
@@ -138,9 +206,9 @@ async def update_all_stocks(db: AsyncSession) -> dict:
 
     if not rows:
         print("ℹ️ 업데이트할 종목(Ticker 설정됨)이 없습니다.")
-        return {"updated_count": 0, "failed_tickers": []}
+        return {"updated_count": 0, "failed_tickers": [], "dividend_count": 0, "plan": summarize({}, 0)}
 
-    # 2. Ticker별 그룹화 (동일 Ticker = API 1회 호출)
+    # 2. Ticker별 그룹화 (동일 Ticker = API 1회 호출, price_history 1벌 저장)
     ticker_map: dict[str, list[tuple]] = {}
     for asset, detail in rows:
         t = normalize_ticker(detail.ticker)
@@ -151,126 +219,167 @@ async def update_all_stocks(db: AsyncSession) -> dict:
     print(f"📋 총 {len(rows)}개 자산, {len(ticker_map)}개 종목 처리 시작")
 
     updated_count  = 0
+    dividend_count = 0
     failed_tickers = []
     today_str      = datetime.now().strftime("%Y-%m-%d")
-    tomorrow_str   = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
 
+    # 3. 자산별 원장 보유 수량 로드 + 필요한 시세 시작일 (첫 거래일, 없으면 취득일)
+    positions: dict[str, Optional[Position]] = {}
+    need_starts: dict[str, str] = {}
+    for ticker, asset_list in ticker_map.items():
+        start_candidates = []
+        for asset, _ in asset_list:
+            positions[asset.id] = await load_position(db, asset.id)
+            if positions[asset.id] is not None:
+                start_candidates.append(str(positions[asset.id][0][0]))
+            elif asset.acquisition_date:
+                # 이력이 없으면 취득일부터. (30일 전부터 무조건 채우면 보유 전 기간에도 평가액이 생김)
+                start_candidates.append(asset.acquisition_date[:10])
+            else:
+                start_candidates.append((datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d"))
+        need_starts[ticker] = min(start_candidates)
+
+    # 환율 Ticker: 해당 통화를 쓰는 종목들 중 가장 이른 시작일부터
+    fx_starts: dict[str, str] = {}
     for ticker, asset_list in ticker_map.items():
+        for currency in {d.currency or "KRW" for _, d in asset_list} - {"KRW"}:
+            fx_starts[currency] = min(fx_starts.get(currency, need_starts[ticker]), need_starts[ticker])
+
+    # 4. 거래소 캘린더 기반 조회 계획: 새 시세가 있을 수 없는 Ticker는 네트워크 조회 생략
+    fx_tickers = {fx_ticker(c): c for c in fx_starts}
+    starts     = {**need_starts, **{t: fx_starts[c] for t, c in fx_tickers.items()}}
+    states     = await get_cache_states(db, set(starts))
+    plans      = {t: plan_ticker(t, states.get(t), s) for t, s in starts.items()}
+    requests   = 0
+
+    # 4-a. 조회 단계 (쓰기 전): 일별 시세·현재 환율·장중 현재가를 동시에 받아 둔다
+    #      (host별 동시성/속도 제한은 provider 계층).
+    #      DB 쓰기를 시작하면 commit까지 SQLite 쓰기 lock을 잡으므로 그 뒤에는 네트워크 조회를 하지 않는다
+    #      (다른 worker의 쓰기가 busy_timeout을 넘겨 database is locked로 실패하지 않도록)
+    from backend.db.crud import get_settings
+    settings = await get_settings(db)
+    for ticker, currency in fx_tickers.items():
+        stored_rate = settings.get(f"exchange_rate_{currency}")
+        if not plans[ticker]["quote"] and stored_rate:
+            _RATE_CACHE[currency] = float(stored_rate)
+    # 외환 거래 중(평일)이면 현재 환율을 오늘 임시가로, 주말이면 저장된 최근 환율 사용
+    live_fx = [c for t, c in fx_tickers.items() if c not in _RATE_CACHE]
+    # 장중 실시간 현재가 (국내는 네이버 우선, 묶음 요청·TTL 캐시).
+    # 일별 조회 구간이 당일까지 닿는 Ticker는 당일 bar가 오면 필요 없으므로 일별 결과를 본 뒤 (쓰기 전) 조회
+    def reaches_session(t: str) -> bool:
+        return any(end >= plans[t]["session_date"] for _, end in plans[t]["ranges"])
+
+    candidates = [t for t in ticker_map if plans[t]["quote"] and not reaches_session(t)]
+
+    jobs   = {t: p["ranges"] for t, p in plans.items() if p["ranges"]}
+    before = market_data.quote_cache.requests
+    fetched, rates, quotes = await asyncio.gather(
+        asyncio.gather(*(_fetch_ranges(t, r) for t, r in jobs.items()), return_exceptions=True),
+        asyncio.gather(*(get_exchange_rate(c) for c in live_fx)),
+        market_data.quote_cache.get_many(candidates),
+    )
+    results = dict(zip(jobs, fetched))
+    late    = [
+        t for t in ticker_map
+        if plans[t]["quote"] and reaches_session(t) and not isinstance(results.get(t), Exception)
+        and plans[t]["session_date"] not in {r["date"] for r in results.get(t, ())}
+    ]
+    if late:
+        quotes.update(await market_data.quote_cache.get_many(late))
+    requests += sum(len(r) for r in jobs.values()) + len(live_fx) + market_data.quote_cache.requests - before
+
+    # 4-b. 쓰기 단계: 일별 시세 → 환율 → 장중 현재가 upsert
+    for ticker, result in zip(jobs, fetched):
+        if isinstance(result, Exception):
+            print(f"❌ {ticker} 시세 조회 실패: {result}")
+            if ticker in ticker_map:
+                failed_tickers.append(ticker)
+            continue
+        # 마지막 완료 거래일 이후(진행 중인 세션)의 bar는 임시가 → 마감 후 다시 조회해 확정
+        last_complete = plans[ticker]["last_complete"]
+        if last_complete:
+            result = [{**r, "dividend": None} if r["date"] > last_complete else r for r in result]
+        await _store_prices(db, ticker, result)
+
+    for currency, rate in zip(live_fx, rates):
+        await upsert_prices(db, fx_ticker(currency), [{"date": today_str, "close": rate, "dividend": None}])
+
+    for ticker, realtime_price in quotes.items():
+        if ticker in failed_tickers:
+            continue
+        print(f"📡 {ticker}: 장중 현재가 {realtime_price:,.0f} (종가 확정 전)")
+        # 거래소 현지 날짜로 임시가 upsert (다음 업데이트 시 확정 종가로 덮어써짐)
+        await upsert_prices(db, ticker, [{"date": plans[ticker]["session_date"], "close": realtime_price, "dividend": None}])
+
+    plan_report = summarize(plans, requests)
+    UPDATER_FETCHES.inc(requests, "fetched")
+    UPDATER_FETCHES.inc(plan_report["avoided"], "avoided")
+    print(f"🗓️ 조회 계획: 요청 {requests}건, 생략 {plan_report['avoided']}건 {plan_report['reasons']}")
+
+    stored = await get_cache_states(db, set(ticker_map))
+    for ticker, asset_list in ticker_map.items():
+        if ticker in failed_tickers:
+            continue
+        need_start = need_starts[ticker]
         try:
-            # 3. 이 Ticker를 가진 자산들 중 가장 오래된 마지막 이력 날짜 산출
-            start_candidates = []
-            for asset, _ in asset_list:
-                last_q   = select(AssetHistory).where(
-                    AssetHistory.asset_id == asset.id
-                ).order_by(AssetHistory.date.desc()).limit(1)
-                last_res = await db.execute(last_q)
-                last     = last_res.scalar_one_or_none()
-                if last:
-                    start_candidates.append(datetime.strptime(last.date, "%Y-%m-%d"))
-                elif asset.acquisition_date:
-                    # 이력이 없으면 취득일부터. (30일 전부터 무조건 채우면 보유 전 기간에도 평가액이 생김)
-                    start_candidates.append(datetime.strptime(asset.acquisition_date[:10], "%Y-%m-%d"))
-                else:
-                    start_candidates.append(datetime.now() - timedelta(days=30))
-
-            start_date = min(start_candidates)
-            print(f"⏳ {ticker}: {start_date.strftime('%Y-%m-%d')} ~ {today_str}")
-
-            # 4. yfinance 시세 조회 (end는 exclusive이므로 내일 날짜 사용 → 오늘 종가 포함)
-            yf_ticker = yf.Ticker(ticker)
-            hist_df   = yf_ticker.history(start=start_date.strftime("%Y-%m-%d"), end=tomorrow_str)
-
-            if hist_df.empty:
+            if ticker not in stored:
                 print(f"⚠️ {ticker}: 데이터 없음")
                 continue
 
-            # 5-a. 장중 실시간 현재가 조회
-            # hist_df에 오늘 날짜가 없으면 장이 아직 열려 있는 것 → 실시간 현재가 시도
-            today_in_hist = any(
-                idx.strftime("%Y-%m-%d") == today_str for idx in hist_df.index
-            )
-            realtime_price: float | None = None
-            if not today_in_hist:
-                # 국내 주식(.KS/.KQ): 네이버 금융 API 우선 사용 (yfinance fast_info는 KS 미지원)
-                if ticker.endswith(".KS") or ticker.endswith(".KQ"):
-                    rt = get_naver_realtime_price(ticker)
-                    if rt and rt > 0:
-                        realtime_price = rt
-                        print(f"📡 {ticker}: 네이버 현재가 {realtime_price:,.0f} (장중)")
-                else:
-                    try:
-                        fi = yf_ticker.fast_info
-                        rt = getattr(fi, "last_price", None)
-                        if rt and float(rt) > 0:
-                            realtime_price = float(rt)
-                            print(f"📡 {ticker}: 장중 현재가 {realtime_price:,.0f} (종가 확정 전)")
-                    except Exception as e:
-                        print(f"⚠️ {ticker}: 실시간 현재가 조회 실패 ({e})")
-
-            # 5-b. 각 자산에 이력 Upsert
+            currencies  = {d.currency or "KRW" for _, d in asset_list}
+            series_map  = await load_price_series(db, {ticker} | {fx_ticker(c) for c in currencies if c != "KRW"})
+            series      = series_map[ticker]
+            final_price = float(series[1][-1])
+            prev_date   = str(series[0][-2]) if len(series[0]) > 1 else None
+            prev_price  = float(series[1][-2]) if prev_date else None
+            delta_assets = []
+
             for asset, detail in asset_list:
                 currency = detail.currency or "KRW"
-                rate     = get_exchange_rate(currency)
-
-                # 기존 이력 로드. stock_updater는 가격만 갱신하고 수량은 이력값을 보존한다.
-                # (asset.quantity로 모든 이력 수량을 덮어쓰면 매수/매도 시점 이전 보유량까지 변경됨)
-                hist_q   = select(AssetHistory).where(
-                    AssetHistory.asset_id == asset.id
-                ).order_by(AssetHistory.date)
-                hist_res      = await db.execute(hist_q)
-                existing_list = hist_res.scalars().all()
-                existing_map  = {h.date: h for h in existing_list}
-
-                # 새로 추가되는 날짜에 적용할 직전 보유 수량 (마지막 이력 수량, 없으면 asset.quantity)
-                last_qty = (existing_list[-1].quantity if existing_list else asset.quantity) or 0
-
-                # (a) 확정 종가 이력 upsert (hist_df)
-                for date_idx, row in hist_df.iterrows():
-                    date_str = date_idx.strftime("%Y-%m-%d")
-                    price    = float(row["Close"])
-
-                    existing = existing_map.get(date_str)
-                    if existing:
-                        # 기존 수량 유지, 가격·평가액만 갱신
-                        ex_qty = existing.quantity or 0
-                        existing.price = price
-                        existing.value = price * ex_qty * rate
-                    else:
-                        db.add(AssetHistory(
-                            asset_id = asset.id,
-                            date     = date_str,
-                            price    = price,
-                            quantity = last_qty,
-                            value    = price * last_qty * rate,
-                        ))
-
-                # (b) 장중: 오늘 날짜 실시간 현재가 upsert (장 마감 후 재업데이트 시 종가로 덮어써짐)
-                if realtime_price is not None:
-                    existing  = existing_map.get(today_str)
-                    rt_qty    = (existing.quantity if existing else last_qty) or 0
-                    rt_value  = realtime_price * rt_qty * rate
-                    if existing:
-                        existing.price = realtime_price
-                        existing.value = rt_value
-                    else:
-                        db.add(AssetHistory(
-                            asset_id = asset.id,
-                            date     = today_str,
-                            price    = realtime_price,
-                            quantity = rt_qty,
-                            value    = rt_value,
-                        ))
-
-                # 6. current_value 동기화: 실시간가 우선, 없으면 hist_df 최신 종가 (최신 보유 수량 기준)
-                final_price = realtime_price if realtime_price else (
-                    float(hist_df["Close"].iloc[-1]) if not hist_df.empty else None
+                rate     = await get_exchange_rate(currency)   # 4-a에서 받아 둔 값 (네트워크 조회 없음)
+                position = positions[asset.id]
+
+                # 6. current_value 동기화: 최신 종가(실시간가 포함) × 현재 보유 수량(원장 합계, 없으면 asset.quantity)
+                last_qty = total_quantity(position)
+                last_qty = (last_qty if last_qty is not None else asset.quantity) or 0
+                asset.current_value = final_price * last_qty * rate
+                asset.updated_at    = datetime.now().isoformat()
+
+                # SSE delta: 직전 시세일 평가액 = 전일 종가 × 전일 보유 수량 × 전일 환율
+                prev_value = None
+                if prev_date:
+                    prev_qty   = float(quantity_at(position, [prev_date])[0]) if position is not None else last_qty
+                    prev_value = prev_price * prev_qty * _rate_on(series_map.get(fx_ticker(currency)), prev_date, currency, rate)
+                delta_assets.append({
+                    "id":             asset.id,
+                    "current_value":  asset.current_value,
+                    "previous_value": prev_value,
+                })
+
+                # 7. 배당 이력 적재 + trailing DPS/수익률 갱신
+                # 캐시된 배당락 중 이 자산의 보유 시작일 이후 + 마지막 자동 기록 이후분
+                last_auto_q = select(func.max(DividendHistory.date)).where(
+                    DividendHistory.asset_id == asset.id,
+                    DividendHistory.quantity.isnot(None),
                 )
-                if final_price:
-                    asset.current_value = final_price * last_qty * rate
-                    asset.updated_at    = datetime.now().isoformat()
+                last_auto   = (await db.execute(last_auto_q)).scalar_one_or_none()
+                asset_start = str(position[0][0]) if position is not None else (asset.acquisition_date or need_start)[:10]
+                events      = await load_dividend_events(db, ticker, since=max(asset_start, last_auto or ""))
+                if events:
+                    added = await _ingest_dividends(db, asset, currency, events, position, last_qty)
+                    if added:
+                        dividend_count += added
+                        await _refresh_dividend_stats(db, detail, final_price * rate)
 
                 updated_count += 1
 
+            queue_price_delta(db, {
+                "ticker":         ticker,
+                "price":          final_price,
+                "previous_price": prev_price,
+                "currency":       asset_list[0][1].currency or "KRW",
+                "assets":         delta_assets,
+            })
             await db.flush()
 
         except Exception as e:
@@ -278,5 +387,12 @@ async def update_all_stocks(db: AsyncSession) -> dict:
             failed_tickers.append(ticker)
 
     await save_exchange_rates_to_settings(db)
-    print(f"✅ 업데이트 완료: {updated_count}개 자산, 실패: {failed_tickers}")
-    return {"updated_count": updated_count, "failed_tickers": failed_tickers}
+    await persist_price_batch(db)   # 커밋 직후 SSE 구독자에게 전달
+    UPDATER_RUNS.inc(1, "partial" if failed_tickers else "ok")
+    print(f"✅ 업데이트 완료: {updated_count}개 자산, 배당 {dividend_count}건, 실패: {failed_tickers}")
+    return {
+        "updated_count":  updated_count,
+        "failed_tickers": failed_tickers,
+        "dividend_count": dividend_count,
+        "plan":           plan_report,
+    }
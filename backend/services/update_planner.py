@@ -0,0 +1,93 @@
+"""
+시세 업데이트 계획: 거래소 캘린더로 Ticker별 "새로 생겼을 수 있는 데이터"만 조회.
+
+Ticker별 판단 (reason)
+- new:      캐시 없음 → 필요 시작일부터 전체 조회
+- stale:    확정 종가가 마지막 완료 거래일보다 이전 → 확정 최종일부터 조회 (장 마감 후·휴장 다음날 등)
+- intraday: 확정 종가는 최신, 장중 → 일별 조회 없이 실시간 현재가만
+- closed:   확정 종가는 최신, 장 마감/휴장 → 네트워크 조회 없음
+- unknown:  캘린더가 없는 시장 → 기존 방식 (캐시 최종일부터 조회 + 오늘 행이 없으면 현재가)
+새 계좌로 필요 시작일이 앞당겨진 경우(backfill)는 reason과 별개로 앞 구간을 추가 조회한다.
+
+외환(=X)은 평일 24시간 거래: 평일이면 현재 환율 조회, 주말이면 settings에 저장된 최근 환율 사용.
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional
+
+from backend.services.market_calendar import exchange_of, session
+
+_DAY = timedelta(days=1)
+
+
+def plan_ticker(
+    ticker: str,
+    state: Optional[tuple[str, str, Optional[str]]],
+    need_start: str,
+    now: Optional[datetime] = None,
+) -> dict:
+    """
+    state: get_cache_states() 값 (최초일, 최종일, 확정 최종일) 또는 None
+    반환: {
+        "reason":        new | stale | intraday | closed | unknown,
+        "backfill":      앞 구간 추가 조회 여부,
+        "ranges":        [(start, end)] 일별 시세 조회 구간 (end exclusive),
+        "quote":         실시간 현재가(환율이면 현재 환율) 조회 여부,
+        "session_date":  장중 현재가를 저장할 날짜 (거래소 현지 오늘),
+        "last_complete": 이 날짜 이후 행은 임시가(dividend NULL)로 저장. None이면 구분 없음,
+        "legacy":        캘린더 없이 조회했다면의 요청 수 (생략 건수 집계용),
+    }
+    """
+    local_now = (now or datetime.now()).astimezone()
+    today     = local_now.strftime("%Y-%m-%d")
+    tomorrow  = (local_now + _DAY).strftime("%Y-%m-%d")
+    is_fx     = ticker.endswith("=X")
+    lo, hi, final = state if state else (None, None, None)
+
+    # 기존 방식: 캐시 최종일 ~ 내일 (+ 앞 구간), 오늘 행이 없으면 현재가 / 환율은 매번 현재 환율
+    legacy_ranges = 1 if lo is None else 1 + (need_start < lo)
+    legacy = legacy_ranges + (1 if is_fx or hi != today else 0)
+
+    plan = {
+        "reason": "", "backfill": False, "ranges": [], "quote": False,
+        "session_date": today, "last_complete": None, "legacy": legacy,
+    }
+    if lo is not None and need_start < lo:
+        plan["backfill"] = True
+        plan["ranges"].append((need_start, lo))
+
+    exchange = exchange_of(ticker)
+    if exchange is None:
+        plan["reason"] = "unknown" if lo is not None else "new"
+        plan["ranges"].append((hi or need_start, tomorrow))
+        plan["quote"] = hi != today
+        return plan
+
+    s = session(exchange, local_now)
+    # 서버보다 하루 앞선 시간대(서버 UTC + KRX 등)도 현지 오늘 bar가 포함되도록
+    tomorrow = max(tomorrow, (datetime.strptime(s["date"], "%Y-%m-%d") + _DAY).strftime("%Y-%m-%d"))
+    plan["last_complete"] = s["last_complete"]
+    if not is_fx:
+        plan["session_date"] = s["date"]
+    plan["quote"] = s["open"]
+
+    if lo is None:
+        plan["reason"] = "new"
+        plan["ranges"].append((need_start, tomorrow))
+    elif final is None or final < s["last_complete"]:
+        plan["reason"] = "stale"
+        plan["ranges"].append((final or lo, tomorrow))
+    else:
+        plan["reason"] = "intraday" if s["open"] else "closed"
+    return plan
+
+
+def summarize(plans: dict[str, dict], requests: int) -> dict:
+    """실행 리포트: 실제 요청 수, 기존 방식 대비 생략 수, reason별 Ticker 수"""
+    legacy = sum(p["legacy"] for p in plans.values())
+    return {
+        "requests": requests,
+        "avoided":  max(legacy - requests, 0),
+        "reasons":  dict(Counter(p["reason"] for p in plans.values())),
+        "backfill": sum(p["backfill"] for p in plans.values()),
+    }
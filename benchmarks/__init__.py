@@ -0,0 +1,5 @@
+"""
+성능 벤치마크 / 부하 테스트 도구 (배포 대상 아님).
+
+    python -m benchmarks.run --help
+"""
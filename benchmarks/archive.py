@@ -0,0 +1,116 @@
+"""
+시세 이력 Parquet 아카이브 전/후 장기 조회 비교.
+
+합성 포트폴리오를 만든 뒤 같은 조회를 SQLite만으로, 그리고 지난 달까지 Parquet로 내보낸 뒤 다시 측정한다.
+  - prices.all_series: 전체 Ticker 전체 기간 종가 (차트 period=all·lot 손익·위험 분석 적재)
+  - prices.ranges: 전체 Ticker 기간 지정 일괄 load_price_ranges (성과 분석 프레임 적재)
+  - crud.get_all_assets: 자산 목록 + 일별 이력 파생 (차트 입력)
+결과가 SQLite 조회와 같은지 확인하고, 호출당 SQLite/Parquet에서 읽은 행 수를 함께 기록한다.
+
+사용법:
+    python -m benchmarks.archive --assets-per-type 20 --years 10 [--repeat 10] [--out archive.json]
+"""
+import argparse
+import asyncio
+
+import numpy as np
+
+from benchmarks.run import _measure, add_spec_args, spec_from_args, prepare, meta, write_report
+
+
+def _rows_read() -> dict[str, float]:
+    from backend.core.metrics import PRICE_ROWS
+    return {lv[0]: v for lv, v in PRICE_ROWS._values.items()}
+
+
+async def _suite(repeat: int, tickers: set[str]) -> dict:
+    from backend.db.database import async_session
+    from backend.db.crud import get_all_assets
+    from backend.db.prices import load_price_ranges, load_price_series
+
+    async def all_series():
+        async with async_session() as db:
+            await load_price_series(db, tickers)
+
+    async def ranges():
+        async with async_session() as db:
+            await load_price_ranges(db, {t: "2000-01-01" for t in tickers}, None)
+
+    async def all_assets():
+        async with async_session() as db:
+            await get_all_assets(db)
+
+    results = {}
+    for name, fn in (("prices.all_series", all_series), ("prices.ranges", ranges),
+                     ("crud.get_all_assets", all_assets)):
+        before = _rows_read()
+        await fn()
+        after  = _rows_read()
+        results[name] = {
+            **await _measure(fn, repeat, 1),
+            "rows": {k: int(after.get(k, 0) - before.get(k, 0)) for k in ("sqlite", "parquet")},
+        }
+    return results
+
+
+def _same(a: dict, b: dict) -> bool:
+    return a.keys() == b.keys() and all(
+        np.array_equal(a[t][0], b[t][0]) and np.allclose(a[t][1], b[t][1]) for t in a
+    )
+
+
+async def run_archive(spec, repeat: int) -> dict:
+    from sqlalchemy import text
+    from backend.db import archive
+    from backend.db.database import async_session, engine
+    from backend.db.prices import load_price_series
+    from backend.db.portfolio import DEFAULT
+    from backend.services.archive import run_export
+
+    if not archive.available():
+        raise SystemExit("pyarrow가 설치되어 있지 않습니다 (pip install pyarrow).")
+    _, _, dataset = await prepare(spec)
+    async with async_session() as db:
+        tickers  = {t for (t,) in await db.execute(text("SELECT DISTINCT ticker FROM price_history"))}
+        expected = await load_price_series(db, tickers)
+
+    sqlite = await _suite(repeat, tickers)
+    export = await run_export(DEFAULT, full=True)
+    parquet = await _suite(repeat, tickers)
+    async with async_session() as db:
+        same = _same(expected, await load_price_series(db, tickers))
+    await engine.dispose()
+
+    return {
+        "meta":    meta(spec, repeat=repeat),
+        "dataset": dataset,
+        "export":  export,
+        "same":    same,
+        "sqlite":  sqlite,
+        "parquet": parquet,
+        "speedup": {
+            k: round(sqlite[k]["p50_ms"] / max(parquet[k]["p50_ms"], 1e-6), 2) for k in sqlite
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시세 이력 Parquet 아카이브 전/후 비교")
+    add_spec_args(parser)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--out",    help="JSON 리포트 경로 (없으면 stdout)")
+    args = parser.parse_args(argv)
+
+    spec   = spec_from_args(args)
+    report = asyncio.run(run_archive(spec, args.repeat))
+    write_report(report, args.out)
+    for name, ratio in report["speedup"].items():
+        s, p = report["sqlite"][name], report["parquet"][name]
+        print(f"🗄️  {name:<22} {s['p50_ms']:>9.1f}ms → {p['p50_ms']:>8.1f}ms ({ratio}배, "
+              f"SQLite {s['rows']['sqlite']}행 → {p['rows']['sqlite']}행)")
+    if not report["same"]:
+        raise SystemExit("❌ 아카이브 조회 결과가 SQLite와 다릅니다.")
+
+
+if __name__ == "__main__":
+    main()
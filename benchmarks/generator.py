@@ -0,0 +1,112 @@
+"""
+Seed 고정 합성 포트폴리오 생성기.
+
+실제 crud.create_asset / ledger.record_quantity로 자산·거래를 만들고,
+비주식 자산의 일별 이력만 일괄 INSERT한다 (수천~수십만 행을 ORM으로 넣으면 생성이 벤치마크보다 오래 걸림).
+주식 종가/환율은 이후 update_all_stocks(Stub provider)가 price_history에 채운다.
+"""
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.crud import create_asset
+from backend.db.ledger import record_quantity
+from backend.db.models import AssetHistory
+
+ASSET_TYPES = ("STOCK", "REAL_ESTATE", "PENSION", "SAVINGS", "PHYSICAL", "ETC")
+
+# 비주식 유형별 (초기값, 일간 변동성)
+_VALUE_MODEL = {
+    "REAL_ESTATE": (500_000_000, 0.002),
+    "PENSION":     (30_000_000,  0.004),
+    "SAVINGS":     (10_000_000,  0.0005),
+    "PHYSICAL":    (80_000,      0.01),    # 단가 (수량은 원장)
+    "ETC":         (5_000_000,   0.003),
+}
+
+
+@dataclass
+class PortfolioSpec:
+    assets_per_type: int   = 5
+    years:           int   = 3
+    accounts:        int   = 3
+    currencies:      tuple = ("KRW", "USD")
+    trades_per_asset: int  = 4
+    seed:            int   = 42
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _ticker_for(i: int, currency: str) -> str:
+    if currency == "KRW":
+        return f"{100000 + i:06d}.KS"
+    if currency == "JPY":
+        return f"{9000 + i}.T"
+    return f"SYN{i:03d}"
+
+
+async def build_portfolio(db: AsyncSession, spec: PortfolioSpec) -> dict[str, list[str]]:
+    """spec 크기의 포트폴리오 생성. 반환: {자산 유형: [asset_id, ...]}"""
+    rng   = np.random.default_rng(spec.seed)
+    today = datetime.now().date()
+    start = today - timedelta(days=365 * spec.years)
+    days  = pd.bdate_range(start, today)
+    ids: dict[str, list[str]] = {t: [] for t in ASSET_TYPES}
+
+    # ── 주식: Ticker 연동, 계좌/통화 분산, 원장 거래 여러 건
+    for i in range(spec.assets_per_type):
+        currency = spec.currencies[i % len(spec.currencies)]
+        acq      = days[int(rng.integers(0, max(1, len(days) // 4)))].strftime("%Y-%m-%d")
+        qty      = float(rng.integers(1, 200))
+        asset_id = await create_asset(db, {
+            "type": "STOCK", "name": f"종목{i:03d}", "quantity": qty, "acquisition_date": acq,
+            "acquisition_price": 0, "current_value": 0,
+            "detail": {
+                "ticker":       _ticker_for(i, currency),
+                "currency":     currency,
+                "account_name": f"계좌{i % spec.accounts + 1}",
+            },
+        })
+        await db.flush()
+        trade_days = sorted(rng.choice(np.arange(len(days)), size=spec.trades_per_asset, replace=False))
+        for d in trade_days:
+            date = days[d].strftime("%Y-%m-%d")
+            if date <= acq:
+                continue
+            qty = max(1.0, qty + float(rng.integers(-(int(qty) // 2), 50)))
+            await record_quantity(db, asset_id, date, qty)
+        ids["STOCK"].append(asset_id)
+
+    # ── 비주식: 일별(영업일) 이력 일괄 INSERT
+    rows = []
+    for a_type, (base, vol) in _VALUE_MODEL.items():
+        for i in range(spec.assets_per_type):
+            acq    = days[int(rng.integers(0, max(1, len(days) // 4)))]
+            dates  = days[days >= acq]
+            values = base * np.exp(np.cumsum(rng.normal(0.0001, vol, len(dates))))
+            qty    = float(rng.integers(1, 20)) if a_type == "PHYSICAL" else 0
+            detail = {"account_name": f"계좌{i % spec.accounts + 1}"}
+            if a_type == "REAL_ESTATE":
+                detail.update(loan_amount=float(base * 0.3), tenant_deposit=0)
+            asset_id = await create_asset(db, {
+                "type": a_type, "name": f"{a_type.lower()}{i:03d}",
+                "quantity": qty, "acquisition_date": acq.strftime("%Y-%m-%d"),
+                "acquisition_price": float(values[0]), "current_value": float(values[-1] * (qty or 1)),
+                "detail": detail,
+            })
+            for d, v in zip(dates.strftime("%Y-%m-%d"), values):
+                if a_type == "PHYSICAL":
+                    rows.append({"asset_id": asset_id, "date": d, "price": float(v), "value": float(v * qty), "quantity": None})
+                else:
+                    rows.append({"asset_id": asset_id, "date": d, "price": None, "value": float(v), "quantity": None})
+            ids[a_type].append(asset_id)
+
+    if rows:
+        await db.execute(insert(AssetHistory), rows)
+    await db.flush()
+    return ids
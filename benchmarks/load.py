@@ -0,0 +1,247 @@
+"""
+In-process 부하 테스트 (ASGI 메모리 transport).
+
+backend.main:app에 사용자 유형별 Poisson 도착(open-loop)으로 요청을 보내고
+처리량, tail 지연, 오류율, "database is locked" 비율, 이벤트 루프 블로킹 시간을 기록한다.
+도착 스케줄과 요청 파라미터는 seed로 고정되므로 같은 옵션이면 같은 부하가 재현된다.
+
+사용자 유형 (--mix 이름=초당 도착 수):
+    dashboard  GET /api/assets → GET /api/assets/chart (기간 랜덤)
+    reader     GET /api/assets/{id}/history
+    editor     GET /api/assets/{id}/history → PUT 이력 수량 수정
+    updater    POST /api/stocks/update
+
+사용법:
+    python -m benchmarks.load --duration 30 --mix dashboard=4,reader=2,editor=0.5,updater=0.05 \\
+        --slo p95_ms=1500,error_rate=0.01,locked_rate=0,loop_block_max_ms=2000 --out load.json
+    (SLO 위반 시 exit 1)
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from benchmarks.run import add_spec_args, spec_from_args, prepare, meta, percentile, write_report
+
+DEFAULT_MIX = "dashboard=4,reader=2,editor=0.5,updater=0.05"
+PERIODS     = ("all", "10y", "3y", "1y", "3m", "1m")
+
+# SLO 키 → (리포트 경로, 비교 방향)
+SLO_KEYS = {
+    "p50_ms":            ("overall", "p50_ms",    "max"),
+    "p95_ms":            ("overall", "p95_ms",    "max"),
+    "p99_ms":            ("overall", "p99_ms",    "max"),
+    "error_rate":        ("overall", "error_rate", "max"),
+    "locked_rate":       ("overall", "locked_rate", "max"),
+    "min_rps":           ("load",    "throughput_rps", "min"),
+    "loop_block_max_ms": ("loop",    "max_lag_ms", "max"),
+    "loop_block_p99_ms": ("loop",    "p99_lag_ms", "max"),
+}
+
+
+def parse_kv(text: str) -> dict[str, float]:
+    out = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        k, v = part.split("=", 1)
+        out[k.strip()] = float(v)
+    return out
+
+
+def build_schedule(mix: dict[str, float], duration: float, seed: int) -> list[tuple[float, str, float]]:
+    """[(도착 시각(초), 사용자 유형, 0~1 파라미터 난수)] — seed 고정 Poisson 도착"""
+    rng      = np.random.default_rng(seed)
+    schedule = []
+    for name in sorted(mix):
+        rate = mix[name]
+        if rate <= 0:
+            continue
+        t = rng.exponential(1 / rate)
+        while t < duration:
+            schedule.append((float(t), name, float(rng.random())))
+            t += rng.exponential(1 / rate)
+    schedule.sort()
+    return schedule
+
+
+class Recorder:
+    def __init__(self):
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.errors:  dict[str, int] = defaultdict(int)
+        self.locked:  dict[str, int] = defaultdict(int)
+        self.error_samples: list[str] = []
+
+    async def call(self, client, label: str, method: str, path: str, **kw):
+        t0 = time.perf_counter()
+        try:
+            r = await client.request(method, path, **kw)
+            r.raise_for_status()
+            return r
+        except Exception as e:
+            self.errors[label] += 1
+            if "database is locked" in str(e):
+                self.locked[label] += 1
+            if len(self.error_samples) < 10:
+                self.error_samples.append(f"{label}: {type(e).__name__}: {str(e)[:200]}")
+            return None
+        finally:
+            self.samples[label].append((time.perf_counter() - t0) * 1000)
+
+    def summary(self, labels) -> dict:
+        lat = [x for l in labels for x in self.samples[l]]
+        n   = len(lat)
+        err = sum(self.errors[l] for l in labels)
+        lck = sum(self.locked[l] for l in labels)
+        if not n:
+            return {"n": 0}
+        return {
+            "n":           n,
+            "errors":      err,
+            "locked":      lck,
+            "error_rate":  round(err / n, 4),
+            "locked_rate": round(lck / n, 4),
+            "p50_ms":      round(percentile(lat, 0.50), 2),
+            "p95_ms":      round(percentile(lat, 0.95), 2),
+            "p99_ms":      round(percentile(lat, 0.99), 2),
+            "max_ms":      round(max(lat), 2),
+        }
+
+
+async def _loop_monitor(stop: asyncio.Event, lags: list[float], interval: float = 0.005):
+    """이벤트 루프 지연 측정: interval 수면 후 실제 경과 - interval"""
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - t0 - interval) * 1000)
+
+
+async def run_load(spec, mix: dict[str, float], duration: float, max_inflight: int) -> dict:
+    import httpx
+    from backend.db.database import engine
+    from backend.main import app
+
+    provider, ids, dataset = await prepare(spec)
+    stock_ids = ids["STOCK"]
+    all_ids   = [i for v in ids.values() for i in v]
+    schedule  = build_schedule(mix, duration, spec.seed)
+    rec       = Recorder()
+    sem       = asyncio.Semaphore(max_inflight)
+    dropped   = 0
+
+    async def session(client, kind: str, u: float):
+        async with sem:
+            if kind == "dashboard":
+                await rec.call(client, "GET /api/assets", "GET", "/api/assets")
+                period = PERIODS[int(u * len(PERIODS))]
+                await rec.call(client, "GET /api/assets/chart", "GET", f"/api/assets/chart?period={period}")
+            elif kind == "reader":
+                asset_id = all_ids[int(u * len(all_ids))]
+                await rec.call(client, "GET /api/assets/{id}/history", "GET", f"/api/assets/{asset_id}/history")
+            elif kind == "editor" and stock_ids:
+                asset_id = stock_ids[int(u * len(stock_ids))]
+                r = await rec.call(client, "GET /api/assets/{id}/history", "GET", f"/api/assets/{asset_id}/history")
+                rows = r.json() if r is not None else []
+                if rows:
+                    row = rows[int(u * len(rows))]
+                    await rec.call(
+                        client, "PUT /api/assets/{id}/history/{date}", "PUT",
+                        f"/api/assets/{asset_id}/history/{row['date']}",
+                        json={"price": row["price"], "quantity": (row.get("quantity") or 0) + 1},
+                    )
+            elif kind == "updater":
+                await rec.call(client, "POST /api/stocks/update", "POST", "/api/stocks/update")
+
+    stop  = asyncio.Event()
+    lags: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=None) as client:
+        monitor = asyncio.create_task(_loop_monitor(stop, lags))
+        tasks   = []
+        start   = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for at, kind, u in schedule:
+                delay = start + at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if sem.locked() and len([t for t in tasks if not t.done()]) >= max_inflight * 4:
+                    dropped += 1   # 대기열 과적: 클라이언트 포기로 간주
+                    continue
+                tasks.append(asyncio.create_task(session(client, kind, u)))
+            await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await monitor
+
+    await engine.dispose()
+
+    labels = sorted(rec.samples)
+    return {
+        "meta":    meta(spec, mix=mix, duration_s=duration, max_inflight=max_inflight),
+        "dataset": dataset,
+        "load": {
+            "scheduled_sessions": len(schedule),
+            "dropped_sessions":   dropped,
+            "requests":           sum(len(v) for v in rec.samples.values()),
+            "elapsed_s":          round(elapsed, 2),
+            "throughput_rps":     round(sum(len(v) for v in rec.samples.values()) / elapsed, 2),
+        },
+        "overall":   rec.summary(labels),
+        "endpoints": {l: rec.summary([l]) for l in labels},
+        "loop": {
+            "samples":         len(lags),
+            "max_lag_ms":      round(max(lags), 2) if lags else 0.0,
+            "p99_lag_ms":      round(percentile(lags, 0.99), 2) if lags else 0.0,
+            "blocked_ms":      round(sum(l for l in lags if l > 1.0), 1),
+            "blocked_ratio":   round(sum(l for l in lags if l > 1.0) / (elapsed * 1000), 4),
+        },
+        "errors_sample": rec.error_samples,
+    }
+
+
+def check_slo(report: dict, slo: dict[str, float]) -> list[str]:
+    """SLO 위반 목록 (비어 있으면 통과)"""
+    violations = []
+    for key, limit in slo.items():
+        if key not in SLO_KEYS:
+            violations.append(f"알 수 없는 SLO 키: {key}")
+            continue
+        section, field, direction = SLO_KEYS[key]
+        value = report.get(section, {}).get(field, 0.0)
+        if (direction == "max" and value > limit) or (direction == "min" and value < limit):
+            violations.append(f"{key}: {value} ({'≤' if direction == 'max' else '≥'} {limit} 필요)")
+    return violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="In-process 부하 테스트 + SLO 판정")
+    add_spec_args(parser)
+    parser.add_argument("--duration",     type=float, default=20.0, help="부하 구간 (초)")
+    parser.add_argument("--mix",          default=DEFAULT_MIX, help="사용자 유형=초당 도착 수")
+    parser.add_argument("--max-inflight", type=int, default=32, help="동시 진행 세션 상한")
+    parser.add_argument("--slo",          default="", help="예: p95_ms=1500,error_rate=0.01,locked_rate=0")
+    parser.add_argument("--out",          help="JSON 리포트 경로 (없으면 stdout)")
+    args = parser.parse_args(argv)
+
+    spec   = spec_from_args(args)
+    report = asyncio.run(run_load(spec, parse_kv(args.mix), args.duration, args.max_inflight))
+
+    slo = parse_kv(args.slo)
+    violations = check_slo(report, slo)
+    report["slo"] = {"targets": slo, "violations": violations, "passed": not violations}
+    write_report(report, args.out)
+
+    o = report["overall"]
+    print(f"📊 {report['load']['throughput_rps']} req/s, p95 {o.get('p95_ms')}ms, p99 {o.get('p99_ms')}ms, "
+          f"오류 {o.get('error_rate')}, locked {o.get('locked_rate')}, 루프 최대 지연 {report['loop']['max_lag_ms']}ms")
+    for v in violations:
+        print(f"❌ SLO 위반 — {v}")
+    if violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+차트 동시 요청 중 이벤트 루프 지연 측정.
+
+DB 쓰기로 차트 캐시를 무효화한 뒤 같은 조건의 /api/assets/chart 요청 N개를 동시에 보내고,
+그동안 이벤트 루프 지연과 /api/health 응답 시간을 기록한다 (라운드 반복).
+CPU 집계가 루프를 막으면 health가 차트 계산 시간만큼 늦어지고, single-flight가 없으면 N배로 계산한다.
+
+사용법:
+    python -m benchmarks.loop_lag --concurrency 4 --rounds 3 --out lag.json
+    CPU_EXECUTOR_WORKERS=0 python -m benchmarks.loop_lag ...   # 루프 안 실행과 비교
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+
+from benchmarks.load import _loop_monitor
+from benchmarks.run import add_spec_args, spec_from_args, prepare, meta, percentile, write_report
+
+
+async def _health_probe(client, stop: asyncio.Event, samples: list[float], interval: float = 0.05):
+    """interval마다 /api/health — 예정 시각부터 응답까지 (루프가 막혀 늦게 보낸 시간 포함)"""
+    while not stop.is_set():
+        due = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        await client.get("/api/health")
+        samples.append((time.perf_counter() - due) * 1000)
+
+
+def _stats(samples: list[float]) -> dict:
+    if not samples:
+        return {"n": 0}
+    return {
+        "n":      len(samples),
+        "p50_ms": round(percentile(samples, 0.50), 2),
+        "p99_ms": round(percentile(samples, 0.99), 2),
+        "max_ms": round(max(samples), 2),
+    }
+
+
+async def run_lag(spec, concurrency: int, rounds: int) -> dict:
+    import httpx
+    from backend.core.metrics import CACHE_REQUESTS
+    from backend.db.database import engine
+    from backend.main import app
+
+    _, ids, dataset = await prepare(spec)
+    target = next(i for v in ids.values() for i in v)
+
+    lags:   list[float] = []
+    health: list[float] = []
+    charts: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://lag", timeout=None) as client:
+        await client.get("/api/assets/chart?period=all")   # import·커넥션 warm-up
+        misses0 = CACHE_REQUESTS._values.get(("chart", "miss"), 0)
+        start   = time.perf_counter()
+        for r in range(rounds):
+            # 아무 쓰기나 커밋 → data_version 증가 → 차트 캐시 무효화
+            await client.put(f"/api/assets/{target}", json={"name": f"lag-{r}"})
+
+            stop    = asyncio.Event()
+            monitor = asyncio.create_task(_loop_monitor(stop, lags))
+            probe   = asyncio.create_task(_health_probe(client, stop, health))
+
+            async def chart():
+                t0 = time.perf_counter()
+                (await client.get("/api/assets/chart?period=all")).raise_for_status()
+                charts.append((time.perf_counter() - t0) * 1000)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                await asyncio.gather(*(chart() for _ in range(concurrency)))
+            stop.set()
+            await asyncio.gather(monitor, probe)
+        elapsed = time.perf_counter() - start
+        computes = int(CACHE_REQUESTS._values.get(("chart", "miss"), 0) - misses0)
+
+    await engine.dispose()
+    return {
+        "meta":    meta(spec, concurrency=concurrency, rounds=rounds),
+        "dataset": {k: v for k, v in dataset.items() if k != "cold_update"},
+        "elapsed_s":      round(elapsed, 2),
+        "chart_computes": computes,
+        "chart":  _stats(charts),
+        "health": _stats(health),
+        "loop": {
+            "max_lag_ms":  round(max(lags), 2) if lags else 0.0,
+            "p99_lag_ms":  round(percentile(lags, 0.99), 2) if lags else 0.0,
+            "blocked_ms":  round(sum(l for l in lags if l > 1.0), 1),
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="차트 동시 요청 중 이벤트 루프 지연 측정")
+    add_spec_args(parser)
+    parser.add_argument("--concurrency", type=int, default=4, help="라운드당 동시 차트 요청 수")
+    parser.add_argument("--rounds",      type=int, default=3)
+    parser.add_argument("--out",         help="JSON 리포트 경로 (없으면 stdout)")
+    args = parser.parse_args(argv)
+
+    spec   = spec_from_args(args)
+    report = asyncio.run(run_lag(spec, args.concurrency, args.rounds))
+    write_report(report, args.out)
+    print(f"📊 차트 {report['chart_computes']}회 계산 / 요청 {args.concurrency * args.rounds}건, "
+          f"루프 최대 지연 {report['loop']['max_lag_ms']}ms, health p99 {report['health'].get('p99_ms')}ms")
+
+
+if __name__ == "__main__":
+    main()
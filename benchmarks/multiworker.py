@@ -0,0 +1,171 @@
+"""
+다중 worker 점검: 여러 프로세스가 같은 SQLite 파일로 동시에 기동/읽기/쓰기.
+
+uvicorn --workers N과 같은 조건(프로세스별 엔진·메모리 캐시, 공용 DB 파일)을 재현해 확인한다.
+  - 동시 기동 시 migration 충돌 없음 (migrate.lock)
+  - 예약 업데이트 leader는 정확히 1개 (updater.lock)
+  - 한 worker의 쓰기 후 다른 worker의 캐시(settings, chart)가 최신 값을 반환 (data_version)
+  - "database is locked" 오류 없음 (WAL + busy_timeout)
+
+사용법:
+    python -m benchmarks.multiworker --workers 4 --duration 10
+    (점검 실패 시 exit 1)
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.run import add_spec_args, spec_from_args, prepare, write_report, meta
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+async def _worker(index: int, workers: int, duration: float, seed: int) -> dict:
+    """자식 프로세스 본체: 앱 lifespan 기동 → 혼합 읽기/쓰기 → 배리어 후 최종 일관성 확인"""
+    import httpx
+    from benchmarks.provider import StubProvider
+    from backend.main import app
+    from backend.services import scheduler
+
+    StubProvider(seed=seed).install()
+    db_dir  = os.environ["DB_DIR"]
+    errors  = []
+    locked  = 0
+    writes  = 0
+    stale   = 0
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://w") as c:
+            async def call(method, path, **kw):
+                nonlocal locked
+                try:
+                    r = await c.request(method, path, **kw)
+                    r.raise_for_status()
+                    return r.json()
+                except Exception as e:
+                    if "database is locked" in str(e):
+                        locked += 1
+                    errors.append(f"{method} {path}: {str(e)[:160]}")
+                    return None
+
+            assets = await call("GET", "/api/assets") or []
+            stocks = [a for a in assets if a["type"] == "STOCK"]
+            seen: dict[str, int] = {}
+            end = time.perf_counter() + duration
+            i = 0
+            while time.perf_counter() < end:
+                i += 1
+                # 쓰기: 자기 키 + (가끔) 주식 이력 수량
+                await call("PUT", "/api/settings", json={f"mw_worker_{index}": i})
+                writes += 1
+                if stocks and i % 5 == 0:
+                    a = stocks[(index + i) % len(stocks)]
+                    hist = await call("GET", f"/api/assets/{a['id']}/history") or []
+                    if hist:
+                        row = hist[(i * 7) % len(hist)]
+                        await call("PUT", f"/api/assets/{a['id']}/history/{row['date']}",
+                                   json={"price": row["price"], "quantity": (row.get("quantity") or 0) + 1})
+                        writes += 1
+                # 읽기: 다른 worker 키는 단조 증가해야 함 (캐시가 과거 값으로 돌아가면 stale)
+                settings = await call("GET", "/api/settings") or {}
+                for k, v in settings.items():
+                    if k.startswith("mw_worker_"):
+                        if v < seen.get(k, 0):
+                            stale += 1
+                        seen[k] = v
+                await call("GET", "/api/assets/chart?period=1m")
+                await asyncio.sleep(0)
+
+            # 배리어: 모든 worker의 쓰기가 끝난 뒤 최종 상태 비교
+            Path(db_dir, f"mw_done_{index}").write_text(str(i))
+            while sum(1 for p in Path(db_dir).glob("mw_done_*")) < workers:
+                await asyncio.sleep(0.05)
+            finals   = {p.name.removeprefix("mw_done_"): int(p.read_text()) for p in Path(db_dir).glob("mw_done_*")}
+            settings = await call("GET", "/api/settings") or {}
+            coherent = all(settings.get(f"mw_worker_{k}") == v for k, v in finals.items())
+            chart    = await call("GET", "/api/assets/chart?period=1m") or []
+            last_day = max((r["date"] for r in chart), default=None)
+            total    = round(sum(r["value"] for r in chart if r["date"] == last_day), 2)
+            leader   = scheduler.is_leader()
+
+    return {
+        "index": index, "pid": os.getpid(), "iterations": i, "writes": writes,
+        "errors": len(errors), "errors_sample": errors[:5], "locked": locked, "stale_reads": stale,
+        "settings_coherent": coherent, "chart_total": total, "leader": leader,
+    }
+
+
+def _child_main():
+    index, workers, duration, seed = (int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4]), int(sys.argv[5]))
+    import contextlib, io
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = asyncio.run(_worker(index, workers, duration, seed))
+    print("__WORKER__" + json.dumps(result, ensure_ascii=False))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="다중 worker 동시 기동/쓰기/캐시 일관성 점검")
+    add_spec_args(parser)
+    parser.add_argument("--workers",  type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--out",      help="JSON 리포트 경로 (없으면 stdout)")
+    args = parser.parse_args(argv)
+
+    spec = spec_from_args(args)
+    # 데이터셋만 부모에서 만들고, 자식들은 migration 완료된 같은 DB 파일로 기동
+    _, _, dataset = asyncio.run(prepare(spec))
+
+    env = {**os.environ, "UPDATE_INTERVAL_MINUTES": "1"}
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.multiworker", "--child",
+             str(i), str(args.workers), str(args.duration), str(spec.seed)],
+            cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        )
+        for i in range(args.workers)
+    ]
+    results, failures = [], []
+    for p in procs:
+        out, err = p.communicate()
+        line = next((l for l in out.splitlines() if l.startswith("__WORKER__")), None)
+        if p.returncode != 0 or line is None:
+            failures.append(f"worker 비정상 종료 (code {p.returncode}): {err.strip()[-300:]}")
+            continue
+        results.append(json.loads(line.removeprefix("__WORKER__")))
+
+    leaders = sum(r["leader"] for r in results)
+    checks = {
+        "all_workers_ok":    not failures and len(results) == args.workers,
+        "single_leader":     leaders == 1,
+        "no_errors":         all(r["errors"] == 0 for r in results),
+        "no_locked":         all(r["locked"] == 0 for r in results),
+        "no_stale_reads":    all(r["stale_reads"] == 0 for r in results),
+        "settings_coherent": all(r["settings_coherent"] for r in results),
+        "chart_coherent":    len({r["chart_total"] for r in results}) <= 1,
+    }
+    report = {
+        "meta":     meta(spec, workers=args.workers, duration_s=args.duration),
+        "dataset":  dataset,
+        "checks":   checks,
+        "passed":   all(checks.values()),
+        "workers":  results,
+        "failures": failures,
+    }
+    write_report(report, args.out)
+    for name, ok in checks.items():
+        print(f"{'✅' if ok else '❌'} {name}")
+    if not report["passed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        _child_main()
+    else:
+        main()
@@ -0,0 +1,161 @@
+"""
+응답 크기·직렬화·압축 측정.
+
+  - API: /api/assets, /api/assets/chart 등을 Accept-Encoding별(identity/gzip/br)로 호출해
+    전송 크기(wire bytes)와 p50 지연 기록 + 차트 dict의 표준 json / orjson 직렬화 시간 비교
+  - 정적 파일: 빌드 결과물(index.html + 초기 JS/CSS)을 압축 전/후 크기로 받아
+    주어진 대역폭·RTT에서의 첫 렌더 전송 시간 추정 (HTML 1회 왕복 + 초기 자원 병렬 1회 왕복 + 전송)
+
+사용법:
+    python -m benchmarks.payload --assets-per-type 10 --years 5 [--static frontend/dist] \\
+        [--bandwidth-mbps 10 --rtt-ms 50] [--out payload.json]
+    (정적 파일 측정은 npm run build 결과물이 있을 때만 — 없으면 생략)
+"""
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import time
+from pathlib import Path
+
+from benchmarks.run import add_spec_args, spec_from_args, prepare, meta, percentile, write_report
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_ASSET_RE = re.compile(r'<(?:script[^>]*\ssrc|link[^>]*rel="(?:stylesheet|modulepreload)"[^>]*\shref)="/?([^"]+)"')
+
+
+def _encodings() -> list[str]:
+    from backend.core.encoding import ENCODINGS
+    return ["identity", *ENCODINGS]
+
+
+async def _fetch(client, path: str, encoding: str, repeat: int) -> dict:
+    """같은 요청 repeat회 → 전송 크기 + p50 지연 (httpx가 받은 압축 그대로의 byte 수)"""
+    samples, wire, raw = [], 0, 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        async with client.stream("GET", path, headers={"accept-encoding": encoding}) as r:
+            r.raise_for_status()
+            body = await r.aread()
+            wire = r.num_bytes_downloaded
+            raw  = len(body)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return {"bytes": wire, "raw_bytes": raw, "p50_ms": round(percentile(samples, 0.5), 2)}
+
+
+def _serialize(chart, repeat: int) -> dict:
+    """차트 dict 직렬화: 표준 json(기존 JSONResponse 방식) vs orjson"""
+    from backend.core.encoding import dumps
+
+    def stdlib():
+        return json.dumps(chart, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+    out = {}
+    for name, fn in (("json", stdlib), ("orjson", lambda: dumps(chart))):
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - t0) * 1000)
+        out[name] = {"p50_ms": round(statistics.median(samples), 3), "bytes": len(fn())}
+    out["speedup"] = round(out["json"]["p50_ms"] / max(out["orjson"]["p50_ms"], 1e-6), 1)
+    return out
+
+
+async def _static(directory: Path, bandwidth: float, rtt: float) -> dict:
+    """index.html이 참조하는 초기 JS/CSS 전송량·첫 렌더 전송 시간 추정 (ms)"""
+    import httpx
+    from starlette.applications import Starlette
+    from backend.core.encoding import CompressionMiddleware, PrecompressedStaticFiles
+
+    app = Starlette()
+    app.add_middleware(CompressionMiddleware)
+    app.mount("/", PrecompressedStaticFiles(directory=str(directory), html=True))
+
+    html     = (directory / "index.html").read_text(encoding="utf-8")
+    critical = ["/", *("/" + p for p in dict.fromkeys(_ASSET_RE.findall(html)))]
+    report: dict = {"files": critical}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://static") as client:
+        for encoding in ("identity", "gzip", "br"):
+            sizes, headers = [], {}
+            for path in critical:
+                async with client.stream("GET", path, headers={"accept-encoding": encoding}) as r:
+                    r.raise_for_status()
+                    await r.aread()
+                    sizes.append(r.num_bytes_downloaded)
+                    headers[path] = {k: r.headers.get(k) for k in ("content-encoding", "cache-control")}
+            total = sum(sizes)
+            report[encoding] = {
+                "bytes":            total,
+                # HTML 왕복 + 초기 자원 병렬 왕복 + 전체 전송 (대역폭 공유)
+                "first_render_ms":  round(2 * rtt + total * 8 / (bandwidth * 1e6) * 1000, 1),
+                "headers":          headers,
+            }
+    return report
+
+
+async def run_payload(spec, repeat: int, static_dir: Path | None, bandwidth: float, rtt: float) -> dict:
+    import httpx
+    from backend.db.database import async_session, engine
+    from backend.db.crud import get_all_assets, generate_chart_data
+    from backend.main import app
+
+    _, ids, dataset = await prepare(spec)
+    async with async_session() as db:
+        assets = await get_all_assets(db)
+    chart = generate_chart_data(assets, period="all", group_by="name")
+
+    api: dict[str, dict] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://payload", timeout=None) as client:
+        for name, path in [
+            ("GET /api/assets",               "/api/assets"),
+            ("GET /api/assets/chart",         "/api/assets/chart"),
+            ("GET /api/assets/chart?name",    "/api/assets/chart?group_by=name"),
+            ("GET /api/summary",              "/api/summary"),
+        ]:
+            await client.get(path)   # 캐시 warm-up
+            api[name] = {enc: await _fetch(client, path, enc, repeat) for enc in _encodings()}
+            base = api[name]["identity"]["bytes"]
+            for enc in _encodings()[1:]:
+                api[name][enc]["ratio"] = round(api[name][enc]["bytes"] / base, 3) if base else None
+    await engine.dispose()
+
+    report = {
+        "meta":      meta(spec, repeat=repeat, bandwidth_mbps=bandwidth, rtt_ms=rtt),
+        "dataset":   dataset,
+        "serialize": _serialize(chart, repeat),
+        "api":       api,
+    }
+    if static_dir is not None and (static_dir / "index.html").exists():
+        report["static"] = await _static(static_dir, bandwidth, rtt)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="응답 크기·직렬화·압축 측정")
+    add_spec_args(parser)
+    parser.add_argument("--repeat",         type=int,   default=10)
+    parser.add_argument("--static",         default=str(ROOT / "frontend" / "dist"), help="빌드 결과물 경로")
+    parser.add_argument("--bandwidth-mbps", type=float, default=10.0)
+    parser.add_argument("--rtt-ms",         type=float, default=50.0)
+    parser.add_argument("--out",            help="JSON 리포트 경로 (없으면 stdout)")
+    args = parser.parse_args(argv)
+
+    spec   = spec_from_args(args)
+    report = asyncio.run(run_payload(spec, args.repeat, Path(args.static), args.bandwidth_mbps, args.rtt_ms))
+    write_report(report, args.out)
+
+    chart = report["api"]["GET /api/assets/chart?name"]
+    best  = min((v for k, v in chart.items() if k != "identity"), key=lambda v: v["bytes"])
+    print(f"📦 차트 {chart['identity']['bytes'] / 1024:.1f}KB → {best['bytes'] / 1024:.1f}KB, "
+          f"직렬화 {report['serialize']['speedup']}배 빠름")
+    if "static" in report:
+        s = report["static"]
+        print(f"🖥️  첫 렌더 전송 {s['identity']['first_render_ms']}ms → br {s['br']['first_render_ms']}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+시세/환율 Stub provider.
+
+market_data provider 체인을 이 provider 하나로 교체해 seed 고정 랜덤워크 시세를 돌려준다.
+같은 (seed, ticker)는 어떤 구간으로 조회해도 같은 날짜에 같은 종가를 반환하므로
+증분 Backfill(캐시 앞/뒤 구간 조회) 경로도 실제와 같은 형태로 재현된다.
+"""
+import zlib
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from backend.services import market_data
+
+EPOCH    = pd.Timestamp("2000-01-03")
+FX_BASE  = {"USD": 1300.0, "JPY": 9.5}
+_DIV_MONTHS = (3, 6, 9, 12)
+
+
+class StubProvider(market_data.Provider):
+    name = "stub"
+    ops  = ("history", "fx_rate")
+
+    def __init__(self, seed: int = 42):
+        super().__init__()
+        self.seed  = seed
+        self.calls = 0   # history() 호출 수 (캐시 적중 확인용)
+        self._paths: dict[str, pd.DataFrame] = {}
+
+    def _path(self, ticker: str) -> pd.DataFrame:
+        """EPOCH ~ 내일까지의 영업일 전체 시계열 (Ticker별 1회 생성)"""
+        if ticker in self._paths:
+            return self._paths[ticker]
+        idx = pd.bdate_range(EPOCH, datetime.now().date() + timedelta(days=1))
+        rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode())])
+        if ticker.endswith("KRW=X"):
+            base  = FX_BASE.get(ticker[:3], 1.0)
+            close = base * np.exp(np.cumsum(rng.normal(0, 0.004, len(idx))))
+            div   = np.zeros(len(idx))
+        else:
+            base  = 50_000.0 if ticker.endswith((".KS", ".KQ")) else 100.0
+            close = base * np.exp(np.cumsum(rng.normal(0.0002, 0.015, len(idx))))
+            # 분기 첫 영업일 배당락 (종가의 0.5%)
+            first = np.append(True, idx.month[1:] != idx.month[:-1]) & np.isin(idx.month, _DIV_MONTHS)
+            div   = np.where(first, np.round(close * 0.005, 4), 0.0)
+        df = pd.DataFrame({"Close": close, "Dividends": div}, index=idx)
+        self._paths[ticker] = df
+        return df
+
+    def frame(self, ticker: str, start=None, end=None) -> pd.DataFrame:
+        self.calls += 1
+        df    = self._path(ticker)
+        today = pd.Timestamp(datetime.now().date())
+        end   = min(pd.Timestamp(end) if end else today + pd.Timedelta(days=1), today + pd.Timedelta(days=1))
+        start = pd.Timestamp(start) if start else end - pd.Timedelta(days=5)
+        return df[(df.index >= start) & (df.index < end)]
+
+    async def history(self, ticker: str, start: str, end: str) -> list[dict]:
+        df = self.frame(ticker, start, end)
+        return [
+            {"date": d, "close": float(c), "dividend": float(v)}
+            for d, c, v in zip(df.index.strftime("%Y-%m-%d"), df["Close"], df["Dividends"])
+        ]
+
+    def close_on(self, ticker: str, date: str) -> float:
+        df  = self._path(ticker)
+        pos = df.index.searchsorted(pd.Timestamp(date), side="right") - 1
+        return float(df["Close"].iloc[max(pos, 0)])
+
+    async def fx_rate(self, currency: str) -> float:
+        return self.close_on(f"{currency}KRW=X", datetime.now().strftime("%Y-%m-%d"))
+
+    def install(self):
+        """시세/환율 조회 provider 체인을 Stub 하나로 교체 (실시간 현재가는 없음)"""
+        market_data.set_providers([self])
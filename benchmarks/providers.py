@@ -0,0 +1,300 @@
+"""
+시세 provider 계층 오프라인 점검: 로컬 Stub HTTP 서버(네이버/Yahoo/frankfurter 형식)로 검증.
+
+  - 응답 파싱: Yahoo chart 일별 종가·배당락, 네이버 현재가, frankfurter 환율
+  - ordered fallback: 앞 provider가 5xx면 다음 provider(fixture) 결과 사용
+  - circuit breaker: 응답 없는 host는 threshold회 타임아웃 후 호출 없이 건너뜀 (Ticker마다 타임아웃 X)
+  - half-open 복구: cooldown 후 시험 호출 성공 → 다시 사용
+  - host별 동시성·초당 요청 수 제한, keep-alive 연결 재사용
+  - 국내 현재가 묶음 조회(요청당 NAVER_QUOTE_BATCH종목) + TTL 캐시 적중 시 upstream 요청 없음
+
+사용법:
+    python -m benchmarks.providers [--out report.json]
+    (점검 실패 시 exit 1)
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# 타임아웃을 짧게 (backend 설정은 import 시점에 읽힘)
+os.environ.setdefault("HTTP_CONNECT_TIMEOUT", "0.5")
+os.environ.setdefault("HTTP_READ_TIMEOUT", "0.3")
+TIMEOUT = float(os.environ["HTTP_READ_TIMEOUT"])
+
+
+# ──────────────────────────────────────────────────────────────
+# Stub 서버
+# ──────────────────────────────────────────────────────────────
+def _bdays(start: datetime, end: datetime) -> list[datetime]:
+    days, d = [], start
+    while d < end:
+        if d.weekday() < 5:
+            days.append(d)
+        d += timedelta(days=1)
+    return days
+
+
+def _chart(ticker: str, query: dict) -> dict:
+    """Yahoo v8 chart 형식: 영업일 종가 100+i, 분기 첫 영업일 배당 1.0"""
+    if "period1" in query:
+        start = datetime.fromtimestamp(int(query["period1"]), timezone.utc)
+        end   = datetime.fromtimestamp(int(query["period2"]), timezone.utc)
+    else:
+        end   = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        start = end - timedelta(days=1)
+    days   = _bdays(start, end)
+    stamps = [int((d + timedelta(hours=14)).timestamp()) for d in days]   # 장중 시각 (UTC)
+    divs   = {
+        str(ts): {"amount": 1.0, "date": ts}
+        for ts, d in zip(stamps, days)
+        if d.month in (3, 6, 9, 12) and (d.day == 1 or (d.weekday() == 0 and d.day <= 3))   # 월 첫 영업일
+    }
+    closes = [100.0 + i for i in range(len(days))]
+    return {"chart": {"result": [{
+        "meta":       {"symbol": ticker, "gmtoffset": 0, "regularMarketPrice": 123.5},
+        "timestamp":  stamps,
+        "events":     {"dividends": divs},
+        "indicators": {"quote": [{"close": closes}], "adjclose": [{"adjclose": closes}]},
+    }], "error": None}}
+
+
+class StubServer:
+    """prefix(/naver, /yahoo, /frankfurter)별 모드: ok | slow | error(500) | hang(타임아웃 초과)"""
+
+    def __init__(self):
+        self.modes    = {"naver": "ok", "yahoo": "ok", "frankfurter": "ok"}
+        self.requests = {k: 0 for k in self.modes}
+        self.inflight = {k: 0 for k in self.modes}
+        self.peak     = {k: 0 for k in self.modes}
+        self.conns    = {k: set() for k in self.modes}
+        self._lock    = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # keep-alive
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url    = urlparse(self.path)
+                prefix = url.path.split("/")[1]
+                query  = {k: v[0] for k, v in parse_qs(url.query).items()}
+                with stub._lock:
+                    stub.requests[prefix] += 1
+                    stub.inflight[prefix] += 1
+                    stub.peak[prefix] = max(stub.peak[prefix], stub.inflight[prefix])
+                    stub.conns[prefix].add(self.client_address)
+                try:
+                    mode = stub.modes[prefix]
+                    if mode == "hang":
+                        time.sleep(TIMEOUT * 4)
+                    elif mode == "slow":
+                        time.sleep(0.05)
+                    if mode == "error":
+                        self._send(500, {"error": "injected"})
+                    else:
+                        self._send(200, stub.route(prefix, url.path, query))
+                finally:
+                    with stub._lock:
+                        stub.inflight[prefix] -= 1
+
+            def _send(self, status, body):
+                data = json.dumps(body).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass   # hang 모드: 클라이언트가 이미 타임아웃으로 끊음
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url   = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def route(self, prefix: str, path: str, query: dict) -> dict:
+        if prefix == "naver" and "/realtime/" in path:
+            codes = path.rsplit("/", 1)[-1].split(",")
+            return {"datas": [{"itemCode": c, "closePrice": f"{int(c) % 1000 + 1000:,}"} for c in codes]}
+        if prefix == "naver":
+            return {"closePrice": "71,000"}
+        if prefix == "yahoo":
+            return _chart(path.rsplit("/", 1)[-1], query)
+        if path.endswith("/latest"):
+            return {"rates": {"KRW": 1380.5}}
+        start, end = path.rsplit("/", 1)[-1].split("..")
+        days = _bdays(datetime.strptime(start, "%Y-%m-%d"), datetime.strptime(end, "%Y-%m-%d") + timedelta(days=1))
+        return {"rates": {d.strftime("%Y-%m-%d"): {"KRW": 1300.0 + i} for i, d in enumerate(days)}}
+
+    def reset_stats(self):
+        for k in self.modes:
+            self.requests[k], self.peak[k] = 0, 0
+            self.conns[k] = set()
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+# ──────────────────────────────────────────────────────────────
+# 점검
+# ──────────────────────────────────────────────────────────────
+async def _checks(server: StubServer, fixtures: str) -> tuple[dict, dict]:
+    from backend.services import market_data as md
+
+    naver   = md.NaverProvider(base_url=server.url + "/naver", polling_url=server.url + "/naver")
+    yahoo   = md.YahooProvider(base_url=server.url + "/yahoo")
+    frank   = md.FrankfurterProvider(base_url=server.url + "/frankfurter")
+    fixture = md.FixtureProvider(fixtures)
+    checks, stats = {}, {}
+
+    # 1. 파싱 (2024-03-01 금 ~ 2024-03-09 토, end exclusive → 영업일 6일, 3/1 배당)
+    md.set_providers([naver, yahoo, frank])
+    rows = await md.history("AAA", "2024-03-01", "2024-03-09")
+    checks["yahoo_history_parsed"] = (
+        rows is not None and len(rows) == 6 and rows[0]["date"] == "2024-03-01"
+        and rows[0]["dividend"] == 1.0 and rows[-1]["close"] == 105.0
+    )
+    checks["naver_quote"]    = await md.quote("005930.KS") == 71000.0
+    checks["yahoo_quote"]    = await md.quote("AAPL") == 123.5   # 해외 주식은 네이버 건너뜀
+    md.set_providers([frank, yahoo])
+    checks["frankfurter_fx"] = await md.fx_rate("USD") == 1380.5
+    md.set_providers([yahoo, frank])
+    fx_rows = await md.history("USDKRW=X", "2024-03-04", "2024-03-06")
+    checks["yahoo_first_for_fx_history"] = bool(fx_rows) and fx_rows[0]["close"] == 100.0
+
+    # 2. ordered fallback: Yahoo 5xx → fixture
+    server.modes["yahoo"] = "error"
+    md.set_providers([yahoo, fixture])
+    rows = await md.history("BBB", "2024-01-01", "2024-12-31")
+    checks["fallback_on_5xx"] = rows is not None and [r["close"] for r in rows] == [10.0, 11.0]
+    yahoo.breaker.success()
+
+    # 3. circuit breaker: Yahoo 무응답 → threshold회만 타임아웃, 이후 frankfurter로 즉시 fallback
+    server.modes["yahoo"] = "hang"
+    server.reset_stats()
+    md.set_providers([yahoo, frank])
+    n  = 12
+    t0 = time.perf_counter()
+    results = [await md.history("USDKRW=X", "2024-03-04", "2024-03-06") for _ in range(n)]
+    elapsed = time.perf_counter() - t0
+    threshold = yahoo.breaker.threshold
+    stats["outage"] = {
+        "tickers":        n,
+        "yahoo_requests": server.requests["yahoo"],
+        "elapsed_s":      round(elapsed, 3),
+        "naive_s":        round(n * TIMEOUT, 3),
+    }
+    checks["breaker_opens"]    = yahoo.breaker.state == "open" and server.requests["yahoo"] == threshold
+    checks["fallback_served"]  = all(r and r[0]["close"] == 1300.0 for r in results)
+    checks["outage_fail_fast"] = elapsed < (threshold + 1) * TIMEOUT + 1.0
+
+    # 4. half-open: cooldown 후 시험 호출 성공 → closed
+    server.modes["yahoo"] = "ok"
+    yahoo.breaker.cooldown = 0.2
+    await asyncio.sleep(0.25)
+    rows = await md.history("USDKRW=X", "2024-03-04", "2024-03-06")
+    checks["half_open_recovers"] = yahoo.breaker.state == "closed" and rows[0]["close"] == 100.0
+
+    # 5. host별 동시성·속도 제한 + keep-alive
+    server.modes["yahoo"] = "slow"
+    server.reset_stats()
+    yahoo.limiter.rate = 20.0
+    burst = 30
+    t0 = time.perf_counter()
+    await asyncio.gather(*(md.history(f"T{i}", "2024-03-04", "2024-03-06") for i in range(burst)))
+    elapsed = time.perf_counter() - t0
+    min_s   = (burst - yahoo.limiter.concurrency) / yahoo.limiter.rate
+    stats["burst"] = {
+        "requests":      server.requests["yahoo"],
+        "peak_inflight": server.peak["yahoo"],
+        "connections":   len(server.conns["yahoo"]),
+        "elapsed_s":     round(elapsed, 3),
+        "min_s":         round(min_s, 3),
+    }
+    checks["concurrency_limited"] = server.peak["yahoo"] <= yahoo.limiter.concurrency
+    checks["rate_limited"]        = elapsed >= min_s * 0.9
+    checks["keep_alive_reused"]   = len(server.conns["yahoo"]) <= yahoo.limiter.concurrency
+
+    # 6. 국내 현재가 묶음 조회 + TTL 캐시 (해외 Ticker는 Yahoo 종목별)
+    server.modes["yahoo"] = "ok"
+    server.reset_stats()
+    md.set_providers([naver, yahoo])
+    krx   = [f"{100000 + i:06d}.KS" for i in range(45)]
+    cache = md.QuoteCache(ttl=0.3)
+    first = await cache.get_many(krx + ["AAPL"])
+    calls = dict(server.requests)
+    again = await cache.get_many(krx + ["AAPL"])
+    cached_calls = server.requests["naver"] + server.requests["yahoo"] - calls["naver"] - calls["yahoo"]
+    await asyncio.sleep(0.35)
+    await cache.get_many(krx[:5])
+    expected_batches = -(-len(krx) // naver.batch_size)
+    stats["quotes"] = {
+        "tickers":          len(krx) + 1,
+        "naver_requests":   calls["naver"],
+        "yahoo_requests":   calls["yahoo"],
+        "cached_requests":  cached_calls,
+        "after_ttl":        server.requests["naver"] - calls["naver"],
+        "counted_requests": cache.requests,
+    }
+    checks["quotes_batched"]    = calls["naver"] == expected_batches and first.get("100042.KS") == 1042.0
+    checks["quotes_fallback"]   = calls["yahoo"] == 1 and first.get("AAPL") == 123.5
+    checks["quotes_ttl_cache"]  = cached_calls == 0 and again == first
+    checks["quotes_ttl_expiry"] = server.requests["naver"] - calls["naver"] == 1
+    checks["quotes_counted"]    = cache.requests == expected_batches + 2
+
+    # 동시 요청은 조회 1회로 합침 (single-flight)
+    server.reset_stats()
+    cache = md.QuoteCache(ttl=60)
+    both  = await asyncio.gather(cache.get_many(krx[:10]), cache.get_many(krx[:10]))
+    checks["quotes_single_flight"] = server.requests["naver"] == 1 and both[0] == both[1] and len(both[0]) == 10
+
+    md.set_providers(None)
+    await md.aclose()
+    return checks, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시세 provider 계층 오프라인 점검 (로컬 Stub 서버)")
+    parser.add_argument("--out", help="JSON 리포트 경로 (없으면 stdout)")
+    args = parser.parse_args(argv)
+
+    from benchmarks.run import write_report, meta
+
+    server = StubServer()
+    with tempfile.TemporaryDirectory() as fixtures:
+        with open(os.path.join(fixtures, "BBB.json"), "w", encoding="utf-8") as f:
+            json.dump({"history": [
+                {"date": "2024-03-04", "close": 10.0, "dividend": 0},
+                {"date": "2024-03-05", "close": 11.0},
+            ]}, f)
+        try:
+            checks, stats = asyncio.run(_checks(server, fixtures))
+        finally:
+            server.close()
+
+    report = {
+        "meta":   meta(timeout_s=TIMEOUT),
+        "stats":  stats,
+        "checks": checks,
+        "passed": all(checks.values()),
+    }
+    write_report(report, args.out)
+    for name, ok in checks.items():
+        print(f"{'✅' if ok else '❌'} {name}")
+    if not report["passed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+벤치마크 실행기.
+
+임시 SQLite DB에 합성 포트폴리오를 만들고, 실제 crud 함수와 FastAPI 앱(in-process ASGI)을
+Stub 시세로 반복 호출해 p50/p95 지연과 최대 메모리를 JSON으로 기록한다.
+
+사용법:
+    python -m benchmarks.run --assets-per-type 10 --years 5 --out bench.json
+    python -m benchmarks.run --compare base.json --out new.json   # p95 회귀 시 exit 1
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+
+def percentile(samples: list[float], q: float) -> float:
+    s = sorted(samples)
+    k = (len(s) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(s) - 1)
+    return s[lo] + (s[hi] - s[lo]) * (k - lo)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+
+async def _measure(fn, repeat: int, warmup: int) -> dict:
+    """fn(비동기) 반복 실행 → 지연 통계(ms) + 1회 실행 최대 메모리(KB)"""
+    quiet = io.StringIO()
+    with contextlib.redirect_stdout(quiet):
+        for _ in range(warmup):
+            await fn()
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            await fn()
+            samples.append((time.perf_counter() - t0) * 1000)
+        tracemalloc.start()
+        await fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {
+        "n":       repeat,
+        "p50_ms":  round(percentile(samples, 0.50), 3),
+        "p95_ms":  round(percentile(samples, 0.95), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "min_ms":  round(min(samples), 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+async def prepare(spec) -> tuple:
+    """
+    임시 DB 초기화 + 합성 포트폴리오 생성 + 최초(cold) 시세 Backfill.
+    반환: (provider, {유형: [asset_id]}, dataset 요약)
+    """
+    # 백엔드 모듈은 DB_DIR 설정 후 import (config가 import 시점에 경로를 고정)
+    from sqlalchemy import text
+    from backend.db.database import async_session, init_db
+    from backend.services.stock_updater import update_all_stocks
+    from benchmarks.generator import build_portfolio
+    from benchmarks.provider import StubProvider
+
+    provider = StubProvider(seed=spec.seed)
+    provider.install()
+
+    await init_db()
+    t0 = time.perf_counter()
+    async with async_session() as db:
+        ids = await build_portfolio(db, spec)
+        await db.commit()
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    # 최초 업데이트 = price_history 전체 Backfill
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        async with async_session() as db:
+            cold = await update_all_stocks(db)
+            await db.commit()
+        cold_ms = (time.perf_counter() - t0) * 1000
+
+    async with async_session() as db:
+        rows = (await db.execute(text(
+            "SELECT (SELECT COUNT(*) FROM assets), (SELECT COUNT(*) FROM asset_history), "
+            "(SELECT COUNT(*) FROM price_history), (SELECT COUNT(*) FROM transactions)"
+        ))).one()
+
+    dataset = {
+        "assets":         rows[0],
+        "asset_history":  rows[1],
+        "price_history":  rows[2],
+        "transactions":   rows[3],
+        "build_ms":       round(build_ms, 1),
+        "cold_update_ms": round(cold_ms, 1),
+        "cold_update":    cold,
+        "provider_calls": provider.calls,
+    }
+    return provider, ids, dataset
+
+
+def meta(spec=None, **extra) -> dict:
+    info = {
+        "commit":    _git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python":    platform.python_version(),
+        "platform":  platform.platform(),
+    }
+    if spec is not None:
+        info["spec"] = spec.to_dict()
+    return {**info, **extra}
+
+
+async def run(spec, repeat: int, warmup: int) -> dict:
+    import httpx
+    from backend.db.database import async_session, engine
+    from backend.db.crud import get_all_assets, generate_chart_data, update_history, get_history
+    from backend.services.stock_updater import update_all_stocks
+    from backend.main import app
+
+    provider, ids, dataset = await prepare(spec)
+    async with async_session() as db:
+        assets = await get_all_assets(db)
+
+    stock_id = ids["STOCK"][len(ids["STOCK"]) // 2] if ids["STOCK"] else None
+    results: dict[str, dict] = {}
+
+    async def crud_get_all_assets():
+        async with async_session() as db:
+            await get_all_assets(db)
+
+    async def chart_all_by_type():
+        generate_chart_data(assets, period="all", group_by="type")
+
+    async def chart_1y_by_name():
+        generate_chart_data(assets, period="1y", group_by="name")
+
+    async def crud_update_history():
+        # 중간 날짜 수량 수정 (원장 1건 기록 + current_value 동기화) → 롤백해 상태 고정
+        async with async_session() as db:
+            hist = await get_history(db, stock_id)
+            mid  = hist[len(hist) // 2]
+            await update_history(db, stock_id, mid["date"], {"price": mid["price"], "quantity": (mid["quantity"] or 0) + 1})
+            await db.rollback()
+
+    async def updater_warm():
+        async with async_session() as db:
+            await update_all_stocks(db)
+            await db.rollback()
+
+    results["crud.get_all_assets"]       = await _measure(crud_get_all_assets, repeat, warmup)
+    results["chart.all.type"]            = await _measure(chart_all_by_type, repeat, warmup)
+    results["chart.1y.name"]             = await _measure(chart_1y_by_name, repeat, warmup)
+    if stock_id:
+        results["crud.update_history"]   = await _measure(crud_update_history, repeat, warmup)
+    results["updater.update_all_stocks"] = await _measure(updater_warm, max(3, repeat // 4), 1)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, path in [
+            ("http.GET /api/assets",             "/api/assets"),
+            ("http.GET /api/assets/chart",       "/api/assets/chart"),
+            ("http.GET /api/assets/chart?1y",    "/api/assets/chart?period=1y&group_by=name"),
+        ] + ([("http.GET /api/assets/{id}/history", f"/api/assets/{stock_id}/history")] if stock_id else []):
+            async def call(path=path):
+                r = await client.get(path)
+                r.raise_for_status()
+            results[name] = await _measure(call, repeat, warmup)
+
+    await engine.dispose()
+    return {"meta": meta(spec, repeat=repeat), "dataset": dataset, "results": results}
+
+
+def compare(base: dict, new: dict, threshold: float) -> bool:
+    """p95 기준 비교표 출력. threshold 배 이상 느려진 항목이 있으면 False"""
+    ok = True
+    print(f"{'benchmark':<38} {'base p95':>10} {'new p95':>10} {'ratio':>7}")
+    for name, r in new["results"].items():
+        b = base.get("results", {}).get(name)
+        if not b:
+            print(f"{name:<38} {'-':>10} {r['p95_ms']:>10.2f} {'new':>7}")
+            continue
+        ratio = r["p95_ms"] / b["p95_ms"] if b["p95_ms"] else float("inf")
+        flag  = " ⚠️" if ratio > threshold else ""
+        ok    = ok and ratio <= threshold
+        print(f"{name:<38} {b['p95_ms']:>10.2f} {r['p95_ms']:>10.2f} {ratio:>7.2f}{flag}")
+    return ok
+
+
+def add_spec_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--assets-per-type", type=int, default=5)
+    parser.add_argument("--years",           type=int, default=3)
+    parser.add_argument("--accounts",        type=int, default=3)
+    parser.add_argument("--currencies",      default="KRW,USD", help="쉼표 구분 (KRW,USD,JPY)")
+    parser.add_argument("--trades",          type=int, default=4, help="주식 자산당 원장 거래 수")
+    parser.add_argument("--seed",            type=int, default=42)
+
+
+def spec_from_args(args):
+    """임시 DB_DIR 설정 후 PortfolioSpec 생성 (백엔드 import 전에 호출)"""
+    os.environ["DB_DIR"] = tempfile.mkdtemp(prefix="asset-bench-")
+    from benchmarks.generator import PortfolioSpec
+    return PortfolioSpec(
+        assets_per_type  = args.assets_per_type,
+        years            = args.years,
+        accounts         = args.accounts,
+        currencies       = tuple(c.strip().upper() for c in args.currencies.split(",") if c.strip()),
+        trades_per_asset = args.trades,
+        seed             = args.seed,
+    )
+
+
+def write_report(report: dict, out: str | None):
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"📝 {out} 저장")
+    else:
+        print(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 포트폴리오 벤치마크")
+    add_spec_args(parser)
+    parser.add_argument("--repeat",    type=int, default=20)
+    parser.add_argument("--warmup",    type=int, default=2)
+    parser.add_argument("--out",       help="JSON 리포트 경로 (없으면 stdout)")
+    parser.add_argument("--compare",   help="비교 기준 JSON 리포트")
+    parser.add_argument("--threshold", type=float, default=1.25, help="p95 회귀 허용 배율")
+    args = parser.parse_args(argv)
+
+    spec   = spec_from_args(args)
+    report = asyncio.run(run(spec, args.repeat, args.warmup))
+    write_report(report, args.out)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = json.load(f)
+        if not compare(base, report, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+콜드 스타트 측정: 새 프로세스 기동 → 첫 /api/health 응답까지.
+
+각 회차마다 별도 Python 프로세스에서 backend.main import → lifespan(init_db) →
+ASGI로 /api/health 1회 호출 후 종료한다. 부모 프로세스에서 잰 전체 시간(인터프리터 기동 포함)과
+자식이 보고한 구간(import / init_db / 첫 응답)을 함께 기록한다.
+첫 회차는 빈 DB(최초 설치), 이후는 같은 DB 재기동(컨테이너 재시작)이다.
+
+사용법:
+    python -m benchmarks.startup --runs 5 [--out startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.run import meta, write_report
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_CHILD = r"""
+import asyncio, json, time
+t0 = time.perf_counter()
+from backend.main import app
+t1 = time.perf_counter()
+
+async def main():
+    import httpx
+    async with app.router.lifespan_context(app):
+        t2 = time.perf_counter()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://s") as c:
+            r = await c.get("/api/health")
+            r.raise_for_status()
+        t3 = time.perf_counter()
+    return t2, t3
+
+t2, t3 = asyncio.run(main())
+print("__STARTUP__" + json.dumps({"import_ms": (t1 - t0) * 1000, "init_db_ms": (t2 - t1) * 1000,
+                                 "first_response_ms": (t3 - t2) * 1000, "to_health_ms": (t3 - t0) * 1000}))
+"""
+
+
+def _spawn(db_dir: str) -> dict:
+    env = {**os.environ, "DB_DIR": db_dir, "PYTHONDONTWRITEBYTECODE": "0"}
+    t0  = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", _CHILD], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    wall = (time.perf_counter() - t0) * 1000
+    line = next(l for l in out.splitlines() if l.startswith("__STARTUP__"))
+    return {"wall_ms": wall, **json.loads(line.removeprefix("__STARTUP__"))}
+
+
+def _round(d: dict) -> dict:
+    return {k: round(v, 1) for k, v in d.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="콜드 스타트 → 첫 /api/health 응답 시간")
+    parser.add_argument("--runs", type=int, default=5, help="재기동 측정 횟수")
+    parser.add_argument("--out",  help="JSON 리포트 경로 (없으면 stdout)")
+    args = parser.parse_args(argv)
+
+    db_dir = tempfile.mkdtemp(prefix="asset-startup-")
+    first  = _spawn(db_dir)
+    warm   = [_spawn(db_dir) for _ in range(args.runs)]
+    report = {
+        "meta":        meta(runs=args.runs),
+        "first_boot":  _round(first),
+        "restart_median": _round({k: statistics.median(r[k] for r in warm) for k in warm[0]}),
+        "restart_runs": [_round(r) for r in warm],
+    }
+    write_report(report, args.out)
+    print(f"🚀 재기동 → 첫 /api/health: 중앙값 {report['restart_median']['wall_ms']}ms "
+          f"(import {report['restart_median']['import_ms']}ms, init_db {report['restart_median']['init_db_ms']}ms)")
+
+
+if __name__ == "__main__":
+    main()
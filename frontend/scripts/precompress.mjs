@@ -0,0 +1,43 @@
+// 빌드 결과물(dist) 정적 파일을 .br/.gz로 미리 압축 (서버는 요청마다 압축하지 않고 그대로 전송)
+// Node 내장 zlib만 사용 — 추가 의존성 없음. `npm run build` 마지막 단계에서 실행
+import { readdirSync, readFileSync, statSync, writeFileSync } from 'node:fs'
+import { join, extname } from 'node:path'
+import { brotliCompressSync, gzipSync, constants } from 'node:zlib'
+
+const DIST       = new URL('../dist/', import.meta.url).pathname
+const EXTENSIONS = new Set(['.js', '.css', '.html', '.svg', '.json', '.txt', '.map'])
+const MIN_BYTES  = 1024
+const MAX_RATIO  = 0.9   // 10% 이상 줄지 않으면 압축본을 만들지 않음
+
+function* walk(dir) {
+  for (const name of readdirSync(dir)) {
+    const path = join(dir, name)
+    if (statSync(path).isDirectory()) yield* walk(path)
+    else yield path
+  }
+}
+
+let raw = 0, br = 0, gz = 0, files = 0
+for (const path of walk(DIST)) {
+  if (!EXTENSIONS.has(extname(path))) continue
+  const body = readFileSync(path)
+  if (body.length < MIN_BYTES) continue
+
+  const brotli = brotliCompressSync(body, {
+    params: {
+      [constants.BROTLI_PARAM_QUALITY]:   constants.BROTLI_MAX_QUALITY,
+      [constants.BROTLI_PARAM_SIZE_HINT]: body.length,
+    },
+  })
+  const gzip = gzipSync(body, { level: 9 })
+  if (brotli.length <= body.length * MAX_RATIO) writeFileSync(`${path}.br`, brotli)
+  if (gzip.length <= body.length * MAX_RATIO) writeFileSync(`${path}.gz`, gzip)
+
+  files += 1
+  raw   += body.length
+  br    += Math.min(brotli.length, body.length)
+  gz    += Math.min(gzip.length, body.length)
+}
+
+const kb = (n) => `${(n / 1024).toFixed(1)} KB`
+console.log(`🗜️  precompress: ${files} files, ${kb(raw)} → br ${kb(br)} / gzip ${kb(gz)}`)
@@ -6,6 +6,7 @@ import AssetForm from './AssetForm'
 import DividendSection from './DividendSection'
 import ConfirmDialog from '@/components/common/ConfirmDialog'
 import { useDeleteAsset, useUpdateAsset } from '@/hooks/useAssets'
+import { useAssetSeries } from '@/hooks/useHistory'
 import { useSettings } from '@/hooks/useSettings'
 import { formatMoney, formatManwon, formatPnl, formatPrice, formatAvgPrice, TYPE_LABELS } from '@/lib/utils'
 import type { Asset, RealEstateDetail, Settings, StockDetail, PensionDetail } from '@/types'
@@ -34,6 +35,7 @@ export default function AssetDetail({ asset, chartData }: Props) {
   const deleteMut = useDeleteAsset()
   const updateMut = useUpdateAsset()
   const { data: settings } = useSettings()
+  const { data: series }   = useAssetSeries(asset.id)
 
   const a     = asset
   const d     = a.detail as (RealEstateDetail & StockDetail & PensionDetail) | undefined
@@ -86,10 +88,10 @@ export default function AssetDetail({ asset, chartData }: Props) {
 
   const miniChart = chartData
     ? chartData.map((c) => ({ ...c, valueMan: c.value / 1000 }))
-    : a.history.map((h) => ({
-        date: h.date,
-        valueMan: (h.value ?? 0) / 1000,
-      })).sort((x, y) => x.date.localeCompare(y.date))
+    : (series?.points ?? []).map((p) => ({
+        date: p.date,
+        valueMan: (p.value ?? 0) / 1000,
+      }))
 
   return (
     <div className="space-y-5">
@@ -20,6 +20,7 @@ export default function AssetForm({ asset, onClose }: Props) {
   const [quantity,         setQuantity]         = useState(asset.quantity ?? 0)
   const [disposalDate,     setDisposalDate]     = useState(asset.disposalDate ?? '')
   const [disposalPrice,    setDisposalPrice]    = useState(asset.disposalPrice ?? 0)
+  const [memo,             setMemo]             = useState(asset.memo ?? '')
 
   // 부동산
   const [address,       setAddress]       = useState((d?.address       as string)  ?? '')
@@ -71,6 +72,7 @@ export default function AssetForm({ asset, onClose }: Props) {
       acquisitionPrice,
       disposalDate: disposalDate || undefined,
       disposalPrice: disposalDate ? disposalPrice : undefined,
+      memo,
       detail: buildDetail(asset.type),
     }
     if (asset.type === 'STOCK' || asset.type === 'PHYSICAL') {
@@ -93,6 +95,10 @@ export default function AssetForm({ asset, onClose }: Props) {
           <label className={labelCls}>자산명</label>
           <input className={inputCls} value={name} onChange={(e) => setName(e.target.value)} />
         </div>
+        <div className="col-span-2">
+          <label className={labelCls}>메모 (검색 대상)</label>
+          <input className={inputCls} value={memo} onChange={(e) => setMemo(e.target.value)} />
+        </div>
         <div>
           <label className={labelCls}>취득일</label>
           <input type="date" className={inputCls} value={acquisitionDate} onChange={(e) => setAcquisitionDate(e.target.value)} />
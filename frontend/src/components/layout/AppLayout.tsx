@@ -1,7 +1,10 @@
 import { Outlet } from 'react-router-dom'
 import Sidebar from './Sidebar'
+import { usePriceStream } from '@/hooks/usePriceStream'
 
 export default function AppLayout() {
+  usePriceStream()
+
   return (
     <div className="flex h-screen bg-gray-950 text-gray-100 overflow-hidden">
       <Sidebar />
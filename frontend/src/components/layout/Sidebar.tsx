@@ -1,9 +1,11 @@
+import { useState } from 'react'
 import { NavLink } from 'react-router-dom'
 import {
   LayoutDashboard, Home, TrendingUp, Shield,
-  PiggyBank, Gem, Music, Settings, Sunset,
+  PiggyBank, Gem, Music, Settings, Sunset, Plus,
 } from 'lucide-react'
 import { cn } from '@/lib/utils'
+import { useCreatePortfolio, useCurrentPortfolio, usePortfolios, useSwitchPortfolio } from '@/hooks/usePortfolios'
 
 const NAV_ITEMS = [
   { to: '/',            icon: LayoutDashboard, label: '대시보드'   },
@@ -19,6 +21,53 @@ const PLAN_ITEMS = [
   { to: '/retirement', icon: Sunset, label: '은퇴 계획' },
 ]
 
+const NAME_RE = /^[a-z0-9][a-z0-9_-]{0,31}$/
+
+/** 포트폴리오 선택 (가족 구성원 등 — 서버에서는 포트폴리오마다 DB 파일이 따로) */
+function PortfolioSelect() {
+  const { data: portfolios = [] } = usePortfolios()
+  const current = useCurrentPortfolio()
+  const select  = useSwitchPortfolio()
+  const create  = useCreatePortfolio()
+  const [name, setName] = useState('')
+
+  const submit = () => {
+    if (!NAME_RE.test(name)) return
+    create.mutate(name, { onSuccess: () => setName('') })
+  }
+
+  return (
+    <div className="px-4 py-3 border-b border-gray-800 space-y-2">
+      <select
+        value={current}
+        onChange={(e) => select(e.target.value)}
+        className="w-full bg-gray-800 border border-gray-700 rounded-md px-2 py-1.5 text-sm text-gray-100"
+      >
+        {(portfolios.some((p) => p.name === current) ? portfolios : [{ name: current }, ...portfolios]).map((p) => (
+          <option key={p.name} value={p.name}>{p.name}</option>
+        ))}
+      </select>
+      <div className="flex gap-1">
+        <input
+          value={name}
+          onChange={(e) => setName(e.target.value.toLowerCase())}
+          onKeyDown={(e) => e.key === 'Enter' && submit()}
+          placeholder="새 포트폴리오"
+          className="flex-1 min-w-0 bg-gray-800 border border-gray-700 rounded-md px-2 py-1 text-xs text-gray-100"
+        />
+        <button
+          onClick={submit}
+          disabled={!NAME_RE.test(name) || create.isPending}
+          className="px-2 rounded-md bg-gray-800 text-gray-400 hover:text-gray-100 disabled:opacity-40"
+          title="포트폴리오 추가"
+        >
+          <Plus className="w-3.5 h-3.5" />
+        </button>
+      </div>
+    </div>
+  )
+}
+
 export default function Sidebar() {
   return (
     <aside className="w-56 flex-shrink-0 bg-gray-900 border-r border-gray-800 flex flex-col">
@@ -27,6 +76,8 @@ export default function Sidebar() {
         <h1 className="text-base font-bold text-blue-400 tracking-tight">💼 Asset Manager</h1>
       </div>
 
+      <PortfolioSelect />
+
       {/* 네비게이션 */}
       <nav className="flex-1 py-3 px-2 space-y-0.5 overflow-y-auto">
         {NAV_ITEMS.map(({ to, icon: Icon, label }) => (
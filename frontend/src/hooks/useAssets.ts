@@ -1,6 +1,6 @@
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
-import { assetApi } from '@/lib/api'
-import type { Asset, AssetType, ChartParams } from '@/types'
+import { analyticsApi, assetApi, summaryApi } from '@/lib/api'
+import type { Asset, AssetType, ChartParams, LotMethod, PerformanceParams, RiskParams } from '@/types'
 
 const ASSETS_KEY = ['assets'] as const
 
@@ -12,6 +12,40 @@ export function useAssets() {
   })
 }
 
+// ['assets', ...] 하위 키 → 자산 변경 시 invalidateQueries(['assets'])로 함께 무효화
+export function useSummary() {
+  return useQuery({
+    queryKey: [...ASSETS_KEY, 'summary'],
+    queryFn: () => summaryApi.get(),
+    staleTime: 5 * 60 * 1000,
+  })
+}
+
+// 기간 TWR·XIRR — 자산 변경 시 summary와 함께 무효화
+export function usePerformance(params: PerformanceParams = {}) {
+  return useQuery({
+    queryKey: [...ASSETS_KEY, 'performance', params],
+    queryFn: () => analyticsApi.performance(params),
+    staleTime: 5 * 60 * 1000,
+  })
+}
+
+export function useRisk(params: RiskParams = {}) {
+  return useQuery({
+    queryKey: [...ASSETS_KEY, 'risk', params],
+    queryFn: () => analyticsApi.risk(params),
+    staleTime: 5 * 60 * 1000,
+  })
+}
+
+export function usePnl(method: LotMethod = 'fifo') {
+  return useQuery({
+    queryKey: [...ASSETS_KEY, 'pnl', method],
+    queryFn: () => analyticsApi.pnl(method),
+    staleTime: 5 * 60 * 1000,
+  })
+}
+
 export function useAssetsByType(type: AssetType): Asset[] {
   const { data } = useAssets()
   return data?.filter((a) => a.type === type) ?? []
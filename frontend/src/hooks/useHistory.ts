@@ -1,6 +1,28 @@
-import { useMutation, useQueryClient } from '@tanstack/react-query'
+import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
 import { historyApi } from '@/lib/api'
-import type { HistoryItem } from '@/types'
+import type { AssetSeries, HistoryItem, SeriesParams } from '@/types'
+
+// ['assets', ...] 하위 키 → 자산·이력 변경 시 함께 무효화되고, 다시 받을 때는 바뀐 구간만 받아 합침
+export function useAssetSeries(assetId: string, interval: SeriesParams['interval'] = 'week') {
+  const qc  = useQueryClient()
+  const key = ['assets', 'series', assetId, interval]
+  return useQuery({
+    queryKey: key,
+    queryFn: async (): Promise<AssetSeries> => {
+      const prev = qc.getQueryData<AssetSeries>(key)
+      const next = await historyApi.series(assetId, {
+        interval,
+        fields: 'value',
+        ...(prev ? { since_version: prev.version } : {}),
+      })
+      if (!prev || next.full) return next
+      if (next.since === null) return { ...prev, version: next.version }
+      const since = next.since
+      return { ...next, points: [...prev.points.filter((p) => p.date < since), ...next.points] }
+    },
+    staleTime: 5 * 60 * 1000,
+  })
+}
 
 export function useAddHistory(assetId: string) {
   const qc = useQueryClient()
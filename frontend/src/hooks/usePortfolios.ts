@@ -0,0 +1,48 @@
+import { useSyncExternalStore } from 'react'
+import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { currentPortfolio, portfolioApi, selectPortfolio, subscribePortfolio } from '@/lib/api'
+
+const PORTFOLIOS_KEY = ['portfolios'] as const
+
+export function usePortfolios() {
+  return useQuery({
+    queryKey: PORTFOLIOS_KEY,
+    queryFn: portfolioApi.list,
+    staleTime: 10 * 60 * 1000,
+  })
+}
+
+export function useConsolidatedSummary(enabled = true) {
+  return useQuery({
+    queryKey: [...PORTFOLIOS_KEY, 'summary'],
+    queryFn: portfolioApi.summary,
+    enabled,
+    staleTime: 60 * 1000,
+  })
+}
+
+export function useCurrentPortfolio() {
+  return useSyncExternalStore(subscribePortfolio, currentPortfolio)
+}
+
+/** 포트폴리오 전환: 쿼리 키에 포트폴리오가 없으므로 캐시를 모두 초기화하고 다시 조회 */
+export function useSwitchPortfolio() {
+  const qc = useQueryClient()
+  return (name: string) => {
+    if (name === currentPortfolio()) return
+    selectPortfolio(name)
+    qc.resetQueries()
+  }
+}
+
+export function useCreatePortfolio() {
+  const qc     = useQueryClient()
+  const select = useSwitchPortfolio()
+  return useMutation({
+    mutationFn: (name: string) => portfolioApi.create(name),
+    onSuccess: ({ name }) => {
+      qc.invalidateQueries({ queryKey: PORTFOLIOS_KEY })
+      select(name)
+    },
+  })
+}
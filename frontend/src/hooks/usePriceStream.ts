@@ -0,0 +1,60 @@
+import { useEffect } from 'react'
+import { useQueryClient } from '@tanstack/react-query'
+import { deepCamel } from '@/lib/utils'
+import type { Asset } from '@/types'
+import { useCurrentPortfolio } from './usePortfolios'
+
+interface PriceDelta {
+  ticker:        string
+  price:         number
+  previousPrice: number | null
+  currency:      string
+  ts:            string
+  batch:         string
+  assets:        { id: string; currentValue: number; previousValue: number | null }[]
+}
+
+// 스트림 연결 여부 (연결 중이면 시세 업데이트 후 전체 자산 목록 재조회 생략)
+let streamConnected = false
+export const isPriceStreamConnected = () => streamConnected
+
+/**
+ * /api/stream/prices SSE 구독 → ['assets'] 캐시의 해당 자산만 제자리 갱신.
+ * 앱 레이아웃에서 1회 마운트. 포트폴리오가 바뀌면 그 포트폴리오 스트림으로 재연결
+ * (EventSource는 헤더를 못 보내므로 ?portfolio=).
+ */
+export function usePriceStream() {
+  const qc        = useQueryClient()
+  const portfolio = useCurrentPortfolio()
+
+  useEffect(() => {
+    const es = new EventSource(`/api/stream/prices?portfolio=${encodeURIComponent(portfolio)}`)
+    es.onopen  = () => { streamConnected = true }
+    es.onerror = () => { streamConnected = false }   // EventSource가 retry 간격으로 자동 재연결
+
+    es.addEventListener('price', (e) => {
+      const delta = deepCamel(JSON.parse((e as MessageEvent).data)) as PriceDelta
+      const byId  = new Map(delta.assets.map((a) => [a.id, a]))
+      qc.setQueryData<Asset[]>(['assets'], (old) =>
+        old?.map((a) => {
+          const d = byId.get(a.id)
+          if (!d) return a
+          return {
+            ...a,
+            currentValue:  d.currentValue,
+            previousValue: d.previousValue ?? a.previousValue,
+            previousPrice: delta.previousPrice ?? a.previousPrice,
+            updatedAt:     delta.ts,
+          }
+        }),
+      )
+      // KPI 요약은 서버 집계값 → 재조회 (서버는 data_version 캐시라 가벼움)
+      qc.invalidateQueries({ queryKey: ['assets', 'summary'] })
+    })
+
+    return () => {
+      streamConnected = false
+      es.close()
+    }
+  }, [qc, portfolio])
+}
@@ -16,6 +16,9 @@ export function useSaveSettings() {
   const qc = useQueryClient()
   return useMutation({
     mutationFn: (data: Partial<Settings>) => settingsApi.save(data),
-    onSuccess: () => qc.invalidateQueries({ queryKey: SETTINGS_KEY }),
+    onSuccess: () => {
+      qc.invalidateQueries({ queryKey: SETTINGS_KEY })
+      qc.invalidateQueries({ queryKey: ['assets', 'summary'] })   // 환율 → 외화 원금
+    },
   })
 }
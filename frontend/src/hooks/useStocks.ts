@@ -1,10 +1,15 @@
 import { useMutation, useQueryClient } from '@tanstack/react-query'
 import { stockApi } from '@/lib/api'
+import { isPriceStreamConnected } from './usePriceStream'
 
 export function useUpdateStocks() {
   const qc = useQueryClient()
   return useMutation({
     mutationFn: () => stockApi.update(),
-    onSuccess: () => qc.invalidateQueries({ queryKey: ['assets'] }),
+    onSuccess: () => {
+      // 스트림 연결 중이면 평가액은 SSE delta로 이미 반영됨 → 전체 목록 재조회 생략
+      if (!isPriceStreamConnected()) qc.invalidateQueries({ queryKey: ['assets'] })
+      qc.invalidateQueries({ queryKey: ['dividends'] })
+    },
   })
 }
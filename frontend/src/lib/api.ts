@@ -1,12 +1,29 @@
 import axios from 'axios'
 import { deepCamel, deepSnake } from './utils'
-import type { Asset, AssetType, ChartDataPoint, ChartParams, HistoryItem, Settings, RetirementPlan, DividendRecord, DividendSummary } from '@/types'
+import type { Asset, AssetQuery, ConsolidatedSummary, PortfolioInfo, AssetSeries, AssetType, ChartDataPoint, ChartParams, HistoryItem, LotMethod, Performance, PnlReport, PerformanceParams, RiskParams, RiskReport, Settings, RetirementPlan, DividendRecord, DividendSummary, PortfolioSummary, SeriesParams } from '@/types'
 
 const api = axios.create({
   baseURL: '/api',
   headers: { 'Content-Type': 'application/json' },
 })
 
+// ── 현재 포트폴리오 (요청마다 X-Portfolio 헤더로 전송) ─────────
+const PORTFOLIO_KEY           = 'portfolio'
+export const DEFAULT_PORTFOLIO = 'default'
+const portfolioListeners       = new Set<() => void>()
+
+export const currentPortfolio = () => localStorage.getItem(PORTFOLIO_KEY) || DEFAULT_PORTFOLIO
+
+export function selectPortfolio(name: string) {
+  localStorage.setItem(PORTFOLIO_KEY, name)
+  portfolioListeners.forEach((l) => l())
+}
+
+export function subscribePortfolio(listener: () => void) {
+  portfolioListeners.add(listener)
+  return () => { portfolioListeners.delete(listener) }
+}
+
 // 응답: snake_case → camelCase
 api.interceptors.response.use((res) => {
   res.data = deepCamel(res.data)
@@ -16,6 +33,7 @@ api.interceptors.response.use((res) => {
 // 요청: camelCase → snake_case
 api.interceptors.request.use((config) => {
   if (config.data) config.data = deepSnake(config.data)
+  config.headers.set('X-Portfolio', currentPortfolio())
   return config
 })
 
@@ -24,6 +42,13 @@ export const assetApi = {
   getAll: (type?: AssetType) =>
     api.get<Asset[]>('/assets', { params: type ? { type } : {} }).then((r) => r.data),
 
+  // 서버 필터·검색·페이지 (nextCursor 없으면 마지막 페이지)
+  query: (params: AssetQuery) =>
+    api.get<Asset[]>('/assets', { params }).then((r) => ({
+      items:      r.data,
+      nextCursor: (r.headers['x-next-cursor'] as string | undefined) ?? null,
+    })),
+
   getChart: (params: ChartParams) =>
     api.get<ChartDataPoint[]>('/assets/chart', { params }).then((r) => r.data),
 
@@ -37,8 +62,36 @@ export const assetApi = {
     api.delete<{ message: string }>(`/assets/${id}`).then((r) => r.data),
 }
 
+// ── Summary ───────────────────────────────────────────────
+export const summaryApi = {
+  get: () => api.get<PortfolioSummary>('/summary').then((r) => r.data),
+}
+
+// ── Portfolios ────────────────────────────────────────────
+export const portfolioApi = {
+  list:    () => api.get<PortfolioInfo[]>('/portfolios').then((r) => r.data),
+  create:  (name: string) =>
+    api.post<{ name: string; message: string }>('/portfolios', { name }).then((r) => r.data),
+  summary: () => api.get<ConsolidatedSummary>('/portfolios/summary').then((r) => r.data),
+}
+
+// ── Analytics ─────────────────────────────────────────────
+export const analyticsApi = {
+  performance: (params: PerformanceParams) =>
+    api.get<Performance>('/analytics/performance', { params }).then((r) => r.data),
+
+  risk: (params: RiskParams) =>
+    api.get<RiskReport>('/analytics/risk', { params }).then((r) => r.data),
+
+  pnl: (method: LotMethod) =>
+    api.get<PnlReport>('/analytics/pnl', { params: { method } }).then((r) => r.data),
+}
+
 // ── History ───────────────────────────────────────────────
 export const historyApi = {
+  series: (assetId: string, params: SeriesParams) =>
+    api.get<AssetSeries>(`/assets/${assetId}/series`, { params }).then((r) => r.data),
+
   add: (assetId: string, data: HistoryItem) =>
     api.post(`/assets/${assetId}/history`, data).then((r) => r.data),
 
@@ -1,36 +1,27 @@
 import { PieChart, Pie, Cell, Tooltip, ResponsiveContainer, Legend } from 'recharts'
 import KpiCard from '@/components/common/KpiCard'
 import AssetChart from '@/components/common/AssetChart'
-import { useAssets } from '@/hooks/useAssets'
+import { useSummary } from '@/hooks/useAssets'
+import { useConsolidatedSummary, usePortfolios } from '@/hooks/usePortfolios'
 import { formatMoney, formatManwon, TYPE_LABELS, TYPE_COLORS } from '@/lib/utils'
-import type { AssetType } from '@/types'
 
 export default function Dashboard() {
-  const { data: assets = [], isLoading } = useAssets()
+  // KPI·비중은 서버 집계 (/api/summary) — 전체 자산 목록·이력을 받지 않음
+  const { data: summary, isLoading } = useSummary()
+  const { data: portfolios = [] }     = usePortfolios()
+  const multi = portfolios.length > 1
+  const { data: consolidated }        = useConsolidatedSummary(multi)
 
-  const active = assets.filter((a) => !a.disposalDate)
+  const totalAsset = summary?.totalAsset ?? 0
+  const totalLiab  = summary?.totalLiability ?? 0
+  const netWorth   = summary?.netWorth ?? 0
 
-  let totalAsset = 0, totalLiab = 0
-  for (const a of active) {
-    totalAsset += a.currentValue
-    if (a.type === 'REAL_ESTATE' && a.detail) {
-      const d = a.detail as { loanAmount?: number; tenantDeposit?: number }
-      totalLiab += (d.loanAmount ?? 0) + (d.tenantDeposit ?? 0)
-    }
-  }
-  const netWorth = totalAsset - totalLiab
-
-  const pieMap: Partial<Record<AssetType, number>> = {}
-  for (const a of active) {
-    pieMap[a.type] = (pieMap[a.type] ?? 0) + a.currentValue
-  }
-  const pieData = Object.entries(pieMap)
-    .filter(([, v]) => v > 0)
-    .map(([type, value]) => ({
-      name:  TYPE_LABELS[type as AssetType],
-      value,
-      type:  type as AssetType,
-    }))
+  const pieData = (summary?.byType ?? []).map((t) => ({
+    name:  TYPE_LABELS[t.type],
+    value: t.value,
+    share: t.share,
+    type:  t.type,
+  }))
 
   if (isLoading) {
     return (
@@ -82,32 +73,65 @@ export default function Dashboard() {
           </div>
           {/* 범례 + 비율 테이블 */}
           <div className="flex-1 w-full space-y-2">
-            {pieData
-              .sort((a, b) => b.value - a.value)
-              .map((entry) => {
-                const pct = totalAsset > 0 ? (entry.value / totalAsset) * 100 : 0
-                return (
-                  <div key={entry.type} className="flex items-center gap-3">
-                    <span
-                      className="w-2.5 h-2.5 rounded-full shrink-0"
-                      style={{ background: TYPE_COLORS[entry.type] }}
+            {pieData.map((entry) => {
+              const pct = entry.share
+              return (
+                <div key={entry.type} className="flex items-center gap-3">
+                  <span
+                    className="w-2.5 h-2.5 rounded-full shrink-0"
+                    style={{ background: TYPE_COLORS[entry.type] }}
+                  />
+                  <span className="text-xs text-gray-400 w-28 truncate">{entry.name}</span>
+                  <div className="flex-1 bg-gray-700 rounded-full h-1.5 overflow-hidden">
+                    <div
+                      className="h-full rounded-full"
+                      style={{ width: `${pct}%`, background: TYPE_COLORS[entry.type] }}
                     />
-                    <span className="text-xs text-gray-400 w-28 truncate">{entry.name}</span>
-                    <div className="flex-1 bg-gray-700 rounded-full h-1.5 overflow-hidden">
-                      <div
-                        className="h-full rounded-full"
-                        style={{ width: `${pct}%`, background: TYPE_COLORS[entry.type] }}
-                      />
-                    </div>
-                    <span className="text-xs text-gray-300 w-12 text-right">{pct.toFixed(1)}%</span>
-                    <span className="text-xs text-gray-500 w-24 text-right hidden md:block">{formatManwon(entry.value)}</span>
                   </div>
-                )
-              })}
+                  <span className="text-xs text-gray-300 w-12 text-right">{pct.toFixed(1)}%</span>
+                  <span className="text-xs text-gray-500 w-24 text-right hidden md:block">{formatManwon(entry.value)}</span>
+                </div>
+              )
+            })}
           </div>
         </div>
       </div>
 
+      {/* 전체 포트폴리오 합산 — 포트폴리오가 2개 이상일 때만 */}
+      {multi && consolidated && (
+        <div className="bg-gray-800 border border-gray-700 rounded-xl p-5">
+          <h3 className="text-sm font-semibold text-gray-300 mb-4">
+            👪 전체 포트폴리오 합산 · 순 자산 {formatMoney(consolidated.netWorth)}
+          </h3>
+          <table className="w-full text-sm">
+            <thead>
+              <tr className="text-xs text-gray-500 border-b border-gray-700">
+                <th className="text-left py-2">포트폴리오</th>
+                <th className="text-right py-2">총 자산</th>
+                <th className="text-right py-2">총 부채</th>
+                <th className="text-right py-2">순 자산</th>
+                <th className="text-right py-2">비중</th>
+                <th className="text-right py-2">주식 수익률</th>
+              </tr>
+            </thead>
+            <tbody>
+              {consolidated.portfolios.map((p) => (
+                <tr key={p.name} className="border-b border-gray-700/50 text-gray-200">
+                  <td className="py-2">{p.name}</td>
+                  <td className="text-right">{formatManwon(p.totalAsset)}</td>
+                  <td className="text-right text-red-400">{formatManwon(p.totalLiability)}</td>
+                  <td className="text-right text-blue-400">{formatManwon(p.netWorth)}</td>
+                  <td className="text-right">{p.share.toFixed(1)}%</td>
+                  <td className={p.stocks.roi >= 0 ? 'text-right text-emerald-400' : 'text-right text-red-400'}>
+                    {p.stocks.roi.toFixed(2)}%
+                  </td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </div>
+      )}
+
       {/* 자산 성장 추이 — 1줄 */}
       <div className="bg-gray-800 border border-gray-700 rounded-xl p-5">
         <h3 className="text-sm font-semibold text-gray-300 mb-4">📈 자산 성장 추이</h3>
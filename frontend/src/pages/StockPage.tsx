@@ -1,6 +1,6 @@
 import { useState } from 'react'
 import { RefreshCw, Plus, TrendingUp, TrendingDown, Minus, ChevronRight } from 'lucide-react'
-import { useAssets, useAssetsByType } from '@/hooks/useAssets'
+import { useAssets, useAssetsByType, usePerformance, usePnl, useRisk, useSummary } from '@/hooks/useAssets'
 import { useUpdateStocks } from '@/hooks/useStocks'
 import { useDividendSummary } from '@/hooks/useDividends'
 import { useSettings } from '@/hooks/useSettings'
@@ -9,7 +9,7 @@ import AssetChart from '@/components/common/AssetChart'
 import AssetModal from '@/components/common/AssetModal'
 import KpiCard from '@/components/common/KpiCard'
 import { formatMoney, formatManwon, formatPnl, formatAvgPrice, formatPrice } from '@/lib/utils'
-import type { Asset, Settings, StockDetail } from '@/types'
+import type { Asset, LotMethod, PnlSummary, Settings, StockDetail } from '@/types'
 
 // exchange_rate_USD → deepCamel → "exchangeRate_USD"
 function getRate(settings: Settings | undefined, currency?: string): number {
@@ -24,27 +24,52 @@ function costKrw(asset: Asset, settings: Settings | undefined): number {
   return (asset.acquisitionPrice ?? 0) * (asset.quantity ?? 0) * rate
 }
 
+// 서버 요약(/api/summary)이 아직 없을 때만 목록에서 직접 합산
+function sumPnl(stocks: Asset[], settings: Settings | undefined): PnlSummary {
+  const value = stocks.reduce((s, a) => s + a.currentValue, 0)
+  const cost  = stocks.reduce((s, a) => s + costKrw(a, settings), 0)
+  return { value, cost, pnl: value - cost, roi: cost > 0 ? ((value - cost) / cost) * 100 : 0 }
+}
+
+// 수익률(소수) → '+12.3%'
+function fmtRate(r: number | null) {
+  return r == null ? '-' : `${r >= 0 ? '+' : ''}${(r * 100).toFixed(1)}%`
+}
+
 export default function StockPage() {
   const assets = useAssetsByType('STOCK')
   const { isLoading } = useAssets()
   const updateMut = useUpdateStocks()
   const { data: divSummary } = useDividendSummary()
   const { data: settings }   = useSettings()
+  const { data: summary }    = useSummary()
+  const { data: perf }       = usePerformance({ type: 'STOCK' })
+  const { data: risk }       = useRisk()
 
   // 계좌별 뷰: null=계좌 목록, string=선택된 계좌명
   const [activeAccount, setActiveAccount] = useState<string | null>(null)
   const [modalId,       setModalId]       = useState<string | null>(null)
   const [showCreate,    setShowCreate]    = useState(false)
+  const [lotMethod,     setLotMethod]     = useState<LotMethod>('fifo')
+  const { data: pnlReport } = usePnl(lotMethod)
 
   const modalAsset = assets.find((a) => a.id === modalId) ?? null
 
   const active = assets.filter((a) => !a.disposalDate)
   const sold   = assets.filter((a) => !!a.disposalDate)
 
-  const totalVal  = active.reduce((s, a) => s + a.currentValue, 0)
-  const totalCost = active.reduce((s, a) => s + costKrw(a, settings), 0)
-  const pnl = totalVal - totalCost
-  const roi = totalCost > 0 ? (pnl / totalCost) * 100 : 0
+  // KPI·계좌별 원금/손익은 서버 집계값 사용
+  const { value: totalVal, cost: totalCost, pnl, roi } = summary?.stocks ?? sumPnl(active, settings)
+  const accountPnl = new Map((summary?.stocks.accounts ?? []).map((a) => [a.account, a]))
+
+  // 보유 전체 기간 수익률: 선택한 계좌가 있으면 그 계좌, 없으면 주식 전체
+  const perfItem = activeAccount ? perf?.accounts.find((a) => a.key === activeAccount) : perf?.types[0]
+  const perfSub  = perfItem ? `TWR ${fmtRate(perfItem.twrAnnualized ?? perfItem.twr)} · XIRR ${fmtRate(perfItem.xirr)}` : undefined
+
+  // 위험 지표 (현재 비중 포트폴리오, 최근 3년)
+  const riskSub  = risk?.portfolio
+    ? `변동성 ${fmtRate(risk.portfolio.volatility).replace('+', '')} · MDD ${fmtRate(risk.portfolio.maxDrawdown)}`
+    : undefined
 
   // 계좌별 그룹
   const accountMap = new Map<string, Asset[]>()
@@ -112,11 +137,12 @@ export default function StockPage() {
 
       {/* KPI */}
       <div className="grid grid-cols-2 sm:grid-cols-4 gap-3">
-        <KpiCard label="평가 총액" value={formatMoney(totalVal)} color="default" />
+        <KpiCard label="평가 총액" value={formatMoney(totalVal)} color="default" sub={riskSub} />
         <KpiCard
           label="평가 손익"
           value={`${formatPnl(pnl)} (${roi >= 0 ? '+' : ''}${roi.toFixed(1)}%)`}
           color={pnl >= 0 ? 'green' : 'red'}
+          sub={perfSub}
         />
         <KpiCard label="투자 원금" value={formatMoney(totalCost)} color="default" />
         <KpiCard
@@ -159,6 +185,7 @@ export default function StockPage() {
                     key={acct}
                     name={acct}
                     stocks={stocks}
+                    totals={accountPnl.get(acct) ?? sumPnl(stocks, settings)}
                     settings={settings}
                     onClick={() => setActiveAccount(acct)}
                   />
@@ -178,6 +205,43 @@ export default function StockPage() {
             </section>
           )}
 
+          {/* 연도별 실현·미실현 손익 (lot 매칭) */}
+          {pnlReport && pnlReport.years.length > 0 && (
+            <section className="bg-gray-800 border border-gray-700 rounded-xl p-5 space-y-3">
+              <div className="flex items-center justify-between">
+                <h3 className="text-sm font-semibold text-gray-300">🧾 연도별 손익</h3>
+                <select
+                  className="bg-gray-900 border border-gray-700 rounded px-2 py-1 text-xs text-gray-300"
+                  value={lotMethod}
+                  onChange={(e) => setLotMethod(e.target.value as LotMethod)}
+                >
+                  <option value="fifo">선입선출</option>
+                  <option value="average">이동평균</option>
+                </select>
+              </div>
+              <table className="w-full text-xs">
+                <thead className="text-gray-500">
+                  <tr>
+                    <th className="text-left py-1">연도</th>
+                    <th className="text-right">실현 손익</th>
+                    <th className="text-right">미실현 손익</th>
+                    <th className="text-right">해외 양도세 추정</th>
+                  </tr>
+                </thead>
+                <tbody className="text-gray-300">
+                  {[...pnlReport.years].reverse().map((y) => (
+                    <tr key={y.year} className="border-t border-gray-700/60">
+                      <td className="py-1">{y.year}</td>
+                      <td className="text-right">{formatPnl(y.realized)}</td>
+                      <td className="text-right">{formatPnl(y.unrealized)}</td>
+                      <td className="text-right">{y.estimatedTax > 0 ? formatMoney(y.estimatedTax) : '-'}</td>
+                    </tr>
+                  ))}
+                </tbody>
+              </table>
+            </section>
+          )}
+
           {active.length === 0 && sold.length === 0 && (
             <div className="text-center py-16 text-gray-500 bg-gray-800/50 rounded-xl border border-gray-700">
               등록된 주식 자산이 없습니다.
@@ -193,7 +257,7 @@ export default function StockPage() {
           <AccountSummaryBanner
             name={activeAccount}
             stocks={currentStocks}
-            settings={settings}
+            totals={accountPnl.get(activeAccount) ?? sumPnl(currentStocks, settings)}
             onBack={() => setActiveAccount(null)}
           />
 
@@ -225,17 +289,15 @@ export default function StockPage() {
 
 /* ── 계좌 카드 ── */
 function AccountCard({
-  name, stocks, settings, onClick,
+  name, stocks, totals, settings, onClick,
 }: {
   name: string
   stocks: Asset[]
+  totals: PnlSummary
   settings: Settings | undefined
   onClick: () => void
 }) {
-  const val  = stocks.reduce((s, a) => s + a.currentValue, 0)
-  const cost = stocks.reduce((s, a) => s + costKrw(a, settings), 0)
-  const pnl  = val - cost
-  const roi  = cost > 0 ? (pnl / cost) * 100 : 0
+  const { value: val, pnl, roi } = totals
   const topStocks = stocks.slice(0, 3)
 
   return (
@@ -302,17 +364,14 @@ function AccountCard({
 
 /* ── 계좌 선택 후 요약 배너 ── */
 function AccountSummaryBanner({
-  name, stocks, settings, onBack,
+  name, stocks, totals, onBack,
 }: {
   name: string
   stocks: Asset[]
-  settings: Settings | undefined
+  totals: PnlSummary
   onBack: () => void
 }) {
-  const val  = stocks.reduce((s, a) => s + a.currentValue, 0)
-  const cost = stocks.reduce((s, a) => s + costKrw(a, settings), 0)
-  const pnl  = val - cost
-  const roi  = cost > 0 ? (pnl / cost) * 100 : 0
+  const { value: val, pnl, roi } = totals
 
   return (
     <div className="bg-gray-800 border border-blue-500/30 rounded-xl p-4">
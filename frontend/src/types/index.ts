@@ -56,6 +56,152 @@ export interface DividendSummary {
   totalMonthly: number
 }
 
+export interface PnlSummary {
+  value: number
+  cost:  number   // 원금 (KRW 환산)
+  pnl:   number
+  roi:   number   // %
+}
+
+/** /api/summary — 대시보드·주식 페이지 KPI (이력 미포함) */
+export interface PortfolioSummary {
+  totalAsset:     number
+  totalLiability: number
+  netWorth:       number
+  byType:  { type: AssetType; value: number; count: number; share: number }[]
+  stocks:  PnlSummary & { accounts: (PnlSummary & { account: string; count: number })[] }
+  rates:   Record<string, number>
+}
+
+/** /api/portfolios — 포트폴리오(포트폴리오별 DB 파일) 목록 */
+export interface PortfolioInfo {
+  name: string
+  size: number    // DB 파일 byte
+  open: boolean   // 서버에서 엔진이 열려 있는지
+}
+
+/** /api/portfolios/summary — 전체 포트폴리오 합산 */
+export interface ConsolidatedSummary {
+  totalAsset:     number
+  totalLiability: number
+  netWorth:       number
+  byType:     { type: AssetType; value: number; count: number; share: number }[]
+  portfolios: {
+    name:           string
+    totalAsset:     number
+    totalLiability: number
+    netWorth:       number
+    share:          number   // 전체 자산 중 비중 (%)
+    stocks:         PnlSummary
+  }[]
+}
+
+/** /api/analytics/performance — 기간 성과 (수익률은 소수, 0.1 = 10%) */
+export interface PerformanceParams {
+  from?: string
+  to?:   string
+  type?: AssetType
+}
+
+export interface PerformanceItem {
+  key:           string
+  label:         string
+  startValue:    number
+  endValue:      number
+  netFlow:       number   // 기간 순유입 (매수 +, 매도 −)
+  income:        number   // 배당
+  pnl:           number
+  twr:           number | null
+  twrAnnualized: number | null   // 기간 1년 이상일 때만
+  xirr:          number | null
+  type?:         AssetType
+  account?:      string | null
+}
+
+export interface Performance {
+  from:      string | null
+  to:        string
+  holdings:  PerformanceItem[]
+  accounts:  PerformanceItem[]
+  types:     PerformanceItem[]
+  portfolio: PerformanceItem | null
+}
+
+/** /api/analytics/risk — 위험 지표 (변동성·낙폭은 소수, 연환산) */
+export interface RiskParams {
+  from?:      string
+  to?:        string
+  benchmark?: string
+  window?:    number
+}
+
+export interface RiskStats {
+  volatility:        number | null
+  maxDrawdown:       number | null
+  drawdownStart:     string | null
+  drawdownEnd:       string | null
+  beta:              number | null
+  observations:      number
+  rollingVolatility: (number | null)[]   // rollingDates에 맞춘 값
+}
+
+export interface RiskHolding extends RiskStats {
+  ticker:   string
+  name:     string
+  currency: string
+  assetIds: string[]
+  weight:   number
+}
+
+export interface RiskReport {
+  from:          string | null
+  to:            string | null
+  requestedFrom: string | null   // 요청한 시작일 (압축 구간이면 from이 dailyFrom으로 당겨짐)
+  dailyFrom:     string | null   // 이 날짜 이후만 일별 시세 (compaction 경계, 압축 전이면 null)
+  window:        number
+  observations:  number
+  holdings:      RiskHolding[]
+  portfolio:     RiskStats | null
+  benchmark:     (RiskStats & { ticker: string }) | null
+  rollingDates:  string[]
+  matrix:        { tickers: string[]; correlation: (number | null)[][]; covariance: (number | null)[][] }
+}
+
+/** /api/analytics/pnl — lot 매칭 실현·미실현 손익 (KRW) */
+export type LotMethod = 'fifo' | 'average'
+
+export interface PnlYear {
+  year:             number
+  realized:         number
+  proceeds:         number
+  cost:             number
+  unrealized:       number   // 연말(올해는 오늘) 기준
+  endValue:         number
+  endCost:          number
+  overseasRealized: number
+  taxableOverseas:  number
+  estimatedTax:     number   // 해외주식 양도세 추정 (공제 250만 원 후 22%)
+}
+
+export interface PnlHolding {
+  assetId:        string
+  name:           string
+  ticker:         string | null
+  currency:       string
+  quantity:       number
+  cost:           number
+  value:          number
+  unrealized:     number
+  realized:       number
+  realizedByYear: Record<string, number>
+}
+
+export interface PnlReport {
+  method:   LotMethod
+  years:    PnlYear[]
+  holdings: PnlHolding[]
+}
+
 export interface PensionDetail {
   pensionType?:           string
   expectedStartYear:      number
@@ -85,12 +231,59 @@ export interface Asset {
   disposalDate?:    string
   disposalPrice?:   number
   quantity:         number
+  memo?:            string
   createdAt:        string
   updatedAt:        string
   history:          HistoryItem[]
   detail?:          AssetDetail
 }
 
+/** GET /api/assets 쿼리 (limit 지정 시 다음 cursor는 응답 헤더 X-Next-Cursor) */
+export interface AssetQuery {
+  type?:     AssetType
+  account?:  string
+  ticker?:   string
+  currency?: Currency
+  status?:   'active' | 'disposed' | 'all'
+  q?:        string
+  sort?:     'name' | 'value' | 'acquisition_date' | 'created_at' | 'updated_at'
+  order?:    'asc' | 'desc'
+  cursor?:   string
+  limit?:    number
+}
+
+/** GET /api/assets/{id}/series 쿼리 */
+export interface SeriesParams {
+  from?:          string
+  to?:            string
+  interval?:      'day' | 'week' | 'month'
+  fields?:        string   // 'price,value,quantity' 중 쉼표 구분
+  since_version?: number   // 이 버전 이후 바뀐 구간만
+}
+
+/** 구간별 점 (date = 구간 시작일). 단가는 OHLC, 평가액·수량은 구간 마지막 값 */
+export interface SeriesPoint {
+  date:      string
+  open?:     number | null
+  high?:     number | null
+  low?:      number | null
+  close?:    number | null
+  value?:    number | null
+  quantity?: number | null
+}
+
+/** full=false면 since 이후 점만 담김 (since=null이면 변경 없음) */
+export interface AssetSeries {
+  assetId:  string
+  interval: 'day' | 'week' | 'month'
+  from:     string | null
+  to:       string | null
+  version:  number
+  full:     boolean
+  since:    string | null
+  points:   SeriesPoint[]
+}
+
 export interface ChartDataPoint {
   date:   string
   label:  string
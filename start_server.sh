@@ -28,15 +28,17 @@ cp -r /app/frontend/dist /app/static
 # 3. Backend 시작
 echo "[3/3] Starting Backend Server..."
 mkdir -p /app/logs
+# WORKERS: uvicorn worker 프로세스 수 (캐시는 data_version으로 동기화, 예약 업데이트는 1개 worker만)
 setsid nohup python -m uvicorn backend.main:app \
     --host 0.0.0.0 \
     --port 8090 \
+    --workers "${WORKERS:-2}" \
     >> /app/logs/server.log 2>&1 &
 echo $! > "$PID_FILE"
 
 echo "========================================"
 echo "  Deployment Complete!"
-echo "  Server PID : $(cat $PID_FILE)"
+echo "  Server PID : $(cat $PID_FILE) (workers: ${WORKERS:-2})"
 echo "  URL        : http://localhost:8090"
 echo "  Logs       : tail -f /app/logs/server.log"
 echo "========================================"
@@ -0,0 +1,14 @@
+"""
+테스트 공통 설정.
+backend.core.config가 import 시점에 환경변수를 읽으므로, 어떤 backend 모듈보다 먼저
+임시 DB 디렉터리와 오프라인 시세 제공자를 지정한다.
+"""
+import os
+import sys
+import tempfile
+
+os.environ["DB_DIR"]                = tempfile.mkdtemp(prefix="assets-test-")
+os.environ["MARKET_DATA_PROVIDERS"] = "fixture"
+os.environ["PARQUET_INTERVAL_HOURS"] = "0"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
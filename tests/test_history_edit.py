@@ -0,0 +1,44 @@
+"""종가로 파생되는 이력에서 수동 수정한 날짜가 수정값 그대로 돌아오는지 확인"""
+import asyncio
+
+import httpx
+
+from backend.main import app
+from backend.db.database import init_db, async_session
+from backend.db.crud import create_asset
+from backend.db.prices import upsert_prices
+
+
+async def _scenario():
+    await init_db()
+    async with async_session() as db:
+        asset_id = await create_asset(db, {
+            "type": "STOCK", "name": "편집 테스트", "quantity": 10,
+            "acquisition_date": "2024-01-02",
+            "detail": {"ticker": "EDIT.KS", "currency": "KRW"},
+        })
+        await upsert_prices(db, "EDIT.KS", [
+            {"date": "2024-01-02", "close": 102.0},
+            {"date": "2024-01-03", "close": 103.0},
+            {"date": "2024-01-04", "close": 104.0},
+        ])
+        await db.commit()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        before = {h["date"][:10]: h for h in (await client.get(f"/api/assets/{asset_id}/history")).json()}
+        put    = await client.put(f"/api/assets/{asset_id}/history/2024-01-03", json={"price": 555, "value": 5550})
+        after  = {h["date"][:10]: h for h in (await client.get(f"/api/assets/{asset_id}/history")).json()}
+    return before, put, after
+
+
+def test_edited_day_overrides_derived_close():
+    before, put, after = asyncio.run(_scenario())
+
+    assert before["2024-01-03"]["price"] == 103.0
+    assert put.status_code == 200
+    assert after["2024-01-03"]["price"] == 555.0
+    assert after["2024-01-03"]["value"] == 5550.0
+    # 수정하지 않은 날짜는 계속 종가 × 수량
+    assert after["2024-01-04"]["price"] == 104.0
+    assert after["2024-01-04"]["value"] == 1040.0
@@ -0,0 +1,23 @@
+"""존재하지 않는 자산에 하위 행(이력·거래·배당)을 쓰면 FK 위반 500 대신 404"""
+import asyncio
+
+import httpx
+
+from backend.main import app
+from backend.db.database import init_db
+
+
+async def _requests():
+    await init_db()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return [
+            await client.post("/api/assets/no-such-asset/history", json={"date": "2024-01-03", "value": 1000}),
+            await client.put("/api/assets/no-such-asset/history/2024-01-03", json={"price": 10, "quantity": 3}),
+            await client.post("/api/dividends/no-such-asset", json={"date": "2024-01-03", "amount_krw": 100}),
+        ]
+
+
+def test_child_rows_of_unknown_asset_return_404():
+    for response in asyncio.run(_requests()):
+        assert response.status_code == 404, (response.request.url, response.text)
@@ -0,0 +1,106 @@
+"""
+다중 worker 보장 확인: 같은 DB_DIR을 쓰는 worker 프로세스 2개를 동시에 띄워
+  - 동시 기동 시 migration이 충돌 없이 한 번만 적용되는지 (migrate.lock)
+  - 예약 업데이트 leader가 정확히 1개이고, leader가 내려놓으면 다른 worker가 이어받는지 (updater.lock)
+  - 한 worker의 쓰기 후 다른 worker의 캐시(settings, 자산 목록)가 최신 값을 돌려주는지 (data_version)
+를 확인한다. worker는 stdin으로 JSON 명령을 받고 stdout으로 JSON 결과를 한 줄씩 돌려준다.
+"""
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+WORKER = r'''
+import asyncio, contextlib, json, sys
+
+async def main():
+    import httpx
+    from backend.db.database import init_db
+    from backend.main import app
+    from backend.services import scheduler
+
+    out = sys.__stdout__
+    with contextlib.redirect_stdout(sys.stderr):
+        await init_db()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://w") as c:
+            for line in sys.stdin:
+                cmd = json.loads(line)
+                op  = cmd["op"]
+                if op == "schedule":
+                    await scheduler.run_scheduled_update(0)
+                    reply = {"leader": scheduler.is_leader()}
+                elif op == "release":
+                    scheduler.release()
+                    reply = {"leader": scheduler.is_leader()}
+                elif op == "get":
+                    reply = (await c.get(cmd["path"])).json()
+                else:
+                    r = await c.request(op.upper(), cmd["path"], json=cmd.get("json"))
+                    reply = {"status": r.status_code}
+                out.write(json.dumps(reply) + "\n")
+                out.flush()
+
+asyncio.run(main())
+'''
+
+
+class Worker:
+    def __init__(self, db_dir: str):
+        env = dict(os.environ, DB_DIR=db_dir, PYTHONPATH=str(ROOT), CPU_EXECUTOR_WORKERS="1")
+        self.proc = subprocess.Popen(
+            [sys.executable, "-c", WORKER], cwd=ROOT, env=env, text=True,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+
+    def send(self, op: str, **kw):
+        self.proc.stdin.write(json.dumps({"op": op, **kw}) + "\n")
+        self.proc.stdin.flush()
+        line = self.proc.stdout.readline()
+        assert line, self.proc.stderr.read()
+        return json.loads(line)
+
+    def close(self) -> str:
+        self.proc.stdin.close()
+        self.proc.wait(timeout=60)
+        stderr = self.proc.stderr.read()
+        assert self.proc.returncode == 0, stderr
+        return stderr
+
+
+def test_two_workers_share_one_db():
+    db_dir  = tempfile.mkdtemp(prefix="assets-mw-")
+    a, b    = Worker(db_dir), Worker(db_dir)   # 동시 기동 → migrate.lock으로 직렬화
+    workers = [a, b]
+    try:
+        # 예약 업데이트 leader는 정확히 1개
+        leaders = [w.send("schedule")["leader"] for w in workers]
+        assert sorted(leaders) == [False, True]
+        leader, follower = (a, b) if leaders[0] else (b, a)
+        assert leader.send("schedule")["leader"] is True       # 유지
+        assert follower.send("schedule")["leader"] is False
+
+        # leader가 내려놓으면 다음 주기에 다른 worker가 이어받는다
+        assert leader.send("release")["leader"] is False
+        assert follower.send("schedule")["leader"] is True
+        assert leader.send("schedule")["leader"] is False
+
+        # a의 캐시를 채운 뒤 b가 쓰면, a의 다음 조회는 b의 쓰기를 반영
+        assert a.send("get", path="/api/settings").get("target_amount") is None
+        assert a.send("get", path="/api/assets") == []
+        assert b.send("put", path="/api/settings", json={"target_amount": "123"})["status"] == 200
+        assert b.send("post", path="/api/assets", json={"type": "ETC", "name": "b가 추가"})["status"] == 201
+        assert a.send("get", path="/api/settings")["target_amount"] == 123
+        assert [x["name"] for x in a.send("get", path="/api/assets")] == ["b가 추가"]
+    finally:
+        stderr = [w.close() for w in workers]
+
+    # migration은 한 worker만 적용하고, 다른 worker는 최신 버전 확인만
+    applied = [s for s in stderr if "migration v1~" in s]
+    assert len(applied) == 1, stderr
+    with sqlite3.connect(os.path.join(db_dir, "assets.db")) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] > 0